@@ -0,0 +1,57 @@
+"""Add vehicle_cache table for the local listing index
+
+Revision ID: 010_add_vehicle_cache
+Revises: 009_add_jsonb_tables
+Create Date: 2026-10-16
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "010_add_vehicle_cache"
+down_revision = "009_add_jsonb_tables"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "vehicle_cache",
+        sa.Column("vin", sa.String(length=17), nullable=False),
+        sa.Column("make", sa.String(length=100), nullable=True),
+        sa.Column("model", sa.String(length=100), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("mileage", sa.Integer(), nullable=True),
+        sa.Column("inventory_type", sa.String(length=50), nullable=True),
+        sa.Column("listing", JSONB, nullable=False),
+        sa.Column(
+            "first_seen_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "last_seen_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("vin"),
+    )
+    op.create_index("idx_vehicle_cache_make_model_year", "vehicle_cache", ["make", "model", "year"])
+    op.create_index("idx_vehicle_cache_price", "vehicle_cache", ["price"])
+    op.create_index("idx_vehicle_cache_mileage", "vehicle_cache", ["mileage"])
+    op.create_index("idx_vehicle_cache_last_seen", "vehicle_cache", ["last_seen_at"])
+
+
+def downgrade():
+    op.drop_index("idx_vehicle_cache_last_seen", table_name="vehicle_cache")
+    op.drop_index("idx_vehicle_cache_mileage", table_name="vehicle_cache")
+    op.drop_index("idx_vehicle_cache_price", table_name="vehicle_cache")
+    op.drop_index("idx_vehicle_cache_make_model_year", table_name="vehicle_cache")
+    op.drop_table("vehicle_cache")
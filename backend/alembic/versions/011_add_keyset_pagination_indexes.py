@@ -0,0 +1,55 @@
+"""Add (timestamp, id) composite indexes for keyset pagination
+
+Revision ID: 011_add_keyset_pagination_indexes
+Revises: 010_add_vehicle_cache
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "011_add_keyset_pagination_indexes"
+down_revision = "010_add_vehicle_cache"
+branch_labels = None
+depends_on = None
+
+# name, table, columns
+KEYSET_INDEXES = [
+    ("ix_deals_created_at_id", "deals", ["created_at", "id"]),
+    ("ix_favorites_user_created_at_id", "favorites", ["user_id", "created_at", "id"]),
+    ("ix_saved_searches_user_created_at_id", "saved_searches", ["user_id", "created_at", "id"]),
+    (
+        "ix_negotiation_sessions_user_created_at_id",
+        "negotiation_sessions",
+        ["user_id", "created_at", "id"],
+    ),
+    ("idx_search_history_user_cursor", "search_history", ["user_id", "timestamp", "id"]),
+    ("idx_ai_responses_feature_cursor", "ai_responses", ["feature", "timestamp", "id"]),
+    ("idx_ai_responses_deal_cursor", "ai_responses", ["deal_id", "timestamp", "id"]),
+    ("idx_ai_responses_user_cursor", "ai_responses", ["user_id", "timestamp", "id"]),
+]
+
+# (column, timestamp) indexes that are prefixes of the new ones
+SUPERSEDED_INDEXES = [
+    ("idx_ai_responses_feature", "ai_responses", ["feature", "timestamp"]),
+    ("idx_ai_responses_deal", "ai_responses", ["deal_id", "timestamp"]),
+    ("idx_ai_responses_user", "ai_responses", ["user_id", "timestamp"]),
+]
+
+
+def upgrade():
+    # search_history and ai_responses are large; build without locking out writes
+    with op.get_context().autocommit_block():
+        for name, table, columns in KEYSET_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        for name, table, _ in SUPERSEDED_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        for name, table, _ in reversed(KEYSET_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,119 @@
+"""Partition search_history and ai_responses by month on timestamp
+
+Revision ID: 012_partition_search_history_ai_responses
+Revises: 011_add_keyset_pagination_indexes
+Create Date: 2026-10-16
+
+Each table is rebuilt as a range-partitioned table with one partition per
+calendar month (UTC), named <table>_pYYYYMM, plus a <table>_default partition
+for rows outside every range. Partitions from the oldest existing row up to
+PREMAKE_MONTHS ahead are created here; after that the partition maintenance
+job (app.services.partition_maintenance) keeps creating upcoming months and
+removes expired ones. The primary key becomes (id, timestamp), since a
+unique constraint on a partitioned table must include the partition key.
+
+"""
+
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "012_partition_search_history_ai_responses"
+down_revision = "011_add_keyset_pagination_indexes"
+branch_labels = None
+depends_on = None
+
+PREMAKE_MONTHS = 3
+
+TABLES = {
+    "search_history": {
+        "indexes": [
+            ("ix_search_history_id", ["id"]),
+            ("ix_search_history_user_id", ["user_id"]),
+            ("ix_search_history_session_id", ["session_id"]),
+            ("idx_search_history_timestamp", ["timestamp"]),
+            ("idx_search_history_user_cursor", ["user_id", "timestamp", "id"]),
+        ],
+        "foreign_keys": [("user_id", "users")],
+    },
+    "ai_responses": {
+        "indexes": [
+            ("ix_ai_responses_id", ["id"]),
+            ("ix_ai_responses_feature", ["feature"]),
+            ("ix_ai_responses_user_id", ["user_id"]),
+            ("ix_ai_responses_deal_id", ["deal_id"]),
+            ("ix_ai_responses_timestamp", ["timestamp"]),
+            ("idx_ai_responses_feature_cursor", ["feature", "timestamp", "id"]),
+            ("idx_ai_responses_deal_cursor", ["deal_id", "timestamp", "id"]),
+            ("idx_ai_responses_user_cursor", ["user_id", "timestamp", "id"]),
+        ],
+        "foreign_keys": [("user_id", "users"), ("deal_id", "deals")],
+    },
+}
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(UTC)
+    return datetime(moment.year, moment.month, 1, tzinfo=UTC)
+
+
+def _first_month(table: str) -> datetime:
+    """Month of the oldest row, or the current month for an empty table"""
+    oldest = op.get_bind().execute(sa.text(f'SELECT min("timestamp") FROM {table}')).scalar()
+    return _month_start(oldest or datetime.now(UTC))
+
+
+def _rebuild(table: str, new: str, partitioned: bool) -> None:
+    """Copy table into a new plain or partitioned table and swap it in"""
+    spec = TABLES[table]
+    if partitioned:
+        first = _first_month(table)
+        op.execute(
+            f'CREATE TABLE {new} (LIKE {table} INCLUDING DEFAULTS) PARTITION BY RANGE ("timestamp")'
+        )
+        op.execute(f'ALTER TABLE {new} ADD CONSTRAINT {new}_pkey PRIMARY KEY (id, "timestamp")')
+        month = first
+        last = _add_months(_month_start(datetime.now(UTC)), PREMAKE_MONTHS)
+        while month <= last:
+            end = _add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {new} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            month = end
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {new} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {new} (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"ALTER TABLE {new} ADD CONSTRAINT {new}_pkey PRIMARY KEY (id)")
+
+    op.execute(f"INSERT INTO {new} SELECT * FROM {table}")
+
+    # The id sequence is owned by the old table; keep it when that is dropped
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.drop_table(table)
+    op.rename_table(new, table)
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {new}_pkey TO {table}_pkey")
+
+    for name, columns in spec["indexes"]:
+        op.create_index(name, table, columns)
+    for column, referred_table in spec["foreign_keys"]:
+        op.create_foreign_key(f"{table}_{column}_fkey", table, referred_table, [column], ["id"])
+
+
+def upgrade():
+    for table in TABLES:
+        _rebuild(table, f"{table}_partitioned", partitioned=True)
+
+
+def downgrade():
+    for table in TABLES:
+        _rebuild(table, f"{table}_unpartitioned", partitioned=False)
@@ -0,0 +1,73 @@
+"""Add hourly rollup tables for popular searches and AI usage analytics
+
+Revision ID: 013_add_hourly_rollups
+Revises: 012_partition_search_history_ai_responses
+Create Date: 2026-10-16
+
+The rollups are backfilled from the existing rows; afterwards the rollup
+refresher (app.services.rollup_refresher) keeps the recent hours current.
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "013_add_hourly_rollups"
+down_revision = "012_partition_search_history_ai_responses"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "search_rollups_hourly",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("make", sa.Text(), nullable=True),
+        sa.Column("model", sa.Text(), nullable=True),
+        sa.Column("search_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_search_rollups_hourly_bucket", "search_rollups_hourly", ["bucket"])
+
+    op.create_table(
+        "ai_usage_rollups_hourly",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("feature", sa.String(length=50), nullable=False),
+        sa.Column("model_used", sa.String(length=100), nullable=True),
+        sa.Column("llm_used", sa.Integer(), nullable=False),
+        sa.Column("call_count", sa.Integer(), nullable=False),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_ai_usage_rollups_hourly_bucket", "ai_usage_rollups_hourly", ["bucket"])
+
+    op.execute(
+        """
+        INSERT INTO search_rollups_hourly (bucket, make, model, search_count)
+        SELECT date_trunc('hour', "timestamp"), search_criteria ->> 'make',
+               search_criteria ->> 'model', count(*)
+        FROM search_history
+        GROUP BY 1, 2, 3
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO ai_usage_rollups_hourly
+            (bucket, feature, model_used, llm_used, call_count, total_tokens)
+        SELECT date_trunc('hour', "timestamp"), feature, model_used, llm_used,
+               count(*), coalesce(sum(tokens_used), 0)
+        FROM ai_responses
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("idx_ai_usage_rollups_hourly_bucket", table_name="ai_usage_rollups_hourly")
+    op.drop_table("ai_usage_rollups_hourly")
+    op.drop_index("idx_search_rollups_hourly_bucket", table_name="search_rollups_hourly")
+    op.drop_table("search_rollups_hourly")
@@ -0,0 +1,30 @@
+"""Add price_changed_at to vehicle_cache
+
+Revision ID: 014_add_vehicle_cache_price_changed_at
+Revises: 013_add_hourly_rollups
+Create Date: 2026-10-16
+
+Set by the listing upsert when a known VIN comes back at a different price,
+so price changes are detected from the upsert's RETURNING clause.
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "014_add_vehicle_cache_price_changed_at"
+down_revision = "013_add_hourly_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "vehicle_cache", sa.Column("price_changed_at", sa.DateTime(timezone=True), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column("vehicle_cache", "price_changed_at")
@@ -2,21 +2,81 @@
 Authentication dependencies for FastAPI
 """
 
+import logging
+from datetime import datetime
+from typing import Any
+
 from fastapi import Cookie, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_token
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.security import decode_token_cached
+from app.db.cache import cache
+from app.db.session import get_async_db
 from app.models.models import User
 from app.repositories.user_repository import UserRepository
 
+logger = logging.getLogger(__name__)
+
+USER_CACHE_PREFIX = "auth:user"
+# Identity fields cached per user; credentials and reset tokens are never cached
+_CACHED_USER_FIELDS = ("id", "email", "username", "full_name", "is_active", "is_superuser")
+_CACHED_USER_DATETIMES = ("created_at", "updated_at")
+
+
+def _user_cache_key(user_id: int) -> str:
+    return f"{USER_CACHE_PREFIX}:{user_id}"
+
 
-def get_current_user(
+def _user_snapshot(user: User) -> dict[str, Any]:
+    snapshot = {field: getattr(user, field) for field in _CACHED_USER_FIELDS}
+    for field in _CACHED_USER_DATETIMES:
+        value = getattr(user, field)
+        snapshot[field] = value.isoformat() if value else None
+    return snapshot
+
+
+def _user_from_snapshot(snapshot: dict[str, Any]) -> User:
+    """Build a detached User from a cached snapshot (not bound to any session)"""
+    values = {field: snapshot.get(field) for field in _CACHED_USER_FIELDS}
+    for field in _CACHED_USER_DATETIMES:
+        value = snapshot.get(field)
+        values[field] = datetime.fromisoformat(value) if value else None
+    return User(**values)
+
+
+async def invalidate_cached_user(user_id: int) -> None:
+    """
+    Drop a user's cached identity so the next request re-reads it
+
+    Call after deactivating a user or resetting their password.
+    """
+    await cache.delete(_user_cache_key(user_id))
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> User | None:
+    """Resolve a user from the identity cache, falling back to the database"""
+    key = _user_cache_key(user_id)
+    snapshot = await cache.get(key)
+    if isinstance(snapshot, dict):
+        return _user_from_snapshot(snapshot)
+
+    user = await UserRepository(db).get_by_id(user_id)
+    if user is not None:
+        await cache.set(key, _user_snapshot(user), ex=settings.AUTH_USER_CACHE_TTL_SECONDS)
+    return user
+
+
+async def get_current_user(
     access_token: str | None = Cookie(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
     """
     Get the current authenticated user from the access token cookie
+
+    Token verification is memoized per token and the user's identity is
+    cached for AUTH_USER_CACHE_TTL_SECONDS, so repeat requests do no database
+    work. The returned User is detached when it comes from the cache.
     """
     if not access_token:
         raise HTTPException(
@@ -25,7 +85,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = decode_token(access_token)
+    payload = decode_token_cached(access_token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,8 +118,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
 
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
+    user = await _load_user(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,10 +41,11 @@ class RateLimitMiddleware:
             # Use a hash of IP for anonymous users
             user_id = f"ip:{client_ip}"
 
-        # Check rate limit
-        is_allowed, retry_after = await self.limiter.is_allowed(user_id)
+        # Check rate limit (one round-trip also returns the remaining count)
+        result = await self.limiter.check(user_id)
 
-        if not is_allowed:
+        if not result.allowed:
+            retry_after = result.retry_after
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail=f"Rate limit exceeded. Try again in {retry_after} seconds.",
@@ -52,8 +53,7 @@ class RateLimitMiddleware:
             )
 
         # Add rate limit info to response headers
-        remaining = await self.limiter.get_remaining_requests(user_id)
-        request.state.rate_limit_remaining = remaining
+        request.state.rate_limit_remaining = result.remaining
 
 
 # Pre-configured rate limiters for different use cases
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
+from app.db.pagination import InvalidCursorError, next_cursor
 from app.db.session import get_async_db
 from app.models.models import User
 from app.repositories.ai_response_repository import AIResponseRepository
@@ -20,6 +21,7 @@ async def get_deal_ai_history(
     current_user: User = Depends(get_current_user),
     limit: int = Query(100, ge=1, le=500),
     skip: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
     db: AsyncSession = Depends(get_async_db),
 ):
     """
@@ -31,7 +33,8 @@ async def get_deal_ai_history(
     Args:
         deal_id: Deal ID
         limit: Maximum number of records to return (1-500)
-        skip: Number of records to skip for pagination
+        skip: Number of records to skip (offset pagination)
+        cursor: `next_cursor` from the previous page; takes precedence over skip
 
     Returns:
         List of AI response records with metadata
@@ -44,10 +47,11 @@ async def get_deal_ai_history(
 
     try:
         repo = AIResponseRepository(db)
-        responses = await repo.get_by_deal_id(deal_id, limit=limit, skip=skip)
+        responses = await repo.get_by_deal_id(deal_id, limit=limit, skip=skip, cursor=cursor)
         return {
             "deal_id": deal_id,
             "count": len(responses),
+            "next_cursor": next_cursor(responses, limit, "timestamp"),
             "responses": [
                 {
                     "id": r.id,
@@ -63,6 +67,8 @@ async def get_deal_ai_history(
                 for r in responses
             ],
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve AI history: {str(e)}"
@@ -75,6 +81,7 @@ async def get_user_ai_history(
     current_user: User = Depends(get_current_user),
     limit: int = Query(100, ge=1, le=500),
     skip: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
     db: AsyncSession = Depends(get_async_db),
 ):
     """
@@ -86,7 +93,8 @@ async def get_user_ai_history(
     Args:
         user_id: User ID
         limit: Maximum number of records to return (1-500)
-        skip: Number of records to skip for pagination
+        skip: Number of records to skip (offset pagination)
+        cursor: `next_cursor` from the previous page; takes precedence over skip
 
     Returns:
         List of AI response records with metadata
@@ -100,10 +108,11 @@ async def get_user_ai_history(
 
     try:
         repo = AIResponseRepository(db)
-        responses = await repo.get_by_user_id(user_id, limit=limit, skip=skip)
+        responses = await repo.get_by_user_id(user_id, limit=limit, skip=skip, cursor=cursor)
         return {
             "user_id": user_id,
             "count": len(responses),
+            "next_cursor": next_cursor(responses, limit, "timestamp"),
             "responses": [
                 {
                     "id": r.id,
@@ -119,6 +128,8 @@ async def get_user_ai_history(
                 for r in responses
             ],
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve AI history: {str(e)}"
@@ -132,6 +143,7 @@ async def get_feature_ai_history(
     user_id: int | None = Query(None),
     limit: int = Query(100, ge=1, le=500),
     skip: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
     db: AsyncSession = Depends(get_async_db),
 ):
     """
@@ -144,7 +156,8 @@ async def get_feature_ai_history(
         feature: Feature name (negotiation, deal_evaluation, car_recommendation, etc.)
         user_id: Optional user ID filter
         limit: Maximum number of records to return (1-500)
-        skip: Number of records to skip for pagination
+        skip: Number of records to skip (offset pagination)
+        cursor: `next_cursor` from the previous page; takes precedence over skip
 
     Returns:
         List of AI response records for the feature
@@ -163,11 +176,13 @@ async def get_feature_ai_history(
             user_id=user_id,
             limit=limit,
             skip=skip,
+            cursor=cursor,
         )
         return {
             "feature": feature,
             "user_id": user_id,
             "count": len(responses),
+            "next_cursor": next_cursor(responses, limit, "timestamp"),
             "responses": [
                 {
                     "id": r.id,
@@ -183,6 +198,8 @@ async def get_feature_ai_history(
                 for r in responses
             ],
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve AI history: {str(e)}"
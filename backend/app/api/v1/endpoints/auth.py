@@ -3,12 +3,12 @@ Authentication endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, invalidate_cached_user
 from app.core.config import settings
 from app.core.security import create_access_token, create_refresh_token, decode_token
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.models import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.auth_schemas import (
@@ -25,37 +25,39 @@ router = APIRouter()
 
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user_in: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new user account
     """
     user_repo = UserRepository(db)
 
     # Check if user already exists
-    if user_repo.get_by_email(user_in.email):
+    if await user_repo.get_by_email(user_in.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    if user_repo.get_by_username(user_in.username):
+    if await user_repo.get_by_username(user_in.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken"
         )
 
     # Create new user
-    user = user_repo.create(user_in)
+    user = await user_repo.create(user_in)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(response: Response, login_request: LoginRequest, db: Session = Depends(get_db)):
+async def login(
+    response: Response, login_request: LoginRequest, db: AsyncSession = Depends(get_async_db)
+):
     """
     Login and get access and refresh tokens
     """
     user_repo = UserRepository(db)
 
     # Authenticate user
-    user = user_repo.authenticate(login_request.email, login_request.password)
+    user = await user_repo.authenticate(login_request.email, login_request.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -89,10 +91,10 @@ def login(response: Response, login_request: LoginRequest, db: Session = Depends
 
 
 @router.post("/refresh", response_model=Token)
-def refresh(
+async def refresh(
     response: Response,
     refresh_request: RefreshTokenRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Refresh access token using refresh token
@@ -133,7 +135,7 @@ def refresh(
 
     # Verify user exists and is active
     user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
+    user = await user_repo.get_by_id(user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -185,9 +187,9 @@ def get_me(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/forgot-password", response_model=ForgotPasswordResponse)
-def forgot_password(
+async def forgot_password(
     request: ForgotPasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Request a password reset token
@@ -199,7 +201,7 @@ def forgot_password(
 
     # Create reset token if user exists
     # In production, the token would be sent via email
-    _ = user_repo.create_password_reset_token(request.email)
+    _ = await user_repo.create_password_reset_token(request.email)
 
     # Always return success message to prevent email enumeration
     # In production, send email with reset link containing the token
@@ -211,9 +213,9 @@ def forgot_password(
 
 
 @router.post("/reset-password", response_model=ForgotPasswordResponse)
-def reset_password(
+async def reset_password(
     request: ResetPasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Reset password using a valid reset token
@@ -221,12 +223,15 @@ def reset_password(
     user_repo = UserRepository(db)
 
     # Attempt to reset password
-    success = user_repo.reset_password(request.token, request.new_password)
+    user = await user_repo.reset_password(request.token, request.new_password)
 
-    if not success:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired reset token",
         )
 
+    # Make every replica re-read the user on its next request
+    await invalidate_cached_user(user.id)
+
     return ForgotPasswordResponse(message="Password has been reset successfully.")
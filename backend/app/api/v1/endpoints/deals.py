@@ -2,11 +2,12 @@
 Deal endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
-from app.db.session import get_db
+from app.db.pagination import InvalidCursorError, next_cursor
+from app.db.session import get_async_db
 from app.models.models import User
 from app.repositories.deal_repository import DealRepository
 from app.schemas.schemas import (
@@ -22,35 +23,47 @@ router = APIRouter()
 
 
 @router.post("/", response_model=DealResponse, status_code=status.HTTP_201_CREATED)
-def create_deal(
+async def create_deal(
     deal_in: DealCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Create a new deal (requires authentication)"""
     repository = DealRepository(db)
-    deal = repository.create(deal_in)
+    deal = await repository.create(deal_in)
     return deal
 
 
 @router.get("/", response_model=list[DealResponse])
-def get_deals(
+async def get_deals(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get all deals with pagination (requires authentication)"""
+    """
+    Get all deals, newest first (requires authentication)
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    next page; `skip` is still accepted when no cursor is given.
+    """
     repository = DealRepository(db)
-    deals = repository.get_all(skip=skip, limit=limit)
+    try:
+        deals = await repository.get_all(skip=skip, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    if cursor_out := next_cursor(deals, limit, "created_at"):
+        response.headers["X-Next-Cursor"] = cursor_out
     return deals
 
 
 @router.get("/search", response_model=DealResponse)
-def get_deal_by_email_and_vin(
+async def get_deal_by_email_and_vin(
     customer_email: str,
     vehicle_vin: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get deals by customer email and vehicle VIN (requires authentication)"""
@@ -62,7 +75,7 @@ def get_deal_by_email_and_vin(
         )
 
     repository = DealRepository(db)
-    deal = repository.get_deal_by_vehicle_and_customer(vehicle_vin, customer_email)
+    deal = await repository.get_deal_by_vehicle_and_customer(vehicle_vin, customer_email)
     if not deal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -72,14 +85,14 @@ def get_deal_by_email_and_vin(
 
 
 @router.get("/{deal_id}", response_model=DealResponse)
-def get_deal(
+async def get_deal(
     deal_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get a specific deal by ID (requires authentication)"""
     repository = DealRepository(db)
-    deal = repository.get(deal_id)
+    deal = await repository.get(deal_id)
     if not deal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -89,37 +102,50 @@ def get_deal(
 
 
 @router.put("/{deal_id}", response_model=DealResponse)
-def update_deal(
+async def update_deal(
     deal_id: int,
     deal_in: DealUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Update a deal (requires authentication)"""
     repository = DealRepository(db)
-    deal = repository.update(deal_id, deal_in)
+    existing = await repository.get(deal_id)
+    if not existing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Deal with id {deal_id} not found",
+        )
+    previous_vin = existing.vehicle_vin
+    deal = await repository.update(deal_id, deal_in)
     if not deal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Deal with id {deal_id} not found",
         )
+    # Price, mileage or VIN may have changed; evaluations cached under the old
+    # and the new VIN are stale
+    await deal_evaluation_service.invalidate_deal(deal, previous_vin=previous_vin)
     return deal
 
 
 @router.delete("/{deal_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_deal(
+async def delete_deal(
     deal_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Delete a deal (requires authentication)"""
     repository = DealRepository(db)
-    deleted = repository.delete(deal_id)
-    if not deleted:
+    deal = await repository.get(deal_id)
+    if not deal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Deal with id {deal_id} not found",
         )
+    # Drop evaluations tagged to the deal before it goes away
+    await deal_evaluation_service.invalidate_deal(deal)
+    await repository.delete(deal_id)
     return None
 
 
@@ -4,11 +4,12 @@ Favorites endpoints with repository pattern and in-memory fallback
 
 import threading
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
-from app.db.session import get_db
+from app.db.pagination import DEFAULT_PAGE_SIZE, InvalidCursorError, next_cursor
+from app.db.session import get_async_db
 from app.models.models import User
 from app.repositories.favorite_repository import FavoriteRepository
 from app.schemas.schemas import FavoriteCreate, FavoriteResponse
@@ -22,51 +23,66 @@ storage_lock = threading.Lock()
 
 
 @router.post("/", response_model=FavoriteResponse, status_code=status.HTTP_201_CREATED)
-def add_favorite(
+async def add_favorite(
     favorite_in: FavoriteCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Add a car to favorites (requires authentication)"""
     user_id = current_user.id
     repository = FavoriteRepository(db)
 
     # Check if already exists
-    if repository.exists(user_id, favorite_in.vin):
+    if await repository.exists(user_id, favorite_in.vin):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Vehicle already in favorites",
         )
 
     # Create favorite
-    favorite = repository.create(user_id, favorite_in)
+    favorite = await repository.create(user_id, favorite_in)
     return favorite
 
 
 @router.get("/", response_model=list[FavoriteResponse])
-def get_favorites(
+async def get_favorites(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get all favorites for the current user (requires authentication)"""
+    """
+    Get favorites for the current user, newest first (requires authentication)
+
+    Without limit or cursor every favorite is returned. Pass limit to page, and
+    the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    """
     user_id = current_user.id
     repository = FavoriteRepository(db)
-
-    favorites = repository.get_all_by_user(user_id)
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+
+    try:
+        favorites = await repository.get_all_by_user(user_id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    if cursor_out := next_cursor(favorites, limit, "created_at"):
+        response.headers["X-Next-Cursor"] = cursor_out
     return favorites
 
 
 @router.delete("/{vin}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_favorite(
+async def remove_favorite(
     vin: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Remove a car from favorites (requires authentication)"""
     user_id = current_user.id
     repository = FavoriteRepository(db)
 
-    if not repository.delete_by_user_and_vin(user_id, vin):
+    if not await repository.delete_by_user_and_vin(user_id, vin):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Vehicle not found in favorites",
@@ -76,16 +92,16 @@ def remove_favorite(
 
 
 @router.get("/{vin}", response_model=FavoriteResponse)
-def get_favorite(
+async def get_favorite(
     vin: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Check if a specific vehicle is in favorites (requires authentication)"""
     user_id = current_user.id
     repository = FavoriteRepository(db)
 
-    favorite = repository.get_by_user_and_vin(user_id, vin)
+    favorite = await repository.get_by_user_and_vin(user_id, vin)
     if not favorite:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -5,7 +5,8 @@ Insurance recommendation endpoints
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import get_current_user, get_db
+from app.api.dependencies import get_current_user
+from app.db.session import get_db
 from app.models.models import User
 from app.schemas.insurance_schemas import (
     InsuranceRecommendationRequest,
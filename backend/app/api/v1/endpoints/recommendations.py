@@ -84,6 +84,7 @@ async def get_car_recommendations(
         return CarRecommendationResponse(
             recommendations=recommendations,
             total_found=result.get("total_found", 0),
+            total_found_is_estimate=result.get("total_found_is_estimate", False),
             total_analyzed=result.get("total_analyzed", 0),
             search_criteria=result.get("search_criteria", {}),
             message=result.get("message"),
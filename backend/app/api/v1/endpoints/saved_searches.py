@@ -3,10 +3,11 @@ Saved searches endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
-from app.db.session import get_db
+from app.db.pagination import InvalidCursorError, next_cursor
+from app.db.session import get_async_db
 from app.models.models import User
 from app.repositories.saved_search_repository import saved_search_repository
 from app.schemas.saved_search_schemas import (
@@ -23,7 +24,7 @@ router = APIRouter()
 async def create_saved_search(
     search: SavedSearchCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new saved search for the current user
@@ -33,7 +34,7 @@ async def create_saved_search(
         search_data = search.model_dump()
 
         # Create saved search
-        saved_search = saved_search_repository.create(
+        saved_search = await saved_search_repository.create(
             db=db, user_id=current_user.id, search_data=search_data
         )
 
@@ -50,20 +51,30 @@ async def create_saved_search(
 async def get_saved_searches(
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Get all saved searches for the current user
+    Get saved searches for the current user, newest first
+
+    Pass `next_cursor` back as `cursor` to fetch the next page; `skip` is
+    still accepted when no cursor is given.
     """
     try:
-        searches = saved_search_repository.get_user_searches(
-            db=db, user_id=current_user.id, skip=skip, limit=limit
+        searches = await saved_search_repository.get_user_searches(
+            db=db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
         )
-        total = saved_search_repository.count_user_searches(db=db, user_id=current_user.id)
+        total = await saved_search_repository.count_user_searches(db=db, user_id=current_user.id)
 
-        return SavedSearchList(searches=searches, total=total)
+        return SavedSearchList(
+            searches=searches,
+            total=total,
+            next_cursor=next_cursor(searches, limit, "created_at"),
+        )
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -75,12 +86,12 @@ async def get_saved_searches(
 async def get_saved_search(
     search_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get a specific saved search by ID
     """
-    saved_search = saved_search_repository.get_by_id(
+    saved_search = await saved_search_repository.get_by_id(
         db=db, search_id=search_id, user_id=current_user.id
     )
 
@@ -95,7 +106,7 @@ async def update_saved_search(
     search_id: int,
     search_update: SavedSearchUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Update a saved search
@@ -103,7 +114,7 @@ async def update_saved_search(
     # Convert Pydantic model to dict, excluding None values
     update_data = search_update.model_dump(exclude_unset=True)
 
-    updated_search = saved_search_repository.update(
+    updated_search = await saved_search_repository.update(
         db=db, search_id=search_id, user_id=current_user.id, update_data=update_data
     )
 
@@ -117,12 +128,14 @@ async def update_saved_search(
 async def delete_saved_search(
     search_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Delete a saved search
     """
-    deleted = saved_search_repository.delete(db=db, search_id=search_id, user_id=current_user.id)
+    deleted = await saved_search_repository.delete(
+        db=db, search_id=search_id, user_id=current_user.id
+    )
 
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved search not found")
@@ -30,6 +30,18 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = ""  # REQUIRED: Must be set via environment variable
     POSTGRES_DB: str = "autodealgenie"
     POSTGRES_PORT: int = 5432
+    # Monthly partitions of search_history and ai_responses (see partition_maintenance)
+    PARTITION_MAINTENANCE_ENABLED: bool = True
+    PARTITION_MAINTENANCE_HOUR_UTC: int = 3
+    PARTITION_PREMAKE_MONTHS: int = 3  # Future months created ahead of time
+    SEARCH_HISTORY_RETENTION_MONTHS: int = 12  # Whole months kept before the current one
+    AI_RESPONSES_RETENTION_MONTHS: int = 24
+    PARTITION_ARCHIVE_SCHEMA: str | None = None  # Move expired partitions here instead of dropping
+    # Hourly rollups behind popular searches and AI analytics (see rollup_refresher)
+    ROLLUP_REFRESH_ENABLED: bool = True
+    ROLLUP_REFRESH_INTERVAL_SECONDS: int = 300
+    ROLLUP_RECOMPUTE_HOURS: int = 2  # Past hours rebuilt each run, for late-committed rows
+    ROLLUP_RETENTION_DAYS: int = 400  # Covers the 365-day analytics window
 
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
@@ -40,6 +52,23 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     USE_REDIS: bool = True  # Set to False to use in-memory caching
+    REDIS_MAX_CONNECTIONS: int = 50  # Per pool (decoded and binary clients each have one)
+    REDIS_POOL_TIMEOUT_SECONDS: float = 1.0  # Max wait for a free pooled connection
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 1.0
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = 1.0
+    REDIS_RETRIES: int = 2  # Retries of a command after a timeout or dropped connection
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30  # Ping idle pooled connections before reuse
+    REDIS_RECONNECT_INTERVAL_SECONDS: float = 5.0  # Background reconnect cadence while unhealthy
+    IN_MEMORY_CACHE_MAXSIZE: int = 10000  # Entries in the cache used when Redis is disabled
+    IN_MEMORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # LRU eviction above this footprint
+    IN_MEMORY_CACHE_TTL_SECONDS: int = 3600  # Default expiry for keys set without one
+    CACHE_L1_MAXSIZE: int = 1000  # Per-process entries held in front of Redis
+    CACHE_L1_MAX_BYTES: int = 16 * 1024 * 1024
+    CACHE_L1_TTL_SECONDS: int = 30  # Upper bound on L1 staleness if an invalidation is missed
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"  # Pub/sub channel for L1 coherence
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024  # Compress serialized cache values at least this large
+    CACHE_COMPRESSION_CODEC: str = "zlib"  # "zlib" or "zstd"; both are always readable
+    CACHE_TAG_TTL_SECONDS: int = 86400  # Minimum lifetime of a tag's key set in Redis
 
     @property
     def REDIS_URL(self) -> str:
@@ -67,10 +96,33 @@ class Settings(BaseSettings):
     OPENROUTER_API_KEY: str | None = None  # OpenRouter API key (preferred if set)
     OPENAI_MODEL: str = "gpt-4"
     OPENAI_BASE_URL: str | None = None  # Optional: Use for OpenRouter or custom endpoints
+    LLM_CACHE_ENABLED: bool = True  # Cache responses for prompts with a TTL policy
 
     # MarketCheck API
     MARKET_CHECK_API_KEY: str | None = None
-    MAX_SEARCH_RESULTS: int = 50  # Maximum number of results to fetch from API for LLM analysis
+    MAX_SEARCH_RESULTS: int = 200  # Listings fetched per search, pre-scored down to the LLM pool
+    MARKET_CHECK_PAGE_SIZE: int = 50  # Listings per MarketCheck request (API maximum is 50)
+    MARKET_CHECK_MAX_CONCURRENT_PAGES: int = 4  # Pages fetched in parallel per search
+    LLM_CANDIDATE_POOL_SIZE: int = 50  # Best pre-scored listings handed to the LLM for ranking
+    LISTING_INDEX_ENABLED: bool = True  # Answer repeat searches from the local vehicle_cache table
+    LISTING_INDEX_MAX_AGE_SECONDS: int = 3600  # Listings seen longer ago are treated as stale
+    LISTING_INDEX_MIN_RESULTS: int = 20  # Fresh local matches needed to skip the API
+    CACHE_WARMER_ENABLED: bool = True  # Daily pre-population of popular search/evaluation caches
+    CACHE_WARMER_HOUR_UTC: int = 11  # Ahead of the US morning peak
+    CACHE_WARMER_TOP_SEARCHES: int = 20
+    CACHE_WARMER_TOP_DEALS: int = 20
+    CACHE_WARMER_LOOKBACK_DAYS: int = 7
+    CACHE_WARMER_MAX_MARKETCHECK_CALLS: int = 80  # Per run; a search costs one call per page
+    CACHE_WARMER_MAX_LLM_CALLS: int = 40  # Per run
+    MARKET_DATA_CACHE_PATH: str = "market_data_cache/cache.db"  # SQLite search result cache
+    MARKET_DATA_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # LRU eviction above this size
+    MARKET_DATA_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    MARKET_CHECK_HTTP2: bool = True  # Requires the h2 package; falls back to HTTP/1.1 otherwise
+    MARKET_CHECK_MAX_CONNECTIONS: int = 20
+    MARKET_CHECK_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    MARKET_CHECK_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection stays pooled
+    MARKET_CHECK_CONNECT_TIMEOUT: float = 5.0
+    MARKET_CHECK_READ_TIMEOUT: float = 30.0
 
     # Security
     SECRET_KEY: str  # REQUIRED: Must be set via environment variable (min 32 chars)
@@ -79,6 +131,8 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     PASSWORD_RESET_TOKEN_EXPIRE_HOURS: int = 1
     PASSWORD_RESET_TOKEN_LENGTH: int = 32
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60  # Upper bound on a missed user invalidation
+    AUTH_TOKEN_CACHE_MAXSIZE: int = 10000  # Verified access tokens memoized per process
 
     # Environment
     ENVIRONMENT: str = "development"  # development, staging, production
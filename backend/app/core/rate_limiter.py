@@ -1,12 +1,146 @@
 """
 Rate limiting utility using Redis
-Implements user-based rate limiting with sliding window
+Implements user-based rate limiting with sliding window, falling back to an
+in-process GCRA limiter when Redis is disabled or unavailable
 """
 
+import hashlib
+import logging
+import math
 import time
+import uuid
+from dataclasses import dataclass
+
+from redis.exceptions import NoScriptError
 
 from app.db.redis import redis_client
 
+logger = logging.getLogger(__name__)
+
+# Absorbs float rounding so exactly max_requests fit in a burst
+_EPSILON = 1e-9
+
+# Sliding-window log checked and recorded atomically in one round-trip.
+# KEYS[1] = window key; ARGV = now (ms), window (ms), limit, unique member.
+# Returns {allowed (0/1), remaining, retry_after (ms)}.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return {1, limit - count - 1, 0}
+end
+
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+local retry_after = window
+if oldest[2] then
+    retry_after = tonumber(oldest[2]) + window - now
+end
+return {0, 0, retry_after}
+"""
+SLIDING_WINDOW_SHA = hashlib.sha1(SLIDING_WINDOW_SCRIPT.encode()).hexdigest()
+
+
+def _get_redis():
+    """Return the Redis client, or None when Redis is not connected"""
+    try:
+        return redis_client.get_client()
+    except RuntimeError:
+        return None
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a single rate limit check"""
+
+    allowed: bool
+    remaining: int
+    retry_after: int | None = None  # Seconds, only set when not allowed
+
+
+class InMemoryRateLimiter:
+    """
+    In-process rate limiter using GCRA (generic cell rate algorithm)
+
+    Each key stores a single float, its theoretical arrival time (TAT), so
+    memory is O(1) per active key. Requests are spaced window/max_requests
+    apart with a burst of up to max_requests. Checks never await, so on the
+    event loop they are atomic without locks. Keys are spread over shards
+    and one shard is swept per interval, dropping keys whose TAT has passed
+    (an idle key is indistinguishable from a new one).
+    """
+
+    def __init__(self, max_requests: int, window_seconds: int, num_shards: int = 16):
+        """
+        Initialize in-memory rate limiter
+
+        Args:
+            max_requests: Maximum number of requests allowed per window
+            window_seconds: Time window in seconds
+            num_shards: Number of key shards swept independently
+        """
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.emission_interval = window_seconds / max_requests
+        self._shards: list[dict[str, float]] = [{} for _ in range(num_shards)]
+        # Sweep every shard once per window
+        self._sweep_interval = window_seconds / num_shards
+        self._next_sweep = time.monotonic() + self._sweep_interval
+        self._sweep_shard = 0
+
+    def _shard(self, key: str) -> dict[str, float]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        shard = self._shards[self._sweep_shard]
+        for key in [key for key, tat in shard.items() if tat <= now]:
+            del shard[key]
+        self._sweep_shard = (self._sweep_shard + 1) % len(self._shards)
+        self._next_sweep = now + self._sweep_interval
+
+    def _remaining(self, tat: float, now: float) -> int:
+        return max(0, int((self.window_seconds - (tat - now)) / self.emission_interval + _EPSILON))
+
+    async def check(self, user_id: int | str) -> RateLimitResult:
+        """Check the rate limit and record the request if it is allowed"""
+        now = time.monotonic()
+        self._maybe_sweep(now)
+
+        key = str(user_id)
+        shard = self._shard(key)
+        new_tat = max(shard.get(key, now), now) + self.emission_interval
+        if new_tat - now > self.window_seconds + _EPSILON:
+            retry_after = new_tat - self.window_seconds - now
+            return RateLimitResult(
+                allowed=False, remaining=0, retry_after=max(1, math.ceil(retry_after))
+            )
+
+        shard[key] = new_tat
+        return RateLimitResult(allowed=True, remaining=self._remaining(new_tat, now))
+
+    async def is_allowed(self, user_id: int | str) -> tuple[bool, int | None]:
+        """Check if request is allowed; see RateLimiter.is_allowed"""
+        result = await self.check(user_id)
+        return result.allowed, result.retry_after
+
+    async def get_remaining_requests(self, user_id: int | str) -> int:
+        """Get number of remaining requests without recording a request"""
+        now = time.monotonic()
+        tat = self._shard(str(user_id)).get(str(user_id), now)
+        return self._remaining(max(tat, now), now)
+
 
 class RateLimiter:
     """Redis-based rate limiter with sliding window"""
@@ -21,61 +155,79 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        # Used whenever Redis is disabled or unhealthy
+        self.fallback = InMemoryRateLimiter(max_requests, window_seconds)
+
+    def _key(self, user_id: int | str) -> str:
+        return f"rate_limit:user:{user_id}"
 
-    async def is_allowed(self, user_id: int) -> tuple[bool, int | None]:
+    async def check(self, user_id: int | str) -> RateLimitResult:
         """
-        Check if request is allowed for user
+        Check the rate limit and record the request if it is allowed
+
+        The check and the record happen in one atomic EVALSHA, so concurrent
+        requests cannot both take the last slot. Each request is stored as a
+        unique member, so bursts within the same millisecond are all counted.
 
         Args:
-            user_id: User ID to check rate limit for
+            user_id: User ID (or other client identifier) to check
 
         Returns:
-            Tuple of (is_allowed, retry_after_seconds)
-            - is_allowed: True if request is allowed
-            - retry_after_seconds: Seconds to wait before retry (None if allowed)
+            RateLimitResult with allowed flag, remaining requests and retry-after
         """
-        client = redis_client.get_client()
+        client = _get_redis()
         if not client:
-            # If Redis is not available, allow request (fail-open)
-            return True, None
-
-        key = f"rate_limit:user:{user_id}"
-        current_time = int(time.time())
+            # Redis disabled or unavailable: limit per process instead
+            return await self.fallback.check(user_id)
 
-        # Use Redis pipeline for atomic operations
-        pipe = client.pipeline()
+        now_ms = int(time.time() * 1000)
+        args = (
+            now_ms,
+            self.window_seconds * 1000,
+            self.max_requests,
+            f"{now_ms}:{uuid.uuid4().hex}",
+        )
+        try:
+            try:
+                allowed, remaining, retry_after_ms = await client.evalsha(
+                    SLIDING_WINDOW_SHA, 1, self._key(user_id), *args
+                )
+            except NoScriptError:
+                # First call on this server (or after SCRIPT FLUSH); EVAL also caches it
+                allowed, remaining, retry_after_ms = await client.eval(
+                    SLIDING_WINDOW_SCRIPT, 1, self._key(user_id), *args
+                )
+        except Exception as e:
+            logger.warning(f"Rate limit check failed, using in-process limiter: {e}")
+            redis_client.report_error(e)
+            return await self.fallback.check(user_id)
 
-        # Remove old entries outside the window
-        window_start = current_time - self.window_seconds
-        pipe.zremrangebyscore(key, 0, window_start)
+        if allowed:
+            return RateLimitResult(allowed=True, remaining=int(remaining))
+        return RateLimitResult(
+            allowed=False,
+            remaining=0,
+            retry_after=max(1, math.ceil(int(retry_after_ms) / 1000)),
+        )
 
-        # Count requests in current window
-        pipe.zcard(key)
-
-        # Add current request timestamp
-        pipe.zadd(key, {str(current_time): current_time})
-
-        # Set expiry on key
-        pipe.expire(key, self.window_seconds)
-
-        # Execute pipeline
-        results = await pipe.execute()
-        request_count = results[1]  # Get count result
+    async def is_allowed(self, user_id: int | str) -> tuple[bool, int | None]:
+        """
+        Check if request is allowed for user
 
-        if request_count >= self.max_requests:
-            # Get oldest request in window to calculate retry time
-            oldest = await client.zrange(key, 0, 0, withscores=True)
-            if oldest:
-                oldest_timestamp = int(oldest[0][1])
-                retry_after = oldest_timestamp + self.window_seconds - current_time
-                return False, retry_after
-            return False, self.window_seconds
+        Args:
+            user_id: User ID to check rate limit for
 
-        return True, None
+        Returns:
+            Tuple of (is_allowed, retry_after_seconds)
+            - is_allowed: True if request is allowed
+            - retry_after_seconds: Seconds to wait before retry (None if allowed)
+        """
+        result = await self.check(user_id)
+        return result.allowed, result.retry_after
 
-    async def get_remaining_requests(self, user_id: int) -> int:
+    async def get_remaining_requests(self, user_id: int | str) -> int:
         """
-        Get number of remaining requests for user
+        Get number of remaining requests for user without recording a request
 
         Args:
             user_id: User ID to check
@@ -83,20 +235,19 @@ class RateLimiter:
         Returns:
             Number of remaining requests
         """
-        client = redis_client.get_client()
+        client = _get_redis()
         if not client:
-            return self.max_requests
-
-        key = f"rate_limit:user:{user_id}"
-        current_time = int(time.time())
-        window_start = current_time - self.window_seconds
-
-        # Remove old entries and count
-        pipe = client.pipeline()
-        pipe.zremrangebyscore(key, 0, window_start)
-        pipe.zcard(key)
-        results = await pipe.execute()
-        request_count = results[1]
+            return await self.fallback.get_remaining_requests(user_id)
+
+        now_ms = int(time.time() * 1000)
+        try:
+            request_count = await client.zcount(
+                self._key(user_id), f"({now_ms - self.window_seconds * 1000}", "+inf"
+            )
+        except Exception as e:
+            logger.warning(f"Could not read rate limit usage: {e}")
+            redis_client.report_error(e)
+            return await self.fallback.get_remaining_requests(user_id)
 
         return max(0, self.max_requests - request_count)
 
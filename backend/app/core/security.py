@@ -2,6 +2,8 @@
 Security utilities for password hashing and JWT tokens
 """
 
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -63,3 +65,38 @@ def decode_token(token: str) -> dict[str, Any] | None:
     except JWTError as e:
         print(f"JWT Decode Error: {e}")
         return None
+
+
+# token -> (payload, expiry as time.time()); LRU order
+_verified_tokens: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+
+
+def decode_token_cached(token: str) -> dict[str, Any] | None:
+    """
+    Decode and verify a JWT token, memoizing successful verifications
+
+    A token's payload cannot change, so it is verified once and reused until
+    its exp claim. Failures are not memoized.
+    """
+    now = time.time()
+    entry = _verified_tokens.get(token)
+    if entry is not None:
+        payload, expires_at = entry
+        if now < expires_at:
+            _verified_tokens.move_to_end(token)
+            return payload
+        del _verified_tokens[token]
+
+    payload = decode_token(token)
+    if payload is None:
+        return None
+
+    _verified_tokens[token] = (payload, float(payload.get("exp", now)))
+    while len(_verified_tokens) > settings.AUTH_TOKEN_CACHE_MAXSIZE:
+        _verified_tokens.popitem(last=False)
+    return payload
+
+
+def clear_token_cache() -> None:
+    """Forget all memoized token verifications"""
+    _verified_tokens.clear()
@@ -0,0 +1,156 @@
+"""
+Single-flight request coalescing
+Collapses concurrent identical requests into one computation, in-process and across workers
+"""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.db.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Deletes the lock only if it is still held by the caller's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent computations that share a key
+
+    Within one process, the first caller for a key runs the computation and
+    every concurrent caller awaits the same task. Across workers, the first
+    caller also takes a short Redis lock; callers in other workers that fail to
+    take it poll the shared cache until the leader has populated it, and only
+    compute themselves if the lock disappears or the wait times out.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        lock_ttl_seconds: int = 30,
+        poll_interval_seconds: float = 0.25,
+        wait_timeout_seconds: float = 30.0,
+    ):
+        """
+        Initialize single-flight group
+
+        Args:
+            name: Name used for Redis lock keys and logging
+            lock_ttl_seconds: Expiry of the cross-worker Redis lock
+            poll_interval_seconds: Delay between cache polls while another worker computes
+            wait_timeout_seconds: Maximum time to wait for another worker before computing
+        """
+        self.name = name
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def _lock_key(self, key: str) -> str:
+        return f"singleflight:{self.name}:{key}"
+
+    def _get_redis(self):
+        """Return the Redis client, or None when Redis is not connected"""
+        try:
+            return redis_client.get_client()
+        except RuntimeError:
+            return None
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        cache_lookup: Callable[[], Awaitable[Any | None]] | None = None,
+    ) -> Any:
+        """
+        Run fn once for all concurrent callers sharing key
+
+        Args:
+            key: Deduplication key (e.g. the search cache key)
+            fn: Coroutine factory performing the expensive computation. It must
+                populate the shared cache itself for cross-worker waiters to see it.
+            cache_lookup: Coroutine factory reading the shared cache, used by
+                callers waiting on a leader in another worker
+
+        Returns:
+            Result of fn (or the cached value written by another worker)
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            logger.info(f"[{self.name}] Joining in-flight computation for key: {key}")
+        else:
+            # Run as a separate task so a cancelled caller does not cancel the others
+            task = asyncio.create_task(self._run_across_workers(key, fn, cache_lookup))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished computation so the next caller starts a fresh one"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            task.exception()
+
+    def inflight_count(self) -> int:
+        """Number of keys currently being computed in this process"""
+        return len(self._inflight)
+
+    async def _run_across_workers(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        cache_lookup: Callable[[], Awaitable[Any | None]] | None,
+    ) -> Any:
+        """Take the Redis lock and compute, or wait for the worker holding it"""
+        client = self._get_redis()
+        if client is None or cache_lookup is None:
+            return await fn()
+
+        lock_key = self._lock_key(key)
+        token = uuid.uuid4().hex
+        try:
+            acquired = await client.set(lock_key, token, nx=True, ex=self.lock_ttl_seconds)
+        except Exception as e:
+            logger.warning(f"[{self.name}] Could not acquire lock, computing locally: {e}")
+            return await fn()
+
+        if acquired:
+            try:
+                return await fn()
+            finally:
+                try:
+                    await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.warning(f"[{self.name}] Failed to release lock {lock_key}: {e}")
+
+        logger.info(f"[{self.name}] Another worker is computing key {key}, polling cache")
+        waited = 0.0
+        while waited < self.wait_timeout_seconds:
+            await asyncio.sleep(self.poll_interval_seconds)
+            waited += self.poll_interval_seconds
+
+            cached = await cache_lookup()
+            if cached is not None:
+                return cached
+
+            try:
+                if not await client.exists(lock_key):
+                    # Leader finished without caching (e.g. it failed); compute ourselves
+                    break
+            except Exception:
+                break
+
+        logger.info(f"[{self.name}] Gave up waiting for key {key}, computing locally")
+        return await fn()
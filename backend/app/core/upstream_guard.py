@@ -0,0 +1,139 @@
+"""
+Failure caching for flaky upstream APIs
+Remembers that an upstream just failed so concurrent callers fail fast instead
+of each running their own retry loop, and lets a single probe through at a time
+to detect recovery.
+"""
+
+import logging
+import time
+import uuid
+
+from app.db.cache import jittered_ttl
+from app.db.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamUnavailableError(ConnectionError):
+    """Raised without calling the upstream while a recent failure is cached"""
+
+
+class UpstreamGuard:
+    """
+    Short-lived failure cache with single-probe recovery
+
+    After a failure is recorded, calls are rejected for failure_ttl seconds
+    (with jitter so replicas do not all probe at once). During that window
+    one caller at a time may take the probe slot and call the upstream; its
+    success clears the failure, its failure extends it. State lives in Redis
+    so the whole fleet shares it, with an in-process fallback without Redis.
+    """
+
+    def __init__(self, name: str, failure_ttl: int = 30, probe_ttl: int = 15):
+        """
+        Initialize upstream guard
+
+        Args:
+            name: Upstream name used for Redis keys and logging
+            failure_ttl: Seconds a recorded failure keeps rejecting calls
+            probe_ttl: Seconds a probe holds the probe slot
+        """
+        self.name = name
+        self.failure_ttl = failure_ttl
+        self.probe_ttl = probe_ttl
+        self.instance_id = uuid.uuid4().hex
+        self._failed_until = 0.0
+        self._probe_until = 0.0
+
+    def clear_local(self) -> None:
+        """Forget the in-process failure state"""
+        self._failed_until = 0.0
+        self._probe_until = 0.0
+
+    @property
+    def _failure_key(self) -> str:
+        return f"upstream:{self.name}:failed"
+
+    @property
+    def _probe_key(self) -> str:
+        return f"upstream:{self.name}:probe"
+
+    def _get_redis(self):
+        """Return the Redis client, or None when Redis is not connected"""
+        try:
+            return redis_client.get_client()
+        except RuntimeError:
+            return None
+
+    async def before_call(self) -> bool:
+        """
+        Check whether the upstream may be called now
+
+        Returns:
+            True if this call is the recovery probe, False for a normal call
+
+        Raises:
+            UpstreamUnavailableError: If a failure is cached and another caller
+                already holds the probe slot
+        """
+        client = self._get_redis()
+        if client is None:
+            now = time.monotonic()
+            if now < self._failed_until:
+                if now < self._probe_until:
+                    raise UpstreamUnavailableError(f"{self.name} recently failed")
+                self._probe_until = now + self.probe_ttl
+                logger.info(f"[{self.name}] Probing upstream after recent failure")
+                return True
+            return False
+
+        try:
+            if not await client.exists(self._failure_key):
+                return False
+            acquired = await client.set(
+                self._probe_key, self.instance_id, nx=True, ex=self.probe_ttl
+            )
+        except Exception as e:
+            # Guard state unavailable: let the call through rather than block it
+            logger.warning(f"[{self.name}] Could not read upstream failure state: {e}")
+            return False
+
+        if not acquired:
+            raise UpstreamUnavailableError(f"{self.name} recently failed")
+        logger.info(f"[{self.name}] Probing upstream after recent failure")
+        return True
+
+    async def record_failure(self) -> None:
+        """Cache a failure so other callers fail fast"""
+        ttl = jittered_ttl(self.failure_ttl)
+        logger.warning(f"[{self.name}] Upstream failure cached for {ttl}s")
+        client = self._get_redis()
+        if client is None:
+            self._failed_until = time.monotonic() + ttl
+            self._probe_until = 0.0
+            return
+        try:
+            await client.set(self._failure_key, "1", ex=ttl)
+            await client.delete(self._probe_key)
+        except Exception as e:
+            logger.warning(f"[{self.name}] Could not cache upstream failure: {e}")
+
+    async def record_success(self, probe: bool) -> None:
+        """
+        Clear the cached failure after a successful probe
+
+        Args:
+            probe: Value returned by before_call for this call
+        """
+        if not probe:
+            return
+        logger.info(f"[{self.name}] Upstream recovered")
+        client = self._get_redis()
+        if client is None:
+            self.clear_local()
+            return
+        try:
+            await client.delete(self._failure_key, self._probe_key)
+        except Exception as e:
+            logger.warning(f"[{self.name}] Could not clear upstream failure: {e}")
@@ -0,0 +1,49 @@
+"""
+Set-based bulk deletes
+Rows are deleted with DELETE ... WHERE id IN (SELECT id ... LIMIT n)
+RETURNING id, in chunks committed one at a time, instead of loading every row
+into the session and deleting it object by object. Only primary keys come
+back, so memory stays flat however large the JSONB documents are, and each
+chunk holds its row locks only until its own commit.
+"""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+async def delete_in_chunks(
+    db: AsyncSession,
+    model: Any,
+    *criteria: ColumnElement[bool],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Delete every row of model matching criteria
+
+    Args:
+        db: Database session; committed after each chunk
+        model: Mapped class with an integer id primary key
+        *criteria: WHERE clauses selecting the rows to delete
+        chunk_size: Maximum rows deleted per statement
+
+    Returns:
+        Number of rows deleted
+    """
+    total = 0
+    while True:
+        chunk = select(model.id).filter(*criteria).limit(chunk_size).scalar_subquery()
+        result = await db.execute(
+            delete(model)
+            .where(model.id.in_(chunk))
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = len(result.all())
+        await db.commit()
+        total += deleted
+        if deleted < chunk_size:
+            return total
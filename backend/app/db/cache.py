@@ -0,0 +1,390 @@
+"""
+Two-tier cache facade used by all services
+L1 is a small per-process cache; L2 is Redis when connected, otherwise the
+shared in-memory cache. Writes go through both tiers and are broadcast over
+Redis pub/sub so other replicas drop their L1 copies. Values are encoded
+with app.db.serialization, so every tier holds the same compact bytes.
+Entries can carry deal and VIN tags so every key derived from one
+record is dropped with a single invalidate_tags call. While Redis is
+unhealthy the in-memory cache serves as the only tier; local tiers are
+cleared when Redis comes back since invalidations were missed meanwhile.
+"""
+
+import asyncio
+import logging
+import random
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.config import settings
+from app.db import serialization
+from app.db.in_memory_cache import InMemoryCache, in_memory_cache
+from app.db.redis import CONNECTION_ERRORS, redis_client
+from app.metrics import cache_hits, cache_misses
+
+logger = logging.getLogger(__name__)
+
+L1_CACHE_NAME = "cache_l1"
+L2_CACHE_NAME = "cache_l2"
+TAG_KEY_PREFIX = "cache:tag:"
+
+
+def jittered_ttl(ttl: int, jitter: float = 0.2) -> int:
+    """
+    Spread a TTL by up to +/- jitter so entries written together do not expire together
+
+    Args:
+        ttl: Base TTL in seconds
+        jitter: Maximum relative deviation
+
+    Returns:
+        TTL in seconds, at least 1
+    """
+    return max(1, round(ttl * random.uniform(1 - jitter, 1 + jitter)))
+
+
+def deal_tag(deal_id: int) -> str:
+    """Tag for entries derived from a deal"""
+    return f"deal:{deal_id}"
+
+
+def vin_tag(vin: str) -> str:
+    """Tag for entries derived from a vehicle's listing or price"""
+    return f"vin:{vin.upper()}"
+
+
+class TwoTierCache:
+    """
+    Read-through / write-through cache with a per-process L1 in front of Redis
+
+    Values are any JSON-serializable object; they are encoded once on write
+    and decoded on every read, so callers never share mutable cached objects. Hot
+    keys are answered from L1 without a network round-trip; L1 entries live at
+    most CACHE_L1_TTL_SECONDS (or the key's own TTL if shorter) and are
+    dropped early when another replica publishes an invalidation.
+    """
+
+    def __init__(
+        self,
+        l1_maxsize: int,
+        l1_ttl: int,
+        channel: str,
+        l1_max_bytes: int | None = None,
+    ):
+        """
+        Initialize cache facade
+
+        Args:
+            l1_maxsize: Maximum number of L1 entries
+            l1_ttl: Maximum time an entry stays in L1, in seconds
+            channel: Redis pub/sub channel for invalidation messages
+            l1_max_bytes: Approximate L1 memory budget in bytes
+        """
+        self.l1 = InMemoryCache(
+            maxsize=l1_maxsize, ttl=l1_ttl, max_bytes=l1_max_bytes, name=L1_CACHE_NAME
+        )
+        self.l1_ttl = l1_ttl
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+        self._listener_task: asyncio.Task | None = None
+        # Tag membership when Redis is not connected
+        self._local_tags: dict[str, set[str]] = {}
+        self._bypassing_redis = False
+
+    def get_redis(self):
+        """Return the Redis client, or None when Redis is not connected or unhealthy"""
+        try:
+            client = redis_client.get_binary_client()
+        except RuntimeError:
+            self._bypassing_redis = True
+            return None
+        if self._bypassing_redis:
+            self._bypassing_redis = False
+            self._on_redis_recovered()
+        return client
+
+    def _on_redis_recovered(self) -> None:
+        """Drop local tiers that may have missed invalidations while Redis was down"""
+        self.l1.clear()
+        in_memory_cache.clear()
+        self._local_tags.clear()
+        logger.info("Redis available again, cleared local cache tiers")
+
+    def _report_error(self, action: str, error: Exception) -> None:
+        logger.warning(f"Error {action}: {error}")
+        redis_client.report_error(error)
+
+    async def get(self, key: str) -> Any | None:
+        """
+        Get a value, checking L1 before L2
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Decoded value, or None on miss, backend error or undecodable entry
+        """
+        raw = await self._get_raw(key)
+        if raw is None:
+            return None
+        try:
+            return serialization.decode(raw)
+        except Exception as e:
+            logger.warning(f"Discarding undecodable cache entry {key}: {e}")
+            return None
+
+    async def _get_raw(self, key: str) -> bytes | str | None:
+        client = self.get_redis()
+        if client is None:
+            # No Redis: the shared in-memory cache is the only tier
+            return await in_memory_cache.get(key)
+
+        value = await self.l1.get(key)
+        if value is not None:
+            return value
+
+        try:
+            # Value and remaining TTL in one round-trip, so L1 never outlives L2
+            pipe = client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            value, remaining_ms = await pipe.execute()
+        except Exception as e:
+            self._report_error(f"reading {key} from Redis", e)
+            if isinstance(e, CONNECTION_ERRORS):
+                return await in_memory_cache.get(key)
+            return None
+
+        if value is None:
+            cache_misses.labels(cache_name=L2_CACHE_NAME).inc()
+            return None
+
+        cache_hits.labels(cache_name=L2_CACHE_NAME).inc()
+        # PTTL is negative for keys without an expiry
+        ttl = remaining_ms / 1000 if isinstance(remaining_ms, int) and remaining_ms > 0 else None
+        await self.l1.set(key, value, ex=min(ttl, self.l1_ttl) if ttl else self.l1_ttl)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ex: int | None = None,
+        tags: list[str] | None = None,
+    ) -> None:
+        """
+        Write a value through to L2 and L1 and invalidate other replicas' L1
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ex: Expiry in seconds
+            tags: Tags the entry is registered under for invalidate_tags
+        """
+        value = serialization.encode(value)
+        client = self.get_redis()
+        if client is None:
+            await in_memory_cache.set(key, value, ex=ex)
+            await self._tag_local(key, tags)
+            return
+
+        try:
+            if ex:
+                await client.setex(key, ex, value)
+            else:
+                await client.set(key, value)
+        except Exception as e:
+            self._report_error(f"writing {key} to Redis", e)
+            await self.l1.delete(key)
+            if isinstance(e, CONNECTION_ERRORS):
+                await in_memory_cache.set(key, value, ex=ex)
+                await self._tag_local(key, tags)
+            return
+
+        await self._tag_redis(client, key, tags, ex)
+        await self.l1.set(key, value, ex=min(ex, self.l1_ttl) if ex else self.l1_ttl)
+        await self._publish_invalidation(key)
+
+    async def _tag_redis(self, client, key: str, tags: list[str] | None, ex: int | None) -> None:
+        if not tags:
+            return
+        try:
+            # One round-trip for all tag writes
+            pipe = client.pipeline(transaction=False)
+            for tag in tags:
+                tag_key = f"{TAG_KEY_PREFIX}{tag}"
+                pipe.sadd(tag_key, key)
+                # Keep the set at least as long as its newest member
+                if ex:
+                    pipe.expire(tag_key, max(ex, settings.CACHE_TAG_TTL_SECONDS))
+            await pipe.execute()
+        except Exception as e:
+            self._report_error(f"tagging {key} with {', '.join(tags)}", e)
+
+    async def _tag_local(self, key: str, tags: list[str] | None) -> None:
+        for tag in tags or ():
+            keys = self._local_tags.setdefault(tag, set())
+            keys.add(key)
+            if len(keys) > in_memory_cache.maxsize:
+                # Forget keys the in-memory cache has already expired or evicted
+                live = [k for k in list(keys) if await in_memory_cache.exists(k)]
+                keys.intersection_update(live)
+
+    async def invalidate_tags(self, *tags: str) -> list[str]:
+        """
+        Delete every entry registered under any of the given tags
+
+        Args:
+            tags: Tags to invalidate (see deal_tag, vin_tag)
+
+        Returns:
+            Keys that were registered under the tags and have been deleted
+        """
+        if not tags:
+            return []
+        client = self.get_redis()
+        if client is None:
+            keys: set[str] = set()
+            for tag in tags:
+                keys |= self._local_tags.pop(tag, set())
+            for key in keys:
+                await in_memory_cache.delete(key)
+            return sorted(keys)
+
+        tag_keys = [f"{TAG_KEY_PREFIX}{tag}" for tag in tags]
+        try:
+            pipe = client.pipeline(transaction=False)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            keys = {
+                m.decode() if isinstance(m, bytes) else m
+                for members in await pipe.execute()
+                for m in members
+            }
+
+            # Delete the entries and tag sets and notify replicas in one round-trip
+            pipe = client.pipeline(transaction=False)
+            pipe.delete(*keys, *tag_keys)
+            for key in keys:
+                pipe.publish(self.channel, f"{self.instance_id}:{key}")
+            await pipe.execute()
+        except Exception as e:
+            self._report_error(f"invalidating cache tags {', '.join(tags)}", e)
+            return []
+
+        for key in keys:
+            await self.l1.delete(key)
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cache entries for tags {', '.join(tags)}")
+        return sorted(keys)
+
+    async def delete(self, key: str) -> None:
+        """Delete a key from both tiers and invalidate other replicas' L1"""
+        client = self.get_redis()
+        if client is None:
+            await in_memory_cache.delete(key)
+            return
+
+        await self.l1.delete(key)
+        try:
+            await client.delete(key)
+        except Exception as e:
+            self._report_error(f"deleting {key} from Redis", e)
+            return
+        await self._publish_invalidation(key)
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any | None]],
+        ex: int | None = None,
+    ) -> Any | None:
+        """
+        Read-through helper: return the cached value or load, store and return it
+
+        Args:
+            key: Cache key
+            loader: Coroutine factory producing the value on a miss (None is not cached)
+            ex: Expiry in seconds for loaded values
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+        value = await loader()
+        if value is not None:
+            await self.set(key, value, ex=ex)
+        return value
+
+    async def _publish_invalidation(self, key: str) -> None:
+        client = self.get_redis()
+        if client is None:
+            return
+        try:
+            await client.publish(self.channel, f"{self.instance_id}:{key}")
+        except Exception as e:
+            logger.debug(f"Failed to publish cache invalidation for {key}: {e}")
+
+    async def handle_invalidation(self, message: bytes | str) -> None:
+        """Drop a key from L1 when another replica changed it"""
+        if isinstance(message, bytes):
+            message = message.decode()
+        instance_id, _, key = message.partition(":")
+        if instance_id != self.instance_id and key:
+            await self.l1.delete(key)
+
+    async def start(self) -> None:
+        """Subscribe to invalidation messages (called from the application lifespan)"""
+        if redis_client.binary_client is None or self._listener_task is not None:
+            return
+        self._listener_task = asyncio.create_task(self._listen())
+        logger.info(f"Listening for cache invalidations on {self.channel}")
+
+    async def _listen(self) -> None:
+        """Subscribe while Redis is healthy, resubscribing after it recovers"""
+        while True:
+            client = self.get_redis()
+            if client is None:
+                await asyncio.sleep(settings.REDIS_RECONNECT_INTERVAL_SECONDS)
+                continue
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self.handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # L1 is not used while Redis is down and is cleared on recovery
+                self._report_error("listening for cache invalidations", e)
+                await asyncio.sleep(settings.REDIS_RECONNECT_INTERVAL_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+
+    def clear_local(self) -> None:
+        """Clear this process's L1 and local tag index"""
+        self.l1.clear()
+        self._local_tags.clear()
+
+
+# Global cache facade
+cache = TwoTierCache(
+    l1_maxsize=settings.CACHE_L1_MAXSIZE,
+    l1_ttl=settings.CACHE_L1_TTL_SECONDS,
+    channel=settings.CACHE_INVALIDATION_CHANNEL,
+    l1_max_bytes=settings.CACHE_L1_MAX_BYTES,
+)
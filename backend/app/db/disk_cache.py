@@ -0,0 +1,233 @@
+"""
+Persistent on-disk cache backed by SQLite in WAL mode
+Replaces the one-JSON-file-per-key market data cache with a single indexed
+database that supports per-key TTL and LRU eviction by total byte budget
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from app.core.config import settings
+from app.db import serialization
+
+logger = logging.getLogger(__name__)
+
+# Only rewrite an entry's access time when it is older than this, so hot keys
+# do not turn every read into a write
+ACCESS_TIME_RESOLUTION_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_last_access ON cache_entries (last_access);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at);
+"""
+
+
+class DiskCache:
+    """
+    SQLite-backed key/value cache
+
+    Every write is a single transaction, so readers never observe partial
+    entries. Blocking SQLite calls run in a worker thread via asyncio.to_thread
+    so the event loop is never blocked on disk I/O. The total stored size is
+    kept as a running count (loaded when the database is opened) so writes do
+    not scan the table; it is recomputed from the table only when it crosses
+    max_bytes, which also corrects drift from other processes sharing the file.
+    """
+
+    def __init__(self, path: str, max_bytes: int, default_ttl: int | None = None):
+        """
+        Initialize disk cache
+
+        Args:
+            path: SQLite database file (parent directories are created on first use)
+            max_bytes: Total serialized size above which least recently used
+                entries are evicted
+            default_ttl: Expiry in seconds for entries set without one (None = no expiry)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._total_bytes = self._sum_sizes(conn)
+            self._conn = conn
+            logger.info(f"Opened disk cache at {self.path} (max_bytes={self.max_bytes})")
+        return self._conn
+
+    @staticmethod
+    def _sum_sizes(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    @staticmethod
+    def _size_of(conn: sqlite3.Connection, key: str) -> int:
+        row = conn.execute("SELECT size FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _get_sync(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, size, expires_at, last_access FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            blob, size, expires_at, last_access = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._total_bytes -= size
+                return None
+
+            try:
+                # Same header-prefixed encoding as the Redis and in-process tiers
+                value = serialization.decode(blob)
+            except Exception as e:
+                logger.warning(f"Discarding undecodable disk cache entry {key}: {e}")
+                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._total_bytes -= size
+                return None
+
+            if now - last_access >= ACCESS_TIME_RESOLUTION_SECONDS:
+                conn.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (now, key))
+
+        return value
+
+    def _set_sync(self, key: str, value: Any, ttl: int | None) -> None:
+        blob = serialization.encode(value)
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                total = self._total_bytes - self._size_of(conn, key) + len(blob)
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), expires_at, now),
+                )
+                if total > self.max_bytes:
+                    total = self._evict(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._total_bytes = total
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """
+        Drop expired entries, then least recently used ones until under budget
+
+        Returns:
+            Total size of the remaining entries
+        """
+        conn.execute(
+            "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        total = self._sum_sizes(conn)
+        if total <= self.max_bytes:
+            return total
+
+        to_free = total - self.max_bytes
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM cache_entries ORDER BY last_access"):
+            victims.append((key,))
+            total -= size
+            to_free -= size
+            if to_free <= 0:
+                break
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+        logger.info(f"Disk cache evicted {len(victims)} entries to stay under byte budget")
+        return total
+
+    def _delete_sync(self, key: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            size = self._size_of(conn, key)
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._total_bytes -= size
+
+    def _stats_sync(self) -> dict[str, int]:
+        with self._lock:
+            count, total = (
+                self._connect()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries")
+                .fetchone()
+            )
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
+
+    def _clear_sync(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM cache_entries")
+            self._total_bytes = 0
+
+    def _close_sync(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def get(self, key: str) -> Any | None:
+        """Get value from cache, or None if missing or expired"""
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> None:
+        """
+        Set value in cache
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ex: Expiry in seconds (defaults to default_ttl)
+        """
+        await asyncio.to_thread(self._set_sync, key, value, ex or self.default_ttl)
+
+    async def delete(self, key: str) -> None:
+        """Delete key from cache"""
+        await asyncio.to_thread(self._delete_sync, key)
+
+    async def stats(self) -> dict[str, int]:
+        """Return entry count and total serialized bytes"""
+        return await asyncio.to_thread(self._stats_sync)
+
+    async def clear(self) -> None:
+        """Remove all entries"""
+        await asyncio.to_thread(self._clear_sync)
+
+    async def close(self) -> None:
+        """Close the underlying database connection"""
+        await asyncio.to_thread(self._close_sync)
+
+
+# Persistent cache for car search results (fallback behind Redis)
+market_data_cache = DiskCache(
+    path=settings.MARKET_DATA_CACHE_PATH,
+    max_bytes=settings.MARKET_DATA_CACHE_MAX_BYTES,
+    default_ttl=settings.MARKET_DATA_CACHE_TTL_SECONDS,
+)
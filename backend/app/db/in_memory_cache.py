@@ -1,38 +1,133 @@
 """
-In-memory caching implementation using cachetools
+In-memory caching implementation with per-key TTL and a byte budget
 Used as a fallback when Redis is not available (e.g., GCP Free Tier)
 """
 
+import heapq
+import json
 import logging
-from typing import Any
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
 
-from cachetools import TTLCache
+from app.core.config import settings
+from app.metrics import cache_evictions, cache_hits, cache_misses, cache_resident_bytes
 
 logger = logging.getLogger(__name__)
 
 
-class InMemoryCache:
-    """In-memory cache using cachetools TTLCache"""
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory held by a cached value, in bytes"""
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, bytes | bytearray):
+        return sys.getsizeof(value)
+    try:
+        return sys.getsizeof(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
 
-    def __init__(self, maxsize: int = 1000, ttl: int = 3600):
+class InMemoryCache:
+    """
+    In-memory LRU cache with per-key expiry and a byte budget
+
+    Entries are kept in recency order; when either maxsize entries or max_bytes
+    is exceeded the least recently used entries are evicted. Expiry times are
+    tracked in a min-heap so expired entries are reclaimed without scanning the
+    whole cache. Hits and misses go to the cache_hits/cache_misses counters
+    (hit ratio = hits / (hits + misses)), evictions to cache_evictions and the
+    current footprint to cache_resident_bytes, all labelled with ``name``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        ttl: int = 3600,
+        max_bytes: int | None = None,
+        name: str = "in_memory",
+    ):
         """
         Initialize in-memory cache
 
         Args:
             maxsize: Maximum number of items to store
-            ttl: Time-to-live in seconds (default 1 hour)
+            ttl: Default time-to-live in seconds for keys set without ``ex``
+            max_bytes: Approximate memory budget in bytes (None = entry count only)
+            name: Metric label for this cache
         """
-        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
-        logger.info(f"Initialized in-memory cache (maxsize={maxsize}, ttl={ttl}s)")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        logger.info(
+            f"Initialized in-memory cache {name} "
+            f"(maxsize={maxsize}, ttl={ttl}s, max_bytes={max_bytes})"
+        )
+
+    def _remove(self, key: str, reason: str | None = None) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        if reason:
+            cache_evictions.labels(cache_name=self.name, reason=reason).inc()
+
+    def _purge_expired(self, now: float) -> None:
+        """Drop entries whose expiry has passed"""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Skip heap records left behind by overwritten or deleted keys
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key, reason="expired")
+        # Stale records accumulate when keys are overwritten; rebuild occasionally
+        if len(heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [(e.expires_at, k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def _evict_to_fit(self) -> None:
+        """Evict least recently used entries until within entry and byte limits"""
+        while self._entries and (
+            len(self._entries) > self.maxsize
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key, reason="capacity")
+
+    def _update_gauge(self) -> None:
+        cache_resident_bytes.labels(cache_name=self.name).set(self._bytes)
 
     async def get(self, key: str) -> Any | None:
         """Get value from cache"""
-        value = self.cache.get(key)
-        if value is not None:
-            logger.debug(f"Cache hit: {key}")
-        else:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.time():
+            self._remove(key, reason="expired")
+            self._update_gauge()
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            cache_misses.labels(cache_name=self.name).inc()
             logger.debug(f"Cache miss: {key}")
-        return value
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        cache_hits.labels(cache_name=self.name).inc()
+        logger.debug(f"Cache hit: {key}")
+        return entry.value
 
     async def set(self, key: str, value: Any, ex: int | None = None) -> None:
         """
@@ -41,25 +136,39 @@ class InMemoryCache:
         Args:
             key: Cache key
             value: Value to cache
-            ex: Expiry in seconds (Note: Uses cache default TTL, not per-key expiry.
-                For per-key TTL support, use Redis with USE_REDIS=true)
+            ex: Expiry in seconds (defaults to the cache TTL)
         """
-        self.cache[key] = value
+        now = time.time()
+        size = _estimate_size(value)
+        if key in self._entries:
+            self._remove(key)
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.warning(f"Not caching {key}: {size} bytes exceeds budget of {self.max_bytes}")
+            self._update_gauge()
+            return
+
+        expires_at = now + (ex if ex else self.ttl)
+        self._entries[key] = _Entry(value, expires_at, size)
+        self._bytes += size
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+
+        self._purge_expired(now)
+        self._evict_to_fit()
+        self._update_gauge()
         logger.debug(f"Cache set: {key}")
-        if ex is not None:
-            logger.debug(
-                "Note: In-memory cache uses default TTL. Per-key expiry requires USE_REDIS=true"
-            )
 
     async def delete(self, key: str) -> None:
         """Delete key from cache"""
-        if key in self.cache:
-            del self.cache[key]
+        if key in self._entries:
+            self._remove(key)
+            self._update_gauge()
             logger.debug(f"Cache delete: {key}")
 
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
-        return key in self.cache
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.time()
 
     async def ping(self) -> bool:
         """Health check - always returns True for in-memory cache"""
@@ -69,11 +178,30 @@ class InMemoryCache:
         """Close connection - no-op for in-memory cache"""
         logger.info("In-memory cache closed (no-op)")
 
+    def stats(self) -> dict[str, Any]:
+        """Return entry count, resident bytes and hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
     def clear(self) -> None:
         """Clear all cached items"""
-        self.cache.clear()
+        self._entries.clear()
+        self._expiry_heap.clear()
+        self._bytes = 0
+        self._update_gauge()
         logger.info("In-memory cache cleared")
 
 
 # Global in-memory cache instance
-in_memory_cache = InMemoryCache()
+in_memory_cache = InMemoryCache(
+    maxsize=settings.IN_MEMORY_CACHE_MAXSIZE,
+    ttl=settings.IN_MEMORY_CACHE_TTL_SECONDS,
+    max_bytes=settings.IN_MEMORY_CACHE_MAX_BYTES,
+)
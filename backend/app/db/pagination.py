@@ -0,0 +1,97 @@
+"""
+Keyset (cursor) pagination
+List queries are ordered newest first on (timestamp, id). A cursor is an
+opaque token holding the (timestamp, id) of the last row of a page; the next
+page continues strictly after it, so the database seeks straight to the page
+through the matching composite index instead of counting past OFFSET rows.
+OFFSET is still accepted when no cursor is given, for existing clients.
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode the position of a row as an opaque, URL-safe cursor"""
+    payload = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was tampered with
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(row_id, int):
+            raise TypeError("cursor id must be an integer")
+        return datetime.fromisoformat(timestamp), row_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def paginate(
+    query: Select,
+    timestamp_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: str | None = None,
+    skip: int = 0,
+    limit: int | None = DEFAULT_PAGE_SIZE,
+) -> Select:
+    """
+    Order a query newest first and restrict it to one page
+
+    Args:
+        query: Select with the list filters already applied
+        timestamp_column: Row creation time column
+        id_column: Primary key column, breaks ties between equal timestamps
+        cursor: Cursor from the previous page; takes precedence over skip
+        skip: Number of rows to skip (offset compatibility mode)
+        limit: Maximum number of rows to return (None: no limit)
+
+    Returns:
+        The paginated query
+    """
+    query = query.order_by(timestamp_column.desc(), id_column.desc())
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        # Row-value comparison so PostgreSQL can seek on (..., timestamp, id) indexes.
+        # The redundant bound on timestamp alone lets it skip newer partitions
+        # of time-partitioned tables, which it cannot infer from the row value.
+        query = query.filter(
+            tuple_(timestamp_column, id_column)
+            < tuple_(literal(timestamp, timestamp_column.type), literal(row_id, id_column.type)),
+            timestamp_column <= literal(timestamp, timestamp_column.type),
+        )
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def next_cursor(rows: Sequence[Any], limit: int | None, timestamp_attr: str) -> str | None:
+    """
+    Build the cursor for the page after rows
+
+    Returns None when the page is short, i.e. there are no more rows, or was
+    not limited. A full last page yields a cursor to an empty page.
+    """
+    if not rows or limit is None or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, timestamp_attr), last.id)
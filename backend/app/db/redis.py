@@ -1,48 +1,174 @@
 """
 Redis connection setup
+Both clients share tuned, instrumented connection pools. When a command fails
+with a connection error the client is marked unhealthy, get_client() raises
+so callers use their in-process fallbacks, and a background task reconnects.
 """
 
+import asyncio
 import logging
+import time
 
 import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from app.core.config import settings
+from app.metrics import redis_available, redis_pool_checkout_duration
 
 logger = logging.getLogger(__name__)
 
+# Errors that mean Redis itself is unreachable, as opposed to a bad command
+CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError, ConnectionError, TimeoutError)
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Blocking connection pool that records how long callers wait for a connection"""
+
+    def __init__(self, *args, pool_name: str = "default", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_name = pool_name
+
+    async def get_connection(self, command_name, *keys, **options):
+        start = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        finally:
+            redis_pool_checkout_duration.labels(pool=self.pool_name).observe(
+                time.perf_counter() - start
+            )
+
+
+def _create_pool(pool_name: str, **kwargs) -> InstrumentedConnectionPool:
+    """Build a connection pool sized and timed from settings"""
+    return InstrumentedConnectionPool.from_url(
+        settings.REDIS_URL,
+        pool_name=pool_name,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+        socket_keepalive=True,
+        retry_on_timeout=True,
+        retry=Retry(ExponentialBackoff(cap=0.5, base=0.05), settings.REDIS_RETRIES),
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+        **kwargs,
+    )
+
 
 class RedisClient:
     """Redis connection manager"""
 
     client: redis.Redis = None
+    # Returns raw bytes; used for binary cache payloads (see app.db.serialization)
+    binary_client: redis.Redis = None
+    healthy: bool = False
+    _reconnect_task: asyncio.Task | None = None
 
     @classmethod
     async def connect_redis(cls):
         """Connect to Redis"""
+        cls.client = redis.Redis(
+            connection_pool=_create_pool("text", encoding="utf-8", decode_responses=True)
+        )
+        cls.binary_client = redis.Redis(connection_pool=_create_pool("binary"))
         try:
-            cls.client = await redis.from_url(
-                settings.REDIS_URL, encoding="utf-8", decode_responses=True
-            )
             # Verify connection by pinging
             await cls.client.ping()
-            logger.info("Successfully connected to Redis")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {str(e)}")
+            # Keep the pools so the background task can bring Redis in later
+            cls.mark_unhealthy(e)
             raise
+        cls._set_healthy(True)
+        logger.info(
+            f"Successfully connected to Redis "
+            f"(max {settings.REDIS_MAX_CONNECTIONS} connections per pool)"
+        )
 
     @classmethod
     async def close_redis(cls):
         """Close Redis connection"""
+        if cls._reconnect_task is not None:
+            cls._reconnect_task.cancel()
+            await asyncio.gather(cls._reconnect_task, return_exceptions=True)
+            cls._reconnect_task = None
+        cls._set_healthy(False)
+        if cls.binary_client:
+            await cls.binary_client.aclose()
         if cls.client:
-            await cls.client.close()
+            await cls.client.aclose()
             logger.info("Redis connection closed")
 
+    @classmethod
+    def _set_healthy(cls, healthy: bool) -> None:
+        cls.healthy = healthy
+        redis_available.set(1 if healthy else 0)
+
+    @classmethod
+    def report_error(cls, error: BaseException) -> None:
+        """
+        Record a failed Redis command
+
+        Connection-level errors mark Redis unhealthy so callers switch to their
+        in-process fallbacks until the background reconnect succeeds; other
+        errors (bad command, wrong type) are ignored here.
+
+        Args:
+            error: Exception raised by the Redis command
+        """
+        if isinstance(error, CONNECTION_ERRORS):
+            cls.mark_unhealthy(error)
+
+    @classmethod
+    def mark_unhealthy(cls, error: BaseException | None = None) -> None:
+        """Bypass Redis and start reconnecting in the background"""
+        if cls.healthy:
+            logger.error(f"Redis unavailable, falling back to in-process cache: {error}")
+        cls._set_healthy(False)
+        if cls.client is None:
+            return
+        if cls._reconnect_task is None or cls._reconnect_task.done():
+            try:
+                cls._reconnect_task = asyncio.get_running_loop().create_task(cls._reconnect())
+            except RuntimeError:
+                # No running loop (e.g. during interpreter shutdown); nothing to schedule
+                cls._reconnect_task = None
+
+    @classmethod
+    async def _reconnect(cls) -> None:
+        """Ping both pools until Redis answers, then mark it healthy again"""
+        while True:
+            await asyncio.sleep(settings.REDIS_RECONNECT_INTERVAL_SECONDS)
+            try:
+                await cls.client.ping()
+                await cls.binary_client.ping()
+            except Exception as e:
+                logger.debug(f"Redis still unavailable: {e}")
+                continue
+            cls._set_healthy(True)
+            logger.info("Reconnected to Redis")
+            return
+
     @classmethod
     def get_client(cls):
         """Get Redis client"""
         if cls.client is None:
             raise RuntimeError("Redis client is not initialized. Call connect_redis() first.")
+        if not cls.healthy:
+            raise RuntimeError("Redis is unavailable; reconnecting in the background.")
         return cls.client
 
+    @classmethod
+    def get_binary_client(cls):
+        """Get Redis client that returns bytes instead of decoded strings"""
+        if cls.binary_client is None:
+            raise RuntimeError("Redis client is not initialized. Call connect_redis() first.")
+        if not cls.healthy:
+            raise RuntimeError("Redis is unavailable; reconnecting in the background.")
+        return cls.binary_client
+
 
 redis_client = RedisClient()
@@ -0,0 +1,116 @@
+"""
+Serialization for cached payloads
+Values are encoded as compact JSON (orjson when installed) and compressed
+above a size threshold with the codec set by CACHE_COMPRESSION_CODEC. Every
+encoded value starts with a two-byte header so the codec can change without
+breaking entries already in the cache; values without a header are legacy
+``json.dumps`` text and are still readable. Every replica decodes both codecs,
+so replicas sharing a Redis may be configured differently.
+"""
+
+import json
+import logging
+import zlib
+from typing import Any
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is in requirements.txt
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# First header byte; never the first byte of JSON text, so legacy entries are unambiguous
+MAGIC = 0x00
+
+FORMAT_JSON = 0x01
+FORMAT_JSON_ZLIB = 0x02
+FORMAT_JSON_ZSTD = 0x03
+
+CODECS = {"zlib": FORMAT_JSON_ZLIB, "zstd": FORMAT_JSON_ZSTD}
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3) if zstandard else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def _dump_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _load_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode(value: Any, compress_min_bytes: int | None = None, codec: str | None = None) -> bytes:
+    """
+    Encode a JSON-serializable value for the cache
+
+    Args:
+        value: Value to encode
+        compress_min_bytes: Compress payloads at least this large
+            (defaults to CACHE_COMPRESSION_MIN_BYTES)
+        codec: Compression codec, "zlib" or "zstd"
+            (defaults to CACHE_COMPRESSION_CODEC)
+
+    Returns:
+        Header-prefixed bytes
+
+    Raises:
+        ValueError: If the codec is unknown or zstandard is not installed
+    """
+    if compress_min_bytes is None:
+        compress_min_bytes = settings.CACHE_COMPRESSION_MIN_BYTES
+    codec = codec or settings.CACHE_COMPRESSION_CODEC
+    if codec not in CODECS:
+        raise ValueError(f"Unknown cache compression codec {codec!r}")
+
+    body = _dump_json(value)
+    if len(body) < compress_min_bytes:
+        return bytes((MAGIC, FORMAT_JSON)) + body
+    if codec == "zstd":
+        if _zstd_compressor is None:
+            raise ValueError("CACHE_COMPRESSION_CODEC is zstd but zstandard is not installed")
+        return bytes((MAGIC, FORMAT_JSON_ZSTD)) + _zstd_compressor.compress(body)
+    return bytes((MAGIC, FORMAT_JSON_ZLIB)) + zlib.compress(body, 1)
+
+
+def decode(data: bytes | str) -> Any:
+    """
+    Decode a cached value written by encode() or by the legacy json.dumps path
+
+    Args:
+        data: Raw value read from the cache
+
+    Returns:
+        Decoded value
+
+    Raises:
+        ValueError: If the payload is corrupt or uses an unavailable codec
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+
+    if len(data) < 2 or data[0] != MAGIC:
+        return _load_json(data)
+
+    codec, body = data[1], data[2:]
+    if codec == FORMAT_JSON:
+        return _load_json(body)
+    if codec == FORMAT_JSON_ZLIB:
+        return _load_json(zlib.decompress(body))
+    if codec == FORMAT_JSON_ZSTD:
+        if _zstd_decompressor is None:
+            raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+        return _load_json(_zstd_decompressor.decompress(body))
+    raise ValueError(f"Unknown cache payload format {codec:#x}")
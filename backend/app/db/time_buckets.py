@@ -0,0 +1,27 @@
+"""
+Hourly time buckets for rollup tables
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class hour_bucket(FunctionElement):
+    """Truncate a timestamp column to the start of its hour"""
+
+    type = DateTime(timezone=True)
+    name = "hour_bucket"
+    inherit_cache = True
+
+
+@compiles(hour_bucket)
+def _compile_hour_bucket(element, compiler, **kw):
+    return f"date_trunc('hour', {compiler.process(element.clauses, **kw)})"
+
+
+def hour_start(moment: datetime) -> datetime:
+    """Start (UTC) of the hour containing moment"""
+    return moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
@@ -7,8 +7,10 @@ from app.llm.llm_client import (
     generate_structured_json,
     generate_text,
     llm_client,
+    stream_text,
 )
 from app.llm.prompts import get_prompt, list_prompts
+from app.llm.response_cache import PROMPT_TTL_POLICIES, llm_response_cache
 from app.llm.schemas import (
     AddOn,
     CarSelectionItem,
@@ -33,8 +35,11 @@ __all__ = [
     "llm_client",
     "generate_structured_json",
     "generate_text",
+    "stream_text",
     "get_prompt",
     "list_prompts",
+    "llm_response_cache",
+    "PROMPT_TTL_POLICIES",
     "AgentRole",
     "LLMRequest",
     "LLMResponse",
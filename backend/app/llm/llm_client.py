@@ -1,13 +1,16 @@
 """
-Synchronous LLM client for OpenAI Chat Completions with Multi-Agent Intelligence
+LLM client for OpenAI Chat Completions with Multi-Agent Intelligence
 
 This module provides a centralized LLM client for the AutoDealGenie platform,
 replacing CrewAI's heavy orchestration with direct OpenAI API integration.
 
 Key Features:
-- Synchronous OpenAI client for simpler deployment and debugging
+- Async OpenAI client so long completions never block the event loop
+- Token streaming for chat-style replies (time-to-first-token)
+- Synchronous OpenAI client for scripts, workers and debugging
 - Multi-agent intelligence with role-based prompts and backstories
 - Structured JSON output with Pydantic validation
+- Content-addressed response cache with per-prompt TTL policies
 - Comprehensive error handling with descriptive logging
 - Support for agent-to-agent communication and context passing
 
@@ -21,15 +24,17 @@ Agent Architecture:
 
 import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Any, Literal, TypeVar
 
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from pydantic import BaseModel, ValidationError
 
 from app.core.config import settings
 from app.llm.agent_system_prompts import get_agent_system_prompt
 from app.llm.prompts import get_prompt
+from app.llm.response_cache import llm_response_cache
 from app.utils.error_handler import ApiError
 
 logger = logging.getLogger(__name__)
@@ -42,19 +47,24 @@ AgentRole = Literal["research", "loan", "negotiation", "evaluator", "qa"]
 
 class LLMClient:
     """
-    Synchronous client for OpenAI LLM operations with multi-agent intelligence
+    Client for OpenAI LLM operations with multi-agent intelligence
 
     This client supports modular, step-by-step agent operations that replace
     CrewAI's sequential orchestration with direct API calls. Each agent has
     a well-defined role, backstory, and set of capabilities.
+
+    Every generation method has an async counterpart (``agenerate_*``) built on
+    ``AsyncOpenAI``. Request handlers and services must use the async methods so
+    that a 5-30s completion does not freeze the whole uvicorn worker.
     """
 
     def __init__(self):
         """
         Initialize the LLM client with OpenRouter API key
 
-        The client uses synchronous operations for simpler error handling
-        and debugging compared to async alternatives.
+        Both a synchronous and an asynchronous OpenAI client are created from the
+        same configuration. They share the prompt registry, agent system prompts
+        and response validation implemented below.
 
         Supports custom base URLs for OpenRouter and other OpenAI-compatible endpoints.
         """
@@ -66,6 +76,7 @@ class LLMClient:
                 "Neither OPENROUTER_API_KEY nor OPENAI_API_KEY is set. LLM features will be disabled."
             )
             self.client = None
+            self.async_client = None
         else:
             # Initialize with optional base_url for OpenRouter support
             client_kwargs = {"api_key": api_key}
@@ -78,6 +89,7 @@ class LLMClient:
                 )
 
             self.client = OpenAI(**client_kwargs)
+            self.async_client = AsyncOpenAI(**client_kwargs)
             logger.info(f"LLM client initialized with model: {settings.OPENAI_MODEL}")
 
     def is_available(self) -> bool:
@@ -89,66 +101,47 @@ class LLMClient:
         """
         return self.client is not None
 
-    def generate_structured_json(
+    def _ensure_available(self) -> None:
+        """Raise a 503 ApiError if no API key is configured"""
+        if not self.is_available():
+            logger.error(
+                "LLM client not available - neither OPENROUTER_API_KEY nor OPENAI_API_KEY configured"
+            )
+            raise ApiError(
+                status_code=503,
+                message="LLM service is not available",
+                details={"reason": "Neither OPENROUTER_API_KEY nor OPENAI_API_KEY configured"},
+            )
+
+    def _build_messages(
         self,
         prompt_id: str,
         variables: dict[str, Any],
-        response_model: type[T],
-        temperature: float = 0.7,
-        max_tokens: int | None = None,
-        agent_role: AgentRole | None = None,
-    ) -> T:
+        agent_role: AgentRole | None,
+        output_format: Literal["json", "text"],
+    ) -> list[dict[str, str]]:
         """
-        Generate structured JSON output using OpenAI and validate with Pydantic model
-
-        This method supports multi-agent workflows by allowing specification of
-        agent roles (Research, Loan Analyzer, Negotiation, Evaluator).
-        The agent role influences the system prompt and response style.
+        Format the prompt template and pair it with the agent system prompt
 
         Args:
-            prompt_id: ID of the prompt template to use (e.g., 'research_vehicles')
+            prompt_id: ID of the prompt template to use
             variables: Variables to substitute in the prompt template
-            response_model: Pydantic model class for response validation
-            temperature: Sampling temperature (0.0-2.0). Lower for factual, higher for creative
-            max_tokens: Maximum tokens to generate (optional)
             agent_role: Optional agent role for specialized system prompts
+            output_format: Expected output format ("json" or "text")
 
         Returns:
-            Instance of response_model with validated data
+            Chat messages ready for the Chat Completions API
 
         Raises:
-            ApiError: If LLM is not available, prompt not found, or API call fails
-
-        Example:
-            >>> result = client.generate_structured_json(
-            ...     prompt_id="research_vehicles",
-            ...     variables={"make": "Honda", "model": "Civic"},
-            ...     response_model=VehicleReport,
-            ...     agent_role="research"
-            ... )
+            ApiError: If the prompt is not found
         """
-        if not self.is_available():
-            logger.error(
-                "LLM client not available - neither OPENROUTER_API_KEY nor OPENAI_API_KEY configured"
-            )
-            raise ApiError(
-                status_code=503,
-                message="LLM service is not available",
-                details={"reason": "Neither OPENROUTER_API_KEY nor OPENAI_API_KEY configured"},
-            )
-
         try:
             # Get and format the prompt
             prompt_template = get_prompt(prompt_id)
             formatted_prompt = prompt_template.format(**variables)
 
             # Get agent-specific system prompt
-            system_prompt = get_agent_system_prompt(agent_role, "json")
-
-            logger.info(
-                f"Generating structured JSON: prompt_id='{prompt_id}', "
-                f"agent_role='{agent_role or 'default'}', model={settings.OPENAI_MODEL}"
-            )
+            system_prompt = get_agent_system_prompt(agent_role, output_format)
 
         except KeyError as e:
             logger.error(f"Prompt not found: {e}")
@@ -158,38 +151,98 @@ class LLMClient:
                 details={"error": str(e)},
             ) from e
 
-        try:
-            # Call OpenAI API with JSON mode
-            # Using response_format to ensure valid JSON output
-            response = self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": formatted_prompt},
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens,
-                response_format={"type": "json_object"},
+        kind = "structured JSON" if output_format == "json" else "text"
+        logger.info(
+            f"Generating {kind}: prompt_id='{prompt_id}', "
+            f"agent_role='{agent_role or 'default'}', model={settings.OPENAI_MODEL}"
+        )
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": formatted_prompt},
+        ]
+
+    def _log_usage(self, response: Any) -> None:
+        """Log token usage for monitoring"""
+        if response.usage:
+            logger.info(
+                f"OpenAI tokens: {response.usage.total_tokens} "
+                f"(prompt: {response.usage.prompt_tokens}, "
+                f"completion: {response.usage.completion_tokens})"
             )
 
-            # Extract content from response
-            content = response.choices[0].message.content
-            if not content:
-                logger.error("Empty response from OpenAI API")
-                raise ApiError(
-                    status_code=500,
-                    message="Received empty response from LLM",
-                    details={"prompt_id": prompt_id, "agent_role": agent_role},
-                )
+    def _response_cache_key(
+        self,
+        prompt_id: str,
+        messages: list[dict[str, str]],
+        agent_role: AgentRole | None,
+        temperature: float,
+        max_tokens: int | None,
+        output_format: Literal["json", "text"],
+        use_cache: bool,
+    ) -> str | None:
+        """
+        Get the response cache key for a request, or None if it must not be cached
 
-            # Log token usage for monitoring
-            if response.usage:
-                logger.info(
-                    f"OpenAI tokens: {response.usage.total_tokens} "
-                    f"(prompt: {response.usage.prompt_tokens}, "
-                    f"completion: {response.usage.completion_tokens})"
-                )
+        Requests are cached only when caching is enabled globally and per call,
+        and the prompt has a TTL policy in app.llm.response_cache.
+        """
+        if not (use_cache and settings.LLM_CACHE_ENABLED):
+            return None
+        if llm_response_cache.get_ttl(prompt_id) is None:
+            return None
+        return llm_response_cache.build_key(
+            prompt_id=prompt_id,
+            messages=messages,
+            agent_role=agent_role,
+            model=settings.OPENAI_MODEL,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            output_format=output_format,
+        )
+
+    def _extract_content(self, response: Any, prompt_id: str, agent_role: AgentRole | None) -> str:
+        """
+        Extract message content from a completion, rejecting empty responses
+
+        Raises:
+            ApiError: If the completion has no content
+        """
+        content = response.choices[0].message.content
+        if not content:
+            logger.error("Empty response from OpenAI API")
+            raise ApiError(
+                status_code=500,
+                message="Received empty response from LLM",
+                details={"prompt_id": prompt_id, "agent_role": agent_role},
+            )
+
+        self._log_usage(response)
+        return content
+
+    def _parse_structured_content(
+        self,
+        content: str,
+        response_model: type[T],
+        prompt_id: str,
+        agent_role: AgentRole | None,
+    ) -> T:
+        """
+        Parse raw LLM content as JSON and validate it with a Pydantic model
+
+        Args:
+            content: Raw message content returned by the LLM
+            response_model: Pydantic model class for response validation
+            prompt_id: ID of the prompt template (for error details)
+            agent_role: Agent role (for error details)
+
+        Returns:
+            Instance of response_model with validated data
 
+        Raises:
+            ApiError: If the content is not valid JSON or fails validation
+        """
+        try:
             # Parse JSON from response
             # First, check if the LLM returns Markdown code block and clean it
             if content.strip().startswith("```json") and content.strip().endswith("```"):
@@ -224,10 +277,6 @@ class LLMClient:
             )
             return validated_response
 
-        except ApiError:
-            # Re-raise ApiError without wrapping
-            raise
-
         except ValidationError as e:
             logger.error(
                 f"Response validation failed for {response_model.__name__}: {e}. "
@@ -273,51 +322,199 @@ class LLMClient:
                 },
             ) from e
 
-        except openai.AuthenticationError as e:
-            logger.error(f"OpenAI authentication error: {e}")
-            raise ApiError(
+    def _translate_error(
+        self, error: Exception, operation: str, agent_role: AgentRole | None
+    ) -> ApiError:
+        """
+        Map an exception raised during generation to an ApiError
+
+        Args:
+            error: Exception raised by the OpenAI SDK or response handling
+            operation: Name of the public method, used in log messages
+            agent_role: Agent role (for error details)
+
+        Returns:
+            ApiError to raise in place of the original exception
+        """
+        if isinstance(error, ApiError):
+            return error
+
+        if isinstance(error, openai.AuthenticationError):
+            logger.error(f"OpenAI authentication error: {error}")
+            return ApiError(
                 status_code=401,
                 message="OpenAI API authentication failed",
-                details={"error": str(e)},
-            ) from e
+                details={"error": str(error)},
+            )
 
-        except openai.RateLimitError as e:
-            logger.error(f"OpenAI rate limit exceeded: {e}")
-            raise ApiError(
+        if isinstance(error, openai.RateLimitError):
+            logger.error(f"OpenAI rate limit exceeded: {error}")
+            return ApiError(
                 status_code=429,
                 message="OpenAI API rate limit exceeded",
                 details={
-                    "error": str(e),
-                    "retry_after": getattr(e, "retry_after", None),
+                    "error": str(error),
+                    "retry_after": getattr(error, "retry_after", None),
                 },
-            ) from e
+            )
 
-        except openai.APITimeoutError as e:
-            logger.error(f"OpenAI API timeout: {e}")
-            raise ApiError(
+        if isinstance(error, openai.APITimeoutError):
+            logger.error(f"OpenAI API timeout: {error}")
+            return ApiError(
                 status_code=504,
                 message="OpenAI API request timed out",
-                details={"error": str(e)},
-            ) from e
+                details={"error": str(error)},
+            )
 
-        except openai.APIError as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise ApiError(
+        if isinstance(error, openai.APIError):
+            logger.error(f"OpenAI API error: {error}")
+            return ApiError(
                 status_code=502,
                 message="OpenAI API error",
                 details={
-                    "error": str(e),
-                    "status_code": getattr(e, "status_code", None),
+                    "error": str(error),
+                    "status_code": getattr(error, "status_code", None),
                 },
-            ) from e
+            )
+
+        logger.error(f"Unexpected error in {operation}: {error}", exc_info=True)
+        return ApiError(
+            status_code=500,
+            message="Unexpected error during LLM generation",
+            details={"error": str(error), "agent_role": agent_role},
+        )
+
+    def generate_structured_json(
+        self,
+        prompt_id: str,
+        variables: dict[str, Any],
+        response_model: type[T],
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        agent_role: AgentRole | None = None,
+    ) -> T:
+        """
+        Generate structured JSON output using OpenAI and validate with Pydantic model
+
+        This method supports multi-agent workflows by allowing specification of
+        agent roles (Research, Loan Analyzer, Negotiation, Evaluator).
+        The agent role influences the system prompt and response style.
+
+        This call blocks the current thread. From async code use
+        ``agenerate_structured_json`` instead.
+
+        Args:
+            prompt_id: ID of the prompt template to use (e.g., 'research_vehicles')
+            variables: Variables to substitute in the prompt template
+            response_model: Pydantic model class for response validation
+            temperature: Sampling temperature (0.0-2.0). Lower for factual, higher for creative
+            max_tokens: Maximum tokens to generate (optional)
+            agent_role: Optional agent role for specialized system prompts
+
+        Returns:
+            Instance of response_model with validated data
+
+        Raises:
+            ApiError: If LLM is not available, prompt not found, or API call fails
+
+        Example:
+            >>> result = client.generate_structured_json(
+            ...     prompt_id="research_vehicles",
+            ...     variables={"make": "Honda", "model": "Civic"},
+            ...     response_model=VehicleReport,
+            ...     agent_role="research"
+            ... )
+        """
+        self._ensure_available()
+        messages = self._build_messages(prompt_id, variables, agent_role, "json")
+
+        try:
+            # Call OpenAI API with JSON mode
+            # Using response_format to ensure valid JSON output
+            response = self.client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"},
+            )
+            content = self._extract_content(response, prompt_id, agent_role)
+            return self._parse_structured_content(content, response_model, prompt_id, agent_role)
 
         except Exception as e:
-            logger.error(f"Unexpected error in generate_structured_json: {e}", exc_info=True)
-            raise ApiError(
-                status_code=500,
-                message="Unexpected error during LLM generation",
-                details={"error": str(e), "agent_role": agent_role},
-            ) from e
+            raise self._translate_error(e, "generate_structured_json", agent_role) from e
+
+    async def agenerate_structured_json(
+        self,
+        prompt_id: str,
+        variables: dict[str, Any],
+        response_model: type[T],
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        agent_role: AgentRole | None = None,
+        use_cache: bool = True,
+    ) -> T:
+        """
+        Async version of generate_structured_json built on AsyncOpenAI
+
+        Uses the same prompt registry, agent system prompts and Pydantic
+        validation as the synchronous method, but awaits the completion so
+        other requests on the same worker keep being served meanwhile.
+
+        Validated responses for prompts with a TTL policy are cached by
+        content hash and served without calling the API on repeat requests.
+
+        Args:
+            prompt_id: ID of the prompt template to use (e.g., 'research_vehicles')
+            variables: Variables to substitute in the prompt template
+            response_model: Pydantic model class for response validation
+            temperature: Sampling temperature (0.0-2.0). Lower for factual, higher for creative
+            max_tokens: Maximum tokens to generate (optional)
+            agent_role: Optional agent role for specialized system prompts
+            use_cache: Set to False to bypass the response cache for this call
+
+        Returns:
+            Instance of response_model with validated data
+
+        Raises:
+            ApiError: If LLM is not available, prompt not found, or API call fails
+        """
+        self._ensure_available()
+        messages = self._build_messages(prompt_id, variables, agent_role, "json")
+
+        cache_key = self._response_cache_key(
+            prompt_id, messages, agent_role, temperature, max_tokens, "json", use_cache
+        )
+        if cache_key:
+            cached = await llm_response_cache.get(cache_key)
+            if cached is not None:
+                try:
+                    return response_model.model_validate_json(cached)
+                except ValidationError:
+                    logger.warning(
+                        f"Cached LLM response no longer matches {response_model.__name__}, "
+                        "regenerating"
+                    )
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"},
+            )
+            content = self._extract_content(response, prompt_id, agent_role)
+            result = self._parse_structured_content(content, response_model, prompt_id, agent_role)
+
+        except Exception as e:
+            raise self._translate_error(e, "agenerate_structured_json", agent_role) from e
+
+        if cache_key:
+            await llm_response_cache.set(
+                cache_key, result.model_dump_json(), llm_response_cache.get_ttl(prompt_id)
+            )
+        return result
 
     def generate_text(
         self,
@@ -333,6 +530,9 @@ class LLMClient:
         This method supports conversational and advisory responses from
         various agent roles in the multi-agent system.
 
+        This call blocks the current thread. From async code use
+        ``agenerate_text`` instead.
+
         Args:
             prompt_id: ID of the prompt template to use
             variables: Variables to substitute in the prompt template
@@ -353,122 +553,155 @@ class LLMClient:
             ...     agent_role="negotiation"
             ... )
         """
-        if not self.is_available():
-            logger.error(
-                "LLM client not available - neither OPENROUTER_API_KEY nor OPENAI_API_KEY configured"
+        self._ensure_available()
+        messages = self._build_messages(prompt_id, variables, agent_role, "text")
+
+        try:
+            # Call OpenAI API
+            response = self.client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
             )
-            raise ApiError(
-                status_code=503,
-                message="LLM service is not available",
-                details={"reason": "Neither OPENROUTER_API_KEY nor OPENAI_API_KEY configured"},
+            content = self._extract_content(response, prompt_id, agent_role)
+
+            logger.info(
+                f"Successfully generated text response ({len(content)} characters) "
+                f"for agent_role='{agent_role or 'default'}'"
             )
+            return content
 
-        try:
-            # Get and format the prompt
-            prompt_template = get_prompt(prompt_id)
-            formatted_prompt = prompt_template.format(**variables)
+        except Exception as e:
+            raise self._translate_error(e, "generate_text", agent_role) from e
 
-            # Get agent-specific system prompt
-            system_prompt = get_agent_system_prompt(agent_role, "text")
+    async def agenerate_text(
+        self,
+        prompt_id: str,
+        variables: dict[str, Any],
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        agent_role: AgentRole | None = None,
+        use_cache: bool = True,
+    ) -> str:
+        """
+        Async version of generate_text built on AsyncOpenAI
+
+        Responses for prompts with a TTL policy are served from the response
+        cache on repeat requests.
+
+        Args:
+            prompt_id: ID of the prompt template to use
+            variables: Variables to substitute in the prompt template
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate (optional)
+            agent_role: Optional agent role for specialized system prompts
+            use_cache: Set to False to bypass the response cache for this call
+
+        Returns:
+            Generated text string
+
+        Raises:
+            ApiError: If LLM is not available, prompt not found, or API call fails
+        """
+        self._ensure_available()
+        messages = self._build_messages(prompt_id, variables, agent_role, "text")
+
+        cache_key = self._response_cache_key(
+            prompt_id, messages, agent_role, temperature, max_tokens, "text", use_cache
+        )
+        if cache_key:
+            cached = await llm_response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            content = self._extract_content(response, prompt_id, agent_role)
 
             logger.info(
-                f"Generating text: prompt_id='{prompt_id}', "
-                f"agent_role='{agent_role or 'default'}', model={settings.OPENAI_MODEL}"
+                f"Successfully generated text response ({len(content)} characters) "
+                f"for agent_role='{agent_role or 'default'}'"
             )
 
-        except KeyError as e:
-            logger.error(f"Prompt not found: {e}")
-            raise ApiError(
-                status_code=400,
-                message=f"Invalid prompt_id: {prompt_id}",
-                details={"error": str(e)},
-            ) from e
+        except Exception as e:
+            raise self._translate_error(e, "agenerate_text", agent_role) from e
+
+        if cache_key:
+            await llm_response_cache.set(cache_key, content, llm_response_cache.get_ttl(prompt_id))
+        return content
+
+    async def astream_text(
+        self,
+        prompt_id: str,
+        variables: dict[str, Any],
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        agent_role: AgentRole | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream text output from OpenAI as incremental content deltas
+
+        Yields each non-empty content fragment as soon as the API produces it,
+        so callers can forward tokens to the user while the completion is still
+        running. Joining every yielded fragment gives the same text that
+        agenerate_text would have returned.
 
+        Args:
+            prompt_id: ID of the prompt template to use
+            variables: Variables to substitute in the prompt template
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate (optional)
+            agent_role: Optional agent role for specialized system prompts
+
+        Yields:
+            Content deltas in generation order
+
+        Raises:
+            ApiError: If LLM is not available, prompt not found, the API call fails,
+                or the stream finishes without producing any content
+        """
+        self._ensure_available()
+        messages = self._build_messages(prompt_id, variables, agent_role, "text")
+
+        total_chars = 0
         try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
+            stream = await self.async_client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": formatted_prompt},
-                ],
+                messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                stream=True,
             )
 
-            # Extract content from response
-            content = response.choices[0].message.content
-            if not content:
-                logger.error("Empty response from OpenAI API")
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    total_chars += len(delta)
+                    yield delta
+
+            if total_chars == 0:
+                logger.error("Empty streamed response from OpenAI API")
                 raise ApiError(
                     status_code=500,
                     message="Received empty response from LLM",
                     details={"prompt_id": prompt_id, "agent_role": agent_role},
                 )
 
-            # Log token usage for monitoring
-            if response.usage:
-                logger.info(
-                    f"OpenAI tokens: {response.usage.total_tokens} "
-                    f"(prompt: {response.usage.prompt_tokens}, "
-                    f"completion: {response.usage.completion_tokens})"
-                )
-
             logger.info(
-                f"Successfully generated text response ({len(content)} characters) "
+                f"Successfully streamed text response ({total_chars} characters) "
                 f"for agent_role='{agent_role or 'default'}'"
             )
-            return content
-
-        except ApiError:
-            # Re-raise ApiError without wrapping
-            raise
-
-        except openai.AuthenticationError as e:
-            logger.error(f"OpenAI authentication error: {e}")
-            raise ApiError(
-                status_code=401,
-                message="OpenAI API authentication failed",
-                details={"error": str(e)},
-            ) from e
-
-        except openai.RateLimitError as e:
-            logger.error(f"OpenAI rate limit exceeded: {e}")
-            raise ApiError(
-                status_code=429,
-                message="OpenAI API rate limit exceeded",
-                details={
-                    "error": str(e),
-                    "retry_after": getattr(e, "retry_after", None),
-                },
-            ) from e
-
-        except openai.APITimeoutError as e:
-            logger.error(f"OpenAI API timeout: {e}")
-            raise ApiError(
-                status_code=504,
-                message="OpenAI API request timed out",
-                details={"error": str(e)},
-            ) from e
-
-        except openai.APIError as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise ApiError(
-                status_code=502,
-                message="OpenAI API error",
-                details={
-                    "error": str(e),
-                    "status_code": getattr(e, "status_code", None),
-                },
-            ) from e
 
         except Exception as e:
-            logger.error(f"Unexpected error in generate_text: {e}", exc_info=True)
-            raise ApiError(
-                status_code=500,
-                message="Unexpected error during LLM generation",
-                details={"error": str(e), "agent_role": agent_role},
-            ) from e
+            raise self._translate_error(e, "astream_text", agent_role) from e
 
 
 # Singleton instance
@@ -476,19 +709,20 @@ llm_client = LLMClient()
 
 
 # Convenience functions for direct usage
-def generate_structured_json(
+async def generate_structured_json(
     prompt_id: str,
     variables: dict[str, Any],
     response_model: type[T],
     temperature: float = 0.7,
     max_tokens: int | None = None,
     agent_role: AgentRole | None = None,
+    use_cache: bool = True,
 ) -> T:
     """
     Generate structured JSON output using OpenAI and validate with Pydantic model
 
-    This is a convenience wrapper around LLMClient.generate_structured_json()
-    for direct module-level usage in service layers.
+    This is a convenience wrapper around LLMClient.agenerate_structured_json()
+    for direct module-level usage in async service layers.
 
     Args:
         prompt_id: ID of the prompt template to use
@@ -497,6 +731,7 @@ def generate_structured_json(
         temperature: Sampling temperature (0.0-2.0)
         max_tokens: Maximum tokens to generate (optional)
         agent_role: Optional agent role for specialized system prompts
+        use_cache: Set to False to bypass the response cache for this call
 
     Returns:
         Instance of response_model with validated data
@@ -508,35 +743,37 @@ def generate_structured_json(
         >>> from app.llm import generate_structured_json
         >>> from app.llm.schemas import VehicleReport
         >>>
-        >>> report = generate_structured_json(
+        >>> report = await generate_structured_json(
         ...     prompt_id="research_vehicles",
         ...     variables={"make": "Honda", "budget": 25000},
         ...     response_model=VehicleReport,
         ...     agent_role="research"
         ... )
     """
-    return llm_client.generate_structured_json(
+    return await llm_client.agenerate_structured_json(
         prompt_id=prompt_id,
         variables=variables,
         response_model=response_model,
         temperature=temperature,
         max_tokens=max_tokens,
         agent_role=agent_role,
+        use_cache=use_cache,
     )
 
 
-def generate_text(
+async def generate_text(
     prompt_id: str,
     variables: dict[str, Any],
     temperature: float = 0.7,
     max_tokens: int | None = None,
     agent_role: AgentRole | None = None,
+    use_cache: bool = True,
 ) -> str:
     """
     Generate text output using OpenAI
 
-    This is a convenience wrapper around LLMClient.generate_text()
-    for direct module-level usage in service layers.
+    This is a convenience wrapper around LLMClient.agenerate_text()
+    for direct module-level usage in async service layers.
 
     Args:
         prompt_id: ID of the prompt template to use
@@ -544,6 +781,7 @@ def generate_text(
         temperature: Sampling temperature (0.0-2.0)
         max_tokens: Maximum tokens to generate (optional)
         agent_role: Optional agent role for specialized system prompts
+        use_cache: Set to False to bypass the response cache for this call
 
     Returns:
         Generated text string
@@ -554,16 +792,62 @@ def generate_text(
     Example:
         >>> from app.llm import generate_text
         >>>
-        >>> advice = generate_text(
+        >>> advice = await generate_text(
         ...     prompt_id="negotiation_advice",
         ...     variables={"price": 25000, "target": 23000},
         ...     agent_role="negotiation"
         ... )
     """
-    return llm_client.generate_text(
+    return await llm_client.agenerate_text(
         prompt_id=prompt_id,
         variables=variables,
         temperature=temperature,
         max_tokens=max_tokens,
         agent_role=agent_role,
+        use_cache=use_cache,
     )
+
+
+async def stream_text(
+    prompt_id: str,
+    variables: dict[str, Any],
+    temperature: float = 0.7,
+    max_tokens: int | None = None,
+    agent_role: AgentRole | None = None,
+) -> AsyncIterator[str]:
+    """
+    Stream text output using OpenAI
+
+    This is a convenience wrapper around LLMClient.astream_text()
+    for direct module-level usage in async service layers.
+
+    Args:
+        prompt_id: ID of the prompt template to use
+        variables: Variables to substitute in the prompt template
+        temperature: Sampling temperature (0.0-2.0)
+        max_tokens: Maximum tokens to generate (optional)
+        agent_role: Optional agent role for specialized system prompts
+
+    Yields:
+        Content deltas in generation order
+
+    Raises:
+        ApiError: If LLM is not available, prompt not found, or API call fails
+
+    Example:
+        >>> from app.llm import stream_text
+        >>>
+        >>> async for delta in stream_text(
+        ...     prompt_id="negotiation_chat",
+        ...     variables={...},
+        ... ):
+        ...     await websocket.send_json({"type": "message_delta", "delta": delta})
+    """
+    async for delta in llm_client.astream_text(
+        prompt_id=prompt_id,
+        variables=variables,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        agent_role=agent_role,
+    ):
+        yield delta
@@ -0,0 +1,166 @@
+"""
+Content-addressed cache for LLM responses
+
+Identical prompts (same prompt_id, formatted prompt, agent role, model,
+temperature and token limit) produce interchangeable answers for the
+analytical prompts used by AutoDealGenie, e.g. ranking the same listing set
+with ``car_selection_from_list`` or comparing the same VIN pair with
+``vehicle_comparison``. This module caches those responses so repeated
+requests skip the LLM round-trip entirely.
+
+Only prompts with an entry in ``PROMPT_TTL_POLICIES`` are cached. Negotiation
+prompts are conversational and intentionally left out.
+
+Storage is the shared two-tier cache (app.db.cache): a per-process L1 in
+front of Redis, or the in-memory cache alone when Redis is not connected.
+Hits and misses are exported through the ``cache_hits``/``cache_misses``
+Prometheus counters under ``cache_name="llm_response"``.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any
+
+from app.db.cache import cache
+from app.metrics import cache_hits, cache_misses, cache_operation_duration
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAME = "llm_response"
+CACHE_KEY_PREFIX = "llm_cache"
+
+# Per-prompt TTLs in seconds. Prompts not listed here are never cached.
+PROMPT_TTL_POLICIES: dict[str, int] = {
+    "car_selection_from_list": 900,  # Listing sets churn quickly (matches search cache)
+    "evaluation": 3600,  # Matches DealEvaluationService.CACHE_TTL
+    "vehicle_condition": 3600,
+    "vehicle_comparison": 86400,  # Same VIN pair compares the same way all day
+}
+
+
+class LLMResponseCache:
+    """Cache of validated LLM responses keyed on a canonical hash of the request"""
+
+    def __init__(self, ttl_policies: dict[str, int] | None = None):
+        """
+        Initialize the response cache
+
+        Args:
+            ttl_policies: Mapping of prompt_id to TTL in seconds
+                (defaults to PROMPT_TTL_POLICIES)
+        """
+        self.ttl_policies = ttl_policies if ttl_policies is not None else PROMPT_TTL_POLICIES
+
+    def get_ttl(self, prompt_id: str) -> int | None:
+        """
+        Get the TTL policy for a prompt
+
+        Args:
+            prompt_id: ID of the prompt template
+
+        Returns:
+            TTL in seconds, or None if responses for this prompt are not cached
+        """
+        return self.ttl_policies.get(prompt_id)
+
+    def build_key(
+        self,
+        prompt_id: str,
+        messages: list[dict[str, str]],
+        agent_role: str | None,
+        model: str,
+        temperature: float,
+        max_tokens: int | None,
+        output_format: str,
+    ) -> str:
+        """
+        Build a content-addressed cache key for an LLM request
+
+        The formatted messages are hashed rather than the raw variables, so a
+        change to a prompt template or agent system prompt automatically
+        produces new keys.
+
+        Args:
+            prompt_id: ID of the prompt template
+            messages: Formatted chat messages sent to the API
+            agent_role: Agent role used for the system prompt
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Token limit
+            output_format: "json" or "text"
+
+        Returns:
+            Cache key string
+        """
+        key_payload: dict[str, Any] = {
+            "prompt_id": prompt_id,
+            "messages": messages,
+            "agent_role": agent_role,
+            "model": model,
+            "temperature": round(float(temperature), 4),
+            "max_tokens": max_tokens,
+            "format": output_format,
+        }
+        key_data = json.dumps(key_payload, sort_keys=True, separators=(",", ":"))
+        key_hash = hashlib.sha256(key_data.encode()).hexdigest()
+        return f"{CACHE_KEY_PREFIX}:{prompt_id}:{key_hash}"
+
+    async def get(self, key: str) -> str | None:
+        """
+        Look up a cached response payload
+
+        Args:
+            key: Cache key from build_key()
+
+        Returns:
+            Serialized payload, or None on miss or backend error
+        """
+        start = time.perf_counter()
+        try:
+            cached = await cache.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading LLM response cache: {e}")
+            cached = None
+        finally:
+            cache_operation_duration.labels(operation="get", cache_name=CACHE_NAME).observe(
+                time.perf_counter() - start
+            )
+
+        # Entries written before payloads were serialized decode to dicts; re-fetch them
+        if not isinstance(cached, str):
+            cached = None
+
+        if cached is None:
+            cache_misses.labels(cache_name=CACHE_NAME).inc()
+            logger.debug(f"LLM cache MISS for key: {key}")
+            return None
+
+        cache_hits.labels(cache_name=CACHE_NAME).inc()
+        logger.info(f"LLM cache HIT for key: {key}")
+        return cached
+
+    async def set(self, key: str, payload: str, ttl: int) -> None:
+        """
+        Store a response payload
+
+        Args:
+            key: Cache key from build_key()
+            payload: Serialized response (validated model JSON or raw text)
+            ttl: Time-to-live in seconds
+        """
+        start = time.perf_counter()
+        try:
+            await cache.set(key, payload, ex=ttl)
+            logger.debug(f"Cached LLM response for key: {key} (TTL: {ttl}s)")
+        except Exception as e:
+            logger.warning(f"Error writing LLM response cache: {e}")
+        finally:
+            cache_operation_duration.labels(operation="set", cache_name=CACHE_NAME).observe(
+                time.perf_counter() - start
+            )
+
+
+# Singleton instance
+llm_response_cache = LLMResponseCache()
@@ -15,11 +15,17 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.logging import configure_logging
+from app.db.cache import cache
+from app.db.disk_cache import market_data_cache
 from app.metrics import initialize_metrics
 from app.middleware.error_middleware import ErrorHandlerMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.services.cache_warmer import cache_warmer
+from app.services.partition_maintenance import partition_maintainer
 from app.services.rabbitmq_consumer import deals_consumer, handle_deal_message
 from app.services.rabbitmq_producer import rabbitmq_producer
+from app.services.rollup_refresher import rollup_refresher
+from app.tools.marketcheck_client import marketcheck_client
 
 
 @asynccontextmanager
@@ -50,12 +56,15 @@ async def lifespan(app: FastAPI):
             print("Redis connected successfully")
         except Exception as e:
             print(f"WARNING: Failed to initialize Redis: {e}")
-            print("Falling back to in-memory cache")
+            print("Falling back to in-memory cache; reconnecting to Redis in the background")
             using_redis = False
 
     if not using_redis:
         print("Using in-memory cache (Redis disabled)")
 
+    # Keep per-process L1 caches coherent across replicas
+    await cache.start()
+
     # Initialize RabbitMQ/Queue connection
     if settings.USE_RABBITMQ:
         try:
@@ -83,12 +92,34 @@ async def lifespan(app: FastAPI):
             print(f"WARNING: Failed to initialize RabbitMQ services: {e}")
             print("Application will continue without messaging features.")
 
+    # Open the pooled MarketCheck HTTP client
+    await marketcheck_client.start()
+
+    if settings.CACHE_WARMER_ENABLED:
+        cache_warmer.start()
+
+    if settings.PARTITION_MAINTENANCE_ENABLED:
+        partition_maintainer.start()
+
+    if settings.ROLLUP_REFRESH_ENABLED:
+        rollup_refresher.start()
+
     if settings.USE_MOCK_SERVICES:
         print("Mock services are ENABLED - using mock endpoints for development")
     yield
     # Shutdown
     print("Shutting down AutoDealGenie backend...")
 
+    await cache_warmer.stop()
+    await partition_maintainer.stop()
+    await rollup_refresher.stop()
+
+    await marketcheck_client.close()
+    print("MarketCheck HTTP client closed")
+
+    await cache.stop()
+    await market_data_cache.close()
+
     # Close connections
     if using_rabbitmq:
         await rabbitmq.close()
@@ -97,10 +128,11 @@ async def lifespan(app: FastAPI):
         await in_memory_queue.close()
         print("In-memory queue closed")
 
-    if using_redis:
+    if settings.USE_REDIS:
+        # Also stops the background reconnect if Redis never came up
         await redis_client.close_redis()
         print("Redis connection closed")
-    else:
+    if not using_redis:
         await in_memory_cache.close()
         print("In-memory cache closed")
 
@@ -150,7 +182,7 @@ app.add_middleware(
     allow_origins=settings.BACKEND_CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=allowed_methods,
-    expose_headers=["X-Request-ID", "X-Process-Time"],
+    expose_headers=["X-Request-ID", "X-Process-Time", "X-Next-Cursor"],
     allow_headers=allowed_headers,
 )
 
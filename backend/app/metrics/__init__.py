@@ -6,9 +6,11 @@ from app.metrics.prometheus import (
     app_info,
     auth_failures,
     auth_success,
+    cache_evictions,
     cache_hits,
     cache_misses,
     cache_operation_duration,
+    cache_resident_bytes,
     db_queries_total,
     db_query_duration,
     db_query_errors,
@@ -26,6 +28,8 @@ from app.metrics.prometheus import (
     negotiation_duration,
     negotiation_messages,
     negotiation_sessions,
+    redis_available,
+    redis_pool_checkout_duration,
     user_signups,
     vehicle_search_duration,
     vehicle_searches,
@@ -51,6 +55,10 @@ __all__ = [
     "cache_hits",
     "cache_misses",
     "cache_operation_duration",
+    "cache_evictions",
+    "cache_resident_bytes",
+    "redis_pool_checkout_duration",
+    "redis_available",
     "external_api_requests",
     "external_api_duration",
     "external_api_errors",
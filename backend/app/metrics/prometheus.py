@@ -116,6 +116,30 @@ cache_operation_duration = Histogram(
     buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1],
 )
 
+cache_evictions = Counter(
+    "autodealgenie_cache_evictions_total",
+    "Total number of entries evicted from in-process caches",
+    ["cache_name", "reason"],
+)
+
+cache_resident_bytes = Gauge(
+    "autodealgenie_cache_resident_bytes",
+    "Approximate memory held by in-process cache entries",
+    ["cache_name"],
+)
+
+redis_pool_checkout_duration = Histogram(
+    "autodealgenie_redis_pool_checkout_seconds",
+    "Time spent waiting for a connection from the Redis pool",
+    ["pool"],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0],
+)
+
+redis_available = Gauge(
+    "autodealgenie_redis_available",
+    "Whether Redis is connected and healthy (1) or bypassed for the in-process cache (0)",
+)
+
 # External API Metrics
 external_api_requests = Counter(
     "autodealgenie_external_api_requests_total",
@@ -13,6 +13,7 @@ from app.models.negotiation import (
     NegotiationSession,
     NegotiationStatus,
 )
+from app.models.vehicle_cache import VehicleCache
 
 __all__ = [
     "Deal",
@@ -28,4 +29,5 @@ __all__ = [
     "LoanRecommendation",
     "InsuranceRecommendation",
     "AIResponseType",
+    "VehicleCache",
 ]
@@ -3,7 +3,7 @@ SQLAlchemy models for data previously stored in MongoDB
 Now using PostgreSQL with JSONB columns for flexible schema
 """
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 
@@ -34,6 +34,10 @@ class SearchHistory(Base):
     """
     Search history model - stores all car search queries
     Previously stored in MongoDB, now using PostgreSQL JSONB
+
+    In PostgreSQL the table is partitioned by month on timestamp with primary
+    key (id, timestamp) (migration 012); old months are dropped by
+    app.services.partition_maintenance.
     """
 
     __tablename__ = "search_history"
@@ -50,7 +54,11 @@ class SearchHistory(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
 
-    __table_args__ = (Index("idx_search_history_timestamp", "timestamp"),)
+    __table_args__ = (
+        Index("idx_search_history_timestamp", "timestamp"),
+        # Keyset pagination of a user's history (see app.db.pagination)
+        Index("idx_search_history_user_cursor", "user_id", "timestamp", "id"),
+    )
 
     def __repr__(self):
         return f"<SearchHistory {self.id}: User {self.user_id}, Results {self.result_count}>"
@@ -60,6 +68,8 @@ class AIResponse(Base):
     """
     AI response model - stores comprehensive AI interactions
     Previously stored in MongoDB, now using PostgreSQL JSONB
+
+    Partitioned by month on timestamp in PostgreSQL, like SearchHistory.
     """
 
     __tablename__ = "ai_responses"
@@ -81,10 +91,53 @@ class AIResponse(Base):
     )
 
     __table_args__ = (
-        Index("idx_ai_responses_feature", "feature", "timestamp"),
-        Index("idx_ai_responses_deal", "deal_id", "timestamp"),
-        Index("idx_ai_responses_user", "user_id", "timestamp"),
+        # (column, timestamp, id) for keyset pagination (see app.db.pagination)
+        Index("idx_ai_responses_feature_cursor", "feature", "timestamp", "id"),
+        Index("idx_ai_responses_deal_cursor", "deal_id", "timestamp", "id"),
+        Index("idx_ai_responses_user_cursor", "user_id", "timestamp", "id"),
     )
 
     def __repr__(self):
         return f"<AIResponse {self.id}: Feature {self.feature}, Deal {self.deal_id}>"
+
+
+class SearchRollupHourly(Base):
+    """
+    Search counts per hour and make/model, rolled up from search_history
+    Rebuilt for recent hours by app.services.rollup_refresher
+    """
+
+    __tablename__ = "search_rollups_hourly"
+
+    id = Column(Integer, primary_key=True)
+    bucket = Column(DateTime(timezone=True), nullable=False)  # Start of the hour
+    make = Column(Text, nullable=True)  # search_criteria ->> 'make'
+    model = Column(Text, nullable=True)  # search_criteria ->> 'model'
+    search_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("idx_search_rollups_hourly_bucket", "bucket"),)
+
+    def __repr__(self):
+        return f"<SearchRollupHourly {self.bucket}: {self.make} {self.model} x{self.search_count}>"
+
+
+class AIUsageRollupHourly(Base):
+    """
+    AI call counts and token sums per hour and feature/model/llm_used, rolled
+    up from ai_responses by app.services.rollup_refresher
+    """
+
+    __tablename__ = "ai_usage_rollups_hourly"
+
+    id = Column(Integer, primary_key=True)
+    bucket = Column(DateTime(timezone=True), nullable=False)  # Start of the hour
+    feature = Column(String(50), nullable=False)
+    model_used = Column(String(100), nullable=True)
+    llm_used = Column(Integer, nullable=False)  # 1 for True, 0 for False
+    call_count = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (Index("idx_ai_usage_rollups_hourly_bucket", "bucket"),)
+
+    def __repr__(self):
+        return f"<AIUsageRollupHourly {self.bucket}: {self.feature} x{self.call_count}>"
@@ -10,6 +10,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     Float,
+    Index,
     Integer,
     String,
     Text,
@@ -62,6 +63,9 @@ class Deal(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
+    # Keyset pagination (see app.db.pagination)
+    __table_args__ = (Index("ix_deals_created_at_id", "created_at", "id"),)
+
     def __repr__(self):
         return f"<Deal {self.id}: {self.vehicle_year} {self.vehicle_make} {self.vehicle_model}>"
 
@@ -142,6 +146,8 @@ class Favorite(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
+    __table_args__ = (Index("ix_favorites_user_created_at_id", "user_id", "created_at", "id"),)
+
     def __repr__(self):
         return f"<Favorite {self.id}: {self.user_id} - {self.year} {self.make} {self.model}>"
 
@@ -176,5 +182,7 @@ class SavedSearch(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
+    __table_args__ = (Index("ix_saved_searches_user_created_at_id", "user_id", "created_at", "id"),)
+
     def __repr__(self):
         return f"<SavedSearch {self.id}: {self.user_id} - {self.name}>"
@@ -4,7 +4,7 @@ SQLAlchemy models for Negotiation feature
 
 import enum
 
-from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Integer, Text
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Index, Integer, Text
 from sqlalchemy.sql import func
 
 from app.db.session import Base
@@ -45,6 +45,10 @@ class NegotiationSession(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
+    __table_args__ = (
+        Index("ix_negotiation_sessions_user_created_at_id", "user_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<NegotiationSession {self.id}: User {self.user_id}, Deal {self.deal_id}>"
 
@@ -0,0 +1,50 @@
+"""
+SQLAlchemy model for the local vehicle listing index
+Stores every parsed MarketCheck listing keyed by VIN so repeat searches can be
+answered without calling the paid API
+"""
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class VehicleCache(Base):
+    """
+    Vehicle listing cache model - one row per VIN
+    Filter columns are denormalized from the listing (make/model lower-cased)
+    so searches can use the indexes below
+    """
+
+    __tablename__ = "vehicle_cache"
+
+    vin = Column(String(17), primary_key=True)
+
+    # Indexed filter columns
+    make = Column(String(100), nullable=True)  # Lower-cased
+    model = Column(String(100), nullable=True)  # Lower-cased
+    year = Column(Integer, nullable=True)
+    price = Column(Float, nullable=True)
+    mileage = Column(Integer, nullable=True)
+    inventory_type = Column(String(50), nullable=True)  # new, used, certified
+
+    # Full parsed listing as returned by MarketCheckAPIClient.parse_listing
+    listing = Column(JSONB, nullable=False)
+
+    first_seen_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_seen_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    price_changed_at = Column(
+        DateTime(timezone=True), nullable=True
+    )  # Last re-ingest at a new price
+
+    __table_args__ = (
+        Index("idx_vehicle_cache_make_model_year", "make", "model", "year"),
+        Index("idx_vehicle_cache_price", "price"),
+        Index("idx_vehicle_cache_mileage", "mileage"),
+        Index("idx_vehicle_cache_last_seen", "last_seen_at"),
+    )
+
+    def __repr__(self):
+        return f"<VehicleCache {self.vin}: {self.year} {self.make} {self.model}>"
@@ -5,13 +5,16 @@ Previously used MongoDB, now using PostgreSQL JSONB
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from sqlalchemy import case, desc, func, select
+from sqlalchemy import case, delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.jsonb_data import AIResponse
+from app.db.bulk import delete_in_chunks
+from app.db.pagination import paginate
+from app.db.time_buckets import hour_bucket, hour_start
+from app.models.jsonb_data import AIResponse, AIUsageRollupHourly
 
 logger = logging.getLogger(__name__)
 
@@ -87,15 +90,16 @@ class AIResponseRepository:
         return record
 
     async def get_by_deal_id(
-        self, deal_id: int, limit: int = 100, skip: int = 0
+        self, deal_id: int, limit: int = 100, skip: int = 0, cursor: str | None = None
     ) -> list[AIResponse]:
         """
-        Get all AI responses for a deal
+        Get all AI responses for a deal, newest first
 
         Args:
             deal_id: Deal ID
             limit: Maximum number of records to return
-            skip: Number of records to skip (for pagination)
+            skip: Number of records to skip (offset pagination)
+            cursor: Cursor from the previous page; takes precedence over skip
 
         Returns:
             List of AI response records
@@ -105,24 +109,28 @@ class AIResponseRepository:
             raise ValueError(f"Invalid deal_id: {deal_id}")
 
         result = await self.db.execute(
-            select(AIResponse)
-            .filter(AIResponse.deal_id == deal_id)
-            .order_by(desc(AIResponse.timestamp))
-            .offset(skip)
-            .limit(limit)
+            paginate(
+                select(AIResponse).filter(AIResponse.deal_id == deal_id),
+                AIResponse.timestamp,
+                AIResponse.id,
+                cursor=cursor,
+                skip=skip,
+                limit=limit,
+            )
         )
         return result.scalars().all()
 
     async def get_by_user_id(
-        self, user_id: int, limit: int = 100, skip: int = 0
+        self, user_id: int, limit: int = 100, skip: int = 0, cursor: str | None = None
     ) -> list[AIResponse]:
         """
-        Get all AI responses for a user
+        Get all AI responses for a user, newest first
 
         Args:
             user_id: User ID
             limit: Maximum number of records to return
-            skip: Number of records to skip (for pagination)
+            skip: Number of records to skip (offset pagination)
+            cursor: Cursor from the previous page; takes precedence over skip
 
         Returns:
             List of AI response records
@@ -132,11 +140,14 @@ class AIResponseRepository:
             raise ValueError(f"Invalid user_id: {user_id}")
 
         result = await self.db.execute(
-            select(AIResponse)
-            .filter(AIResponse.user_id == user_id)
-            .order_by(desc(AIResponse.timestamp))
-            .offset(skip)
-            .limit(limit)
+            paginate(
+                select(AIResponse).filter(AIResponse.user_id == user_id),
+                AIResponse.timestamp,
+                AIResponse.id,
+                cursor=cursor,
+                skip=skip,
+                limit=limit,
+            )
         )
         return result.scalars().all()
 
@@ -146,15 +157,17 @@ class AIResponseRepository:
         user_id: int | None = None,
         limit: int = 100,
         skip: int = 0,
+        cursor: str | None = None,
     ) -> list[AIResponse]:
         """
-        Get AI responses for a specific feature
+        Get AI responses for a specific feature, newest first
 
         Args:
             feature: Feature name
             user_id: Optional user ID filter
             limit: Maximum number of records to return
-            skip: Number of records to skip (for pagination)
+            skip: Number of records to skip (offset pagination)
+            cursor: Cursor from the previous page; takes precedence over skip
 
         Returns:
             List of AI response records
@@ -177,8 +190,11 @@ class AIResponseRepository:
                 raise ValueError(f"Invalid user_id: {user_id}")
             query = query.filter(AIResponse.user_id == user_id)
 
-        query = query.order_by(desc(AIResponse.timestamp)).offset(skip).limit(limit)
-        result = await self.db.execute(query)
+        result = await self.db.execute(
+            paginate(
+                query, AIResponse.timestamp, AIResponse.id, cursor=cursor, skip=skip, limit=limit
+            )
+        )
         return result.scalars().all()
 
     async def get_deal_lifecycle(self, deal_id: int) -> dict[str, Any]:
@@ -222,28 +238,35 @@ class AIResponseRepository:
         """
         Get analytics about AI usage
 
+        Reads the hourly rollups, so the cost does not grow with the number
+        of AI responses. The window starts on an hour boundary and lags by up
+        to one rollup refresh.
+
         Args:
             days: Number of days to look back
 
         Returns:
             Analytics data
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        print("DEBUG: Cutoff date:", cutoff_date)
+        cutoff = hour_start(datetime.now(UTC) - timedelta(days=days))
+        rollup = AIUsageRollupHourly
         # Aggregate by feature
         result = await self.db.execute(
             select(
-                AIResponse.feature,
-                func.count(AIResponse.id).label("count"),
-                func.sum(case((AIResponse.llm_used == 1, 1), else_=0)).label("llm_count"),
-                func.sum(case((AIResponse.llm_used == 0, 1), else_=0)).label("fallback_count"),
-                func.sum(AIResponse.tokens_used).label("total_tokens"),
+                rollup.feature,
+                func.sum(rollup.call_count).label("count"),
+                func.sum(case((rollup.llm_used == 1, rollup.call_count), else_=0)).label(
+                    "llm_count"
+                ),
+                func.sum(case((rollup.llm_used == 0, rollup.call_count), else_=0)).label(
+                    "fallback_count"
+                ),
+                func.sum(rollup.total_tokens).label("total_tokens"),
             )
-            .filter(AIResponse.timestamp >= cutoff_date)
-            .group_by(AIResponse.feature)
+            .filter(rollup.bucket >= cutoff)
+            .group_by(rollup.feature)
         )
         results = result.all()
-        print("DEBUG:", results)
 
         analytics = {"period_days": days, "features": {}}
         for row in results:
@@ -253,9 +276,38 @@ class AIResponseRepository:
                 "fallback_calls": row.fallback_count or 0,
                 "total_tokens": row.total_tokens or 0,
             }
-        print("DEBUG:", analytics)
         return analytics
 
+    async def rebuild_hourly_rollups(self, since: datetime) -> None:
+        """
+        Recompute the usage rollups for every hour from since onwards
+
+        The buckets are deleted and re-aggregated from ai_responses, so reruns
+        are idempotent and rows committed late are picked up. The caller
+        commits.
+
+        Args:
+            since: Start of the first hour to rebuild
+        """
+        bucket = hour_bucket(AIResponse.timestamp)
+        group = (bucket, AIResponse.feature, AIResponse.model_used, AIResponse.llm_used)
+
+        await self.db.execute(
+            delete(AIUsageRollupHourly).where(AIUsageRollupHourly.bucket >= since)
+        )
+        await self.db.execute(
+            insert(AIUsageRollupHourly).from_select(
+                ["bucket", "feature", "model_used", "llm_used", "call_count", "total_tokens"],
+                select(
+                    *group,
+                    func.count(),
+                    func.coalesce(func.sum(AIResponse.tokens_used), 0),
+                )
+                .filter(AIResponse.timestamp >= since)
+                .group_by(*group),
+            )
+        )
+
     async def delete_by_deal_id(self, deal_id: int) -> int:
         """
         Delete all AI responses for a deal
@@ -266,12 +318,7 @@ class AIResponseRepository:
         Returns:
             Number of records deleted
         """
-        result = await self.db.execute(select(AIResponse).filter(AIResponse.deal_id == deal_id))
-        responses_to_delete = result.scalars().all()
-        for response in responses_to_delete:
-            await self.db.delete(response)
-        await self.db.commit()
-        count = len(responses_to_delete)
+        count = await delete_in_chunks(self.db, AIResponse, AIResponse.deal_id == deal_id)
         logger.info(f"Deleted {count} AI responses for deal {deal_id}")
         return count
 
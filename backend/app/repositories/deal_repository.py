@@ -2,8 +2,10 @@
 Repository pattern for Deal operations
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.pagination import paginate
 from app.models.models import Deal, DealStatus
 from app.schemas.schemas import DealCreate, DealUpdate
 
@@ -18,51 +20,62 @@ NORMALIZE_STATUS = {
 class DealRepository:
     """Repository for Deal database operations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, deal_in: DealCreate) -> Deal:
+    async def create(self, deal_in: DealCreate) -> Deal:
         """Create a new deal"""
         # Use mode='json' to properly serialize enums to their string values
         deal = Deal(**deal_in.model_dump(mode="json"))
         if isinstance(deal_in.status, str):
             deal_in.status = NORMALIZE_STATUS.get(deal_in.status, DealStatus.IN_PROGRESS)
         self.db.add(deal)
-        self.db.commit()
-        self.db.refresh(deal)
+        await self.db.commit()
+        await self.db.refresh(deal)
         return deal
 
-    def get(self, deal_id: int) -> Deal | None:
+    async def get(self, deal_id: int) -> Deal | None:
         """Get a deal by ID"""
-        return self.db.query(Deal).filter(Deal.id == deal_id).first()
-
-    def get_all(self, skip: int = 0, limit: int = 100) -> list[Deal]:
-        """Get all deals with pagination"""
-        return self.db.query(Deal).offset(skip).limit(limit).all()
+        result = await self.db.execute(select(Deal).filter(Deal.id == deal_id))
+        return result.scalars().first()
+
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, cursor: str | None = None
+    ) -> list[Deal]:
+        """Get all deals, newest first, by cursor or offset"""
+        result = await self.db.execute(
+            paginate(select(Deal), Deal.created_at, Deal.id, cursor=cursor, skip=skip, limit=limit)
+        )
+        return result.scalars().all()
 
-    def get_by_status(self, status: str, skip: int = 0, limit: int = 100) -> list[Deal]:
+    async def get_by_status(self, status: str, skip: int = 0, limit: int = 100) -> list[Deal]:
         """Get deals by status"""
-        return self.db.query(Deal).filter(Deal.status == status).offset(skip).limit(limit).all()
+        result = await self.db.execute(
+            select(Deal).filter(Deal.status == status).offset(skip).limit(limit)
+        )
+        return result.scalars().all()
 
-    def get_by_email(self, email: str) -> list[Deal]:
+    async def get_by_email(self, email: str) -> list[Deal]:
         """Get deals by customer email"""
-        return self.db.query(Deal).filter(Deal.customer_email == email).all()
+        result = await self.db.execute(select(Deal).filter(Deal.customer_email == email))
+        return result.scalars().all()
 
-    def get_deal_by_vehicle_and_customer(
+    async def get_deal_by_vehicle_and_customer(
         self, vehicle_vin: str, customer_email: str
     ) -> Deal | None:
         """
         Get a deal by vehicle VIN and customer email.
         """
-        return (
-            self.db.query(Deal)
-            .filter(Deal.vehicle_vin == vehicle_vin, Deal.customer_email == customer_email)
-            .first()
+        result = await self.db.execute(
+            select(Deal).filter(
+                Deal.vehicle_vin == vehicle_vin, Deal.customer_email == customer_email
+            )
         )
+        return result.scalars().first()
 
-    def update(self, deal_id: int, deal_in: DealUpdate) -> Deal | None:
+    async def update(self, deal_id: int, deal_in: DealUpdate) -> Deal | None:
         """Update a deal"""
-        deal = self.get(deal_id)
+        deal = await self.get(deal_id)
         if not deal:
             return None
 
@@ -71,16 +84,16 @@ class DealRepository:
         for field, value in update_data.items():
             setattr(deal, field, value)
 
-        self.db.commit()
-        self.db.refresh(deal)
+        await self.db.commit()
+        await self.db.refresh(deal)
         return deal
 
-    def delete(self, deal_id: int) -> bool:
+    async def delete(self, deal_id: int) -> bool:
         """Delete a deal"""
-        deal = self.get(deal_id)
+        deal = await self.get(deal_id)
         if not deal:
             return False
 
-        self.db.delete(deal)
-        self.db.commit()
+        await self.db.delete(deal)
+        await self.db.commit()
         return True
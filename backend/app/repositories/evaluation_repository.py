@@ -2,7 +2,10 @@
 Repository pattern for DealEvaluation operations
 """
 
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.evaluation import DealEvaluation, EvaluationStatus, PipelineStep
 
@@ -10,10 +13,10 @@ from app.models.evaluation import DealEvaluation, EvaluationStatus, PipelineStep
 class EvaluationRepository:
     """Repository for DealEvaluation database operations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(
+    async def create(
         self,
         user_id: int,
         deal_id: int,
@@ -25,83 +28,108 @@ class EvaluationRepository:
             user_id=user_id, deal_id=deal_id, status=status, current_step=current_step
         )
         self.db.add(evaluation)
-        self.db.commit()
-        self.db.refresh(evaluation)
+        await self.db.commit()
+        await self.db.refresh(evaluation)
         return evaluation
 
-    def get(self, evaluation_id: int) -> DealEvaluation | None:
+    async def get(self, evaluation_id: int) -> DealEvaluation | None:
         """Get an evaluation by ID"""
-        return self.db.query(DealEvaluation).filter(DealEvaluation.id == evaluation_id).first()
+        result = await self.db.execute(
+            select(DealEvaluation).filter(DealEvaluation.id == evaluation_id)
+        )
+        return result.scalars().first()
 
-    def get_by_deal(self, deal_id: int) -> list[DealEvaluation]:
+    async def get_by_deal(self, deal_id: int) -> list[DealEvaluation]:
         """Get all evaluations for a deal"""
-        return self.db.query(DealEvaluation).filter(DealEvaluation.deal_id == deal_id).all()
+        result = await self.db.execute(
+            select(DealEvaluation).filter(DealEvaluation.deal_id == deal_id)
+        )
+        return result.scalars().all()
 
-    def get_latest_by_deal(self, deal_id: int) -> DealEvaluation | None:
+    async def get_latest_by_deal(self, deal_id: int) -> DealEvaluation | None:
         """Get the most recent evaluation for a deal"""
-        return (
-            self.db.query(DealEvaluation)
+        result = await self.db.execute(
+            select(DealEvaluation)
             .filter(DealEvaluation.deal_id == deal_id)
             .order_by(DealEvaluation.created_at.desc())
-            .first()
+            .limit(1)
         )
+        return result.scalars().first()
+
+    async def get_most_evaluated_deal_ids(self, limit: int = 10, days: int = 7) -> list[int]:
+        """Get IDs of the deals with the most evaluations started in the last N days"""
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        result = await self.db.execute(
+            select(DealEvaluation.deal_id, func.count().label("count"))
+            .filter(DealEvaluation.created_at >= cutoff_date)
+            .group_by(DealEvaluation.deal_id)
+            .order_by(func.count().desc())
+            .limit(limit)
+        )
+        return [row.deal_id for row in result.all()]
 
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> list[DealEvaluation]:
+    async def get_by_user(
+        self, user_id: int, skip: int = 0, limit: int = 100
+    ) -> list[DealEvaluation]:
         """Get all evaluations for a user with pagination"""
-        return (
-            self.db.query(DealEvaluation)
+        result = await self.db.execute(
+            select(DealEvaluation)
             .filter(DealEvaluation.user_id == user_id)
             .order_by(DealEvaluation.created_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
 
-    def update_status(self, evaluation_id: int, status: EvaluationStatus) -> DealEvaluation | None:
+    async def update_status(
+        self, evaluation_id: int, status: EvaluationStatus
+    ) -> DealEvaluation | None:
         """Update evaluation status"""
-        evaluation = self.get(evaluation_id)
+        evaluation = await self.get(evaluation_id)
         if not evaluation:
             return None
 
         evaluation.status = status
-        self.db.commit()
-        self.db.refresh(evaluation)
+        await self.db.commit()
+        await self.db.refresh(evaluation)
         return evaluation
 
-    def update_step(self, evaluation_id: int, current_step: PipelineStep) -> DealEvaluation | None:
+    async def update_step(
+        self, evaluation_id: int, current_step: PipelineStep
+    ) -> DealEvaluation | None:
         """Update evaluation current step"""
-        evaluation = self.get(evaluation_id)
+        evaluation = await self.get(evaluation_id)
         if not evaluation:
             return None
 
         evaluation.current_step = current_step
-        self.db.commit()
-        self.db.refresh(evaluation)
+        await self.db.commit()
+        await self.db.refresh(evaluation)
         return evaluation
 
-    def update_result(
+    async def update_result(
         self,
         evaluation_id: int,
         result_json: dict,
         status: EvaluationStatus | None = None,
     ) -> DealEvaluation | None:
         """Update evaluation result JSON and optionally status"""
-        evaluation = self.get(evaluation_id)
+        evaluation = await self.get(evaluation_id)
         if not evaluation:
             return None
 
         evaluation.result_json = result_json
         if status:
             evaluation.status = status
-        self.db.commit()
-        self.db.refresh(evaluation)
+        await self.db.commit()
+        await self.db.refresh(evaluation)
         return evaluation
 
-    def advance_step(
+    async def advance_step(
         self, evaluation_id: int, next_step: PipelineStep, step_result: dict
     ) -> DealEvaluation | None:
         """Advance to next step and update results"""
-        evaluation = self.get(evaluation_id)
+        evaluation = await self.get(evaluation_id)
         if not evaluation:
             return None
 
@@ -111,16 +139,16 @@ class EvaluationRepository:
 
         evaluation.current_step = next_step
         evaluation.result_json = result_json
-        self.db.commit()
-        self.db.refresh(evaluation)
+        await self.db.commit()
+        await self.db.refresh(evaluation)
         return evaluation
 
-    def delete(self, evaluation_id: int) -> bool:
+    async def delete(self, evaluation_id: int) -> bool:
         """Delete an evaluation"""
-        evaluation = self.get(evaluation_id)
+        evaluation = await self.get(evaluation_id)
         if not evaluation:
             return False
 
-        self.db.delete(evaluation)
-        self.db.commit()
+        await self.db.delete(evaluation)
+        await self.db.commit()
         return True
@@ -2,8 +2,10 @@
 Repository pattern for Favorite operations
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.pagination import paginate
 from app.models.models import Favorite
 from app.schemas.schemas import FavoriteCreate
 
@@ -11,58 +13,65 @@ from app.schemas.schemas import FavoriteCreate
 class FavoriteRepository:
     """Repository for Favorite database operations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, user_id: int, favorite_in: FavoriteCreate) -> Favorite:
+    async def create(self, user_id: int, favorite_in: FavoriteCreate) -> Favorite:
         """Create a new favorite for a user"""
         favorite = Favorite(user_id=user_id, **favorite_in.model_dump())
         self.db.add(favorite)
-        self.db.commit()
-        self.db.refresh(favorite)
+        await self.db.commit()
+        await self.db.refresh(favorite)
         return favorite
 
-    def get_by_id(self, favorite_id: int) -> Favorite | None:
+    async def get_by_id(self, favorite_id: int) -> Favorite | None:
         """Get a favorite by ID"""
-        return self.db.query(Favorite).filter(Favorite.id == favorite_id).first()
+        result = await self.db.execute(select(Favorite).filter(Favorite.id == favorite_id))
+        return result.scalars().first()
 
-    def get_by_user_and_vin(self, user_id: int, vin: str) -> Favorite | None:
+    async def get_by_user_and_vin(self, user_id: int, vin: str) -> Favorite | None:
         """Get a specific favorite by user ID and VIN"""
-        return (
-            self.db.query(Favorite).filter(Favorite.user_id == user_id, Favorite.vin == vin).first()
+        result = await self.db.execute(
+            select(Favorite).filter(Favorite.user_id == user_id, Favorite.vin == vin)
         )
+        return result.scalars().first()
 
-    def get_all_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> list[Favorite]:
-        """Get all favorites for a user with pagination"""
-        return (
-            self.db.query(Favorite)
-            .filter(Favorite.user_id == user_id)
-            .order_by(Favorite.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+    async def get_all_by_user(
+        self, user_id: int, skip: int = 0, limit: int | None = 100, cursor: str | None = None
+    ) -> list[Favorite]:
+        """Get favorites for a user, newest first, by cursor or offset (limit None: all)"""
+        result = await self.db.execute(
+            paginate(
+                select(Favorite).filter(Favorite.user_id == user_id),
+                Favorite.created_at,
+                Favorite.id,
+                cursor=cursor,
+                skip=skip,
+                limit=limit,
+            )
         )
+        return result.scalars().all()
 
-    def delete(self, favorite_id: int) -> bool:
+    async def delete(self, favorite_id: int) -> bool:
         """Delete a favorite by ID"""
-        favorite = self.get_by_id(favorite_id)
+        favorite = await self.get_by_id(favorite_id)
         if not favorite:
             return False
 
-        self.db.delete(favorite)
-        self.db.commit()
+        await self.db.delete(favorite)
+        await self.db.commit()
         return True
 
-    def delete_by_user_and_vin(self, user_id: int, vin: str) -> bool:
+    async def delete_by_user_and_vin(self, user_id: int, vin: str) -> bool:
         """Delete a favorite by user ID and VIN"""
-        favorite = self.get_by_user_and_vin(user_id, vin)
+        favorite = await self.get_by_user_and_vin(user_id, vin)
         if not favorite:
             return False
 
-        self.db.delete(favorite)
-        self.db.commit()
+        await self.db.delete(favorite)
+        await self.db.commit()
         return True
 
-    def exists(self, user_id: int, vin: str) -> bool:
+    async def exists(self, user_id: int, vin: str) -> bool:
         """Check if a favorite exists for a user and VIN"""
-        return self.get_by_user_and_vin(user_id, vin) is not None
+        return await self.get_by_user_and_vin(user_id, vin) is not None
@@ -4,8 +4,10 @@ Repository pattern for Negotiation operations
 
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.pagination import paginate
 from app.models.negotiation import (
     MessageRole,
     NegotiationMessage,
@@ -17,10 +19,10 @@ from app.models.negotiation import (
 class NegotiationRepository:
     """Repository for Negotiation database operations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_session(
+    async def create_session(
         self,
         user_id: int,
         deal_id: int,
@@ -35,61 +37,67 @@ class NegotiationRepository:
             current_round=1,
         )
         self.db.add(session)
-        self.db.commit()
-        self.db.refresh(session)
+        await self.db.commit()
+        await self.db.refresh(session)
         return session
 
-    def get_session(self, session_id: int) -> NegotiationSession | None:
+    async def get_session(self, session_id: int) -> NegotiationSession | None:
         """Get a negotiation session by ID"""
-        return self.db.query(NegotiationSession).filter(NegotiationSession.id == session_id).first()
+        result = await self.db.execute(
+            select(NegotiationSession).filter(NegotiationSession.id == session_id)
+        )
+        return result.scalars().first()
 
-    def get_sessions_by_user(
-        self, user_id: int, skip: int = 0, limit: int = 100
+    async def get_sessions_by_user(
+        self, user_id: int, skip: int = 0, limit: int = 100, cursor: str | None = None
     ) -> list[NegotiationSession]:
-        """Get all negotiation sessions for a user"""
-        return (
-            self.db.query(NegotiationSession)
-            .filter(NegotiationSession.user_id == user_id)
-            .order_by(NegotiationSession.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        """Get negotiation sessions for a user, newest first, by cursor or offset"""
+        result = await self.db.execute(
+            paginate(
+                select(NegotiationSession).filter(NegotiationSession.user_id == user_id),
+                NegotiationSession.created_at,
+                NegotiationSession.id,
+                cursor=cursor,
+                skip=skip,
+                limit=limit,
+            )
         )
+        return result.scalars().all()
 
-    def get_sessions_by_deal(self, deal_id: int) -> list[NegotiationSession]:
+    async def get_sessions_by_deal(self, deal_id: int) -> list[NegotiationSession]:
         """Get all negotiation sessions for a deal"""
-        return (
-            self.db.query(NegotiationSession)
+        result = await self.db.execute(
+            select(NegotiationSession)
             .filter(NegotiationSession.deal_id == deal_id)
             .order_by(NegotiationSession.created_at.desc())
-            .all()
         )
+        return result.scalars().all()
 
-    def update_session_status(
+    async def update_session_status(
         self, session_id: int, status: NegotiationStatus
     ) -> NegotiationSession | None:
         """Update the status of a negotiation session"""
-        session = self.get_session(session_id)
+        session = await self.get_session(session_id)
         if not session:
             return None
 
         session.status = status
-        self.db.commit()
-        self.db.refresh(session)
+        await self.db.commit()
+        await self.db.refresh(session)
         return session
 
-    def increment_round(self, session_id: int) -> NegotiationSession | None:
+    async def increment_round(self, session_id: int) -> NegotiationSession | None:
         """Increment the current round of a negotiation session"""
-        session = self.get_session(session_id)
+        session = await self.get_session(session_id)
         if not session:
             return None
 
         session.current_round += 1
-        self.db.commit()
-        self.db.refresh(session)
+        await self.db.commit()
+        await self.db.refresh(session)
         return session
 
-    def add_message(
+    async def add_message(
         self,
         session_id: int,
         role: MessageRole,
@@ -106,38 +114,39 @@ class NegotiationRepository:
             message_metadata=metadata,
         )
         self.db.add(message)
-        self.db.commit()
-        self.db.refresh(message)
+        await self.db.commit()
+        await self.db.refresh(message)
         return message
 
-    def get_messages(
+    async def get_messages(
         self, session_id: int, skip: int = 0, limit: int = 1000
     ) -> list[NegotiationMessage]:
         """Get all messages for a negotiation session"""
-        return (
-            self.db.query(NegotiationMessage)
+        result = await self.db.execute(
+            select(NegotiationMessage)
             .filter(NegotiationMessage.session_id == session_id)
             .order_by(NegotiationMessage.created_at.asc())
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return result.scalars().all()
 
-    def get_latest_message(self, session_id: int) -> NegotiationMessage | None:
+    async def get_latest_message(self, session_id: int) -> NegotiationMessage | None:
         """Get the latest message in a negotiation session"""
-        return (
-            self.db.query(NegotiationMessage)
+        result = await self.db.execute(
+            select(NegotiationMessage)
             .filter(NegotiationMessage.session_id == session_id)
             .order_by(NegotiationMessage.created_at.desc(), NegotiationMessage.id.desc())
-            .first()
+            .limit(1)
         )
+        return result.scalars().first()
 
-    def delete_session(self, session_id: int) -> bool:
+    async def delete_session(self, session_id: int) -> bool:
         """Delete a negotiation session (cascade deletes messages)"""
-        session = self.get_session(session_id)
+        session = await self.get_session(session_id)
         if not session:
             return False
 
-        self.db.delete(session)
-        self.db.commit()
+        await self.db.delete(session)
+        await self.db.commit()
         return True
@@ -2,16 +2,19 @@
 Repository for saved search operations in PostgreSQL
 """
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from datetime import datetime
 
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.pagination import paginate
 from app.models.models import SavedSearch
 
 
 class SavedSearchRepository:
     """Repository for managing saved searches"""
 
-    def create(self, db: Session, user_id: int, search_data: dict) -> SavedSearch:
+    async def create(self, db: AsyncSession, user_id: int, search_data: dict) -> SavedSearch:
         """
         Create a new saved search
 
@@ -25,11 +28,11 @@ class SavedSearchRepository:
         """
         saved_search = SavedSearch(user_id=user_id, **search_data)
         db.add(saved_search)
-        db.commit()
-        db.refresh(saved_search)
+        await db.commit()
+        await db.refresh(saved_search)
         return saved_search
 
-    def get_by_id(self, db: Session, search_id: int, user_id: int) -> SavedSearch | None:
+    async def get_by_id(self, db: AsyncSession, search_id: int, user_id: int) -> SavedSearch | None:
         """
         Get a saved search by ID
 
@@ -41,37 +44,47 @@ class SavedSearchRepository:
         Returns:
             Optional[SavedSearch]: Saved search or None
         """
-        return (
-            db.query(SavedSearch)
-            .filter(and_(SavedSearch.id == search_id, SavedSearch.user_id == user_id))
-            .first()
+        result = await db.execute(
+            select(SavedSearch).filter(
+                and_(SavedSearch.id == search_id, SavedSearch.user_id == user_id)
+            )
         )
-
-    def get_user_searches(
-        self, db: Session, user_id: int, skip: int = 0, limit: int = 100
+        return result.scalars().first()
+
+    async def get_user_searches(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
     ) -> list[SavedSearch]:
         """
-        Get all saved searches for a user
+        Get saved searches for a user, newest first
 
         Args:
             db: Database session
             user_id: User ID
-            skip: Number of records to skip
+            skip: Number of records to skip (offset pagination)
             limit: Maximum number of records to return
+            cursor: Cursor from the previous page; takes precedence over skip
 
         Returns:
             list[SavedSearch]: List of saved searches
         """
-        return (
-            db.query(SavedSearch)
-            .filter(SavedSearch.user_id == user_id)
-            .order_by(SavedSearch.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        result = await db.execute(
+            paginate(
+                select(SavedSearch).filter(SavedSearch.user_id == user_id),
+                SavedSearch.created_at,
+                SavedSearch.id,
+                cursor=cursor,
+                skip=skip,
+                limit=limit,
+            )
         )
+        return result.scalars().all()
 
-    def count_user_searches(self, db: Session, user_id: int) -> int:
+    async def count_user_searches(self, db: AsyncSession, user_id: int) -> int:
         """
         Count total saved searches for a user
 
@@ -82,10 +95,13 @@ class SavedSearchRepository:
         Returns:
             int: Total count
         """
-        return db.query(SavedSearch).filter(SavedSearch.user_id == user_id).count()
+        result = await db.execute(
+            select(func.count()).select_from(SavedSearch).filter(SavedSearch.user_id == user_id)
+        )
+        return result.scalar_one()
 
-    def update(
-        self, db: Session, search_id: int, user_id: int, update_data: dict
+    async def update(
+        self, db: AsyncSession, search_id: int, user_id: int, update_data: dict
     ) -> SavedSearch | None:
         """
         Update a saved search
@@ -99,7 +115,7 @@ class SavedSearchRepository:
         Returns:
             Optional[SavedSearch]: Updated saved search or None
         """
-        saved_search = self.get_by_id(db, search_id, user_id)
+        saved_search = await self.get_by_id(db, search_id, user_id)
         if not saved_search:
             return None
 
@@ -107,11 +123,11 @@ class SavedSearchRepository:
             if value is not None and hasattr(saved_search, key):
                 setattr(saved_search, key, value)
 
-        db.commit()
-        db.refresh(saved_search)
+        await db.commit()
+        await db.refresh(saved_search)
         return saved_search
 
-    def delete(self, db: Session, search_id: int, user_id: int) -> bool:
+    async def delete(self, db: AsyncSession, search_id: int, user_id: int) -> bool:
         """
         Delete a saved search
 
@@ -123,16 +139,16 @@ class SavedSearchRepository:
         Returns:
             bool: True if deleted, False if not found
         """
-        saved_search = self.get_by_id(db, search_id, user_id)
+        saved_search = await self.get_by_id(db, search_id, user_id)
         if not saved_search:
             return False
 
-        db.delete(saved_search)
-        db.commit()
+        await db.delete(saved_search)
+        await db.commit()
         return True
 
-    def update_new_matches_count(
-        self, db: Session, search_id: int, count: int
+    async def update_new_matches_count(
+        self, db: AsyncSession, search_id: int, count: int
     ) -> SavedSearch | None:
         """
         Update the new matches count for a saved search
@@ -145,17 +161,16 @@ class SavedSearchRepository:
         Returns:
             Optional[SavedSearch]: Updated saved search or None
         """
-        saved_search = db.query(SavedSearch).filter(SavedSearch.id == search_id).first()
+        result = await db.execute(select(SavedSearch).filter(SavedSearch.id == search_id))
+        saved_search = result.scalars().first()
         if not saved_search:
             return None
 
         saved_search.new_matches_count = count
-        from datetime import datetime
-
         saved_search.last_checked = datetime.utcnow()
 
-        db.commit()
-        db.refresh(saved_search)
+        await db.commit()
+        await db.refresh(saved_search)
         return saved_search
 
 
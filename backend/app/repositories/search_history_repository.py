@@ -3,13 +3,16 @@ Repository for search history operations in PostgreSQL
 Previously used MongoDB, now using PostgreSQL JSONB
 """
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import delete, desc, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.jsonb_data import SearchHistory
+from app.db.bulk import delete_in_chunks
+from app.db.pagination import paginate
+from app.db.time_buckets import hour_bucket, hour_start
+from app.models.jsonb_data import SearchHistory, SearchRollupHourly
 
 
 class SearchHistoryRepository:
@@ -53,25 +56,29 @@ class SearchHistoryRepository:
         return record
 
     async def get_user_history(
-        self, user_id: int, limit: int = 50, skip: int = 0
+        self, user_id: int, limit: int = 50, skip: int = 0, cursor: str | None = None
     ) -> list[SearchHistory]:
         """
-        Get search history for a user
+        Get search history for a user, newest first
 
         Args:
             user_id: User ID
             limit: Maximum number of records to return
-            skip: Number of records to skip (for pagination)
+            skip: Number of records to skip (offset pagination)
+            cursor: Cursor from the previous page; takes precedence over skip
 
         Returns:
             List of search history records
         """
         result = await self.db.execute(
-            select(SearchHistory)
-            .filter(SearchHistory.user_id == user_id)
-            .order_by(desc(SearchHistory.timestamp))
-            .offset(skip)
-            .limit(limit)
+            paginate(
+                select(SearchHistory).filter(SearchHistory.user_id == user_id),
+                SearchHistory.timestamp,
+                SearchHistory.id,
+                cursor=cursor,
+                skip=skip,
+                limit=limit,
+            )
         )
         return result.scalars().all()
 
@@ -79,6 +86,10 @@ class SearchHistoryRepository:
         """
         Get popular search criteria from recent history
 
+        Reads the hourly rollups, so the cost depends on the number of
+        make/model pairs rather than on search volume. The window starts on
+        an hour boundary and lags by up to one rollup refresh.
+
         Args:
             limit: Maximum number of results
             days: Number of days to look back
@@ -86,21 +97,16 @@ class SearchHistoryRepository:
         Returns:
             List of popular search patterns
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        cutoff = hour_start(datetime.now(UTC) - timedelta(days=days))
 
-        # Query for popular make/model combinations
-        # Note: PostgreSQL JSONB queries use ->> for text extraction
         result = await self.db.execute(
             select(
-                SearchHistory.search_criteria["make"].astext.label("make"),
-                SearchHistory.search_criteria["model"].astext.label("model"),
-                func.count().label("count"),
-            )
-            .filter(SearchHistory.timestamp >= cutoff_date)
-            .group_by(
-                SearchHistory.search_criteria["make"].astext,
-                SearchHistory.search_criteria["model"].astext,
+                SearchRollupHourly.make,
+                SearchRollupHourly.model,
+                func.sum(SearchRollupHourly.search_count).label("count"),
             )
+            .filter(SearchRollupHourly.bucket >= cutoff)
+            .group_by(SearchRollupHourly.make, SearchRollupHourly.model)
             .order_by(desc("count"))
             .limit(limit)
         )
@@ -115,6 +121,32 @@ class SearchHistoryRepository:
             for row in results
         ]
 
+    async def rebuild_hourly_rollups(self, since: datetime) -> None:
+        """
+        Recompute the make/model rollups for every hour from since onwards
+
+        The buckets are deleted and re-aggregated from search_history, so
+        reruns are idempotent and rows committed late are picked up. The
+        caller commits.
+
+        Args:
+            since: Start of the first hour to rebuild
+        """
+        # Note: PostgreSQL JSONB queries use ->> for text extraction
+        bucket = hour_bucket(SearchHistory.timestamp)
+        make = SearchHistory.search_criteria["make"].astext
+        model = SearchHistory.search_criteria["model"].astext
+
+        await self.db.execute(delete(SearchRollupHourly).where(SearchRollupHourly.bucket >= since))
+        await self.db.execute(
+            insert(SearchRollupHourly).from_select(
+                ["bucket", "make", "model", "search_count"],
+                select(bucket, make, model, func.count())
+                .filter(SearchHistory.timestamp >= since)
+                .group_by(bucket, make, model),
+            )
+        )
+
     async def delete_user_history(self, user_id: int) -> int:
         """
         Delete all search history for a user
@@ -125,14 +157,7 @@ class SearchHistoryRepository:
         Returns:
             Number of records deleted
         """
-        result = await self.db.execute(
-            select(SearchHistory).filter(SearchHistory.user_id == user_id)
-        )
-        history_to_delete = result.scalars().all()
-        for history in history_to_delete:
-            await self.db.delete(history)
-        await self.db.commit()
-        return len(history_to_delete)
+        return await delete_in_chunks(self.db, SearchHistory, SearchHistory.user_id == user_id)
 
 
 # Factory function to create repository with db session
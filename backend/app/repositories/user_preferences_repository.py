@@ -8,6 +8,7 @@ from datetime import UTC, datetime, timedelta
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.bulk import delete_in_chunks
 from app.models.jsonb_data import UserPreference
 
 
@@ -164,11 +165,6 @@ class UserPreferencesRepository:
             Number of records deleted
         """
         cutoff_date = datetime.now(UTC) - timedelta(days=days)
-        result = await self.db.execute(
-            select(UserPreference).filter(UserPreference.created_at < cutoff_date)
+        return await delete_in_chunks(
+            self.db, UserPreference, UserPreference.created_at < cutoff_date
         )
-        preferences_to_delete = result.scalars().all()
-        for pref in preferences_to_delete:
-            await self.db.delete(pref)
-        await self.db.commit()
-        return len(preferences_to_delete)
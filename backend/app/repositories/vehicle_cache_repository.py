@@ -1,20 +1,242 @@
+"""
+Repository for the local vehicle listing index in PostgreSQL
+Every listing fetched from MarketCheck is upserted here by VIN so that repeat
+searches can be answered locally while the data is fresh
+"""
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.vehicle_cache import VehicleCache
 
 
+def _lower(value: Any) -> str | None:
+    return value.lower() if isinstance(value, str) and value else None
+
+
+def _to_int(value: Any) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
 class VehicleCacheRepository:
+    """Repository for the VIN-keyed listing index"""
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    @staticmethod
+    def _filter_columns(data: dict[str, Any]) -> dict[str, Any]:
+        """Extract the indexed filter columns from a parsed listing"""
+        return {
+            "make": _lower(data.get("make")),
+            "model": _lower(data.get("model")),
+            "year": _to_int(data.get("year")),
+            "price": _to_float(data.get("price")),
+            "mileage": _to_int(data.get("mileage")),
+            "inventory_type": _lower(data.get("inventory_type")),
+        }
+
+    def _upsert_statement(self, rows: dict[str, dict[str, Any]], now: datetime):
+        """
+        Build a single INSERT ... ON CONFLICT (vin) DO UPDATE for parsed listings
+
+        New VINs get first_seen_at and last_seen_at set to now; known VINs have
+        their data refreshed and last_seen_at bumped, so concurrent ingests of
+        the same new VIN cannot collide on the primary key. A known VIN whose
+        price differs gets price_changed_at set to now, and the statement
+        returns (vin, price_changed) for every row.
+        """
+        statement = insert(VehicleCache).values(
+            [
+                {
+                    "vin": vin,
+                    "listing": dict(data),
+                    "first_seen_at": now,
+                    "last_seen_at": now,
+                    **self._filter_columns(data),
+                }
+                for vin, data in rows.items()
+            ]
+        )
+        excluded = statement.excluded
+        price_changed = VehicleCache.price.is_distinct_from(excluded.price)
+        return statement.on_conflict_do_update(
+            index_elements=[VehicleCache.vin],
+            set_={
+                "make": excluded.make,
+                "model": excluded.model,
+                "year": excluded.year,
+                "price": excluded.price,
+                "mileage": excluded.mileage,
+                "inventory_type": excluded.inventory_type,
+                "listing": excluded.listing,
+                "last_seen_at": excluded.last_seen_at,
+                "price_changed_at": case(
+                    (price_changed, excluded.last_seen_at), else_=VehicleCache.price_changed_at
+                ),
+            },
+        ).returning(VehicleCache.vin, (VehicleCache.price_changed_at == now).label("changed"))
+
     async def add_or_update(self, vehicle_id: str, data: dict) -> VehicleCache:
-        """Add or update a vehicle cache entry"""
-        pass
+        """
+        Add or update a vehicle cache entry
+
+        Args:
+            vehicle_id: VIN of the listing
+            data: Parsed listing (see MarketCheckAPIClient.parse_listing)
+
+        Returns:
+            VehicleCache: Stored entry
+        """
+        await self.db.execute(self._upsert_statement({vehicle_id: data}, datetime.now(UTC)))
+        await self.db.commit()
+        return await self.db.get(VehicleCache, vehicle_id, populate_existing=True)
+
+    async def upsert_listings(
+        self, listings: list[dict[str, Any]], price_changes: set[str] | None = None
+    ) -> int:
+        """
+        Ingest a batch of parsed listings with one upsert statement
+
+        Listings without a VIN are skipped.
+
+        Args:
+            listings: Parsed listings
+            price_changes: If given, VINs of known listings whose price changed are added to it
+
+        Returns:
+            Number of listings stored
+        """
+        by_vin = {listing["vin"]: listing for listing in listings if listing.get("vin")}
+        if not by_vin:
+            return 0
+
+        result = await self.db.execute(self._upsert_statement(by_vin, datetime.now(UTC)))
+        changed = {row.vin for row in result.all() if row.changed}
+        await self.db.commit()
+        if price_changes is not None:
+            price_changes.update(changed)
+        return len(by_vin)
 
     async def get(self, vehicle_id: str) -> VehicleCache | None:
         """Retrieve a vehicle cache entry by ID"""
-        pass
+        return await self.db.get(VehicleCache, vehicle_id)
+
+    @staticmethod
+    def _filter_listings(
+        query,
+        make: str | None = None,
+        model: str | None = None,
+        car_type: str | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        max_mileage: int | None = None,
+        max_age_seconds: int | None = None,
+    ):
+        """Apply search filters to a query over VehicleCache"""
+        if make:
+            query = query.filter(VehicleCache.make == make.lower())
+        if model:
+            query = query.filter(VehicleCache.model == model.lower())
+        if car_type:
+            query = query.filter(VehicleCache.inventory_type == car_type.lower())
+        if min_price:
+            query = query.filter(VehicleCache.price >= min_price)
+        if max_price:
+            query = query.filter(VehicleCache.price <= max_price)
+        if min_year:
+            query = query.filter(VehicleCache.year >= min_year)
+        if max_year:
+            query = query.filter(VehicleCache.year <= max_year)
+        if max_mileage:
+            query = query.filter(VehicleCache.mileage <= max_mileage)
+        if max_age_seconds is not None:
+            cutoff = datetime.now(UTC) - timedelta(seconds=max_age_seconds)
+            query = query.filter(VehicleCache.last_seen_at >= cutoff)
+        return query
+
+    async def search(
+        self,
+        make: str | None = None,
+        model: str | None = None,
+        car_type: str | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        max_mileage: int | None = None,
+        max_age_seconds: int | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """
+        Find stored listings matching search filters
+
+        Uses the same filter semantics as MarketCheckAPIClient.search_cars.
+
+        Args:
+            make: Vehicle make (case-insensitive)
+            model: Vehicle model (case-insensitive)
+            car_type: Inventory type ('new', 'used', 'certified')
+            min_price: Minimum price
+            max_price: Maximum price
+            min_year: Minimum year
+            max_year: Maximum year
+            max_mileage: Maximum mileage
+            max_age_seconds: Only return listings seen within this many seconds
+            limit: Maximum number of listings to return
+
+        Returns:
+            Parsed listings, most recently seen first
+        """
+        query = self._filter_listings(
+            select(VehicleCache.listing),
+            make=make,
+            model=model,
+            car_type=car_type,
+            min_price=min_price,
+            max_price=max_price,
+            min_year=min_year,
+            max_year=max_year,
+            max_mileage=max_mileage,
+            max_age_seconds=max_age_seconds,
+        )
+
+        result = await self.db.execute(
+            query.order_by(VehicleCache.last_seen_at.desc(), VehicleCache.vin).limit(limit)
+        )
+        return [dict(listing) for listing in result.scalars().all()]
+
+    async def count(self, **filters: Any) -> int:
+        """
+        Count stored listings matching search filters
+
+        Args:
+            **filters: Same filters as search, without limit
+
+        Returns:
+            Number of matching listings
+        """
+        query = self._filter_listings(select(func.count()).select_from(VehicleCache), **filters)
+        result = await self.db.execute(query)
+        return result.scalar_one()
 
     async def remove(self, vehicle_id: str) -> None:
         """Delete a vehicle cache entry"""
-        pass
+        await self.db.execute(delete(VehicleCache).filter(VehicleCache.vin == vehicle_id))
+        await self.db.commit()
@@ -24,7 +24,7 @@ class UserPreferenceInput(BaseModel):
         None, description="User's specific priorities or preferences"
     )
     max_results: int | None = Field(
-        None, description="Maximum number of results to analyze", ge=1, le=100
+        None, description="Maximum number of results to analyze", ge=1, le=500
     )
 
     @model_validator(mode="after")
@@ -100,6 +100,9 @@ class CarRecommendationResponse(BaseModel):
         default_factory=list, description="List of recommended vehicles"
     )
     total_found: int = Field(default=0, description="Total number of vehicles found")
+    total_found_is_estimate: bool = Field(
+        default=False, description="Whether total_found is approximate"
+    )
     total_analyzed: int = Field(default=0, description="Total number of vehicles analyzed")
     search_criteria: dict = Field(default_factory=dict, description="Search criteria used")
     message: str | None = Field(None, description="Additional message or information")
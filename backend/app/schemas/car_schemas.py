@@ -19,7 +19,12 @@ class CarSearchRequest(BaseModel):
     user_priorities: str | None = Field(
         None, description="User's specific priorities or preferences"
     )
-    max_results: int = Field(50, description="Maximum number of results to return", ge=1, le=100)
+    max_results: int | None = Field(
+        None,
+        description="Maximum number of listings to analyze (default: MAX_SEARCH_RESULTS)",
+        ge=1,
+        le=500,
+    )
 
 
 class SearchCriteria(BaseModel):
@@ -73,5 +78,6 @@ class CarSearchResponse(BaseModel):
     search_criteria: SearchCriteria
     top_vehicles: list[VehicleRecommendation]
     total_found: int = 0
+    total_found_is_estimate: bool = False
     total_analyzed: int = 0
     message: str | None = None
@@ -70,6 +70,7 @@ class SavedSearchList(BaseModel):
 
     searches: list[SavedSearchResponse]
     total: int
+    next_cursor: str | None = None  # Pass back as `cursor` for the next page
 
 
 class VehicleComparisonRequest(BaseModel):
@@ -0,0 +1,264 @@
+"""
+Cache warming for popular searches and hot deal evaluations
+Replays the most common recent searches and the most active deal evaluations
+through the normal cache-fill path before peak hours, within a per-run budget
+of MarketCheck and LLM calls.
+"""
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from app.core.config import settings
+from app.db.redis import redis_client
+from app.db.session import AsyncSessionLocal
+from app.llm.llm_client import llm_client
+from app.repositories.deal_repository import DealRepository
+from app.repositories.evaluation_repository import EvaluationRepository
+from app.repositories.search_history_repository import SearchHistoryRepository
+from app.services.car_recommendation_service import (
+    _normalize_text,
+    car_recommendation_service,
+)
+from app.services.deal_evaluation_service import deal_evaluation_service
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "cache_warmer:lock"
+
+
+@dataclass
+class WarmingBudget:
+    """Remaining external calls a warming run may spend"""
+
+    marketcheck_calls: int
+    llm_calls: int
+
+    def try_spend(self, marketcheck_calls: int = 0, llm_calls: int = 0) -> bool:
+        """Reserve calls if the budget allows, otherwise leave it unchanged"""
+        if marketcheck_calls > self.marketcheck_calls or llm_calls > self.llm_calls:
+            return False
+        self.marketcheck_calls -= marketcheck_calls
+        self.llm_calls -= llm_calls
+        return True
+
+
+@dataclass
+class WarmingReport:
+    """Outcome of one warming run"""
+
+    searches_warmed: int = 0
+    evaluations_warmed: int = 0
+    already_cached: int = 0
+    skipped_for_budget: int = 0
+    failed: int = 0
+    duration_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+
+class CacheWarmer:
+    """
+    Pre-populates search and evaluation caches
+
+    Each entry that is not already fresh is charged a conservative estimate
+    of the calls it can make (all MarketCheck pages plus one LLM ranking for a
+    search, one LLM call for an evaluation) before it runs, so a run never
+    exceeds its budget even when every entry misses every cache tier.
+    """
+
+    def __init__(
+        self,
+        top_searches: int,
+        top_deals: int,
+        lookback_days: int,
+        max_marketcheck_calls: int,
+        max_llm_calls: int,
+        run_hour_utc: int,
+    ):
+        """
+        Initialize cache warmer
+
+        Args:
+            top_searches: Number of popular make/model searches to warm
+            top_deals: Number of most active deals whose evaluations are warmed
+            lookback_days: History window for popularity
+            max_marketcheck_calls: MarketCheck request budget per run
+            max_llm_calls: LLM request budget per run
+            run_hour_utc: Hour of day (UTC) at which the scheduled run starts
+        """
+        self.top_searches = top_searches
+        self.top_deals = top_deals
+        self.lookback_days = lookback_days
+        self.max_marketcheck_calls = max_marketcheck_calls
+        self.max_llm_calls = max_llm_calls
+        self.run_hour_utc = run_hour_utc
+        self.instance_id = uuid.uuid4().hex
+        self._task: asyncio.Task | None = None
+
+    def _search_cost(self) -> tuple[int, int]:
+        """Worst-case (MarketCheck, LLM) calls for one default-filter search"""
+        pages = math.ceil(settings.MAX_SEARCH_RESULTS / settings.MARKET_CHECK_PAGE_SIZE)
+        return pages, 1 if llm_client.is_available() else 0
+
+    async def _popular_searches(self) -> list[tuple[str | None, str | None]]:
+        """Top make/model pairs, normalized and de-duplicated"""
+        async with AsyncSessionLocal() as db_session:
+            repo = SearchHistoryRepository(db_session)
+            # Over-fetch since case variants of one search are grouped separately
+            popular = await repo.get_popular_searches(
+                limit=self.top_searches * 2, days=self.lookback_days
+            )
+
+        searches: list[tuple[str | None, str | None]] = []
+        for row in popular:
+            pair = (_normalize_text(row["make"]), _normalize_text(row["model"]))
+            if pair == (None, None) or pair in searches:
+                continue
+            searches.append(pair)
+            if len(searches) >= self.top_searches:
+                break
+        return searches
+
+    async def _warm_searches(self, budget: WarmingBudget, report: WarmingReport) -> None:
+        searches = await self._popular_searches()
+        marketcheck_cost, llm_cost = self._search_cost()
+
+        async with AsyncSessionLocal() as db_session:
+            for make, model in searches:
+                try:
+                    if await car_recommendation_service.has_fresh_result(make, model):
+                        report.already_cached += 1
+                        continue
+                    if not budget.try_spend(marketcheck_calls=marketcheck_cost, llm_calls=llm_cost):
+                        report.skipped_for_budget += 1
+                        continue
+                    await car_recommendation_service.warm_search(make, model, db_session)
+                    report.searches_warmed += 1
+                except Exception as e:
+                    report.failed += 1
+                    report.errors.append(f"search {make}/{model}: {e}")
+                    logger.error(f"Cache warming failed for search {make}/{model}: {e}")
+
+    async def _warm_evaluations(self, budget: WarmingBudget, report: WarmingReport) -> None:
+        llm_cost = 1 if llm_client.is_available() else 0
+
+        async with AsyncSessionLocal() as db_session:
+            evaluation_repo = EvaluationRepository(db_session)
+            deal_repo = DealRepository(db_session)
+            targets: list[tuple[int, dict[str, Any]]] = []
+            for deal_id in await evaluation_repo.get_most_evaluated_deal_ids(
+                limit=self.top_deals, days=self.lookback_days
+            ):
+                deal = await deal_repo.get(deal_id)
+                evaluation = await evaluation_repo.get_latest_by_deal(deal_id)
+                if deal is not None and evaluation is not None:
+                    args = deal_evaluation_service.price_evaluation_args(
+                        deal, evaluation.result_json
+                    )
+                    targets.append((deal_id, args))
+
+        for deal_id, args in targets:
+            try:
+                if await deal_evaluation_service.has_cached_evaluation(**args):
+                    report.already_cached += 1
+                    continue
+                if not budget.try_spend(llm_calls=llm_cost):
+                    report.skipped_for_budget += 1
+                    continue
+                await deal_evaluation_service.evaluate_deal(**args, deal_id=deal_id)
+                report.evaluations_warmed += 1
+            except Exception as e:
+                report.failed += 1
+                report.errors.append(f"evaluation {args['vehicle_vin']}: {e}")
+                logger.error(f"Cache warming failed for evaluation {args['vehicle_vin']}: {e}")
+
+    async def run_once(self) -> WarmingReport:
+        """
+        Warm popular searches, then hot deal evaluations
+
+        Returns:
+            WarmingReport with counts of warmed, skipped and failed entries
+        """
+        start = time.perf_counter()
+        budget = WarmingBudget(
+            marketcheck_calls=self.max_marketcheck_calls, llm_calls=self.max_llm_calls
+        )
+        report = WarmingReport()
+
+        for step in (self._warm_searches, self._warm_evaluations):
+            try:
+                await step(budget, report)
+            except Exception as e:
+                report.errors.append(str(e))
+                logger.error(f"Cache warming step {step.__name__} failed: {e}")
+
+        report.duration_seconds = time.perf_counter() - start
+        logger.info(
+            f"Cache warming finished in {report.duration_seconds:.1f}s: "
+            f"{report.searches_warmed} searches, {report.evaluations_warmed} evaluations warmed, "
+            f"{report.already_cached} already cached, "
+            f"{report.skipped_for_budget} skipped for budget, {report.failed} failed"
+        )
+        return report
+
+    async def _acquire_run_lock(self) -> bool:
+        """Let a single replica warm per scheduled run"""
+        try:
+            client = redis_client.get_client()
+        except RuntimeError:
+            return True
+        if client is None:
+            return True
+        try:
+            return bool(await client.set(LOCK_KEY, self.instance_id, nx=True, ex=3600))
+        except Exception as e:
+            logger.warning(f"Could not take cache warming lock, warming anyway: {e}")
+            return True
+
+    def seconds_until_next_run(self, now: datetime | None = None) -> float:
+        """Seconds from now until the next run_hour_utc"""
+        now = now or datetime.now(UTC)
+        next_run = now.replace(hour=self.run_hour_utc, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.seconds_until_next_run())
+            try:
+                if await self._acquire_run_lock():
+                    await self.run_once()
+                else:
+                    logger.info("Cache warming already running on another replica")
+            except Exception as e:
+                logger.error(f"Scheduled cache warming failed: {e}")
+
+    def start(self) -> None:
+        """Schedule the daily warming run (called from the application lifespan)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+            logger.info(f"Cache warming scheduled daily at {self.run_hour_utc:02d}:00 UTC")
+
+    async def stop(self) -> None:
+        """Cancel the scheduled warming task"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Singleton instance
+cache_warmer = CacheWarmer(
+    top_searches=settings.CACHE_WARMER_TOP_SEARCHES,
+    top_deals=settings.CACHE_WARMER_TOP_DEALS,
+    lookback_days=settings.CACHE_WARMER_LOOKBACK_DAYS,
+    max_marketcheck_calls=settings.CACHE_WARMER_MAX_MARKETCHECK_CALLS,
+    max_llm_calls=settings.CACHE_WARMER_MAX_LLM_CALLS,
+    run_hour_utc=settings.CACHE_WARMER_HOUR_UTC,
+)
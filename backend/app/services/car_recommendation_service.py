@@ -3,35 +3,88 @@ Car Recommendation Service with LLM Integration
 Enhanced with caching, rate limiting, retry logic, search history, and webhooks
 """
 
+import asyncio
 import hashlib
+import heapq
 import json
 import logging
-import os
+import math
+import time
+from collections.abc import AsyncIterator
 from typing import Any
 
 from tenacity import (
     before_sleep_log,
     retry,
     retry_if_exception_type,
+    retry_if_not_exception_type,
     stop_after_attempt,
     wait_exponential,
 )
 
 from app.core.config import settings
-from app.db.redis import redis_client
+from app.core.single_flight import SingleFlight
+from app.core.upstream_guard import UpstreamGuard, UpstreamUnavailableError
+from app.db.cache import cache, jittered_ttl, vin_tag
+from app.db.disk_cache import market_data_cache
+from app.db.session import AsyncSessionLocal
 from app.llm import generate_structured_json
 from app.llm.llm_client import llm_client
 from app.llm.schemas import CarSelectionResponse
+from app.metrics import cache_hits, cache_misses
 from app.repositories.ai_response_repository import AIResponseRepository
 from app.repositories.search_history_repository import SearchHistoryRepository
+from app.repositories.vehicle_cache_repository import VehicleCacheRepository
 from app.repositories.webhook_repository import WebhookRepository
 from app.services.webhook_service import webhook_service
 from app.tools.marketcheck_client import marketcheck_client
 
 logger = logging.getLogger(__name__)
 
-# Cache TTL in seconds (15 minutes)
-CACHE_TTL = 900
+# Cache TTLs in seconds. Results younger than CACHE_TTL are fresh; between
+# CACHE_TTL and CACHE_STALE_TTL they are served immediately while a background
+# task refreshes them; after CACHE_STALE_TTL Redis drops them.
+CACHE_TTL = 900  # Soft TTL (15 minutes)
+CACHE_STALE_TTL = 3600  # Hard TTL (1 hour)
+
+# Listing fetches are shared across users and priorities; ranges are widened to
+# these bucket sizes so near-identical searches reuse the same MarketCheck pull
+LISTINGS_CACHE_TTL = 900
+PRICE_BUCKET = 1000
+MILEAGE_BUCKET = 5000
+WIDENED_FILTERS = ("min_price", "max_price", "max_mileage")
+
+# cache_name labels for the cache_hits/cache_misses counters
+RESULTS_CACHE_NAME = "car_search_results"
+LISTINGS_CACHE_NAME = "car_search_listings"
+LISTING_INDEX_CACHE_NAME = "vehicle_listing_index"
+
+# Concurrent identical searches share one MarketCheck call and LLM ranking
+search_single_flight = SingleFlight("car_search")
+
+# Searches that found nothing are cached briefly so new inventory shows up soon
+NEGATIVE_CACHE_TTL = 120
+# After MarketCheck fails, other callers fail fast for this long while one probes
+FAILURE_CACHE_TTL = 30
+marketcheck_guard = UpstreamGuard("marketcheck", failure_ttl=FAILURE_CACHE_TTL)
+
+# Background stale-while-revalidate refreshes in flight, by cache key
+_background_refreshes: dict[str, asyncio.Task] = {}
+
+
+def _normalize_text(value: str | None) -> str | None:
+    """Case-fold and collapse whitespace so equivalent inputs compare equal"""
+    if not value:
+        return None
+    return " ".join(value.split()).casefold() or None
+
+
+def _bucket_down(value: int | None, size: int) -> int | None:
+    return (value // size) * size if value else None
+
+
+def _bucket_up(value: int | None, size: int) -> int | None:
+    return -(-value // size) * size if value else None
 
 
 class CarRecommendationService:
@@ -54,7 +107,11 @@ class CarRecommendationService:
         max_results: int | None = None,
     ) -> str:
         """
-        Generate a cache key for search parameters
+        Generate the ranking-level cache key for search parameters
+
+        Text inputs are case-folded and whitespace-collapsed, so "Toyota" and
+        " toyota " or priorities differing only in spacing share a key. Numeric
+        filters stay exact because they decide which listings are eligible.
 
         Args:
             Search parameters
@@ -64,15 +121,15 @@ class CarRecommendationService:
         """
         # Create a consistent string representation of search params
         params = {
-            "make": make,
-            "model": model,
+            "make": _normalize_text(make),
+            "model": _normalize_text(model),
             "budget_min": budget_min,
             "budget_max": budget_max,
-            "car_type": car_type,
+            "car_type": _normalize_text(car_type),
             "year_min": year_min,
             "year_max": year_max,
             "mileage_max": mileage_max,
-            "user_priorities": user_priorities,
+            "user_priorities": _normalize_text(user_priorities),
             "max_results": max_results,
         }
         # Sort keys for consistency
@@ -81,81 +138,279 @@ class CarRecommendationService:
         hash_obj = hashlib.md5(params_str.encode())
         return f"car_search:{hash_obj.hexdigest()}"
 
-    async def _get_cached_result(self, cache_key: str) -> dict[str, Any] | None:
+    def _listing_fetch_params(
+        self,
+        make: str | None,
+        model: str | None,
+        car_type: str | None,
+        budget_min: int | None,
+        budget_max: int | None,
+        year_min: int | None,
+        year_max: int | None,
+        mileage_max: int | None,
+    ) -> dict[str, Any]:
+        """
+        Build normalized MarketCheck filters for the shared listing fetch
+
+        Price and mileage ranges are widened outward to bucket boundaries, so
+        the fetched set is a superset of what the exact search needs; results
+        are narrowed back with _matches_filters.
         """
-        Get cached search result from Redis
+        return {
+            "make": _normalize_text(make),
+            "model": _normalize_text(model),
+            "car_type": _normalize_text(car_type),
+            "min_price": _bucket_down(budget_min, PRICE_BUCKET),
+            "max_price": _bucket_up(budget_max, PRICE_BUCKET),
+            "min_year": year_min,
+            "max_year": year_max,
+            "max_mileage": _bucket_up(mileage_max, MILEAGE_BUCKET),
+        }
+
+    def _generate_listing_key(self, fetch_params: dict[str, Any], rows: int) -> str:
+        """
+        Generate the listing-level cache key, shared across users and priorities
 
         Args:
-            cache_key: Cache key
+            fetch_params: Output of _listing_fetch_params
+            rows: Number of listings fetched
 
         Returns:
-            Cached result or None
+            Cache key string
         """
-        client = redis_client.get_client()
-        if not client:
-            return None
+        params_str = json.dumps({**fetch_params, "rows": rows}, sort_keys=True)
+        hash_obj = hashlib.md5(params_str.encode())
+        return f"car_listings:{hash_obj.hexdigest()}"
+
+    def _matches_filters(self, listing: dict[str, Any], search_params: dict[str, Any]) -> bool:
+        """
+        Check a parsed listing against exact search filters
 
+        Fields missing from the listing do not exclude it, matching how the
+        listing was already accepted by MarketCheck's own filtering.
+        """
+
+        def text_matches(value: Any, wanted: str | None) -> bool:
+            return not wanted or value is None or _normalize_text(str(value)) == wanted
+
+        if not text_matches(listing.get("make"), _normalize_text(search_params.get("make"))):
+            return False
+        if not text_matches(listing.get("model"), _normalize_text(search_params.get("model"))):
+            return False
+        if not text_matches(
+            listing.get("inventory_type"), _normalize_text(search_params.get("car_type"))
+        ):
+            return False
+
+        for field, low_key, high_key in (
+            ("price", "min_price", "max_price"),
+            ("year", "min_year", "max_year"),
+            ("mileage", None, "max_mileage"),
+        ):
+            value = listing.get(field)
+            if value is None:
+                continue
+            low = search_params.get(low_key) if low_key else None
+            high = search_params.get(high_key)
+            if low and value < low:
+                return False
+            if high and value > high:
+                return False
+        return True
+
+    async def _get_cached_listings(self, listing_key: str) -> dict[str, Any] | None:
+        """
+        Get a cached listing fetch
+
+        Returns:
+            Dictionary with num_found and parsed listings, or None
+        """
         try:
-            cached_data = await client.get(cache_key)
+            cached_data = await cache.get(listing_key)
             if cached_data:
+                return cached_data
+        except Exception as e:
+            logger.error(f"Error reading listings from cache: {e}")
+
+        return None
+
+    async def _set_cached_listings(
+        self, listing_key: str, num_found: int, listings: list[dict[str, Any]]
+    ) -> None:
+        """Cache a listing fetch (empty fetches only briefly)"""
+        try:
+            payload = {"num_found": num_found, "listings": listings}
+            ttl = LISTINGS_CACHE_TTL if listings else jittered_ttl(NEGATIVE_CACHE_TTL)
+            await cache.set(listing_key, payload, ex=ttl)
+            logger.info(f"Cached {len(listings)} listings with key: {listing_key}")
+        except Exception as e:
+            logger.error(f"Error writing listings to cache: {e}")
+
+    async def _get_cached_entry(self, cache_key: str) -> tuple[dict[str, Any], float] | None:
+        """
+        Get cached search result and its age
+
+        Args:
+            cache_key: Cache key
+
+        Returns:
+            Tuple of (result, age in seconds) or None
+        """
+        try:
+            entry = await cache.get(cache_key)
+            if entry:
                 logger.info(f"Cache hit for key: {cache_key}")
-                return json.loads(cached_data)
+                if "cached_at" in entry and "result" in entry:
+                    return entry["result"], max(0.0, time.time() - entry["cached_at"])
+                # Entry written before cached_at was recorded; treat as fresh
+                return entry, 0.0
         except Exception as e:
             logger.error(f"Error reading from cache: {e}")
 
         return None
 
-    async def _set_cached_result(self, cache_key: str, result: dict[str, Any]) -> None:
+    async def _get_cached_result(
+        self, cache_key: str, max_age: float | None = None
+    ) -> dict[str, Any] | None:
         """
-        Cache search result in Redis
+        Get cached search result
 
         Args:
             cache_key: Cache key
-            result: Result to cache
+            max_age: Only return results younger than this many seconds
+
+        Returns:
+            Cached result or None
         """
-        client = redis_client.get_client()
-        if not client:
-            return
+        entry = await self._get_cached_entry(cache_key)
+        if entry is None:
+            return None
+        result, age = entry
+        if max_age is not None and age >= max_age:
+            return None
+        return result
+
+    async def _set_cached_result(
+        self,
+        cache_key: str,
+        result: dict[str, Any],
+        ttl: int | None = None,
+        cached_at: float | None = None,
+    ) -> None:
+        """
+        Cache search result
 
+        Args:
+            cache_key: Cache key
+            result: Result to cache
+            ttl: Hard expiry in seconds (defaults to CACHE_STALE_TTL; shorter
+                TTLs expire before the entry is ever served stale)
+            cached_at: When the result was computed (defaults to now); kept
+                when promoting an older entry from the disk cache
+        """
         try:
-            await client.setex(cache_key, CACHE_TTL, json.dumps(result))
-            logger.info(f"Cached result with key: {cache_key}, TTL: {CACHE_TTL}s")
+            entry = {
+                "cached_at": time.time() if cached_at is None else cached_at,
+                "result": result,
+            }
+            # Tag by the VINs shown so a price change of any of them drops the result
+            tags = [
+                vin_tag(vehicle["vin"])
+                for vehicle in result.get("top_vehicles", [])
+                if vehicle.get("vin")
+            ]
+            await cache.set(cache_key, entry, ex=ttl or CACHE_STALE_TTL, tags=tags)
+            logger.info(
+                f"Cached result with key: {cache_key}, "
+                f"TTL: {CACHE_TTL}s fresh / {ttl or CACHE_STALE_TTL}s hard"
+            )
         except Exception as e:
             logger.error(f"Error writing to cache: {e}")
 
-    def _get_file_cache_path(self, cache_key: str) -> str:
-        """Get path for file cache"""
-        cache_dir = "market_data_cache"
-        if not os.path.exists(cache_dir):
-            os.makedirs(cache_dir)
-        # Sanitize key for filename
-        filename = cache_key.replace(":", "_") + ".json"
-        return os.path.join(cache_dir, filename)
-
-    def _get_from_file_cache(self, cache_key: str) -> dict[str, Any] | None:
-        """Get cached result from file system"""
+    def _schedule_refresh(self, cache_key: str, compute) -> bool:
+        """
+        Refresh a stale cache entry in the background
+
+        At most one refresh runs per key in this process; across workers the
+        refresh goes through search_single_flight, so only one worker calls
+        MarketCheck while the others see the refreshed entry.
+
+        Args:
+            cache_key: Cache key being refreshed
+            compute: Coroutine factory that recomputes and re-caches the result
+
+        Returns:
+            True if a new refresh was started, False if one was already running
+        """
+        if cache_key in _background_refreshes:
+            return False
+
+        async def refresh() -> None:
+            try:
+                await search_single_flight.do(
+                    cache_key,
+                    compute,
+                    cache_lookup=lambda: self._get_cached_result(cache_key, max_age=CACHE_TTL),
+                )
+                logger.info(f"Background refresh completed for key: {cache_key}")
+            except Exception as e:
+                logger.error(f"Background refresh failed for key {cache_key}: {e}")
+            finally:
+                _background_refreshes.pop(cache_key, None)
+
+        _background_refreshes[cache_key] = asyncio.create_task(refresh())
+        return True
+
+    async def _get_from_file_cache(
+        self, cache_key: str
+    ) -> tuple[dict[str, Any], float, int] | None:
+        """
+        Get cached result from the persistent disk cache
+
+        Returns:
+            Tuple of (result, age in seconds, hard TTL) or None if missing or
+            past its hard TTL
+        """
         try:
-            file_path = self._get_file_cache_path(cache_key)
-            if os.path.exists(file_path):
-                with open(file_path) as f:
-                    logger.info(f"Loaded data from file cache: {file_path}")
-                    return json.load(f)
+            entry = await market_data_cache.get(cache_key)
+            if entry is None:
+                return None
+            if "cached_at" not in entry or "result" not in entry:
+                # Written before ages were recorded; it may be days old, so
+                # it cannot be checked against the soft/hard TTLs
+                return None
+            age = max(0.0, time.time() - entry["cached_at"])
+            hard_ttl = min(entry.get("ttl", CACHE_STALE_TTL), CACHE_STALE_TTL)
+            if age >= hard_ttl:
+                return None
+            logger.info(f"Loaded data from disk cache: {cache_key}")
+            return entry["result"], age, hard_ttl
         except Exception as e:
-            logger.error(f"Error reading file cache: {e}")
+            logger.error(f"Error reading disk cache: {e}")
         return None
 
-    def _save_to_file_cache(self, cache_key: str, data: dict[str, Any]) -> None:
-        """Save result to file system"""
+    async def _save_to_file_cache(
+        self, cache_key: str, data: dict[str, Any], ttl: int | None = None
+    ) -> None:
+        """
+        Save result to the persistent disk cache
+
+        Stored with the same cached_at envelope and hard TTL as the Redis entry,
+        so a result promoted back from disk keeps its age.
+        """
         try:
-            file_path = self._get_file_cache_path(cache_key)
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2)
-            logger.info(f"Saved data to file cache: {file_path}")
+            ttl = ttl or CACHE_STALE_TTL
+            entry = {"cached_at": time.time(), "ttl": ttl, "result": data}
+            await market_data_cache.set(cache_key, entry, ex=ttl)
+            logger.info(f"Saved data to disk cache: {cache_key}")
         except Exception as e:
-            logger.error(f"Error writing file cache: {e}")
+            logger.error(f"Error writing disk cache: {e}")
 
     @retry(
-        retry=retry_if_exception_type((ConnectionError, TimeoutError)),
+        retry=(
+            retry_if_exception_type((ConnectionError, TimeoutError))
+            & retry_if_not_exception_type(UpstreamUnavailableError)
+        ),
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
         before_sleep=before_sleep_log(logger, logging.WARNING),
@@ -171,10 +426,15 @@ class CarRecommendationService:
         max_year: int | None = None,
         max_mileage: int | None = None,
         rows: int = 10,
+        start: int = 0,
     ) -> dict[str, Any]:
         """
         Search MarketCheck API with retry logic for transient errors
 
+        Transient failures are recorded in marketcheck_guard, so while
+        MarketCheck is failing only one caller (the probe) keeps retrying and
+        the rest fail fast with UpstreamUnavailableError, which is not retried.
+
         Args:
             Search parameters
 
@@ -183,19 +443,162 @@ class CarRecommendationService:
 
         Raises:
             Exception after 3 failed attempts
+            UpstreamUnavailableError: If a recent failure is cached and another
+                caller is already probing
         """
+        probe = await marketcheck_guard.before_call()
         logger.info("Calling MarketCheck API (with retry logic)")
-        return await marketcheck_client.search_cars(
-            make=make,
-            model=model,
-            car_type=car_type,
-            min_price=min_price,
-            max_price=max_price,
-            min_year=min_year,
-            max_year=max_year,
-            max_mileage=max_mileage,
-            rows=rows,
+        try:
+            response = await marketcheck_client.search_cars(
+                make=make,
+                model=model,
+                car_type=car_type,
+                min_price=min_price,
+                max_price=max_price,
+                min_year=min_year,
+                max_year=max_year,
+                max_mileage=max_mileage,
+                rows=rows,
+                start=start,
+            )
+        except (ConnectionError, TimeoutError):
+            # Includes MarketCheckServerError (5xx/429), so a failing upstream
+            # is cached and probed just like an unreachable one
+            await marketcheck_guard.record_failure()
+            raise
+        await marketcheck_guard.record_success(probe)
+        return response
+
+    async def _iter_marketcheck_pages(
+        self,
+        rows: int,
+        **search_params: Any,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Page through MarketCheck results, yielding each page as soon as it arrives
+
+        The first page is fetched alone to learn num_found; the remaining pages
+        are then fetched concurrently (bounded by MARKET_CHECK_MAX_CONCURRENT_PAGES)
+        and yielded in completion order. A failure on the first page propagates;
+        failures on later pages are logged and skipped so partial results are
+        still ranked.
+
+        Args:
+            rows: Total number of listings wanted across all pages
+            **search_params: Filters passed to _search_marketcheck_with_retry
+
+        Yields:
+            Raw API responses, one per page
+        """
+        page_size = max(1, min(settings.MARKET_CHECK_PAGE_SIZE, rows))
+        first_page = await self._search_marketcheck_with_retry(
+            rows=page_size, start=0, **search_params
         )
+        yield first_page
+
+        total = min(rows, first_page.get("num_found", 0) or 0)
+        offsets = list(range(page_size, total, page_size))
+        if not offsets:
+            return
+
+        semaphore = asyncio.Semaphore(max(1, settings.MARKET_CHECK_MAX_CONCURRENT_PAGES))
+
+        async def fetch_page(offset: int) -> dict[str, Any] | None:
+            async with semaphore:
+                try:
+                    return await self._search_marketcheck_with_retry(
+                        rows=min(page_size, total - offset), start=offset, **search_params
+                    )
+                except Exception as e:
+                    logger.warning(f"MarketCheck page at offset {offset} failed, skipping: {e}")
+                    return None
+
+        tasks = [asyncio.create_task(fetch_page(offset)) for offset in offsets]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                page = await next_page
+                if page is not None:
+                    yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _search_local_index(
+        self, db_session, rows: int, search_params: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], int] | None:
+        """
+        Look up fresh listings matching the search in the local listing index
+
+        Args:
+            db_session: Async database session (the index is skipped without one)
+            rows: Maximum number of listings wanted
+            search_params: Filters in MarketCheckAPIClient.search_cars form
+
+        Returns:
+            Tuple of (parsed listings, total fresh matches in the index), or
+            None if the index cannot answer the search and MarketCheck must be
+            queried
+        """
+        if not settings.LISTING_INDEX_ENABLED or db_session is None:
+            return None
+
+        filters = {**search_params, "max_age_seconds": settings.LISTING_INDEX_MAX_AGE_SECONDS}
+        repo = VehicleCacheRepository(db_session)
+        try:
+            listings = await repo.search(**filters, limit=rows)
+            # Only count separately when the listings were cut off at rows
+            total = await repo.count(**filters) if len(listings) >= rows else len(listings)
+        except Exception as e:
+            logger.error(f"Error querying local listing index: {e}")
+            return None
+
+        if len(listings) < min(rows, settings.LISTING_INDEX_MIN_RESULTS):
+            logger.info(
+                f"Local listing index has {len(listings)} fresh matches, querying MarketCheck"
+            )
+            return None
+
+        logger.info(f"Answered search from local listing index ({len(listings)} of {total})")
+        return listings, total
+
+    async def _index_listings(self, db_session, listings: list[dict[str, Any]]) -> None:
+        """Store fetched listings in the local listing index"""
+        if not settings.LISTING_INDEX_ENABLED or db_session is None or not listings:
+            return
+
+        price_changes: set[str] = set()
+        try:
+            count = await VehicleCacheRepository(db_session).upsert_listings(
+                listings, price_changes=price_changes
+            )
+            logger.info(f"Indexed {count} listings locally")
+        except Exception as e:
+            logger.error(f"Error writing to local listing index: {e}")
+            try:
+                await db_session.rollback()
+            except Exception:
+                pass
+            return
+
+        if price_changes:
+            await self.invalidate_vehicles(price_changes)
+
+    async def invalidate_vehicles(self, vins: set[str] | list[str]) -> None:
+        """
+        Drop cached search results and evaluations that show any of the given VINs
+
+        Args:
+            vins: VINs whose listing changed (e.g. a price drop)
+        """
+        keys = await cache.invalidate_tags(*(vin_tag(vin) for vin in vins))
+        # The disk cache would otherwise repopulate the dropped search results
+        for key in keys:
+            if key.startswith("car_search:"):
+                try:
+                    await market_data_cache.delete(key)
+                except Exception as e:
+                    logger.error(f"Error deleting {key} from disk cache: {e}")
+        logger.info(f"Listing changes for {len(vins)} VINs invalidated {len(keys)} cache entries")
 
     async def _trigger_webhooks(self, vehicles: list[dict[str, Any]], db_session=None) -> None:
         """
@@ -216,7 +619,7 @@ class CarRecommendationService:
             # Process each vehicle
             for vehicle in vehicles:
                 # Find matching subscriptions
-                matching_subs = webhook_repo.get_matching_subscriptions(
+                matching_subs = await webhook_repo.get_matching_subscriptions(
                     make=vehicle.get("make"),
                     model=vehicle.get("model"),
                     price=vehicle.get("price"),
@@ -234,7 +637,7 @@ class CarRecommendationService:
 
                     # Update subscription statuses
                     for sub in matching_subs:
-                        webhook_repo.update(sub.id, {"last_triggered": datetime.utcnow()})
+                        await webhook_repo.update(sub.id, {"last_triggered": datetime.utcnow()})
 
         except Exception as e:
             logger.error(f"Error triggering webhooks: {e}")
@@ -291,11 +694,32 @@ class CarRecommendationService:
             max_results,
         )
 
-        # Multi-tier cache strategy: Redis (fast) → File (persistent fallback)
-        # Check Redis cache first (fast, in-memory)
-        cached_result = await self._get_cached_result(cache_key)
+        search_kwargs = {
+            "cache_key": cache_key,
+            "make": make,
+            "model": model,
+            "budget_min": budget_min,
+            "budget_max": budget_max,
+            "car_type": car_type,
+            "year_min": year_min,
+            "year_max": year_max,
+            "mileage_max": mileage_max,
+            "user_priorities": user_priorities,
+            "rows": rows,
+        }
+
+        # Multi-tier cache strategy: L1/Redis (fast) → Disk (persistent fallback)
+        # Check the shared cache first (in-process L1, then Redis)
+        cached_entry = await self._get_cached_entry(cache_key)
+        cached_result = cached_entry[0] if cached_entry else None
         if cached_result:
-            logger.info("Cache hit from Redis")
+            logger.info("Cache hit from shared cache")
+            cache_hits.labels(cache_name=RESULTS_CACHE_NAME).inc()
+            if cached_entry[1] >= CACHE_TTL:
+                # Stale: serve it now and refresh in the background. The request's
+                # db session closes with the response, so the refresh opens its own.
+                logger.info(f"Serving stale result ({cached_entry[1]:.0f}s old), refreshing")
+                self._schedule_refresh(cache_key, lambda: self._refresh_search(**search_kwargs))
             # Log to search history even for cached results
             if db_session and user_id:
                 try:
@@ -311,12 +735,23 @@ class CarRecommendationService:
 
             return cached_result
 
-        # Check file cache as fallback (persistent storage to avoid API costs)
-        file_cached_result = self._get_from_file_cache(cache_key)
-        if file_cached_result:
-            logger.info("Cache hit from file cache, updating Redis for faster subsequent access")
-            # Update Redis cache for faster subsequent access
-            await self._set_cached_result(cache_key, file_cached_result)
+        # Check disk cache as fallback (persistent storage to avoid API costs)
+        file_entry = await self._get_from_file_cache(cache_key)
+        if file_entry:
+            file_cached_result, age, hard_ttl = file_entry
+            logger.info("Cache hit from disk cache, updating Redis for faster subsequent access")
+            cache_hits.labels(cache_name=RESULTS_CACHE_NAME).inc()
+            # Update Redis cache for faster subsequent access, keeping the
+            # original age so the entry goes stale and expires on schedule
+            await self._set_cached_result(
+                cache_key,
+                file_cached_result,
+                ttl=math.ceil(hard_ttl - age),
+                cached_at=time.time() - age,
+            )
+            if age >= CACHE_TTL:
+                logger.info(f"Serving stale disk result ({age:.0f}s old), refreshing")
+                self._schedule_refresh(cache_key, lambda: self._refresh_search(**search_kwargs))
 
             # Log to history even for file cached results
             if db_session and user_id:
@@ -332,27 +767,102 @@ class CarRecommendationService:
                     logger.error(f"Error logging file cached search to history: {e}")
             return file_cached_result
 
-        # Search MarketCheck API with retry logic
-        try:
-            api_response = await self._search_marketcheck_with_retry(
-                make=make,
-                model=model,
-                car_type=car_type,
-                min_price=budget_min,
-                max_price=budget_max,
-                min_year=year_min,
-                max_year=year_max,
-                max_mileage=mileage_max,
-                rows=rows,  # Use configurable limit for LLM analysis
-            )
-        except Exception as e:
-            logger.error(f"MarketCheck API failed after retries: {e}")
-            raise
+        cache_misses.labels(cache_name=RESULTS_CACHE_NAME).inc()
+
+        # Coalesce concurrent identical searches (in-process and across workers)
+        # so N simultaneous cache misses produce a single MarketCheck call and LLM ranking.
+        # The shared computation outlives the leader request, whose db session
+        # closes when it disconnects, so it opens its own session
+        search = self._refresh_search if db_session is not None else self._search_and_rank
+        result = await search_single_flight.do(
+            cache_key,
+            lambda: search(**search_kwargs, user_id=user_id),
+            cache_lookup=lambda: self._get_cached_result(cache_key, max_age=CACHE_TTL),
+        )
 
-        # Parse listings
-        listings = api_response.get("listings", [])
-        num_found = api_response.get("num_found", 0)
+        # Log to search history for every caller, including coalesced ones
+        if db_session and user_id:
+            try:
+                repo = SearchHistoryRepository(db_session)
+                await repo.create_search_record(
+                    user_id=user_id,
+                    search_criteria=result.get("search_criteria", {}),
+                    result_count=result.get("total_found", 0),
+                    top_vehicles=result.get("top_vehicles", []),
+                )
+            except Exception as e:
+                logger.error(f"Error logging search to history: {e}")
 
+        return result
+
+    async def has_fresh_result(self, make: str | None, model: str | None) -> bool:
+        """Check whether a make/model search with default filters is cached and fresh"""
+        cache_key = self._generate_cache_key(make, model)
+        return await self._get_cached_result(cache_key, max_age=CACHE_TTL) is not None
+
+    async def warm_search(self, make: str | None, model: str | None, db_session=None) -> None:
+        """
+        Populate the cache for a make/model search with default filters
+
+        Used by the cache warmer. Runs the same fetch, index and ranking path as
+        a user search but without history logging, so later searches with
+        narrower filters can also be answered from the listing cache and index.
+        """
+        cache_key = self._generate_cache_key(make, model)
+        search_kwargs = {
+            "cache_key": cache_key,
+            "make": make,
+            "model": model,
+            "budget_min": None,
+            "budget_max": None,
+            "car_type": None,
+            "year_min": None,
+            "year_max": None,
+            "mileage_max": None,
+            "user_priorities": None,
+            "rows": settings.MAX_SEARCH_RESULTS,
+        }
+        await search_single_flight.do(
+            cache_key,
+            lambda: self._search_and_rank(**search_kwargs, db_session=db_session),
+            cache_lookup=lambda: self._get_cached_result(cache_key, max_age=CACHE_TTL),
+        )
+
+    async def _refresh_search(self, **search_kwargs: Any) -> dict[str, Any]:
+        """
+        Recompute a search using a dedicated db session
+
+        Used for background refreshes and coalesced searches, which can outlive
+        the request (and db session) that started them.
+        """
+        async with AsyncSessionLocal() as db_session:
+            return await self._search_and_rank(**search_kwargs, db_session=db_session)
+
+    async def _search_and_rank(
+        self,
+        cache_key: str,
+        make: str | None,
+        model: str | None,
+        budget_min: int | None,
+        budget_max: int | None,
+        car_type: str | None,
+        year_min: int | None,
+        year_max: int | None,
+        mileage_max: int | None,
+        user_priorities: str | None,
+        rows: int,
+        user_id: int | None = None,
+        db_session=None,
+    ) -> dict[str, Any]:
+        """
+        Fetch listings from MarketCheck, rank them and populate the caches
+
+        Runs at most once per cache key at a time (see search_single_flight).
+        Webhooks are triggered here so a coalesced burst fires them only once.
+
+        Returns:
+            Search result dictionary (also written to Redis and disk cache)
+        """
         search_criteria = self._build_search_criteria(
             make,
             model,
@@ -364,35 +874,119 @@ class CarRecommendationService:
             mileage_max,
         )
 
-        if not listings:
+        # Parse and pre-score listings page by page as they arrive, keeping only
+        # the best candidates so LLM input stays bounded however many pages we read
+        pool_size = max(1, settings.LLM_CANDIDATE_POOL_SIZE)
+        candidates: list[tuple[float, int, dict[str, Any]]] = []
+        num_found = 0
+        total_analyzed = 0
+
+        def consider(parsed: dict[str, Any]) -> None:
+            nonlocal total_analyzed
+            if not self._matches_filters(parsed, search_params):
+                return
+            entry = (self._score_listing(parsed), -total_analyzed, parsed)
+            total_analyzed += 1
+            if len(candidates) < pool_size:
+                heapq.heappush(candidates, entry)
+            else:
+                heapq.heappushpop(candidates, entry)
+
+        search_params = {
+            "make": make,
+            "model": model,
+            "car_type": car_type,
+            "min_price": budget_min,
+            "max_price": budget_max,
+            "min_year": year_min,
+            "max_year": year_max,
+            "max_mileage": mileage_max,
+        }
+
+        # Listing fetches are shared across priorities and near-identical ranges
+        fetch_params = self._listing_fetch_params(
+            make, model, car_type, budget_min, budget_max, year_min, year_max, mileage_max
+        )
+        listing_key = self._generate_listing_key(fetch_params, rows)
+
+        widened = any(fetch_params[name] != search_params[name] for name in WIDENED_FILTERS)
+        # Whether every listing in the fetched range was seen; None for the index
+        fetch_complete: bool | None = None
+        local_result: tuple[list[dict[str, Any]], int] | None = None
+
+        cached_listings = await self._get_cached_listings(listing_key)
+        if cached_listings is not None:
+            cache_hits.labels(cache_name=LISTINGS_CACHE_NAME).inc()
+            logger.info(f"Listings cache hit for key: {listing_key}")
+            num_found = cached_listings.get("num_found", 0)
+            listings = cached_listings.get("listings", [])
+            fetch_complete = len(listings) >= num_found
+            for parsed in listings:
+                consider(parsed)
+        else:
+            cache_misses.labels(cache_name=LISTINGS_CACHE_NAME).inc()
+
+            # Answer from the local listing index when it holds enough fresh matches
+            local_result = await self._search_local_index(db_session, rows, search_params)
+            if local_result is not None:
+                cache_hits.labels(cache_name=LISTING_INDEX_CACHE_NAME).inc()
+                local_listings, num_found = local_result
+                for parsed in local_listings:
+                    consider(parsed)
+            else:
+                if settings.LISTING_INDEX_ENABLED and db_session is not None:
+                    cache_misses.labels(cache_name=LISTING_INDEX_CACHE_NAME).inc()
+                fetched: list[dict[str, Any]] = []
+                try:
+                    async for page in self._iter_marketcheck_pages(
+                        rows=rows,  # Use configurable limit for LLM analysis
+                        **fetch_params,
+                    ):
+                        num_found = max(num_found, page.get("num_found", 0) or 0)
+                        for listing in page.get("listings", []):
+                            parsed = marketcheck_client.parse_listing(listing)
+                            fetched.append(parsed)
+                            consider(parsed)
+                except Exception as e:
+                    logger.error(f"MarketCheck API failed after retries: {e}")
+                    raise
+
+                await self._set_cached_listings(listing_key, num_found, fetched)
+                await self._index_listings(db_session, fetched)
+                fetch_complete = len(fetched) >= num_found
+
+        # num_found is MarketCheck's count for the fetch filters. Once a price or
+        # mileage bound was widened to its bucket it includes listings this
+        # search excludes: exact when the whole widened range was fetched and
+        # filtered, otherwise reported as an estimate rather than paying for
+        # another MarketCheck call
+        # The index only holds listings already seen on MarketCheck, so its
+        # count of fresh matches is a lower bound on MarketCheck's total
+        total_found_is_estimate = local_result is not None
+        if widened and fetch_complete is not None:
+            if fetch_complete:
+                num_found = total_analyzed
+            else:
+                total_found_is_estimate = True
+
+        if not candidates:
             result = {
                 "search_criteria": search_criteria,
                 "top_vehicles": [],
                 "total_found": num_found,
+                "total_found_is_estimate": total_found_is_estimate,
                 "message": "No vehicles found matching your criteria.",
             }
 
-            # Cache empty result
-            await self._set_cached_result(cache_key, result)
-            self._save_to_file_cache(cache_key, result)
-
-            # Log to history
-            if db_session and user_id:
-                try:
-                    repo = SearchHistoryRepository(db_session)
-                    await repo.create_search_record(
-                        user_id=user_id,
-                        search_criteria=search_criteria,
-                        result_count=0,
-                        top_vehicles=[],
-                    )
-                except Exception as e:
-                    logger.error(f"Error logging search to history: {e}")
+            # Cache empty result briefly (negative cache)
+            ttl = jittered_ttl(NEGATIVE_CACHE_TTL)
+            await self._set_cached_result(cache_key, result, ttl=ttl)
+            await self._save_to_file_cache(cache_key, result, ttl=ttl)
 
             return result
 
-        # Parse listings to standardized format
-        parsed_listings = [marketcheck_client.parse_listing(listing) for listing in listings]
+        # Best candidates first, ties kept in arrival order
+        parsed_listings = [entry[2] for entry in sorted(candidates, reverse=True)]
 
         # Get LLM recommendations
         if llm_client.is_available():
@@ -407,25 +1001,13 @@ class CarRecommendationService:
             "search_criteria": search_criteria,
             "top_vehicles": top_vehicles[:5],  # Limit to top 5
             "total_found": num_found,
-            "total_analyzed": len(listings),
+            "total_found_is_estimate": total_found_is_estimate,
+            "total_analyzed": total_analyzed,
         }
 
         # Cache result
         await self._set_cached_result(cache_key, result)
-        self._save_to_file_cache(cache_key, result)
-
-        # Log to search history
-        if db_session and user_id:
-            try:
-                repo = SearchHistoryRepository(db_session)
-                await repo.create_search_record(
-                    user_id=user_id,
-                    search_criteria=search_criteria,
-                    result_count=num_found,
-                    top_vehicles=top_vehicles[:5],
-                )
-            except Exception as e:
-                logger.error(f"Error logging search to history: {e}")
+        await self._save_to_file_cache(cache_key, result)
 
         # Trigger webhooks for new vehicles
         try:
@@ -606,35 +1188,7 @@ class CarRecommendationService:
         scored_listings = []
 
         for listing in listings:
-            score = 5.0  # Base score
-
-            # Bonus for clean title
-            if listing.get("carfax_clean_title"):
-                score += 1.0
-
-            # Bonus for single owner
-            if listing.get("carfax_1_owner"):
-                score += 0.5
-
-            # Bonus for lower mileage (relative)
-            mileage = listing.get("mileage") or 999999
-            if mileage < 30000:
-                score += 1.5
-            elif mileage < 50000:
-                score += 1.0
-            elif mileage < 75000:
-                score += 0.5
-
-            # Bonus for newer cars
-            year = listing.get("year") or 2000
-            if year >= 2023:
-                score += 1.5
-            elif year >= 2020:
-                score += 1.0
-            elif year >= 2018:
-                score += 0.5
-
-            listing["recommendation_score"] = round(score, 1)
+            listing["recommendation_score"] = round(self._score_listing(listing), 1)
             listing["highlights"] = self._generate_fallback_highlights(listing)
             listing["recommendation_summary"] = "Good option based on condition and features."
             scored_listings.append(listing)
@@ -643,6 +1197,38 @@ class CarRecommendationService:
         scored_listings.sort(key=lambda x: x["recommendation_score"], reverse=True)
         return scored_listings[:5]
 
+    def _score_listing(self, listing: dict[str, Any]) -> float:
+        """Score a listing on price-independent condition signals (0-10 scale)"""
+        score = 5.0  # Base score
+
+        # Bonus for clean title
+        if listing.get("carfax_clean_title"):
+            score += 1.0
+
+        # Bonus for single owner
+        if listing.get("carfax_1_owner"):
+            score += 0.5
+
+        # Bonus for lower mileage (relative)
+        mileage = listing.get("mileage") or 999999
+        if mileage < 30000:
+            score += 1.5
+        elif mileage < 50000:
+            score += 1.0
+        elif mileage < 75000:
+            score += 0.5
+
+        # Bonus for newer cars
+        year = listing.get("year") or 2000
+        if year >= 2023:
+            score += 1.5
+        elif year >= 2020:
+            score += 1.0
+        elif year >= 2018:
+            score += 0.5
+
+        return score
+
     def _generate_fallback_highlights(self, listing: dict[str, Any]) -> list[str]:
         """Generate highlights when LLM is not available"""
         highlights = []
@@ -9,13 +9,17 @@ import logging
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.redis import redis_client
+from app.core.config import settings
+from app.db.cache import cache, deal_tag, vin_tag
+from app.db.session import AsyncSessionLocal
 from app.llm import generate_structured_json, llm_client
 from app.llm.schemas import DealEvaluation, VehicleConditionAssessment
 from app.models.evaluation import EvaluationStatus, PipelineStep
 from app.models.models import Deal
+from app.repositories.ai_response_repository import AIResponseRepository
+from app.repositories.deal_repository import DealRepository
 from app.repositories.evaluation_repository import EvaluationRepository
 from app.utils.error_handler import ApiError
 
@@ -47,7 +51,7 @@ class DealEvaluationService:
     DEFAULT_LOAN_TERM_MONTHS = 60  # 5-year term
 
     # Cache settings
-    CACHE_TTL = 3600  # Cache evaluation results for 1 hour (in seconds)
+    CACHE_TTL = 6 * 3600  # Cache evaluation results for 6 hours; deal updates invalidate by tag
     CACHE_KEY_PREFIX = "deal_eval"  # Prefix for cache keys
 
     def _generate_cache_key(
@@ -97,7 +101,7 @@ class DealEvaluationService:
 
     async def _get_cached_evaluation(self, cache_key: str) -> dict[str, Any] | None:
         """
-        Retrieve cached evaluation result from Redis
+        Retrieve cached evaluation result
 
         Args:
             cache_key: Cache key to lookup
@@ -106,15 +110,10 @@ class DealEvaluationService:
             Cached evaluation result or None if not found
         """
         try:
-            redis = redis_client.get_client()
-            if redis is None:
-                logger.debug("Redis client not available, skipping cache lookup")
-                return None
-
-            cached_data = await redis.get(cache_key)
+            cached_data = await cache.get(cache_key)
             if cached_data:
                 logger.info(f"Cache HIT for key: {cache_key}")
-                return json.loads(cached_data)
+                return cached_data
             else:
                 logger.info(f"Cache MISS for key: {cache_key}")
                 return None
@@ -122,25 +121,58 @@ class DealEvaluationService:
             logger.warning(f"Error retrieving from cache: {e}")
             return None
 
-    async def _set_cached_evaluation(self, cache_key: str, evaluation: dict[str, Any]) -> None:
+    def _cache_tags(self, vehicle_vin: str, deal_id: int | None = None) -> list[str]:
+        """Tags that let deal and listing changes drop the cached evaluation"""
+        tags = []
+        if vehicle_vin and vehicle_vin != "UNKNOWN":
+            tags.append(vin_tag(vehicle_vin))
+        if deal_id is not None:
+            tags.append(deal_tag(deal_id))
+        return tags
+
+    async def _set_cached_evaluation(
+        self, cache_key: str, evaluation: dict[str, Any], tags: list[str] | None = None
+    ) -> None:
         """
-        Store evaluation result in Redis cache
+        Store evaluation result in cache
 
         Args:
             cache_key: Cache key to store under
             evaluation: Evaluation result to cache
+            tags: Cache tags for invalidation
         """
         try:
-            redis = redis_client.get_client()
-            if redis is None:
-                logger.debug("Redis client not available, skipping cache set")
-                return
-
-            await redis.setex(cache_key, self.CACHE_TTL, json.dumps(evaluation))
+            await cache.set(cache_key, evaluation, ex=self.CACHE_TTL, tags=tags)
             logger.info(f"Cached evaluation for key: {cache_key} (TTL: {self.CACHE_TTL}s)")
         except Exception as e:
             logger.warning(f"Error storing to cache: {e}")
 
+    async def _log_ai_response(
+        self, deal_id: int | None, prompt_variables: dict[str, Any], result: dict[str, Any]
+    ) -> None:
+        """
+        Record an LLM evaluation in ai_responses
+
+        The service is shared across requests and holds no session, so the
+        record is written in its own short-lived one. Failures are only logged.
+        """
+        try:
+            async with AsyncSessionLocal() as db_session:
+                await AIResponseRepository(db_session).create_response(
+                    feature="deal_evaluation",
+                    user_id=None,
+                    deal_id=deal_id,
+                    prompt_id="evaluation",
+                    prompt_variables=prompt_variables,
+                    response_content=result,
+                    response_metadata={"score": result["score"]},
+                    model_used=settings.OPENAI_MODEL,
+                    temperature=0.7,
+                    llm_used=True,
+                )
+        except Exception as e:
+            logger.error(f"Failed to log deal evaluation AI response: {str(e)}")
+
     async def evaluate_deal(
         self,
         vehicle_vin: str,
@@ -150,6 +182,7 @@ class DealEvaluationService:
         make: str | None = None,
         model: str | None = None,
         year: int | None = None,
+        deal_id: int | None = None,
     ) -> dict[str, Any]:
         """
         Evaluate a car deal and provide comprehensive analysis
@@ -165,6 +198,7 @@ class DealEvaluationService:
             make: Vehicle make (optional, improves evaluation accuracy)
             model: Vehicle model (optional, improves evaluation accuracy)
             year: Vehicle year (optional, improves evaluation accuracy)
+            deal_id: Deal the evaluation belongs to (optional, used for cache invalidation)
 
         Returns:
             Dictionary containing fair_value, score, insights, and talking_points
@@ -220,10 +254,20 @@ class DealEvaluationService:
             }
 
             # Cache the successful result
-            await self._set_cached_evaluation(cache_key, result)
+            await self._set_cached_evaluation(
+                cache_key, result, tags=self._cache_tags(vehicle_vin, deal_id)
+            )
 
-            # TODO: Re-enable AI response logging with async repository
-            # This feature requires refactoring the repository to work with async sessions
+            await self._log_ai_response(
+                deal_id,
+                prompt_variables={
+                    "vin": vehicle_vin,
+                    "asking_price": asking_price,
+                    "mileage": mileage,
+                    "condition": condition,
+                },
+                result=result,
+            )
 
             return result
 
@@ -364,7 +408,7 @@ class DealEvaluationService:
 
     async def process_evaluation_step(
         self,
-        db: Session,
+        db: AsyncSession,
         evaluation_id: int,
         user_answers: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
@@ -380,13 +424,13 @@ class DealEvaluationService:
             Dictionary containing step result with either assessment or questions
         """
         repo = EvaluationRepository(db)
-        evaluation = repo.get(evaluation_id)
+        evaluation = await repo.get(evaluation_id)
 
         if not evaluation:
             raise ValueError(f"Evaluation {evaluation_id} not found")
 
         # Get the deal details
-        deal = db.query(Deal).filter(Deal.id == evaluation.deal_id).first()
+        deal = await DealRepository(db).get(evaluation.deal_id)
         if not deal:
             raise ValueError(f"Deal {evaluation.deal_id} not found")
 
@@ -415,18 +459,18 @@ class DealEvaluationService:
         if step_result.get("questions"):
             # If questions are returned, update status to awaiting_input
             result_json[current_step.value] = step_result
-            repo.update_result(evaluation_id, result_json, EvaluationStatus.AWAITING_INPUT)
+            await repo.update_result(evaluation_id, result_json, EvaluationStatus.AWAITING_INPUT)
         else:
             # If no questions, advance to next step
             result_json[current_step.value] = step_result
             next_step = self._get_next_step(current_step)
 
             if next_step:
-                repo.update_step(evaluation_id, next_step)
-                repo.update_result(evaluation_id, result_json, EvaluationStatus.ANALYZING)
+                await repo.update_step(evaluation_id, next_step)
+                await repo.update_result(evaluation_id, result_json, EvaluationStatus.ANALYZING)
             else:
                 # Final step completed
-                repo.update_result(evaluation_id, result_json, EvaluationStatus.COMPLETED)
+                await repo.update_result(evaluation_id, result_json, EvaluationStatus.COMPLETED)
 
         return step_result
 
@@ -469,7 +513,7 @@ class DealEvaluationService:
         # Use LLM to evaluate condition
         if llm_client.is_available():
             try:
-                assessment_result = generate_structured_json(
+                assessment_result = await generate_structured_json(
                     prompt_id="vehicle_condition",
                     variables={
                         "make": deal.vehicle_make or "Unknown",
@@ -518,18 +562,49 @@ class DealEvaluationService:
 
         return {"assessment": assessment, "completed": True}
 
+    def price_evaluation_args(self, deal: Deal, result_json: dict | None) -> dict[str, Any]:
+        """
+        Build the evaluate_deal arguments used by the pipeline's price step
+
+        Shared with the cache warmer so warmed entries hit the same cache keys.
+        """
+        user_inputs = (result_json or {}).get("user_inputs", {})
+        return {
+            "vehicle_vin": user_inputs.get("vin", "UNKNOWN"),
+            "asking_price": deal.asking_price,
+            "condition": user_inputs.get("condition_description", "unknown"),
+            "mileage": deal.vehicle_mileage,
+        }
+
+    async def has_cached_evaluation(
+        self, vehicle_vin: str, asking_price: float, condition: str, mileage: int
+    ) -> bool:
+        """Check whether evaluate_deal would be answered from cache"""
+        cache_key = self._generate_cache_key(vehicle_vin, asking_price, condition, mileage)
+        return await self._get_cached_evaluation(cache_key) is not None
+
+    async def invalidate_deal(self, deal: Deal, previous_vin: str | None = None) -> int:
+        """
+        Drop cached evaluations for a deal and its vehicle after the deal changed
+
+        Args:
+            deal: Deal that was updated or is about to be deleted
+            previous_vin: VIN before the update, if it may have changed
+
+        Returns:
+            Number of cache entries removed
+        """
+        tags = [deal_tag(deal.id)]
+        for vin in (previous_vin, deal.vehicle_vin):
+            if vin and vin_tag(vin) not in tags:
+                tags.append(vin_tag(vin))
+        return len(await cache.invalidate_tags(*tags))
+
     async def _evaluate_price(self, deal: Deal, result_json: dict) -> dict[str, Any]:
         """Evaluate price step"""
         # Use existing evaluate_deal logic
-        user_inputs = result_json.get("user_inputs", {})
-        vin = user_inputs.get("vin", "UNKNOWN")
-        condition = user_inputs.get("condition_description", "unknown")
-
         price_eval = await self.evaluate_deal(
-            vehicle_vin=vin,
-            asking_price=deal.asking_price,
-            condition=condition,
-            mileage=deal.vehicle_mileage,
+            **self.price_evaluation_args(deal, result_json), deal_id=deal.id
         )
 
         return {
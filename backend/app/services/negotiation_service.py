@@ -6,10 +6,13 @@ import logging
 import uuid
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.llm import generate_text
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.llm import generate_text, stream_text
 from app.models.negotiation import MessageRole, NegotiationSession, NegotiationStatus
+from app.repositories.ai_response_repository import AIResponseRepository
 from app.repositories.deal_repository import DealRepository
 from app.repositories.negotiation_repository import NegotiationRepository
 from app.services.loan_calculator_service import LoanCalculatorService
@@ -37,7 +40,7 @@ class NegotiationService:
     SMALL_INCREASE_ADJUSTMENT = 1.02  # 2% increase for moderate discount
     AGGRESSIVE_DECREASE_ADJUSTMENT = 0.98  # 2% decrease to pressure dealer
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.negotiation_repo = NegotiationRepository(db)
         self.deal_repo = DealRepository(db)
@@ -53,13 +56,14 @@ class NegotiationService:
             self._ws_manager = connection_manager
         return self._ws_manager
 
-    async def _broadcast_message(self, session_id: int, message: Any):
+    async def _broadcast_message(self, session_id: int, message: Any, stream_id: str | None = None):
         """
         Broadcast a message via WebSocket to all connected clients
 
         Args:
             session_id: Negotiation session ID
             message: Message object to broadcast
+            stream_id: ID of the delta stream this message completes (optional)
         """
         try:
             message_data = {
@@ -71,12 +75,57 @@ class NegotiationService:
                 "metadata": message.message_metadata,
                 "created_at": message.created_at.isoformat() if message.created_at else None,
             }
-            await self.ws_manager.broadcast_message(session_id, message_data)
+            await self.ws_manager.broadcast_message(session_id, message_data, stream_id=stream_id)
         except Exception as e:
             logger.error(f"Failed to broadcast message via WebSocket: {str(e)}")
             # Don't fail the main operation if WebSocket broadcast fails
 
-    def _get_latest_suggested_price(self, session_id: int, default_price: float) -> float:
+    async def _stream_agent_text(
+        self,
+        session_id: int,
+        stream_id: str,
+        prompt_id: str,
+        variables: dict[str, Any],
+        temperature: float = 0.7,
+    ) -> str:
+        """
+        Generate agent text with the LLM, forwarding each token over WebSocket
+
+        Deltas are broadcast as they arrive so connected clients can render the
+        reply while it is being written. The typing indicator is hidden on the
+        first token. Nothing is persisted here; the caller stores the returned
+        full text once and broadcasts it with the same stream_id.
+
+        Args:
+            session_id: Negotiation session ID
+            stream_id: ID shared by every delta of this reply
+            prompt_id: ID of the prompt template to use
+            variables: Variables to substitute in the prompt template
+            temperature: Sampling temperature
+
+        Returns:
+            The complete generated text
+
+        Raises:
+            ApiError: If the LLM is unavailable or the stream fails
+        """
+        chunks: list[str] = []
+        async for delta in stream_text(
+            prompt_id=prompt_id,
+            variables=variables,
+            temperature=temperature,
+        ):
+            if not chunks:
+                await self.ws_manager.broadcast_typing_indicator(session_id, False)
+            chunks.append(delta)
+            try:
+                await self.ws_manager.broadcast_message_delta(session_id, stream_id, delta)
+            except Exception as e:
+                # Don't fail generation if WebSocket broadcast fails
+                logger.error(f"Failed to broadcast message delta via WebSocket: {str(e)}")
+        return "".join(chunks)
+
+    async def _get_latest_suggested_price(self, session_id: int, default_price: float) -> float:
         """
         Get the latest suggested price from message history
 
@@ -87,7 +136,7 @@ class NegotiationService:
         Returns:
             Latest suggested price or default_price
         """
-        messages = self.negotiation_repo.get_messages(session_id)
+        messages = await self.negotiation_repo.get_messages(session_id)
         for msg in reversed(messages[-10:]):  # Check last 10 messages
             if msg.message_metadata and "suggested_price" in msg.message_metadata:
                 return msg.message_metadata["suggested_price"]
@@ -121,13 +170,13 @@ class NegotiationService:
         )
 
         # Validate deal exists
-        deal = self.deal_repo.get(deal_id)
+        deal = await self.deal_repo.get(deal_id)
         if not deal:
             logger.error(f"[{request_id}] Deal {deal_id} not found")
             raise ApiError(status_code=404, message=f"Deal with id {deal_id} not found")
 
         # Create session
-        session = self.negotiation_repo.create_session(user_id=user_id, deal_id=deal_id)
+        session = await self.negotiation_repo.create_session(user_id=user_id, deal_id=deal_id)
         logger.info(f"[{request_id}] Created session {session.id}")
 
         # Add initial user message
@@ -139,7 +188,7 @@ class NegotiationService:
         if strategy:
             user_message += f" My negotiation approach is {strategy}."
 
-        user_msg = self.negotiation_repo.add_message(
+        user_msg = await self.negotiation_repo.add_message(
             session_id=session.id,
             role=MessageRole.USER,
             content=user_message,
@@ -166,7 +215,7 @@ class NegotiationService:
             # Hide typing indicator
             await self.ws_manager.broadcast_typing_indicator(session.id, False)
 
-            agent_msg = self.negotiation_repo.add_message(
+            agent_msg = await self.negotiation_repo.add_message(
                 session_id=session.id,
                 role=MessageRole.AGENT,
                 content=agent_response["content"],
@@ -219,7 +268,7 @@ class NegotiationService:
         logger.info(f"[{request_id}] Processing next round for session {session_id}")
 
         # Get session
-        session = self.negotiation_repo.get_session(session_id)
+        session = await self.negotiation_repo.get_session(session_id)
         if not session:
             logger.error(f"[{request_id}] Session {session_id} not found")
             raise ApiError(status_code=404, message=f"Session {session_id} not found")
@@ -236,7 +285,9 @@ class NegotiationService:
         # Check max rounds
         if session.current_round >= session.max_rounds:
             logger.warning(f"[{request_id}] Session {session_id} reached max rounds")
-            self.negotiation_repo.update_session_status(session_id, NegotiationStatus.COMPLETED)
+            await self.negotiation_repo.update_session_status(
+                session_id, NegotiationStatus.COMPLETED
+            )
             raise ApiError(
                 status_code=400,
                 message="Maximum negotiation rounds reached",
@@ -244,7 +295,7 @@ class NegotiationService:
             )
 
         # Get deal
-        deal = self.deal_repo.get(session.deal_id)
+        deal = await self.deal_repo.get(session.deal_id)
         if not deal:
             logger.error(f"[{request_id}] Deal {session.deal_id} not found")
             raise ApiError(status_code=404, message="Associated deal not found")
@@ -252,10 +303,12 @@ class NegotiationService:
         # Handle user action
         if user_action == "confirm":
             # User accepts the deal - update negotiation status
-            self.negotiation_repo.update_session_status(session_id, NegotiationStatus.COMPLETED)
+            await self.negotiation_repo.update_session_status(
+                session_id, NegotiationStatus.COMPLETED
+            )
 
             # Get the latest negotiated price to update the deal
-            latest_price = self._get_latest_suggested_price(session_id, deal.asking_price)
+            latest_price = await self._get_latest_suggested_price(session_id, deal.asking_price)
 
             # Update the deal with the final negotiated price and status
             from app.schemas.schemas import DealUpdate
@@ -265,14 +318,14 @@ class NegotiationService:
                 status="completed",
                 notes=f"{deal.notes or ''}\nNegotiation completed. Final agreed price: ${latest_price:,.2f}".strip(),
             )
-            self.deal_repo.update(session.deal_id, deal_update)
+            await self.deal_repo.update(session.deal_id, deal_update)
             logger.info(
                 f"[{request_id}] Deal {session.deal_id} updated - "
                 f"Status: completed, Offer Price: ${latest_price:,.2f}"
             )
 
             message_content = "Thank you! I accept the current offer."
-            self.negotiation_repo.add_message(
+            await self.negotiation_repo.add_message(
                 session_id=session_id,
                 role=MessageRole.USER,
                 content=message_content,
@@ -283,7 +336,7 @@ class NegotiationService:
             agent_content = (
                 "Excellent! The deal is confirmed. " "We'll proceed with finalizing the paperwork."
             )
-            self.negotiation_repo.add_message(
+            await self.negotiation_repo.add_message(
                 session_id=session_id,
                 role=MessageRole.AGENT,
                 content=agent_content,
@@ -302,10 +355,12 @@ class NegotiationService:
 
         elif user_action == "reject":
             # User rejects and ends negotiation
-            self.negotiation_repo.update_session_status(session_id, NegotiationStatus.CANCELLED)
+            await self.negotiation_repo.update_session_status(
+                session_id, NegotiationStatus.CANCELLED
+            )
 
             message_content = "I'm not interested in continuing this negotiation."
-            self.negotiation_repo.add_message(
+            await self.negotiation_repo.add_message(
                 session_id=session_id,
                 role=MessageRole.USER,
                 content=message_content,
@@ -317,7 +372,7 @@ class NegotiationService:
                 "I understand. Thank you for your time. "
                 "Feel free to reach out if you change your mind."
             )
-            self.negotiation_repo.add_message(
+            await self.negotiation_repo.add_message(
                 session_id=session_id,
                 role=MessageRole.AGENT,
                 content=agent_content,
@@ -343,11 +398,11 @@ class NegotiationService:
                 )
 
             # Increment round
-            session = self.negotiation_repo.increment_round(session_id)
+            session = await self.negotiation_repo.increment_round(session_id)
 
             # Add user counter message
             message_content = f"I'd like to counter with an offer of ${counter_offer:,.2f}."
-            user_msg = self.negotiation_repo.add_message(
+            user_msg = await self.negotiation_repo.add_message(
                 session_id=session_id,
                 role=MessageRole.USER,
                 content=message_content,
@@ -373,7 +428,7 @@ class NegotiationService:
                 # Hide typing indicator
                 await self.ws_manager.broadcast_typing_indicator(session_id, False)
 
-                agent_msg = self.negotiation_repo.add_message(
+                agent_msg = await self.negotiation_repo.add_message(
                     session_id=session_id,
                     role=MessageRole.AGENT,
                     content=agent_response["content"],
@@ -382,7 +437,7 @@ class NegotiationService:
                 )
 
                 # Broadcast agent message via WebSocket
-                await self._broadcast_message(session_id, agent_msg)
+                await self._broadcast_message(session_id, agent_msg, stream_id=request_id)
 
                 logger.info(
                     f"[{request_id}] Session {session_id} advanced to round {session.current_round}"
@@ -417,25 +472,21 @@ class NegotiationService:
         deal: Any,
         current_price: float,
         user_target: float,
-        messages: list[Any] | None = None,
+        messages: list[Any],
     ) -> dict[str, Any]:
         """
         Calculate enhanced AI metrics for negotiation intelligence
 
         Args:
-            session_id: Session ID for message history
+            session_id: ID of the negotiation session
             deal: Deal object with asking price
             current_price: Current suggested/negotiated price
             user_target: User's target price
-            messages: Optional pre-fetched messages to avoid redundant queries
+            messages: Messages exchanged in the session so far (fetched by the caller)
 
         Returns:
             Dictionary with AI metrics including confidence, recommendations, etc.
         """
-        # Use provided messages or fetch if not provided
-        if messages is None:
-            messages = self.negotiation_repo.get_messages(session_id)
-
         # Calculate confidence score based on deal quality
         # Handle edge case where current_price > asking_price (negative discount)
         if deal.asking_price > 0:
@@ -525,6 +576,47 @@ class NegotiationService:
             "market_comparison": market_comparison,
         }
 
+    async def _log_ai_response(
+        self,
+        session: NegotiationSession,
+        deal: Any,
+        user_target_price: float,
+        strategy: str | None,
+        content: str,
+        suggested_price: float,
+        llm_used: bool,
+    ) -> None:
+        """
+        Record the initial agent response in ai_responses
+
+        Written in its own session so a logging failure cannot roll back or
+        expire the negotiation objects held in self.db. Failures are only logged.
+        """
+        try:
+            async with AsyncSessionLocal() as db_session:
+                await AIResponseRepository(db_session).create_response(
+                    feature="negotiation",
+                    user_id=session.user_id,
+                    deal_id=deal.id,
+                    prompt_id="negotiation_initial",
+                    prompt_variables={
+                        "asking_price": deal.asking_price,
+                        "target_price": user_target_price,
+                        "strategy": strategy or "Not specified",
+                    },
+                    response_content=content,
+                    response_metadata={
+                        "session_id": session.id,
+                        "suggested_price": round(suggested_price, 2),
+                    },
+                    model_used=settings.OPENAI_MODEL if llm_used else None,
+                    temperature=0.7 if llm_used else None,
+                    llm_used=llm_used,
+                )
+        except Exception as e:
+            # Don't fail the negotiation because logging failed
+            logger.error(f"Failed to log negotiation AI response: {str(e)}")
+
     async def _generate_agent_response(
         self,
         session: NegotiationSession,
@@ -536,9 +628,12 @@ class NegotiationService:
         """Generate agent's initial response using LLM"""
         logger.info(f"[{request_id}] Generating agent response for session {session.id}")
 
+        # Fetched once up front; the metrics below only read it
+        messages = await self.negotiation_repo.get_messages(session.id)
+
         try:
             # Use centralized LLM client
-            response_content = generate_text(
+            response_content = await generate_text(
                 prompt_id="negotiation_initial",
                 variables={
                     "make": deal.vehicle_make,
@@ -571,18 +666,23 @@ class NegotiationService:
                     cash_savings = baseline_financing["total_cost"] - suggested_price
 
             # Calculate enhanced AI metrics
-            # Pass None for messages to fetch them inside the method (first call, no messages yet)
             ai_metrics = self._calculate_ai_metrics(
                 session_id=session.id,
                 deal=deal,
                 current_price=suggested_price,
                 user_target=user_target_price,
-                messages=None,  # Will fetch messages inside the method
+                messages=messages,
             )
 
-            # TODO: Re-enable AI response logging with async repository
-            # This feature requires refactoring the repository to work with async sessions
-            # Don't fail the main operation if logging fails
+            await self._log_ai_response(
+                session,
+                deal,
+                user_target_price,
+                strategy,
+                response_content,
+                suggested_price,
+                llm_used=True,
+            )
 
             return {
                 "content": response_content,
@@ -625,17 +725,23 @@ class NegotiationService:
                     cash_savings = baseline_financing["total_cost"] - suggested_price
 
             # Calculate enhanced AI metrics even for fallback
-            # Pass None for messages to fetch them inside the method (first call, no messages yet)
             ai_metrics = self._calculate_ai_metrics(
                 session_id=session.id,
                 deal=deal,
                 current_price=suggested_price,
                 user_target=user_target_price,
-                messages=None,  # Will fetch messages inside the method
+                messages=messages,
             )
 
-            # TODO: Re-enable AI fallback response logging with async repository
-            # This feature requires refactoring the repository to work with async sessions
+            await self._log_ai_response(
+                session,
+                deal,
+                user_target_price,
+                strategy,
+                fallback_content,
+                suggested_price,
+                llm_used=False,
+            )
 
             return {
                 "content": fallback_content,
@@ -721,7 +827,7 @@ class NegotiationService:
         logger.info(f"[{request_id}] Generating counter response for session {session.id}")
 
         # Get conversation history
-        messages = self.negotiation_repo.get_messages(session.id)
+        messages = await self.negotiation_repo.get_messages(session.id)
         offer_history = []
         for msg in messages[-self.MAX_CONVERSATION_HISTORY :]:  # Last N messages
             if msg.message_metadata and "counter_offer" in msg.message_metadata:
@@ -731,7 +837,9 @@ class NegotiationService:
 
         try:
             # Use centralized LLM client
-            response_content = generate_text(
+            response_content = await self._stream_agent_text(
+                session_id=session.id,
+                stream_id=request_id,
                 prompt_id="negotiation_counter",
                 variables={
                     "make": deal.vehicle_make,
@@ -884,7 +992,7 @@ class NegotiationService:
                 },
             }
 
-    def get_session_with_messages(self, session_id: int) -> dict[str, Any] | None:
+    async def get_session_with_messages(self, session_id: int) -> dict[str, Any] | None:
         """
         Get a negotiation session with all its messages
 
@@ -894,11 +1002,11 @@ class NegotiationService:
         Returns:
             Dictionary with session details and messages, or None if not found
         """
-        session = self.negotiation_repo.get_session(session_id)
+        session = await self.negotiation_repo.get_session(session_id)
         if not session:
             return None
 
-        messages = self.negotiation_repo.get_messages(session_id)
+        messages = await self.negotiation_repo.get_messages(session_id)
 
         return {
             "id": session.id,
@@ -947,20 +1055,20 @@ class NegotiationService:
         logger.info(f"[{request_id}] Processing chat message for session {session_id}")
 
         # Get session
-        session = self.negotiation_repo.get_session(session_id)
+        session = await self.negotiation_repo.get_session(session_id)
         if not session:
             logger.error(f"[{request_id}] Session {session_id} not found")
             raise ApiError(status_code=404, message=f"Session {session_id} not found")
 
         # Allow chat even if session is completed/cancelled for post-negotiation questions
         # Get deal
-        deal = self.deal_repo.get(session.deal_id)
+        deal = await self.deal_repo.get(session.deal_id)
         if not deal:
             logger.error(f"[{request_id}] Deal {session.deal_id} not found")
             raise ApiError(status_code=404, message="Associated deal not found")
 
         # Add user message
-        user_msg = self.negotiation_repo.add_message(
+        user_msg = await self.negotiation_repo.add_message(
             session_id=session_id,
             role=MessageRole.USER,
             content=user_message,
@@ -986,7 +1094,7 @@ class NegotiationService:
             # Hide typing indicator
             await self.ws_manager.broadcast_typing_indicator(session_id, False)
 
-            agent_msg = self.negotiation_repo.add_message(
+            agent_msg = await self.negotiation_repo.add_message(
                 session_id=session_id,
                 role=MessageRole.AGENT,
                 content=agent_response["content"],
@@ -995,7 +1103,7 @@ class NegotiationService:
             )
 
             # Broadcast agent message via WebSocket
-            await self._broadcast_message(session_id, agent_msg)
+            await self._broadcast_message(session_id, agent_msg, stream_id=request_id)
 
             logger.info(f"[{request_id}] Chat message processed successfully")
 
@@ -1041,7 +1149,7 @@ class NegotiationService:
         logger.info(f"[{request_id}] Generating chat response for session {session.id}")
 
         # Get recent conversation history
-        messages = self.negotiation_repo.get_messages(session.id)
+        messages = await self.negotiation_repo.get_messages(session.id)
         recent_messages = messages[-6:]  # Last 6 messages for context
 
         conversation_history = []
@@ -1050,11 +1158,13 @@ class NegotiationService:
             conversation_history.append(f"{role_label}: {msg.content}")
 
         # Get latest suggested price using helper method
-        suggested_price = self._get_latest_suggested_price(session.id, deal.asking_price)
+        suggested_price = await self._get_latest_suggested_price(session.id, deal.asking_price)
 
         try:
             # Use centralized LLM client
-            response_content = generate_text(
+            response_content = await self._stream_agent_text(
+                session_id=session.id,
+                stream_id=request_id,
                 prompt_id="negotiation_chat",
                 variables={
                     "make": deal.vehicle_make,
@@ -1123,7 +1233,7 @@ class NegotiationService:
         logger.info(f"[{request_id}] Analyzing dealer info for session {session_id}")
 
         # Get session
-        session = self.negotiation_repo.get_session(session_id)
+        session = await self.negotiation_repo.get_session(session_id)
         if not session:
             logger.error(f"[{request_id}] Session {session_id} not found")
             raise ApiError(status_code=404, message=f"Session {session_id} not found")
@@ -1138,7 +1248,7 @@ class NegotiationService:
             )
 
         # Get deal
-        deal = self.deal_repo.get(session.deal_id)
+        deal = await self.deal_repo.get(session.deal_id)
         if not deal:
             logger.error(f"[{request_id}] Deal {session.deal_id} not found")
             raise ApiError(status_code=404, message="Associated deal not found")
@@ -1148,7 +1258,7 @@ class NegotiationService:
         if price_mentioned:
             user_msg_content += f"\n\nPrice mentioned: ${price_mentioned:,.2f}"
 
-        user_msg = self.negotiation_repo.add_message(
+        user_msg = await self.negotiation_repo.add_message(
             session_id=session_id,
             role=MessageRole.USER,
             content=user_msg_content,
@@ -1172,7 +1282,7 @@ class NegotiationService:
                 request_id=request_id,
             )
 
-            agent_msg = self.negotiation_repo.add_message(
+            agent_msg = await self.negotiation_repo.add_message(
                 session_id=session_id,
                 role=MessageRole.AGENT,
                 content=agent_response["content"],
@@ -1228,10 +1338,10 @@ class NegotiationService:
         logger.info(f"[{request_id}] Generating dealer info analysis for session {session.id}")
 
         # Get latest suggested price using helper method
-        suggested_price = self._get_latest_suggested_price(session.id, deal.asking_price)
+        suggested_price = await self._get_latest_suggested_price(session.id, deal.asking_price)
 
         # Get user target price from messages or use default
-        messages = self.negotiation_repo.get_messages(session.id)
+        messages = await self.negotiation_repo.get_messages(session.id)
         user_target = deal.asking_price * self.DEFAULT_TARGET_PRICE_RATIO
 
         for msg in reversed(messages[-10:]):
@@ -1241,7 +1351,7 @@ class NegotiationService:
 
         try:
             # Use centralized LLM client
-            response_content = generate_text(
+            response_content = await generate_text(
                 prompt_id="dealer_info_analysis",
                 variables={
                     "make": deal.vehicle_make,
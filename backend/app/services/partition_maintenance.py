@@ -0,0 +1,308 @@
+"""
+Partition maintenance for search_history and ai_responses
+In PostgreSQL both tables are range-partitioned by calendar month (UTC) on
+timestamp, one partition per month named <table>_pYYYYMM (see migration 012).
+A daily job creates the partitions for the coming months ahead of time and
+removes partitions that have fallen out of the retention period. Removal drops
+the partition, or detaches it into an archive schema, which are metadata
+operations that take the same time however many rows the month holds.
+"""
+
+import asyncio
+import logging
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.redis import redis_client
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "partition_maintenance:lock"
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant (UTC) of the month containing moment"""
+    moment = moment.astimezone(UTC)
+    return datetime(moment.year, moment.month, 1, tzinfo=UTC)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift the first day of a month by a number of months"""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Name of the partition holding month's rows"""
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_month(table: str, name: str) -> datetime | None:
+    """Month a monthly partition of table covers, or None for other partitions"""
+    match = _PARTITION_SUFFIX.search(name)
+    if not name.startswith(f"{table}_p") or match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class PartitionPolicy:
+    """Retention for one partitioned table"""
+
+    table: str
+    retention_months: int  # Whole months kept before the current one
+
+
+@dataclass
+class MaintenanceReport:
+    """Outcome of one maintenance run"""
+
+    created: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    archived: list[str] = field(default_factory=list)
+    skipped_tables: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+class PartitionMaintainer:
+    """
+    Creates upcoming monthly partitions and removes expired ones
+
+    Tables that are not partitioned (e.g. before migration 012, or on SQLite
+    in tests) are skipped. The DDL for each partition runs in its own
+    transaction, so one failure does not undo the rest of the run.
+    """
+
+    def __init__(
+        self,
+        policies: list[PartitionPolicy],
+        premake_months: int,
+        run_hour_utc: int,
+        archive_schema: str | None = None,
+    ):
+        """
+        Initialize partition maintainer
+
+        Args:
+            policies: Tables to maintain and their retention
+            premake_months: Number of future months to create partitions for
+            run_hour_utc: Hour of day (UTC) at which the scheduled run starts
+            archive_schema: Detach expired partitions into this schema instead
+                of dropping them
+        """
+        if archive_schema is not None and not _IDENTIFIER.match(archive_schema):
+            raise ValueError(f"Invalid archive schema name: {archive_schema}")
+        self.policies = policies
+        self.premake_months = premake_months
+        self.run_hour_utc = run_hour_utc
+        self.archive_schema = archive_schema
+        self.instance_id = uuid.uuid4().hex
+        self._task: asyncio.Task | None = None
+
+    def plan(
+        self, policy: PartitionPolicy, existing: list[str], now: datetime
+    ) -> tuple[list[datetime], list[str]]:
+        """
+        Work out which partitions to create and which have expired
+
+        Args:
+            policy: Table and retention
+            existing: Names of the table's current partitions
+            now: Current time
+
+        Returns:
+            Tuple of (months to create, expired partition names), oldest first
+        """
+        current = month_start(now)
+        existing_months = {
+            month
+            for month in (partition_month(policy.table, name) for name in existing)
+            if month is not None
+        }
+        to_create = [
+            month
+            for month in (add_months(current, i) for i in range(self.premake_months + 1))
+            if month not in existing_months
+        ]
+        cutoff = add_months(current, -policy.retention_months)
+        expired = [
+            partition_name(policy.table, month)
+            for month in sorted(existing_months)
+            if month < cutoff
+        ]
+        return to_create, expired
+
+    async def _is_partitioned(self, db: AsyncSession, table: str) -> bool:
+        if db.bind.dialect.name != "postgresql":
+            return False
+        result = await db.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :table)"
+            ),
+            {"table": table},
+        )
+        return bool(result.scalar())
+
+    async def _existing_partitions(self, db: AsyncSession, table: str) -> list[str]:
+        result = await db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table"
+            ),
+            {"table": table},
+        )
+        return list(result.scalars().all())
+
+    async def _run_ddl(self, db: AsyncSession, statements: list[str]) -> None:
+        try:
+            for statement in statements:
+                await db.execute(text(statement))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    async def maintain_table(
+        self, db: AsyncSession, policy: PartitionPolicy, now: datetime, report: MaintenanceReport
+    ) -> None:
+        """Create missing upcoming partitions and remove expired ones for one table"""
+        table = policy.table
+        to_create, expired = self.plan(policy, await self._existing_partitions(db, table), now)
+
+        for month in to_create:
+            name = partition_name(table, month)
+            try:
+                await self._run_ddl(
+                    db,
+                    [
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') "
+                        f"TO ('{add_months(month, 1).isoformat()}')"
+                    ],
+                )
+                report.created.append(name)
+            except Exception as e:
+                # e.g. the default partition already holds rows for this month
+                report.errors.append(f"create {name}: {e}")
+                logger.error(f"Could not create partition {name}: {e}")
+
+        for name in expired:
+            try:
+                if self.archive_schema:
+                    await self._run_ddl(
+                        db,
+                        [
+                            f"CREATE SCHEMA IF NOT EXISTS {self.archive_schema}",
+                            f"ALTER TABLE {table} DETACH PARTITION {name}",
+                            f"ALTER TABLE {name} SET SCHEMA {self.archive_schema}",
+                        ],
+                    )
+                    report.archived.append(name)
+                else:
+                    await self._run_ddl(db, [f"DROP TABLE {name}"])
+                    report.dropped.append(name)
+            except Exception as e:
+                report.errors.append(f"expire {name}: {e}")
+                logger.error(f"Could not remove expired partition {name}: {e}")
+
+    async def run_once(self, now: datetime | None = None) -> MaintenanceReport:
+        """
+        Maintain every configured table
+
+        Args:
+            now: Current time (defaults to now, UTC)
+
+        Returns:
+            MaintenanceReport listing created, dropped and archived partitions
+        """
+        now = now or datetime.now(UTC)
+        report = MaintenanceReport()
+
+        async with AsyncSessionLocal() as db_session:
+            for policy in self.policies:
+                try:
+                    if not await self._is_partitioned(db_session, policy.table):
+                        report.skipped_tables.append(policy.table)
+                        continue
+                    await self.maintain_table(db_session, policy, now, report)
+                except Exception as e:
+                    report.errors.append(f"{policy.table}: {e}")
+                    logger.error(f"Partition maintenance failed for {policy.table}: {e}")
+
+        logger.info(
+            f"Partition maintenance finished: {len(report.created)} created, "
+            f"{len(report.dropped)} dropped, {len(report.archived)} archived, "
+            f"{len(report.errors)} errors"
+        )
+        return report
+
+    async def _acquire_run_lock(self) -> bool:
+        """Let a single replica run the DDL per scheduled run"""
+        try:
+            client = redis_client.get_client()
+        except RuntimeError:
+            return True
+        try:
+            return bool(await client.set(LOCK_KEY, self.instance_id, nx=True, ex=3600))
+        except Exception as e:
+            logger.warning(f"Could not take partition maintenance lock, running anyway: {e}")
+            return True
+
+    def seconds_until_next_run(self, now: datetime | None = None) -> float:
+        """Seconds from now until the next run_hour_utc"""
+        now = now or datetime.now(UTC)
+        next_run = now.replace(hour=self.run_hour_utc, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    async def _run_forever(self) -> None:
+        # Run at startup too, so upcoming partitions exist even if the
+        # scheduled run was missed while no replica was up
+        while True:
+            try:
+                if await self._acquire_run_lock():
+                    await self.run_once()
+                else:
+                    logger.info("Partition maintenance already running on another replica")
+            except Exception as e:
+                logger.error(f"Scheduled partition maintenance failed: {e}")
+            await asyncio.sleep(self.seconds_until_next_run())
+
+    def start(self) -> None:
+        """Schedule the daily maintenance run (called from the application lifespan)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+            logger.info(f"Partition maintenance scheduled daily at {self.run_hour_utc:02d}:00 UTC")
+
+    async def stop(self) -> None:
+        """Cancel the scheduled maintenance task"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Singleton instance
+partition_maintainer = PartitionMaintainer(
+    policies=[
+        PartitionPolicy("search_history", settings.SEARCH_HISTORY_RETENTION_MONTHS),
+        PartitionPolicy("ai_responses", settings.AI_RESPONSES_RETENTION_MONTHS),
+    ],
+    premake_months=settings.PARTITION_PREMAKE_MONTHS,
+    run_hour_utc=settings.PARTITION_MAINTENANCE_HOUR_UTC,
+    archive_schema=settings.PARTITION_ARCHIVE_SCHEMA,
+)
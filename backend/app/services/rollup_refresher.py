@@ -0,0 +1,147 @@
+"""
+Hourly rollups of search_history and ai_responses
+Popular searches and AI usage analytics read pre-aggregated hourly buckets
+instead of scanning the raw tables on every call. This job rebuilds the
+trailing few hours of buckets every few minutes, which also picks up rows
+from transactions that committed after their hour ended, and prunes buckets
+past the retention period. Each rollup is rebuilt from its newest bucket when
+that is older than the trailing window, so hours missed while no replica was
+refreshing are filled in on the next run.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.bulk import delete_in_chunks
+from app.db.session import AsyncSessionLocal
+from app.db.time_buckets import hour_start
+from app.models.jsonb_data import AIUsageRollupHourly, SearchRollupHourly
+from app.repositories.ai_response_repository import AIResponseRepository
+from app.repositories.search_history_repository import SearchHistoryRepository
+
+logger = logging.getLogger(__name__)
+
+# Serializes rebuilds across replicas (PostgreSQL transaction-level advisory lock)
+ADVISORY_LOCK_KEY = 0x726F6C6C  # "roll"
+
+
+@dataclass
+class RefreshReport:
+    """Outcome of one rollup refresh"""
+
+    rebuilt_since: datetime
+    skipped: bool = False  # Another replica was refreshing
+    pruned: int = 0
+
+
+class RollupRefresher:
+    """Keeps the hourly search and AI usage rollups up to date"""
+
+    def __init__(self, interval_seconds: int, recompute_hours: int, retention_days: int):
+        """
+        Initialize rollup refresher
+
+        Args:
+            interval_seconds: Seconds between refreshes
+            recompute_hours: Trailing whole hours rebuilt on top of the current one
+            retention_days: Buckets older than this are deleted
+        """
+        self.interval_seconds = interval_seconds
+        self.recompute_hours = recompute_hours
+        self.retention_days = retention_days
+        self._task: asyncio.Task | None = None
+
+    async def _rebuild_since(
+        self, db: AsyncSession, rollup: type, window_start: datetime, cutoff: datetime
+    ) -> datetime:
+        """
+        First hour of rollup to rebuild
+
+        The newest bucket already rolled up is the high-water mark: rebuilding
+        from it when it is older than the trailing window covers every hour
+        since the last successful refresh. Buckets past retention are skipped.
+        """
+        result = await db.execute(select(func.max(rollup.bucket)))
+        watermark = result.scalar()
+        if watermark is None:
+            return window_start
+        if watermark.tzinfo is None:  # SQLite drops the offset
+            watermark = watermark.replace(tzinfo=UTC)
+        return max(min(watermark, window_start), cutoff)
+
+    async def run_once(self, now: datetime | None = None) -> RefreshReport:
+        """
+        Rebuild the recent buckets of both rollups and prune expired ones
+
+        Args:
+            now: Current time (defaults to now, UTC)
+
+        Returns:
+            RefreshReport for the run
+        """
+        now = now or datetime.now(UTC)
+        window_start = hour_start(now) - timedelta(hours=self.recompute_hours)
+        cutoff = hour_start(now - timedelta(days=self.retention_days))
+        report = RefreshReport(rebuilt_since=window_start)
+
+        async with AsyncSessionLocal() as db_session:
+            # Delete-and-insert must not interleave with another replica's,
+            # or both inserts would land and the buckets double count
+            if db_session.bind.dialect.name == "postgresql":
+                result = await db_session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+                )
+                if not result.scalar():
+                    report.skipped = True
+                    return report
+
+            search_since = await self._rebuild_since(
+                db_session, SearchRollupHourly, window_start, cutoff
+            )
+            usage_since = await self._rebuild_since(
+                db_session, AIUsageRollupHourly, window_start, cutoff
+            )
+            await SearchHistoryRepository(db_session).rebuild_hourly_rollups(search_since)
+            await AIResponseRepository(db_session).rebuild_hourly_rollups(usage_since)
+            await db_session.commit()
+            report.rebuilt_since = min(search_since, usage_since)
+
+            for rollup in (SearchRollupHourly, AIUsageRollupHourly):
+                report.pruned += await delete_in_chunks(db_session, rollup, rollup.bucket < cutoff)
+
+        return report
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Rollup refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Schedule periodic refreshes (called from the application lifespan)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+            logger.info(f"Rollup refresh scheduled every {self.interval_seconds}s")
+
+    async def stop(self) -> None:
+        """Cancel the scheduled refresh task"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Singleton instance
+rollup_refresher = RollupRefresher(
+    interval_seconds=settings.ROLLUP_REFRESH_INTERVAL_SECONDS,
+    recompute_hours=settings.ROLLUP_RECOMPUTE_HOURS,
+    retention_days=settings.ROLLUP_RETENTION_DAYS,
+)
@@ -98,19 +98,41 @@ class ConnectionManager:
             },
         )
 
-    async def broadcast_message(self, session_id: int, message_data: dict):
+    async def broadcast_message(
+        self, session_id: int, message_data: dict, stream_id: str | None = None
+    ):
         """
         Broadcast a new message to all connected clients
 
         Args:
             session_id: Negotiation session ID
             message_data: Message data to broadcast
+            stream_id: ID of the delta stream this message completes (optional).
+                Clients replace the in-progress streamed draft with this message.
+        """
+        payload = {
+            "type": "new_message",
+            "message": message_data,
+        }
+        if stream_id is not None:
+            payload["stream_id"] = stream_id
+        await self.send_message(session_id, payload)
+
+    async def broadcast_message_delta(self, session_id: int, stream_id: str, delta: str):
+        """
+        Broadcast an incremental chunk of an agent message that is still being generated
+
+        Args:
+            session_id: Negotiation session ID
+            stream_id: ID shared by every delta of one streamed message
+            delta: Text fragment to append to the draft message
         """
         await self.send_message(
             session_id,
             {
-                "type": "new_message",
-                "message": message_data,
+                "type": "message_delta",
+                "stream_id": stream_id,
+                "delta": delta,
             },
         )
 
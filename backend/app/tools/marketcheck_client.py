@@ -2,11 +2,27 @@
 MarketCheck API Client for fetching vehicle listings
 """
 
+import importlib.util
+import logging
+import time
 from typing import Any
 
 import httpx
 
 from app.core.config import settings
+from app.metrics import external_api_duration, external_api_errors, external_api_requests
+
+logger = logging.getLogger(__name__)
+
+API_NAME = "marketcheck"
+
+
+class MarketCheckServerError(ConnectionError):
+    """MarketCheck answered with a 5xx or 429; the upstream, not the request, is at fault"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class MarketCheckAPIClient:
@@ -14,12 +30,51 @@ class MarketCheckAPIClient:
 
     BASE_URL = "https://api.marketcheck.com/v2"
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, base_url: str | None = None):
         self.api_key = (
             api_key or hasattr(settings, "MARKET_CHECK_API_KEY") or settings.MARKET_CHECK_API_KEY
         )
         if not self.api_key:
             raise ValueError("MARKET_CHECK_API_KEY is required")
+        self.base_url = base_url or self.BASE_URL
+        self._client: httpx.AsyncClient | None = None
+
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """Create the pooled keep-alive client from settings"""
+        http2 = settings.MARKET_CHECK_HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("h2 package not installed, MarketCheck client falling back to HTTP/1.1")
+            http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.MARKET_CHECK_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MARKET_CHECK_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.MARKET_CHECK_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.MARKET_CHECK_READ_TIMEOUT,
+                connect=settings.MARKET_CHECK_CONNECT_TIMEOUT,
+            ),
+        )
+
+    async def start(self) -> None:
+        """Open the shared HTTP client (called from the application lifespan)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_http_client()
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and release pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it lazily outside the lifespan (scripts, tests)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_http_client()
+        return self._client
 
     async def search_cars(
         self,
@@ -32,6 +87,7 @@ class MarketCheckAPIClient:
         max_year: int | None = None,
         max_mileage: int | None = None,
         rows: int = 10,
+        start: int = 0,
     ) -> dict[str, Any]:
         """
         Search for cars using MarketCheck API
@@ -46,11 +102,12 @@ class MarketCheckAPIClient:
             max_year: Maximum year
             max_mileage: Maximum mileage
             rows: Number of results to return (default 50)
+            start: Offset of the first result, used for pagination
 
         Returns:
             Dictionary with search results including num_found and listings
         """
-        endpoint = f"{self.BASE_URL}/search/car/active"
+        endpoint = f"{self.base_url}/search/car/active"
 
         # Build query parameters
         params = {
@@ -59,6 +116,8 @@ class MarketCheckAPIClient:
             "min_photo_links": 3,
             "photo_links": "true",
         }
+        if start:
+            params["start"] = start
 
         # Add optional parameters
         if make:
@@ -78,17 +137,39 @@ class MarketCheckAPIClient:
         if max_mileage:
             params["miles"] = f"0-{max_mileage}"
 
+        return await self._get(endpoint, params)
+
+    async def _get(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Issue a GET on the pooled client and record latency metrics
+
+        Raises:
+            ValueError: MarketCheck rejected the request (4xx other than 429)
+            MarketCheckServerError: MarketCheck returned a 5xx or 429
+            ConnectionError: The request could not be completed
+        """
+        start = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(endpoint, params=params)
-                response.raise_for_status()
-                return response.json()
+            response = await self._get_http_client().get(endpoint, params=params)
+            response.raise_for_status()
+            external_api_requests.labels(api_name=API_NAME, status="success").inc()
+            return response.json()
         except httpx.HTTPStatusError as e:
-            raise ValueError(
-                f"MarketCheck API error: {e.response.status_code} - {e.response.text}"
-            ) from e
+            external_api_requests.labels(api_name=API_NAME, status="error").inc()
+            external_api_errors.labels(
+                api_name=API_NAME, error_type=f"http_{e.response.status_code}"
+            ).inc()
+            status_code = e.response.status_code
+            message = f"MarketCheck API error: {status_code} - {e.response.text}"
+            if status_code >= 500 or status_code == 429:
+                raise MarketCheckServerError(message, status_code) from e
+            raise ValueError(message) from e
         except httpx.RequestError as e:
+            external_api_requests.labels(api_name=API_NAME, status="error").inc()
+            external_api_errors.labels(api_name=API_NAME, error_type=type(e).__name__).inc()
             raise ConnectionError(f"Request to MarketCheck API failed: {str(e)}") from e
+        finally:
+            external_api_duration.labels(api_name=API_NAME).observe(time.perf_counter() - start)
 
     def parse_listing(self, listing: dict[str, Any]) -> dict[str, Any]:
         """
@@ -1,17 +1,26 @@
 """Tests package initialization"""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
-
-from app.db.session import Base, get_db
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.functions import now
+
+from app.core.security import clear_token_cache
+from app.db.cache import cache
+from app.db.in_memory_cache import in_memory_cache
+from app.db.session import Base, get_async_db, get_db
+from app.db.time_buckets import hour_bucket
 from app.main import app
+from app.services.car_recommendation_service import marketcheck_guard
 
 
 # Add a compiler for JSONB on SQLite - render as TEXT
@@ -21,12 +30,49 @@ def compile_jsonb_sqlite(type_, compiler, **kw):
     return "TEXT"
 
 
+# SQLite's CURRENT_TIMESTAMP has no fractional part, while SQLAlchemy binds
+# datetimes as "YYYY-MM-DD HH:MM:SS.ffffff". Store server-side timestamps in the
+# same format so they compare correctly against bound values (pagination cursors).
+@compiles(now, "sqlite")
+def compile_now_sqlite(element, compiler, **kw):
+    """Render now() with microseconds on SQLite"""
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@compiles(hour_bucket, "sqlite")
+def compile_hour_bucket_sqlite(element, compiler, **kw):
+    """Render date_trunc('hour', ...) in SQLAlchemy's SQLite datetime format"""
+    return f"STRFTIME('%Y-%m-%d %H:00:00.000000', {compiler.process(element.clauses, **kw)})"
+
+
 # Use in-memory SQLite for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same file, so rows seeded through `db` are visible to the
+# async repositories and endpoints. NullPool because the TestClient runs the app
+# on its own event loop and pooled aiosqlite connections must not cross loops.
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_caches() -> Generator:
+    """Keep process-wide caches and failure state from leaking between tests"""
+    cache.clear_local()
+    in_memory_cache.clear()
+    marketcheck_guard.clear_local()
+    clear_token_cache()
+    yield
+    cache.clear_local()
+    in_memory_cache.clear()
+    marketcheck_guard.clear_local()
+    clear_token_cache()
+
 
 @pytest.fixture(scope="function")
 def db() -> Generator:
@@ -40,6 +86,19 @@ def db() -> Generator:
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest_asyncio.fixture
+async def async_db(db) -> AsyncGenerator:
+    """Async session on the per-test database created by the db fixture"""
+    async with TestingAsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def async_session_factory(db):
+    """Session factory to patch in for code that opens its own AsyncSessionLocal"""
+    return TestingAsyncSessionLocal
+
+
 @pytest.fixture(scope="function")
 def client(db) -> Generator:
     """Create a test client with database dependency override and mocked external services"""
@@ -50,6 +109,10 @@ def client(db) -> Generator:
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     # Mock Redis connection
     mock_redis = MagicMock()
     mock_redis.connect_redis = AsyncMock()
@@ -76,6 +139,7 @@ def client(db) -> Generator:
     )
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     with (
         patch("app.db.rabbitmq.rabbitmq", mock_rabbitmq),
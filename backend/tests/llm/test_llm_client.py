@@ -1,7 +1,8 @@
-"""Test LLM client functionality with synchronous OpenAI client"""
+"""Test LLM client functionality with synchronous and async OpenAI clients"""
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from openai import APIError, APITimeoutError, AuthenticationError, RateLimitError
@@ -30,6 +31,14 @@ class CarRecommendation(BaseModel):
     key_features: list[str]
 
 
+@pytest.fixture(autouse=True)
+def mock_async_openai():
+    """Patch AsyncOpenAI so client construction never builds a real HTTP client"""
+    with patch("app.llm.llm_client.AsyncOpenAI") as mock_async_cls:
+        mock_async_cls.return_value = MagicMock()
+        yield mock_async_cls
+
+
 @pytest.fixture
 def mock_openai_client():
     """Mock synchronous OpenAI client"""
@@ -524,3 +533,220 @@ class TestLLMClient:
                 # Empty response check happens before other processing
                 assert exc_info.value.status_code == 500
                 assert "empty response" in exc_info.value.message.lower()
+
+
+class TestAsyncLLMClient:
+    """Test the AsyncOpenAI-backed generation path"""
+
+    @pytest.fixture
+    def async_client(self, mock_async_openai):
+        """LLMClient whose async OpenAI client is an AsyncMock"""
+        openai_async = MagicMock()
+        openai_async.chat.completions.create = AsyncMock()
+        mock_async_openai.return_value = openai_async
+
+        with patch("app.llm.llm_client.settings") as mock_settings:
+            mock_settings.OPENAI_API_KEY = "test-api-key"
+            mock_settings.OPENROUTER_API_KEY = None
+            mock_settings.OPENAI_MODEL = "gpt-4"
+            mock_settings.OPENAI_BASE_URL = None
+            mock_settings.LLM_CACHE_ENABLED = False
+
+            with patch("app.llm.llm_client.OpenAI"):
+                client = LLMClient()
+                yield client, openai_async
+
+    def test_async_client_initialized_with_same_config(self, mock_async_openai):
+        """Test AsyncOpenAI is created alongside the sync client"""
+        with patch("app.llm.llm_client.settings") as mock_settings:
+            mock_settings.OPENAI_API_KEY = None
+            mock_settings.OPENROUTER_API_KEY = "openrouter-key"
+            mock_settings.OPENAI_MODEL = "gpt-4"
+            mock_settings.OPENAI_BASE_URL = "https://openrouter.ai/api/v1"
+
+            with patch("app.llm.llm_client.OpenAI"):
+                client = LLMClient()
+
+        mock_async_openai.assert_called_once_with(
+            api_key="openrouter-key", base_url="https://openrouter.ai/api/v1"
+        )
+        assert client.async_client is mock_async_openai.return_value
+
+    @pytest.mark.asyncio
+    async def test_agenerate_structured_json_success(self, async_client, mock_openai_response):
+        """Test async structured JSON generation validates the response"""
+        client, openai_async = async_client
+        openai_async.chat.completions.create.return_value = mock_openai_response
+
+        result = await client.agenerate_structured_json(
+            prompt_id="evaluation",
+            variables={
+                "vin": "1HGBH41JXMN109186",
+                "make": "Honda",
+                "model": "Civic",
+                "year": 2019,
+                "mileage": 35000,
+                "condition": "excellent",
+                "asking_price": 22000,
+            },
+            response_model=DealEvaluation,
+        )
+
+        assert isinstance(result, DealEvaluation)
+        assert result.fair_value == 24500.0
+        call_kwargs = openai_async.chat.completions.create.call_args.kwargs
+        assert call_kwargs["response_format"] == {"type": "json_object"}
+        assert call_kwargs["messages"][0]["role"] == "system"
+
+    @pytest.mark.asyncio
+    async def test_agenerate_structured_json_validation_error(
+        self, async_client, mock_openai_response
+    ):
+        """Test async path applies the same Pydantic validation"""
+        client, openai_async = async_client
+        mock_openai_response.choices[0].message.content = json.dumps({"fair_value": -1})
+        openai_async.chat.completions.create.return_value = mock_openai_response
+
+        with pytest.raises(ApiError) as exc_info:
+            await client.agenerate_structured_json(
+                prompt_id="evaluation",
+                variables={
+                    "vin": "1HGBH41JXMN109186",
+                    "make": "Honda",
+                    "model": "Civic",
+                    "year": 2019,
+                    "mileage": 35000,
+                    "condition": "excellent",
+                    "asking_price": 22000,
+                },
+                response_model=DealEvaluation,
+            )
+
+        assert exc_info.value.status_code == 500
+        assert "validation" in exc_info.value.message.lower()
+
+    @pytest.mark.asyncio
+    async def test_agenerate_text_rate_limit_error(self, async_client):
+        """Test async path maps OpenAI errors to ApiError"""
+        client, openai_async = async_client
+        openai_async.chat.completions.create.side_effect = RateLimitError(
+            "Rate limit exceeded", response=MagicMock(), body=None
+        )
+
+        with pytest.raises(ApiError) as exc_info:
+            await client.agenerate_text(
+                prompt_id="vehicle_comparison",
+                variables={
+                    "vehicle_a": "VIN: 1HGBH41JXMN109186",
+                    "vehicle_b": "VIN: 2T1BURHE0JC123456",
+                    "user_needs": "general comparison",
+                },
+            )
+
+        assert exc_info.value.status_code == 429
+
+    @pytest.mark.asyncio
+    async def test_agenerate_text_client_not_available(self):
+        """Test async text generation when client is not available"""
+        with patch("app.llm.llm_client.settings") as mock_settings:
+            mock_settings.OPENAI_API_KEY = None
+            mock_settings.OPENROUTER_API_KEY = None
+
+            client = LLMClient()
+
+        with pytest.raises(ApiError) as exc_info:
+            await client.agenerate_text(prompt_id="negotiation", variables={})
+
+        assert exc_info.value.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_concurrent_generations_overlap(self, async_client, mock_text_response):
+        """Test concurrent async generations run in parallel on one event loop"""
+        client, openai_async = async_client
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_completion(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return mock_text_response
+
+        openai_async.chat.completions.create.side_effect = slow_completion
+        variables = {
+            "make": "Honda",
+            "model": "Accord",
+            "year": 2020,
+            "asking_price": 25000,
+            "mileage": 45000,
+            "condition": "good",
+            "fair_value": 23500,
+            "score": 7.5,
+        }
+
+        results = await asyncio.gather(
+            *[client.agenerate_text(prompt_id="negotiation", variables=variables) for _ in range(5)]
+        )
+
+        assert results == ["This is a test response from the LLM."] * 5
+        assert max_in_flight == 5
+
+    @pytest.mark.asyncio
+    async def test_astream_text_yields_deltas(self, async_client):
+        """Test streaming yields non-empty content deltas in order"""
+        client, openai_async = async_client
+
+        def make_chunk(content):
+            chunk = MagicMock()
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = content
+            return chunk
+
+        async def fake_stream():
+            for content in ["Counter ", None, "at ", "$23,000."]:
+                yield make_chunk(content)
+
+        openai_async.chat.completions.create.return_value = fake_stream()
+
+        deltas = [
+            delta
+            async for delta in client.astream_text(
+                prompt_id="vehicle_comparison",
+                variables={
+                    "vehicle_a": "VIN: 1HGBH41JXMN109186",
+                    "vehicle_b": "VIN: 2T1BURHE0JC123456",
+                    "user_needs": "general comparison",
+                },
+            )
+        ]
+
+        assert deltas == ["Counter ", "at ", "$23,000."]
+        assert openai_async.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_astream_text_empty_stream(self, async_client):
+        """Test a stream without content raises an empty response error"""
+        client, openai_async = async_client
+
+        async def fake_stream():
+            chunk = MagicMock()
+            chunk.choices = []
+            yield chunk
+
+        openai_async.chat.completions.create.return_value = fake_stream()
+
+        with pytest.raises(ApiError) as exc_info:
+            async for _ in client.astream_text(
+                prompt_id="vehicle_comparison",
+                variables={
+                    "vehicle_a": "VIN: 1HGBH41JXMN109186",
+                    "vehicle_b": "VIN: 2T1BURHE0JC123456",
+                    "user_needs": "general comparison",
+                },
+            ):
+                pass
+
+        assert exc_info.value.status_code == 500
+        assert "empty response" in exc_info.value.message.lower()
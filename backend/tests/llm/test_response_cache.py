@@ -0,0 +1,213 @@
+"""Test content-addressed LLM response cache"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from app.db.in_memory_cache import InMemoryCache
+from app.llm.llm_client import LLMClient
+from app.llm.response_cache import LLMResponseCache
+
+EVALUATION_VARIABLES = {
+    "vin": "1HGBH41JXMN109186",
+    "make": "Honda",
+    "model": "Civic",
+    "year": 2019,
+    "mileage": 35000,
+    "condition": "excellent",
+    "asking_price": 22000,
+}
+
+
+class Evaluation(BaseModel):
+    """Minimal response model for cache tests"""
+
+    fair_value: float
+    score: float
+
+
+def _messages(prompt: str) -> list[dict[str, str]]:
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": prompt}]
+
+
+def _completion(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.usage = None
+    return response
+
+
+class TestLLMResponseCacheKeys:
+    """Test cache key construction and TTL policies"""
+
+    def test_key_is_deterministic(self):
+        """Same request produces the same key"""
+        cache = LLMResponseCache()
+        key1 = cache.build_key(
+            "evaluation", _messages("a"), "evaluator", "gpt-4", 0.7, None, "json"
+        )
+        key2 = cache.build_key(
+            "evaluation", _messages("a"), "evaluator", "gpt-4", 0.7, None, "json"
+        )
+        assert key1 == key2
+        assert key1.startswith("llm_cache:evaluation:")
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"messages": _messages("b")},
+            {"agent_role": "research"},
+            {"model": "gpt-4o"},
+            {"temperature": 0.3},
+            {"max_tokens": 500},
+            {"output_format": "text"},
+        ],
+    )
+    def test_key_changes_with_each_component(self, overrides):
+        """Every request component is part of the key"""
+        cache = LLMResponseCache()
+        base = {
+            "prompt_id": "evaluation",
+            "messages": _messages("a"),
+            "agent_role": "evaluator",
+            "model": "gpt-4",
+            "temperature": 0.7,
+            "max_tokens": None,
+            "output_format": "json",
+        }
+        assert cache.build_key(**base) != cache.build_key(**{**base, **overrides})
+
+    def test_ttl_policy(self):
+        """Only prompts with a policy are cacheable"""
+        cache = LLMResponseCache(ttl_policies={"vehicle_comparison": 60})
+        assert cache.get_ttl("vehicle_comparison") == 60
+        assert cache.get_ttl("negotiation_chat") is None
+
+
+class TestLLMClientResponseCaching:
+    """Test LLMClient async paths read and write the response cache"""
+
+    @pytest.fixture
+    def client_and_api(self):
+        """LLMClient with a mocked AsyncOpenAI and an isolated in-memory cache"""
+        api = MagicMock()
+        api.chat.completions.create = AsyncMock()
+        backend = InMemoryCache()
+
+        with (
+            patch("app.llm.llm_client.settings") as mock_settings,
+            patch("app.llm.llm_client.OpenAI"),
+            patch("app.llm.llm_client.AsyncOpenAI", return_value=api),
+            patch("app.db.cache.redis_client") as mock_redis,
+            patch("app.db.cache.in_memory_cache", backend),
+        ):
+            mock_settings.OPENAI_API_KEY = "test-api-key"
+            mock_settings.OPENROUTER_API_KEY = None
+            mock_settings.OPENAI_MODEL = "gpt-4"
+            mock_settings.OPENAI_BASE_URL = None
+            mock_settings.LLM_CACHE_ENABLED = True
+            mock_redis.get_binary_client.side_effect = RuntimeError("not connected")
+            yield LLMClient(), api
+
+    @pytest.mark.asyncio
+    async def test_structured_json_served_from_cache(self, client_and_api):
+        """Second identical request returns the cached validated payload"""
+        client, api = client_and_api
+        api.chat.completions.create.return_value = _completion(
+            json.dumps({"fair_value": 24500.0, "score": 7.5})
+        )
+
+        first = await client.agenerate_structured_json(
+            prompt_id="evaluation", variables=EVALUATION_VARIABLES, response_model=Evaluation
+        )
+        second = await client.agenerate_structured_json(
+            prompt_id="evaluation", variables=EVALUATION_VARIABLES, response_model=Evaluation
+        )
+
+        assert first == second == Evaluation(fair_value=24500.0, score=7.5)
+        api.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_different_temperature_misses_cache(self, client_and_api):
+        """Temperature is part of the cache key"""
+        client, api = client_and_api
+        api.chat.completions.create.return_value = _completion(
+            json.dumps({"fair_value": 24500.0, "score": 7.5})
+        )
+
+        for temperature in (0.7, 0.2):
+            await client.agenerate_structured_json(
+                prompt_id="evaluation",
+                variables=EVALUATION_VARIABLES,
+                response_model=Evaluation,
+                temperature=temperature,
+            )
+
+        assert api.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses_cache(self, client_and_api):
+        """use_cache=False always calls the API"""
+        client, api = client_and_api
+        api.chat.completions.create.return_value = _completion(
+            json.dumps({"fair_value": 24500.0, "score": 7.5})
+        )
+
+        for _ in range(2):
+            await client.agenerate_structured_json(
+                prompt_id="evaluation",
+                variables=EVALUATION_VARIABLES,
+                response_model=Evaluation,
+                use_cache=False,
+            )
+
+        assert api.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_text_without_policy_is_not_cached(self, client_and_api):
+        """Prompts without a TTL policy are never cached"""
+        client, api = client_and_api
+        api.chat.completions.create.return_value = _completion("Counter at $23,000.")
+        variables = {
+            "make": "Honda",
+            "model": "Accord",
+            "year": 2020,
+            "asking_price": 25000,
+            "mileage": 45000,
+            "condition": "good",
+            "fair_value": 23500,
+            "score": 7.5,
+        }
+
+        for _ in range(2):
+            await client.agenerate_text(prompt_id="negotiation", variables=variables)
+
+        assert api.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_text_with_policy_is_cached_and_counted(self, client_and_api):
+        """Cached text responses increment the hit/miss counters"""
+        from app.metrics import cache_hits, cache_misses
+
+        client, api = client_and_api
+        api.chat.completions.create.return_value = _completion("Vehicle A is the better value.")
+        variables = {
+            "vehicle_a": "VIN: 1HGBH41JXMN109186",
+            "vehicle_b": "VIN: 2T1BURHE0JC123456",
+            "user_needs": "general comparison",
+        }
+        hits_before = cache_hits.labels(cache_name="llm_response")._value.get()
+        misses_before = cache_misses.labels(cache_name="llm_response")._value.get()
+
+        for _ in range(3):
+            result = await client.agenerate_text(
+                prompt_id="vehicle_comparison", variables=variables
+            )
+
+        assert result == "Vehicle A is the better value."
+        api.chat.completions.create.assert_awaited_once()
+        assert cache_hits.labels(cache_name="llm_response")._value.get() - hits_before == 2
+        assert cache_misses.labels(cache_name="llm_response")._value.get() - misses_before == 1
@@ -6,7 +6,7 @@ This script creates a test deal and walks through the evaluation pipeline
 import asyncio
 import json
 
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal
 from app.models.evaluation import EvaluationStatus, PipelineStep
 from app.models.models import Deal, User
 from app.repositories.evaluation_repository import EvaluationRepository
@@ -15,7 +15,7 @@ from app.services.deal_evaluation_service import deal_evaluation_service
 
 async def main():
     """Run manual test of evaluation pipeline"""
-    db = SessionLocal()
+    db = AsyncSessionLocal()
 
     try:
         # Create test user
@@ -27,8 +27,8 @@ async def main():
             full_name="Test User",
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         print(f"✓ Created user: {user.username} (ID: {user.id})")
 
         # Create test deal
@@ -44,8 +44,8 @@ async def main():
             asking_price=25000.00,
         )
         db.add(deal)
-        db.commit()
-        db.refresh(deal)
+        await db.commit()
+        await db.refresh(deal)
         print(
             f"✓ Created deal: {deal.vehicle_year} {deal.vehicle_make} {deal.vehicle_model} (ID: {deal.id})"
         )
@@ -53,7 +53,7 @@ async def main():
         # Create evaluation
         print("\n=== Starting Deal Evaluation Pipeline ===")
         repo = EvaluationRepository(db)
-        evaluation = repo.create(
+        evaluation = await repo.create(
             user_id=user.id,
             deal_id=deal.id,
             status=EvaluationStatus.ANALYZING,
@@ -67,7 +67,7 @@ async def main():
         result = await deal_evaluation_service.process_evaluation_step(
             db=db, evaluation_id=evaluation.id, user_answers=None
         )
-        db.refresh(evaluation)
+        await db.refresh(evaluation)
         print(f"Status: {evaluation.status.value}")
         print(f"Questions: {result.get('questions', [])}")
 
@@ -80,7 +80,7 @@ async def main():
         result = await deal_evaluation_service.process_evaluation_step(
             db=db, evaluation_id=evaluation.id, user_answers=answers
         )
-        db.refresh(evaluation)
+        await db.refresh(evaluation)
         print(f"✓ Status: {evaluation.status.value}, Step: {evaluation.current_step.value}")
         if result.get("assessment"):
             print(f"Assessment: {json.dumps(result['assessment'], indent=2)}")
@@ -90,7 +90,7 @@ async def main():
         result = await deal_evaluation_service.process_evaluation_step(
             db=db, evaluation_id=evaluation.id, user_answers=None
         )
-        db.refresh(evaluation)
+        await db.refresh(evaluation)
         print(f"✓ Status: {evaluation.status.value}, Step: {evaluation.current_step.value}")
         if result.get("assessment"):
             assessment = result["assessment"]
@@ -102,7 +102,7 @@ async def main():
         result = await deal_evaluation_service.process_evaluation_step(
             db=db, evaluation_id=evaluation.id, user_answers=None
         )
-        db.refresh(evaluation)
+        await db.refresh(evaluation)
         if result.get("questions"):
             print(f"Questions: {result['questions']}")
             # Provide financing answers
@@ -110,7 +110,7 @@ async def main():
             result = await deal_evaluation_service.process_evaluation_step(
                 db=db, evaluation_id=evaluation.id, user_answers=financing_answers
             )
-            db.refresh(evaluation)
+            await db.refresh(evaluation)
         print(f"✓ Status: {evaluation.status.value}, Step: {evaluation.current_step.value}")
         if result.get("assessment"):
             print(f"Assessment: {json.dumps(result['assessment'], indent=2)}")
@@ -120,7 +120,7 @@ async def main():
         result = await deal_evaluation_service.process_evaluation_step(
             db=db, evaluation_id=evaluation.id, user_answers=None
         )
-        db.refresh(evaluation)
+        await db.refresh(evaluation)
         print(f"✓ Status: {evaluation.status.value}, Step: {evaluation.current_step.value}")
         if result.get("assessment"):
             assessment = result["assessment"]
@@ -132,7 +132,7 @@ async def main():
         result = await deal_evaluation_service.process_evaluation_step(
             db=db, evaluation_id=evaluation.id, user_answers=None
         )
-        db.refresh(evaluation)
+        await db.refresh(evaluation)
         print(f"✓ Status: {evaluation.status.value}")
         if result.get("assessment"):
             assessment = result["assessment"]
@@ -155,7 +155,7 @@ async def main():
         traceback.print_exc()
 
     finally:
-        db.close()
+        await db.close()
 
 
 if __name__ == "__main__":
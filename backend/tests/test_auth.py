@@ -241,3 +241,27 @@ def test_refresh_token(client: TestClient):
     assert "access_token" in data
     assert "refresh_token" in data
     assert data["token_type"] == "bearer"
+
+
+def test_reset_password_invalidates_cached_user(client: TestClient):
+    """A password reset drops the user's cached identity"""
+    from unittest.mock import AsyncMock, patch
+
+    from app.models.models import User
+
+    with (
+        patch(
+            "app.api.v1.endpoints.auth.UserRepository.reset_password",
+            return_value=User(id=42, email="test@example.com", username="testuser"),
+        ),
+        patch(
+            "app.api.v1.endpoints.auth.invalidate_cached_user", new_callable=AsyncMock
+        ) as invalidate,
+    ):
+        response = client.post(
+            "/api/v1/auth/reset-password",
+            json={"token": "valid-reset-token", "new_password": "Newpassword456!"},
+        )
+
+    assert response.status_code == 200
+    invalidate.assert_awaited_once_with(42)
@@ -0,0 +1,303 @@
+"""
+Tests for the two-tier (L1 + Redis) cache facade
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
+
+from app.db import serialization
+from app.db.cache import TAG_KEY_PREFIX, TwoTierCache, deal_tag, vin_tag
+from app.db.in_memory_cache import InMemoryCache
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [
+            await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in that records calls and published messages"""
+
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.published: list[tuple[str, str]] = []
+        self.get_calls = 0
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        self.get_calls += 1
+        return self.store.get(key)
+
+    async def pttl(self, key):
+        return self.ttls[key] * 1000 if key in self.ttls else -1
+
+    async def set(self, key, value):
+        self.store[key] = value
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def sadd(self, key, *members):
+        self.store.setdefault(key, set()).update(m.encode() for m in members)
+
+    async def smembers(self, key):
+        return set(self.store.get(key, set()))
+
+    async def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture
+def redis():
+    redis = FakeRedis()
+    with patch("app.db.cache.redis_client.get_binary_client", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+def cache():
+    return TwoTierCache(l1_maxsize=100, l1_ttl=30, channel="cache:invalidate")
+
+
+@pytest.mark.asyncio
+async def test_hot_key_served_from_l1_without_redis_round_trip(cache, redis):
+    redis.store["k"] = serialization.encode({"v": 1})
+
+    assert await cache.get("k") == {"v": 1}
+    assert await cache.get("k") == {"v": 1}
+    assert await cache.get("k") == {"v": 1}
+
+    assert redis.get_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_set_writes_through_and_publishes_invalidation(cache, redis):
+    await cache.set("k", {"v": 1}, ex=60)
+
+    assert serialization.decode(redis.store["k"]) == {"v": 1}
+    assert redis.ttls["k"] == 60
+    assert redis.published == [("cache:invalidate", f"{cache.instance_id}:k")]
+    assert await cache.get("k") == {"v": 1}
+    assert redis.get_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidation_from_another_replica_drops_l1(cache, redis):
+    other = TwoTierCache(l1_maxsize=100, l1_ttl=30, channel="cache:invalidate")
+    redis.store["k"] = serialization.encode("old")
+    assert await cache.get("k") == "old"
+
+    await other.set("k", "new")
+    _, message = redis.published[-1]
+    await cache.handle_invalidation(message.encode())
+
+    assert await cache.get("k") == "new"
+
+
+@pytest.mark.asyncio
+async def test_own_invalidation_is_ignored(cache, redis):
+    await cache.set("k", "v")
+    _, message = redis.published[-1]
+
+    await cache.handle_invalidation(message)
+
+    assert await cache.get("k") == "v"
+    assert redis.get_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_l2_hit_reads_value_and_ttl_in_one_round_trip(cache, redis):
+    redis.store["k"] = serialization.encode("v")
+    redis.ttls["k"] = 1
+
+    assert await cache.get("k") == "v"
+    assert redis.round_trips == 1
+
+    # L1 keeps the entry only for the TTL it had left in Redis
+    await asyncio.sleep(1.05)
+    redis.store.pop("k")
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_l1_respects_shorter_key_ttl(cache, redis):
+    await cache.set("k", "v", ex=1)
+    await asyncio.sleep(1.05)
+    redis.store.pop("k")
+
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_delete_clears_both_tiers(cache, redis):
+    await cache.set("k", "v")
+    await cache.delete("k")
+
+    assert "k" not in redis.store
+    assert await cache.get("k") is None
+    assert len(redis.published) == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_treated_as_misses(cache, redis):
+    redis.get = AsyncMock(side_effect=ResponseError("WRONGTYPE"))
+    redis.setex = AsyncMock(side_effect=ResponseError("WRONGTYPE"))
+
+    with patch("app.db.cache.redis_client.report_error") as report_error:
+        await cache.set("k", "v", ex=60)
+        assert await cache.get("k") is None
+
+    assert report_error.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_fail_over_to_in_memory_cache(cache, redis):
+    redis.get = AsyncMock(side_effect=RedisConnectionError("down"))
+    redis.setex = AsyncMock(side_effect=RedisConnectionError("down"))
+    backend = InMemoryCache()
+
+    with (
+        patch("app.db.cache.in_memory_cache", backend),
+        patch("app.db.cache.redis_client.report_error") as report_error,
+    ):
+        await cache.set("k", "v", ex=60)
+        assert await cache.get("k") == "v"
+
+    report_error.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_local_tiers_are_cleared_when_redis_recovers(cache, redis):
+    backend = InMemoryCache()
+    with patch("app.db.cache.in_memory_cache", backend):
+        with patch(
+            "app.db.cache.redis_client.get_binary_client", side_effect=RuntimeError("unhealthy")
+        ):
+            await cache.set("k", "written during outage", ex=3600)
+
+        redis.store["k"] = serialization.encode("current")
+        assert await cache.get("k") == "current"
+        assert await backend.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_in_memory_cache_without_redis(cache):
+    backend = InMemoryCache()
+    with (
+        patch(
+            "app.db.cache.redis_client.get_binary_client", side_effect=RuntimeError("not connected")
+        ),
+        patch("app.db.cache.in_memory_cache", backend),
+    ):
+        await cache.set("k", "v", ex=60)
+        assert await cache.get("k") == "v"
+        assert serialization.decode(await backend.get("k")) == "v"
+
+        await cache.delete("k")
+        assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_loads_once(cache, redis):
+    loader = AsyncMock(return_value="loaded")
+
+    assert await cache.get_or_set("k", loader, ex=60) == "loaded"
+    assert await cache.get_or_set("k", loader, ex=60) == "loaded"
+
+    loader.assert_awaited_once()
+    assert serialization.decode(redis.store["k"]) == "loaded"
+
+
+@pytest.mark.asyncio
+async def test_reads_legacy_json_text_entries(cache, redis):
+    """Entries written as json.dumps text before the format header existed still decode"""
+    redis.store["k"] = b'{"cached_at": 1.0, "result": {"total_found": 3}}'
+
+    assert await cache.get("k") == {"cached_at": 1.0, "result": {"total_found": 3}}
+
+
+@pytest.mark.asyncio
+async def test_undecodable_entry_is_a_miss(cache, redis):
+    redis.store["k"] = b"\x00\x7fgarbage"
+
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tags_drops_every_tagged_key(cache, redis):
+    await cache.set("eval:a", {"v": 1}, ex=60, tags=[deal_tag(1), vin_tag("vin1")])
+    await cache.set("eval:b", {"v": 2}, ex=60, tags=[deal_tag(1)])
+    await cache.set("eval:c", {"v": 3}, ex=60, tags=[deal_tag(2)])
+    redis.published.clear()
+    redis.round_trips = 0
+
+    removed = await cache.invalidate_tags(deal_tag(1))
+
+    assert removed == ["eval:a", "eval:b"]
+    # One round-trip to read the tag sets, one to delete and publish
+    assert redis.round_trips == 2
+    assert await cache.get("eval:a") is None
+    assert await cache.get("eval:b") is None
+    assert await cache.get("eval:c") == {"v": 3}
+    assert f"{TAG_KEY_PREFIX}deal:1" not in redis.store
+    # Other replicas drop their L1 copies too
+    assert sorted(msg for _, msg in redis.published) == [
+        f"{cache.instance_id}:eval:a",
+        f"{cache.instance_id}:eval:b",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_tag_sets_outlive_their_members(cache, redis):
+    await cache.set("k", "v", ex=60, tags=[vin_tag("abc")])
+
+    assert redis.ttls[f"{TAG_KEY_PREFIX}vin:ABC"] >= 60
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tags_without_redis(cache):
+    backend = InMemoryCache()
+    with (
+        patch(
+            "app.db.cache.redis_client.get_binary_client", side_effect=RuntimeError("not connected")
+        ),
+        patch("app.db.cache.in_memory_cache", backend),
+    ):
+        await cache.set("a", "v", ex=60, tags=[deal_tag(7)])
+        await cache.set("b", "v", ex=60)
+
+        assert await cache.invalidate_tags(deal_tag(7)) == ["a"]
+        assert await cache.get("a") is None
+        assert await cache.get("b") == "v"
@@ -0,0 +1,188 @@
+"""
+Tests for the cache warming job
+"""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.evaluation import DealEvaluation, EvaluationStatus, PipelineStep
+from app.models.models import Deal
+from app.services.cache_warmer import CacheWarmer, WarmingBudget
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return MagicMock()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _warmer(**overrides) -> CacheWarmer:
+    params = {
+        "top_searches": 3,
+        "top_deals": 5,
+        "lookback_days": 7,
+        "max_marketcheck_calls": 100,
+        "max_llm_calls": 100,
+        "run_hour_utc": 11,
+    }
+    params.update(overrides)
+    return CacheWarmer(**params)
+
+
+@pytest.fixture
+def popular():
+    rows = [
+        {"make": "Toyota", "model": "Camry", "search_count": 40},
+        {"make": "toyota", "model": "camry ", "search_count": 12},
+        {"make": "Honda", "model": "Civic", "search_count": 30},
+        {"make": None, "model": None, "search_count": 25},
+        {"make": "Ford", "model": "F-150", "search_count": 20},
+        {"make": "Tesla", "model": "Model 3", "search_count": 10},
+    ]
+    repo = MagicMock()
+    repo.get_popular_searches = AsyncMock(return_value=rows)
+    with (
+        patch("app.services.cache_warmer.AsyncSessionLocal", _FakeSession),
+        patch("app.services.cache_warmer.SearchHistoryRepository", return_value=repo),
+    ):
+        yield repo
+
+
+@pytest.fixture
+def search_service():
+    with patch("app.services.cache_warmer.car_recommendation_service") as service:
+        service.has_fresh_result = AsyncMock(return_value=False)
+        service.warm_search = AsyncMock()
+        yield service
+
+
+@pytest.fixture
+def no_evaluations():
+    with patch.object(CacheWarmer, "_warm_evaluations", AsyncMock()):
+        yield
+
+
+def test_budget_reserves_all_or_nothing():
+    budget = WarmingBudget(marketcheck_calls=2, llm_calls=1)
+
+    assert budget.try_spend(marketcheck_calls=1, llm_calls=1)
+    assert not budget.try_spend(marketcheck_calls=1, llm_calls=1)
+    assert budget.marketcheck_calls == 1
+    assert budget.llm_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_warms_top_normalized_searches(popular, search_service, no_evaluations):
+    report = await _warmer().run_once()
+
+    warmed = [call.args[:2] for call in search_service.warm_search.call_args_list]
+    assert warmed == [("toyota", "camry"), ("honda", "civic"), ("ford", "f-150")]
+    assert report.searches_warmed == 3
+
+
+@pytest.mark.asyncio
+async def test_fresh_searches_are_not_recomputed(popular, search_service, no_evaluations):
+    search_service.has_fresh_result = AsyncMock(side_effect=[True, False, True])
+
+    report = await _warmer().run_once()
+
+    assert search_service.warm_search.call_count == 1
+    assert report.already_cached == 2
+
+
+@pytest.mark.asyncio
+async def test_search_budget_is_enforced(popular, search_service, no_evaluations):
+    # One search can cost a page per 50 listings plus an LLM ranking
+    with patch("app.services.cache_warmer.llm_client") as mock_llm:
+        mock_llm.is_available.return_value = True
+        report = await _warmer(max_marketcheck_calls=100, max_llm_calls=2).run_once()
+
+    assert search_service.warm_search.call_count == 2
+    assert report.skipped_for_budget == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_search_does_not_stop_the_run(popular, search_service, no_evaluations):
+    search_service.warm_search = AsyncMock(side_effect=[ConnectionError("down"), None, None])
+
+    report = await _warmer().run_once()
+
+    assert report.failed == 1
+    assert report.searches_warmed == 2
+
+
+@pytest.mark.asyncio
+async def test_warms_evaluations_of_most_active_deals(db, async_session_factory):
+    busy = Deal(
+        customer_name="A",
+        customer_email="a@example.com",
+        vehicle_make="Toyota",
+        vehicle_model="Camry",
+        vehicle_year=2021,
+        vehicle_mileage=30000,
+        vehicle_vin="4T1B11HK5KU000001",
+        asking_price=25000.0,
+    )
+    quiet = Deal(
+        customer_name="B",
+        customer_email="b@example.com",
+        vehicle_make="Honda",
+        vehicle_model="Civic",
+        vehicle_year=2020,
+        vehicle_mileage=40000,
+        vehicle_vin="2HGFC2F59LH000002",
+        asking_price=19000.0,
+    )
+    db.add_all([busy, quiet])
+    db.commit()
+    for deal, count in ((busy, 3), (quiet, 1)):
+        for _ in range(count):
+            db.add(
+                DealEvaluation(
+                    user_id=1,
+                    deal_id=deal.id,
+                    status=EvaluationStatus.COMPLETED,
+                    current_step=PipelineStep.PRICE,
+                    result_json={
+                        "user_inputs": {"vin": deal.vehicle_vin, "condition_description": "good"}
+                    },
+                )
+            )
+    db.commit()
+
+    evaluate = AsyncMock()
+    with (
+        patch("app.services.cache_warmer.AsyncSessionLocal", async_session_factory),
+        patch.object(CacheWarmer, "_warm_searches", AsyncMock()),
+        patch("app.services.cache_warmer.llm_client") as mock_llm,
+        patch(
+            "app.services.cache_warmer.deal_evaluation_service.has_cached_evaluation",
+            AsyncMock(return_value=False),
+        ),
+        patch("app.services.cache_warmer.deal_evaluation_service.evaluate_deal", evaluate),
+    ):
+        mock_llm.is_available.return_value = True
+        report = await _warmer(top_deals=1).run_once()
+
+    evaluate.assert_awaited_once_with(
+        vehicle_vin="4T1B11HK5KU000001",
+        asking_price=25000.0,
+        condition="good",
+        mileage=30000,
+        deal_id=busy.id,
+    )
+    assert report.evaluations_warmed == 1
+
+
+def test_next_run_is_today_or_tomorrow():
+    warmer = _warmer(run_hour_utc=11)
+
+    morning = datetime(2026, 3, 2, 9, 30, tzinfo=UTC)
+    assert warmer.seconds_until_next_run(morning) == 90 * 60
+
+    evening = datetime(2026, 3, 2, 18, 0, tzinfo=UTC)
+    assert warmer.seconds_until_next_run(evening) == 17 * 3600
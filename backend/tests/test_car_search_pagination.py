@@ -0,0 +1,203 @@
+"""
+Tests for paginated MarketCheck fetching and incremental candidate selection
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.services.car_recommendation_service import CarRecommendationService
+from app.tools.marketcheck_client import marketcheck_client
+
+
+def _raw_listing(index: int) -> dict:
+    """Build a raw MarketCheck listing whose quality rises with index"""
+    return {
+        "vin": f"VIN{index:05d}",
+        "price": 20000 + index,
+        "miles": max(0, 100000 - index * 1000),
+        "build": {"make": "Toyota", "model": "Camry", "year": 2015 + index % 10},
+        "carfax_clean_title": index % 2 == 0,
+        "carfax_1_owner": index % 3 == 0,
+    }
+
+
+class FakeMarketCheck:
+    """Stand-in for _search_marketcheck_with_retry that serves paged results"""
+
+    def __init__(self, num_found: int, fail_offsets: set[int] | None = None, delay: float = 0.01):
+        self.num_found = num_found
+        self.fail_offsets = fail_offsets or set()
+        self.delay = delay
+        self.calls: list[tuple[int, int]] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, rows: int = 10, start: int = 0, **kwargs):
+        self.calls.append((start, rows))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if start in self.fail_offsets:
+                raise ConnectionError("page failed")
+            end = min(start + rows, self.num_found)
+            return {
+                "num_found": self.num_found,
+                "listings": [_raw_listing(i) for i in range(start, end)],
+            }
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def service():
+    return CarRecommendationService()
+
+
+@pytest.fixture
+def paging_settings():
+    with (
+        patch.object(settings, "MARKET_CHECK_PAGE_SIZE", 50),
+        patch.object(settings, "MARKET_CHECK_MAX_CONCURRENT_PAGES", 2),
+        patch.object(settings, "LLM_CANDIDATE_POOL_SIZE", 20),
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_fetches_remaining_pages_with_bounded_concurrency(
+    service, paging_settings
+):
+    """The first page is fetched alone, the rest in parallel up to the limit"""
+    fake = FakeMarketCheck(num_found=1000)
+
+    with patch.object(service, "_search_marketcheck_with_retry", new=fake):
+        pages = [page async for page in service._iter_marketcheck_pages(rows=250, make="toyota")]
+
+    assert len(pages) == 5
+    assert fake.calls[0] == (0, 50)
+    assert sorted(start for start, _ in fake.calls) == [0, 50, 100, 150, 200]
+    assert fake.max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_default_settings_page_through_results(service):
+    """With the default result cap a search spans several pages fetched in parallel"""
+    fake = FakeMarketCheck(num_found=1000)
+
+    with patch.object(service, "_search_marketcheck_with_retry", new=fake):
+        pages = [
+            page async for page in service._iter_marketcheck_pages(rows=settings.MAX_SEARCH_RESULTS)
+        ]
+
+    assert len(pages) > 1
+    assert fake.max_active > 1
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_stops_at_num_found(service, paging_settings):
+    """No extra pages are requested beyond the number of available listings"""
+    fake = FakeMarketCheck(num_found=30)
+
+    with patch.object(service, "_search_marketcheck_with_retry", new=fake):
+        pages = [page async for page in service._iter_marketcheck_pages(rows=250)]
+
+    assert len(pages) == 1
+    assert fake.calls == [(0, 50)]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_skips_failed_later_page(service, paging_settings):
+    """A failure after the first page drops that page but keeps the others"""
+    fake = FakeMarketCheck(num_found=1000, fail_offsets={100})
+
+    with patch.object(service, "_search_marketcheck_with_retry", new=fake):
+        pages = [page async for page in service._iter_marketcheck_pages(rows=200)]
+
+    assert len(pages) == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_first_page_failure_propagates(service, paging_settings):
+    """Without a first page there is nothing to rank, so the error surfaces"""
+    fake = FakeMarketCheck(num_found=1000, fail_offsets={0})
+
+    with patch.object(service, "_search_marketcheck_with_retry", new=fake):
+        with pytest.raises(ConnectionError):
+            async for _ in service._iter_marketcheck_pages(rows=200):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_search_and_rank_bounds_llm_input_to_candidate_pool(service, paging_settings):
+    """Hundreds of listings are analysed but only the best candidates reach the LLM"""
+    fake = FakeMarketCheck(num_found=1000)
+    llm_rank = AsyncMock(side_effect=lambda listings, *args: listings[:5])
+
+    with (
+        patch.object(service, "_search_marketcheck_with_retry", new=fake),
+        patch.object(service, "_get_llm_recommendations", llm_rank),
+        patch.object(service, "_set_cached_result", AsyncMock()),
+        patch.object(service, "_save_to_file_cache", AsyncMock()),
+        patch("app.services.car_recommendation_service.llm_client") as mock_llm,
+    ):
+        mock_llm.is_available.return_value = True
+        result = await service._search_and_rank(
+            cache_key="car_search:test",
+            make="Toyota",
+            model="Camry",
+            budget_min=None,
+            budget_max=None,
+            car_type=None,
+            year_min=None,
+            year_max=None,
+            mileage_max=None,
+            user_priorities=None,
+            rows=300,
+        )
+
+    candidates = llm_rank.call_args.args[0]
+    assert len(candidates) == 20
+    scores = [service._score_listing(listing) for listing in candidates]
+    assert scores == sorted(scores, reverse=True)
+    assert result["total_analyzed"] == 300
+    assert result["total_found"] == 1000
+    assert len(result["top_vehicles"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_search_and_rank_fallback_matches_full_scoring(service, paging_settings):
+    """Without the LLM the incremental pool yields the same top 5 as scoring everything"""
+    fake = FakeMarketCheck(num_found=120)
+
+    with (
+        patch.object(service, "_search_marketcheck_with_retry", new=fake),
+        patch.object(service, "_set_cached_result", AsyncMock()),
+        patch.object(service, "_save_to_file_cache", AsyncMock()),
+        patch("app.services.car_recommendation_service.llm_client") as mock_llm,
+    ):
+        mock_llm.is_available.return_value = False
+        result = await service._search_and_rank(
+            cache_key="car_search:test",
+            make=None,
+            model=None,
+            budget_min=None,
+            budget_max=None,
+            car_type=None,
+            year_min=None,
+            year_max=None,
+            mileage_max=None,
+            user_priorities=None,
+            rows=120,
+        )
+
+    everything = [marketcheck_client.parse_listing(_raw_listing(i)) for i in range(120)]
+    expected = service._fallback_recommendations(everything)
+
+    assert [v["recommendation_score"] for v in result["top_vehicles"]] == [
+        v["recommendation_score"] for v in expected
+    ]
+    assert result["total_analyzed"] == 120
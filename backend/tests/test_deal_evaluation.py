@@ -1,11 +1,13 @@
 """Test deal evaluation service and endpoint"""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import select
 
 from app.api.dependencies import get_current_user
 from app.llm.schemas import DealEvaluation
+from app.models.jsonb_data import AIResponse
 from app.models.models import User
 from app.services.deal_evaluation_service import DealEvaluationService
 
@@ -91,6 +93,38 @@ class TestDealEvaluationService:
                 assert len(result["insights"]) > 0
                 assert len(result["talking_points"]) > 0
 
+    @pytest.mark.asyncio
+    async def test_evaluate_deal_logs_ai_response(
+        self, mock_llm_evaluation, async_db, async_session_factory
+    ):
+        """LLM evaluations are recorded in ai_responses"""
+        service = DealEvaluationService()
+
+        with (
+            patch("app.services.deal_evaluation_service.llm_client") as mock_client,
+            patch(
+                "app.services.deal_evaluation_service.generate_structured_json",
+                AsyncMock(return_value=mock_llm_evaluation),
+            ),
+            patch("app.services.deal_evaluation_service.AsyncSessionLocal", async_session_factory),
+        ):
+            mock_client.is_available.return_value = True
+            await service.evaluate_deal(
+                vehicle_vin="5YJSA1E14HF000042",
+                asking_price=31000.00,
+                condition="good",
+                mileage=30000,
+                deal_id=42,
+            )
+
+        result = await async_db.execute(select(AIResponse))
+        logged = result.scalars().all()
+        assert len(logged) == 1
+        assert logged[0].feature == "deal_evaluation"
+        assert logged[0].deal_id == 42
+        assert logged[0].llm_used == 1
+        assert logged[0].response_content["score"] == 7.5
+
     @pytest.mark.asyncio
     async def test_evaluate_deal_fallback(self):
         """Test deal evaluation fallback when LLM is not available"""
@@ -375,12 +409,17 @@ class TestDealEvaluationCaching:
         """Test that cached data is returned on cache hit without calling LLM"""
         service = DealEvaluationService()
 
-        with patch("app.services.deal_evaluation_service.redis_client") as mock_redis_client:
+        with patch("app.db.cache.redis_client") as mock_redis_client:
             mock_redis = AsyncMock()
-            mock_redis.get = AsyncMock(
-                return_value='{"fair_value": 24000.0, "score": 8.0, "insights": ["Cached insight"], "talking_points": ["Cached point"]}'
+            mock_pipeline = MagicMock()
+            mock_pipeline.execute = AsyncMock(
+                return_value=[
+                    '{"fair_value": 24000.0, "score": 8.0, "insights": ["Cached insight"], "talking_points": ["Cached point"]}',
+                    -1,
+                ]
             )
-            mock_redis_client.get_client.return_value = mock_redis
+            mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
+            mock_redis_client.get_binary_client.return_value = mock_redis
 
             with patch("app.services.deal_evaluation_service.llm_client") as mock_client:
                 mock_client.is_available.return_value = True
@@ -410,11 +449,14 @@ class TestDealEvaluationCaching:
         """Test that LLM is called on cache miss and result is cached"""
         service = DealEvaluationService()
 
-        with patch("app.services.deal_evaluation_service.redis_client") as mock_redis_client:
+        with patch("app.db.cache.redis_client") as mock_redis_client:
             mock_redis = AsyncMock()
             mock_redis.get = AsyncMock(return_value=None)  # Ensure get returns None
             mock_redis.setex = AsyncMock(return_value=True)
-            mock_redis_client.get_client.return_value = mock_redis
+            mock_pipeline = MagicMock()
+            mock_pipeline.execute = AsyncMock(return_value=[None, -2])
+            mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
+            mock_redis_client.get_binary_client.return_value = mock_redis
 
             with patch("app.services.deal_evaluation_service.llm_client") as mock_client:
                 mock_client.is_available.return_value = True
@@ -438,8 +480,11 @@ class TestDealEvaluationCaching:
                     # LLM should have been called
                     mock_gen.assert_called_once()
 
-                    # Result should be cached
+                    # Result should be cached and tagged with the VIN
                     mock_redis.setex.assert_called_once()
+                    mock_pipeline.sadd.assert_called_once_with(
+                        "cache:tag:vin:1HGBH41JXMN109186", mock_redis.setex.call_args.args[0]
+                    )
                     assert result["fair_value"] == 24500.00
                     assert result["score"] == 7.5
 
@@ -448,9 +493,9 @@ class TestDealEvaluationCaching:
         """Test graceful degradation when Redis is unavailable"""
         service = DealEvaluationService()
 
-        with patch("app.services.deal_evaluation_service.redis_client") as mock_redis_client:
+        with patch("app.db.cache.redis_client") as mock_redis_client:
             # Redis not available
-            mock_redis_client.get_client.return_value = None
+            mock_redis_client.get_binary_client.return_value = None
 
             with patch("app.services.deal_evaluation_service.llm_client") as mock_client:
                 mock_client.is_available.return_value = True
@@ -1,5 +1,7 @@
 """Test deal endpoints"""
 
+from unittest.mock import AsyncMock, patch
+
 import pytest
 
 from app.api.dependencies import get_current_user
@@ -64,6 +66,43 @@ def test_get_deals(authenticated_client):
     assert isinstance(data, list)
 
 
+def test_get_deals_cursor_pagination(authenticated_client):
+    """Deals are listed newest first and X-Next-Cursor walks every page once"""
+    created = []
+    for i in range(5):
+        response = authenticated_client.post(
+            "/api/v1/deals/",
+            json={
+                "customer_name": f"Customer {i}",
+                "customer_email": f"customer{i}@example.com",
+                "vehicle_make": "Toyota",
+                "vehicle_model": "Camry",
+                "vehicle_vin": "1HGCM41JXMN109186",
+                "vehicle_year": 2022,
+                "asking_price": 25000.00,
+            },
+        )
+        created.append(response.json()["id"])
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = authenticated_client.get("/api/v1/deals/", params=params)
+        assert response.status_code == 200
+        seen.extend(deal["id"] for deal in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params = {"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+
+    assert seen == list(reversed(created))
+
+
+def test_get_deals_invalid_cursor(authenticated_client):
+    """A malformed cursor is a client error"""
+    response = authenticated_client.get("/api/v1/deals/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
 def test_get_deal(authenticated_client):
     """Test getting a specific deal"""
     # First create a deal
@@ -132,6 +171,86 @@ def test_update_deal(authenticated_client):
     assert data["notes"] == "Negotiating price"
 
 
+def test_update_deal_invalidates_cached_evaluations(authenticated_client):
+    """Updating a deal drops evaluations tagged with the deal and its VIN"""
+    deal_data = {
+        "customer_name": "Test Customer",
+        "customer_email": "test@example.com",
+        "vehicle_make": "Ford",
+        "vehicle_model": "F-150",
+        "vehicle_vin": "1HGCM41JXMN109186",
+        "vehicle_year": 2020,
+        "vehicle_mileage": 30000,
+        "asking_price": 35000.00,
+        "status": "pending",
+    }
+    deal_id = authenticated_client.post("/api/v1/deals/", json=deal_data).json()["id"]
+
+    with patch(
+        "app.services.deal_evaluation_service.cache.invalidate_tags",
+        AsyncMock(return_value=[]),
+    ) as invalidate:
+        response = authenticated_client.put(
+            f"/api/v1/deals/{deal_id}", json={"asking_price": 33000.00}
+        )
+
+    assert response.status_code == 200
+    invalidate.assert_awaited_once_with(f"deal:{deal_id}", "vin:1HGCM41JXMN109186")
+
+
+def test_update_deal_vin_invalidates_old_and_new_vin(authenticated_client):
+    """Evaluations cached under the VIN the deal had before the update are dropped too"""
+    deal_data = {
+        "customer_name": "Test Customer",
+        "customer_email": "test@example.com",
+        "vehicle_make": "Ford",
+        "vehicle_model": "F-150",
+        "vehicle_vin": "1HGCM41JXMN109186",
+        "vehicle_year": 2020,
+        "vehicle_mileage": 30000,
+        "asking_price": 35000.00,
+        "status": "pending",
+    }
+    deal_id = authenticated_client.post("/api/v1/deals/", json=deal_data).json()["id"]
+
+    with patch(
+        "app.services.deal_evaluation_service.cache.invalidate_tags",
+        AsyncMock(return_value=[]),
+    ) as invalidate:
+        response = authenticated_client.put(
+            f"/api/v1/deals/{deal_id}", json={"vehicle_vin": "2T1BURHE0JC034061"}
+        )
+
+    assert response.status_code == 200
+    invalidate.assert_awaited_once_with(
+        f"deal:{deal_id}", "vin:1HGCM41JXMN109186", "vin:2T1BURHE0JC034061"
+    )
+
+
+def test_delete_deal_invalidates_cached_evaluations(authenticated_client):
+    deal_data = {
+        "customer_name": "Test Customer",
+        "customer_email": "test@example.com",
+        "vehicle_make": "Ford",
+        "vehicle_model": "F-150",
+        "vehicle_vin": "1HGCM41JXMN109186",
+        "vehicle_year": 2020,
+        "vehicle_mileage": 30000,
+        "asking_price": 35000.00,
+        "status": "pending",
+    }
+    deal_id = authenticated_client.post("/api/v1/deals/", json=deal_data).json()["id"]
+
+    with patch(
+        "app.services.deal_evaluation_service.cache.invalidate_tags",
+        AsyncMock(return_value=[]),
+    ) as invalidate:
+        response = authenticated_client.delete(f"/api/v1/deals/{deal_id}")
+
+    assert response.status_code == 204
+    invalidate.assert_awaited_once_with(f"deal:{deal_id}", "vin:1HGCM41JXMN109186")
+
+
 def test_update_nonexistent_deal(authenticated_client):
     """Test updating a non-existent deal"""
     update_data = {
@@ -0,0 +1,241 @@
+"""
+Tests for the SQLite-backed disk cache
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import time
+
+import pytest
+
+from app.db import serialization
+from app.db.disk_cache import DiskCache
+
+
+def _search_result(index: int) -> dict:
+    """Build a payload shaped like a cached car search result"""
+    return {
+        "search_criteria": {"make": "Toyota", "model": f"Model{index}", "price_max": 30000},
+        "top_vehicles": [
+            {
+                "vin": f"VIN{index:05d}{n}",
+                "make": "Toyota",
+                "model": f"Model{index}",
+                "year": 2020 + n,
+                "price": 25000 + n * 500,
+                "mileage": 30000 - n * 1000,
+                "highlights": ["Clean title verified", "Single owner vehicle"],
+                "recommendation_summary": "Good option based on condition and features.",
+                "photo_links": [f"https://example.com/{index}/{n}/{p}.jpg" for p in range(10)],
+            }
+            for n in range(5)
+        ],
+        "total_found": 120,
+        "total_analyzed": 50,
+    }
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "market.db")
+
+
+@pytest.mark.asyncio
+async def test_set_and_get_round_trip(cache_path):
+    """Values survive serialization and a reopen of the database"""
+    cache = DiskCache(cache_path, max_bytes=10_000_000)
+    await cache.set("car_search:1", _search_result(1))
+    await cache.close()
+
+    reopened = DiskCache(cache_path, max_bytes=10_000_000)
+    assert await reopened.get("car_search:1") == _search_result(1)
+    assert await reopened.get("car_search:missing") is None
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_returned(cache_path):
+    """Entries past their TTL read as misses and are removed"""
+    cache = DiskCache(cache_path, max_bytes=10_000_000, default_ttl=3600)
+    await cache.set("short", {"a": 1}, ex=1)
+    await cache.set("long", {"b": 2})
+
+    time.sleep(1.1)
+
+    assert await cache.get("short") is None
+    assert await cache.get("long") == {"b": 2}
+    assert (await cache.stats())["entries"] == 1
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_entries_use_shared_cache_encoding(cache_path):
+    """Disk entries carry the same format header as the Redis and in-process tiers"""
+    cache = DiskCache(cache_path, max_bytes=10_000_000)
+    await cache.set("k", _search_result(0))
+
+    blob = cache._connect().execute("SELECT value FROM cache_entries").fetchone()[0]
+    assert blob[0] == serialization.MAGIC
+    assert serialization.decode(blob) == _search_result(0)
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_undecodable_entry_is_a_miss_and_removed(cache_path):
+    cache = DiskCache(cache_path, max_bytes=10_000_000)
+    await cache.set("k", _search_result(0))
+    cache._connect().execute("UPDATE cache_entries SET value = ?", (b"\x78\x01garbage",))
+
+    assert await cache.get("k") is None
+    assert (await cache.stats())["entries"] == 0
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_keeps_total_under_budget(cache_path, monkeypatch):
+    """Least recently used entries are evicted once the byte budget is exceeded"""
+    monkeypatch.setattr("app.db.disk_cache.ACCESS_TIME_RESOLUTION_SECONDS", 0.0)
+    entry_size = max(len(serialization.encode(_search_result(i))) for i in range(4))
+    cache = DiskCache(cache_path, max_bytes=entry_size * 3)
+
+    for i in range(3):
+        await cache.set(f"k{i}", _search_result(i))
+        time.sleep(0.01)
+    # Touch k0 so k1 becomes the least recently used entry
+    assert await cache.get("k0") is not None
+    time.sleep(0.01)
+    await cache.set("k3", _search_result(3))
+
+    stats = await cache.stats()
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert await cache.get("k1") is None
+    assert await cache.get("k0") is not None
+    assert await cache.get("k3") is not None
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_running_byte_total_replaces_table_scan(cache_path):
+    """Writes under budget keep the byte total without summing the table"""
+    cache = DiskCache(cache_path, max_bytes=10_000_000)
+    await cache.set("a", _search_result(1))
+    await cache.set("b", _search_result(2))
+
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+    await cache.set("a", {"replaced": True})
+    await cache.delete("b")
+    await cache.set("c", _search_result(3), ex=1)
+    cache._conn.set_trace_callback(None)
+
+    assert not [sql for sql in statements if "SUM(size)" in sql]
+    assert cache._total_bytes == (await cache.stats())["bytes"]
+
+    time.sleep(1.1)
+    assert await cache.get("c") is None
+    assert cache._total_bytes == (await cache.stats())["bytes"]
+    await cache.close()
+
+    reopened = DiskCache(cache_path, max_bytes=10_000_000)
+    await reopened.set("d", 1)
+    assert reopened._total_bytes == (await reopened.stats())["bytes"]
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_delete_and_clear(cache_path):
+    cache = DiskCache(cache_path, max_bytes=10_000_000)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+
+    await cache.delete("a")
+    assert await cache.get("a") is None
+
+    await cache.clear()
+    assert (await cache.stats())["entries"] == 0
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_access_does_not_block_event_loop(cache_path):
+    """Concurrent reads and writes from many tasks complete correctly"""
+    cache = DiskCache(cache_path, max_bytes=10_000_000)
+
+    await asyncio.gather(*(cache.set(f"k{i}", {"i": i}) for i in range(50)))
+    values = await asyncio.gather(*(cache.get(f"k{i}") for i in range(50)))
+
+    assert values == [{"i": i} for i in range(50)]
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_benchmark_against_json_file_directory(tmp_path):
+    """Compare cold start, hit latency and disk usage with the legacy file-per-key cache"""
+    entries = 300
+    payloads = {f"car_search:{i:032x}": _search_result(i) for i in range(entries)}
+
+    # Legacy layout: one pretty-printed JSON file per key
+    legacy_dir = tmp_path / "market_data_cache"
+    legacy_dir.mkdir()
+
+    def legacy_path(key: str) -> str:
+        return os.path.join(str(legacy_dir), key.replace(":", "_") + ".json")
+
+    for key, payload in payloads.items():
+        with open(legacy_path(key), "w") as f:
+            json.dump(payload, f, indent=2)
+
+    def legacy_get(key: str):
+        if not os.path.exists(str(legacy_dir)):
+            os.makedirs(str(legacy_dir))
+        path = legacy_path(key)
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+        return None
+
+    db_path = str(tmp_path / "disk" / "market.db")
+    writer = DiskCache(db_path, max_bytes=1_000_000_000)
+    for key, payload in payloads.items():
+        await writer.set(key, payload)
+    await writer.close()
+
+    keys = list(payloads)
+
+    # Cold start: first lookup in a fresh process-equivalent
+    start = time.perf_counter()
+    legacy_get(keys[0])
+    legacy_cold = time.perf_counter() - start
+
+    cache = DiskCache(db_path, max_bytes=1_000_000_000)
+    start = time.perf_counter()
+    await cache.get(keys[0])
+    disk_cold = time.perf_counter() - start
+
+    # Warm hits
+    legacy_hits, disk_hits = [], []
+    for key in keys:
+        start = time.perf_counter()
+        legacy_get(key)
+        legacy_hits.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await cache.get(key)
+        disk_hits.append(time.perf_counter() - start)
+
+    legacy_bytes = sum(os.path.getsize(legacy_path(key)) for key in keys)
+    disk_bytes = (await cache.stats())["bytes"]
+    await cache.close()
+
+    print(
+        f"\nlegacy files: cold={legacy_cold * 1e3:.3f}ms "
+        f"hit p50={statistics.median(legacy_hits) * 1e3:.3f}ms "
+        f"p99={sorted(legacy_hits)[int(entries * 0.99)] * 1e3:.3f}ms bytes={legacy_bytes}"
+        f"\nsqlite cache: cold={disk_cold * 1e3:.3f}ms "
+        f"hit p50={statistics.median(disk_hits) * 1e3:.3f}ms "
+        f"p99={sorted(disk_hits)[int(entries * 0.99)] * 1e3:.3f}ms bytes={disk_bytes}"
+    )
+
+    assert disk_bytes < legacy_bytes
@@ -165,13 +165,13 @@ async def test_continue_evaluation_with_answers(authenticated_client, mock_deal)
 
 
 @pytest.mark.asyncio
-async def test_submit_answers_when_not_awaiting(authenticated_client, mock_deal, db):
+async def test_submit_answers_when_not_awaiting(authenticated_client, mock_deal, async_db):
     """Test submitting answers when evaluation is not awaiting input"""
     from app.repositories.evaluation_repository import EvaluationRepository
 
     # Create evaluation in completed status
-    repo = EvaluationRepository(db)
-    evaluation = repo.create(
+    repo = EvaluationRepository(async_db)
+    evaluation = await repo.create(
         user_id=1,  # mock_user.id
         deal_id=mock_deal.id,
         status=EvaluationStatus.COMPLETED,
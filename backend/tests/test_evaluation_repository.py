@@ -41,11 +41,12 @@ def mock_deal(db):
     return deal
 
 
-def test_create_evaluation(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_create_evaluation(async_db, mock_user, mock_deal):
     """Test creating a deal evaluation"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
-    evaluation = repo.create(
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
@@ -61,136 +62,144 @@ def test_create_evaluation(db, mock_user, mock_deal):
     assert evaluation.created_at is not None
 
 
-def test_get_evaluation(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_get_evaluation(async_db, mock_user, mock_deal):
     """Test getting an evaluation by ID"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
-    evaluation = repo.create(
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
         current_step=PipelineStep.VEHICLE_CONDITION,
     )
 
-    retrieved = repo.get(evaluation.id)
+    retrieved = await repo.get(evaluation.id)
     assert retrieved is not None
     assert retrieved.id == evaluation.id
     assert retrieved.user_id == mock_user.id
     assert retrieved.deal_id == mock_deal.id
 
 
-def test_get_nonexistent_evaluation(db):
+@pytest.mark.asyncio
+async def test_get_nonexistent_evaluation(async_db):
     """Test getting a non-existent evaluation"""
-    repo = EvaluationRepository(db)
-    evaluation = repo.get(99999)
+    repo = EvaluationRepository(async_db)
+    evaluation = await repo.get(99999)
     assert evaluation is None
 
 
-def test_get_by_deal(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_get_by_deal(async_db, mock_user, mock_deal):
     """Test getting all evaluations for a deal"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
     # Create multiple evaluations
-    eval1 = repo.create(
+    eval1 = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
         current_step=PipelineStep.VEHICLE_CONDITION,
     )
 
-    eval2 = repo.create(
+    eval2 = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.COMPLETED,
         current_step=PipelineStep.FINAL,
     )
 
-    evaluations = repo.get_by_deal(mock_deal.id)
+    evaluations = await repo.get_by_deal(mock_deal.id)
     assert len(evaluations) == 2
     assert eval1.id in [e.id for e in evaluations]
     assert eval2.id in [e.id for e in evaluations]
 
 
-def test_get_latest_by_deal(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_get_latest_by_deal(async_db, mock_user, mock_deal):
     """Test getting the most recent evaluation for a deal"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
     # Create multiple evaluations
-    eval1 = repo.create(
+    eval1 = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
         current_step=PipelineStep.VEHICLE_CONDITION,
     )
 
-    eval2 = repo.create(
+    eval2 = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.COMPLETED,
         current_step=PipelineStep.FINAL,
     )
 
-    latest = repo.get_latest_by_deal(mock_deal.id)
+    latest = await repo.get_latest_by_deal(mock_deal.id)
     assert latest is not None
     # Should return one of the evaluations for this deal
     assert latest.id in [eval1.id, eval2.id]
     assert latest.deal_id == mock_deal.id
 
 
-def test_get_by_user(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_get_by_user(async_db, mock_user, mock_deal):
     """Test getting all evaluations for a user"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
     # Create evaluations
-    eval1 = repo.create(
+    eval1 = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
         current_step=PipelineStep.VEHICLE_CONDITION,
     )
 
-    evaluations = repo.get_by_user(mock_user.id)
+    evaluations = await repo.get_by_user(mock_user.id)
     assert len(evaluations) >= 1
     assert eval1.id in [e.id for e in evaluations]
 
 
-def test_update_status(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_update_status(async_db, mock_user, mock_deal):
     """Test updating evaluation status"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
-    evaluation = repo.create(
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
         current_step=PipelineStep.VEHICLE_CONDITION,
     )
 
-    updated = repo.update_status(evaluation.id, EvaluationStatus.AWAITING_INPUT)
+    updated = await repo.update_status(evaluation.id, EvaluationStatus.AWAITING_INPUT)
     assert updated is not None
     assert updated.status == EvaluationStatus.AWAITING_INPUT
 
 
-def test_update_step(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_update_step(async_db, mock_user, mock_deal):
     """Test updating evaluation step"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
-    evaluation = repo.create(
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
         current_step=PipelineStep.VEHICLE_CONDITION,
     )
 
-    updated = repo.update_step(evaluation.id, PipelineStep.PRICE)
+    updated = await repo.update_step(evaluation.id, PipelineStep.PRICE)
     assert updated is not None
     assert updated.current_step == PipelineStep.PRICE
 
 
-def test_update_result(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_update_result(async_db, mock_user, mock_deal):
     """Test updating evaluation result"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
-    evaluation = repo.create(
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
@@ -199,17 +208,18 @@ def test_update_result(db, mock_user, mock_deal):
 
     result_data = {"vehicle_condition": {"score": 8.5, "notes": ["Good condition"]}}
 
-    updated = repo.update_result(evaluation.id, result_data, EvaluationStatus.COMPLETED)
+    updated = await repo.update_result(evaluation.id, result_data, EvaluationStatus.COMPLETED)
     assert updated is not None
     assert updated.result_json == result_data
     assert updated.status == EvaluationStatus.COMPLETED
 
 
-def test_advance_step(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_advance_step(async_db, mock_user, mock_deal):
     """Test advancing to next step"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
-    evaluation = repo.create(
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
@@ -218,7 +228,7 @@ def test_advance_step(db, mock_user, mock_deal):
 
     step_result = {"score": 8.5, "notes": ["Good condition"]}
 
-    updated = repo.advance_step(evaluation.id, PipelineStep.PRICE, step_result)
+    updated = await repo.advance_step(evaluation.id, PipelineStep.PRICE, step_result)
     assert updated is not None
     assert updated.current_step == PipelineStep.PRICE
     assert updated.result_json is not None
@@ -226,11 +236,12 @@ def test_advance_step(db, mock_user, mock_deal):
     assert updated.result_json[PipelineStep.VEHICLE_CONDITION.value] == step_result
 
 
-def test_delete_evaluation(db, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_delete_evaluation(async_db, mock_user, mock_deal):
     """Test deleting an evaluation"""
-    repo = EvaluationRepository(db)
+    repo = EvaluationRepository(async_db)
 
-    evaluation = repo.create(
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
@@ -238,16 +249,17 @@ def test_delete_evaluation(db, mock_user, mock_deal):
     )
 
     evaluation_id = evaluation.id
-    deleted = repo.delete(evaluation_id)
+    deleted = await repo.delete(evaluation_id)
     assert deleted is True
 
     # Verify deletion
-    retrieved = repo.get(evaluation_id)
+    retrieved = await repo.get(evaluation_id)
     assert retrieved is None
 
 
-def test_delete_nonexistent_evaluation(db):
+@pytest.mark.asyncio
+async def test_delete_nonexistent_evaluation(async_db):
     """Test deleting a non-existent evaluation"""
-    repo = EvaluationRepository(db)
-    deleted = repo.delete(99999)
+    repo = EvaluationRepository(async_db)
+    deleted = await repo.delete(99999)
     assert deleted is False
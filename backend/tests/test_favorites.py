@@ -115,6 +115,24 @@ def test_get_favorites(authenticated_client, sample_favorite_data):
     assert data[0]["vin"] == sample_favorite_data["vin"]
 
 
+def test_get_favorites_unbounded_unless_paged(authenticated_client, sample_favorite_data):
+    """Without limit every favorite comes back; with limit, X-Next-Cursor pages"""
+    for i in range(3):
+        favorite = {**sample_favorite_data, "vin": f"1HGBH41JXMN10918{i}"}
+        assert authenticated_client.post("/api/v1/favorites/", json=favorite).status_code == 201
+
+    response = authenticated_client.get("/api/v1/favorites/")
+    assert len(response.json()) == 3
+    assert "X-Next-Cursor" not in response.headers
+
+    first = authenticated_client.get("/api/v1/favorites/", params={"limit": 2})
+    assert len(first.json()) == 2
+    rest = authenticated_client.get(
+        "/api/v1/favorites/", params={"cursor": first.headers["X-Next-Cursor"]}
+    )
+    assert [f["vin"] for f in first.json() + rest.json()] == [f["vin"] for f in response.json()]
+
+
 def test_get_favorite_by_vin(authenticated_client, sample_favorite_data):
     """Test getting a specific favorite by VIN"""
     # Add a favorite
@@ -160,13 +160,13 @@ async def test_financing_assessment_cash_purchase(authenticated_client, mock_dea
 
 
 @pytest.mark.asyncio
-async def test_get_lender_recommendations(authenticated_client, mock_deal, mock_user, db):
+async def test_get_lender_recommendations(authenticated_client, mock_deal, mock_user, async_db):
     """Test fetching lender recommendations for a good deal with financing"""
     from app.repositories.evaluation_repository import EvaluationRepository
 
     # Create an evaluation with completed financing step
-    repo = EvaluationRepository(db)
-    evaluation = repo.create(
+    repo = EvaluationRepository(async_db)
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
@@ -196,7 +196,7 @@ async def test_get_lender_recommendations(authenticated_client, mock_deal, mock_
             },
         },
     }
-    repo.update_result(evaluation.id, result_json, EvaluationStatus.ANALYZING)
+    await repo.update_result(evaluation.id, result_json, EvaluationStatus.ANALYZING)
 
     # Fetch lender recommendations
     response = authenticated_client.get(
@@ -213,13 +213,13 @@ async def test_get_lender_recommendations(authenticated_client, mock_deal, mock_
 
 @pytest.mark.asyncio
 async def test_lender_recommendations_not_for_poor_deals(
-    authenticated_client, mock_deal, mock_user, db
+    authenticated_client, mock_deal, mock_user, async_db
 ):
     """Test that lender recommendations are not provided for poor quality deals"""
     from app.repositories.evaluation_repository import EvaluationRepository
 
-    repo = EvaluationRepository(db)
-    evaluation = repo.create(
+    repo = EvaluationRepository(async_db)
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
@@ -249,7 +249,7 @@ async def test_lender_recommendations_not_for_poor_deals(
             },
         },
     }
-    repo.update_result(evaluation.id, result_json, EvaluationStatus.ANALYZING)
+    await repo.update_result(evaluation.id, result_json, EvaluationStatus.ANALYZING)
 
     # Fetch lender recommendations
     response = authenticated_client.get(
@@ -266,13 +266,13 @@ async def test_lender_recommendations_not_for_poor_deals(
 
 @pytest.mark.asyncio
 async def test_lender_recommendations_requires_completed_financing(
-    authenticated_client, mock_deal, mock_user, db
+    authenticated_client, mock_deal, mock_user, async_db
 ):
     """Test that lender recommendations require completed financing step"""
     from app.repositories.evaluation_repository import EvaluationRepository
 
-    repo = EvaluationRepository(db)
-    evaluation = repo.create(
+    repo = EvaluationRepository(async_db)
+    evaluation = await repo.create(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         status=EvaluationStatus.ANALYZING,
@@ -289,7 +289,7 @@ async def test_lender_recommendations_requires_completed_financing(
             "completed": False,  # Not completed
         },
     }
-    repo.update_result(evaluation.id, result_json, EvaluationStatus.ANALYZING)
+    await repo.update_result(evaluation.id, result_json, EvaluationStatus.ANALYZING)
 
     # Try to fetch lender recommendations
     response = authenticated_client.get(
@@ -0,0 +1,102 @@
+"""
+Tests for the in-memory cache's per-key TTL, byte budget and metrics
+"""
+
+import time
+
+import pytest
+
+from app.db.in_memory_cache import InMemoryCache
+from app.metrics import cache_evictions, cache_resident_bytes
+
+
+@pytest.mark.asyncio
+async def test_per_key_expiry_overrides_default_ttl():
+    cache = InMemoryCache(ttl=3600, name="test_ttl")
+    await cache.set("short", "a", ex=1)
+    await cache.set("long", "b")
+
+    time.sleep(1.05)
+
+    assert await cache.get("short") is None
+    assert await cache.get("long") == "b"
+    assert not await cache.exists("short")
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_reclaimed_on_write():
+    cache = InMemoryCache(name="test_reclaim")
+    await cache.set("a", "x" * 1000, ex=1)
+    before = cache.stats()["bytes"]
+
+    time.sleep(1.05)
+    await cache.set("b", "y")
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] < before
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_evicts_least_recently_used():
+    """One large value costs more than many small ones"""
+    evicted = cache_evictions.labels(cache_name="test_bytes", reason="capacity")
+    before = evicted._value.get()
+    cache = InMemoryCache(maxsize=1000, max_bytes=2800, name="test_bytes")
+
+    await cache.set("small1", "a" * 100)
+    await cache.set("small2", "b" * 100)
+    await cache.get("small1")
+    await cache.set("big", "c" * 2500)
+
+    assert cache.stats()["bytes"] <= 2800
+    assert await cache.get("small2") is None
+    assert await cache.get("small1") is not None
+    assert await cache.get("big") is not None
+    assert evicted._value.get() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_value_larger_than_budget_is_not_stored():
+    cache = InMemoryCache(max_bytes=500, name="test_oversize")
+    await cache.set("k", "small")
+    await cache.set("k", "x" * 1000)
+
+    assert await cache.get("k") is None
+    assert cache.stats()["bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_entry_count_limit_still_applies():
+    cache = InMemoryCache(maxsize=2, name="test_count")
+    for key in ("a", "b", "c"):
+        await cache.set(key, key)
+
+    assert await cache.get("a") is None
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_overwrite_and_delete_keep_byte_accounting_exact():
+    cache = InMemoryCache(name="test_accounting")
+    await cache.set("k", "x" * 1000)
+    await cache.set("k", "y")
+    await cache.set("other", {"nested": [1, 2, 3]})
+    await cache.delete("other")
+
+    assert cache.stats()["bytes"] == cache._entries["k"].size
+    assert cache_resident_bytes.labels(cache_name="test_accounting")._value.get() == (
+        cache.stats()["bytes"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_hit_ratio():
+    cache = InMemoryCache(name="test_ratio")
+    await cache.set("k", "v")
+    await cache.get("k")
+    await cache.get("k")
+    await cache.get("k")
+    await cache.get("missing")
+
+    assert cache.stats()["hit_ratio"] == 0.75
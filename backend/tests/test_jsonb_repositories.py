@@ -2,11 +2,19 @@
 Tests for PostgreSQL JSONB repositories
 """
 
+import time
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+
 import pytest
 import pytest_asyncio
+from sqlalchemy import func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.db.bulk import delete_in_chunks
+from app.db.time_buckets import hour_start
+from app.models.jsonb_data import AIResponse, SearchHistory, UserPreference
 from app.repositories.ai_response_repository import AIResponseRepository
 from app.repositories.search_history_repository import SearchHistoryRepository
 from app.repositories.user_preferences_repository import UserPreferencesRepository
@@ -81,6 +89,22 @@ class TestUserPreferencesRepository:
         assert latest is not None
         assert latest.preferences["makes"] == ["Honda"]
 
+    @pytest.mark.asyncio
+    async def test_delete_older_preferences(self, db_session: AsyncSession):
+        repo = UserPreferencesRepository(db_session)
+        old = datetime.now(UTC) - timedelta(days=45)
+        await db_session.execute(
+            insert(UserPreference),
+            [{"user_id": f"user{i}", "preferences": {}, "created_at": old} for i in range(3)],
+        )
+        await repo.save_user_preferences(user_id="recent", makes=["Honda"])
+
+        deleted = await repo.delete_older_preferences(days=30)
+
+        assert deleted == 3
+        remaining = await db_session.execute(select(UserPreference.user_id))
+        assert remaining.scalars().all() == ["recent"]
+
 
 class TestSearchHistoryRepository:
     """Test cases for SearchHistoryRepository"""
@@ -123,6 +147,113 @@ class TestSearchHistoryRepository:
         # history = await repo.get_user_history(user_id=1)
         # assert len(history) > 0
 
+    @pytest.mark.asyncio
+    async def test_get_popular_searches(self, db_session: AsyncSession):
+        """Popular searches come from the hourly rollups, rebuilt idempotently"""
+        repo = SearchHistoryRepository(db_session)
+        criteria = [{"make": "Toyota", "model": "Camry"}] * 3 + [{"make": "Honda"}]
+        await db_session.execute(insert(SearchHistory), [{"search_criteria": c} for c in criteria])
+        since = hour_start(datetime.now(UTC))
+
+        for _ in range(2):
+            await repo.rebuild_hourly_rollups(since)
+            await db_session.commit()
+
+        assert await repo.get_popular_searches(limit=10, days=7) == [
+            {"make": "Toyota", "model": "Camry", "search_count": 3},
+            {"make": "Honda", "model": None, "search_count": 1},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_delete_user_history(self, db_session: AsyncSession):
+        repo = SearchHistoryRepository(db_session)
+        await db_session.execute(
+            insert(SearchHistory),
+            [{"user_id": 1 + i % 2, "search_criteria": {"make": "Toyota"}} for i in range(21)],
+        )
+        await db_session.commit()
+
+        assert await repo.delete_user_history(user_id=1) == 11
+        assert await repo.delete_user_history(user_id=1) == 0
+
+        remaining = await db_session.execute(select(SearchHistory.user_id).distinct())
+        assert remaining.scalars().all() == [2]
+
+    @pytest.mark.asyncio
+    async def test_delete_in_chunks_commits_each_chunk(self, db_session: AsyncSession):
+        await db_session.execute(
+            insert(SearchHistory),
+            [{"user_id": 1, "search_criteria": {"make": "Toyota"}} for _ in range(10)],
+        )
+        await db_session.commit()
+        commit = db_session.commit
+        commits = 0
+
+        async def counting_commit():
+            nonlocal commits
+            commits += 1
+            await commit()
+
+        db_session.commit = counting_commit
+        deleted = await delete_in_chunks(
+            db_session, SearchHistory, SearchHistory.user_id == 1, chunk_size=4
+        )
+
+        assert deleted == 10
+        assert commits == 3  # 4 + 4 + 2
+
+    @pytest.mark.asyncio
+    async def test_benchmark_delete_user_history(self, db_session: AsyncSession):
+        """A heavy user's purge no longer loads their JSONB documents"""
+        rows = 5000
+        document = {"make": "Toyota", "notes": "x" * 2000}
+        vehicles = [{"vin": f"VIN{i:014d}", "price": 25000 + i} for i in range(20)]
+
+        async def seed():
+            await db_session.execute(
+                insert(SearchHistory),
+                [
+                    {"user_id": 1, "search_criteria": document, "top_vehicles": vehicles}
+                    for _ in range(rows)
+                ],
+            )
+            await db_session.commit()
+            db_session.expunge_all()
+
+        async def load_then_delete():
+            # Previous implementation
+            result = await db_session.execute(
+                select(SearchHistory).filter(SearchHistory.user_id == 1)
+            )
+            history = result.scalars().all()
+            for record in history:
+                await db_session.delete(record)
+            await db_session.commit()
+            return len(history)
+
+        async def measure(purge):
+            await seed()
+            tracemalloc.start()
+            started = time.perf_counter()
+            deleted = await purge()
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert deleted == rows
+            return elapsed, peak
+
+        before_time, before_peak = await measure(load_then_delete)
+        repo = SearchHistoryRepository(db_session)
+        after_time, after_peak = await measure(lambda: repo.delete_user_history(user_id=1))
+
+        print(
+            f"\ndelete {rows} rows: load-then-delete {before_time * 1000:.0f}ms "
+            f"{before_peak / 2**20:.1f}MiB peak, set-based {after_time * 1000:.0f}ms "
+            f"{after_peak / 2**20:.1f}MiB peak"
+        )
+        assert after_peak * 10 < before_peak
+        assert after_time < before_time
+
 
 class TestAIResponseRepository:
     """Test cases for AIResponseRepository"""
@@ -209,6 +340,9 @@ class TestAIResponseRepository:
             llm_used=False,
         )
 
+        await repo.rebuild_hourly_rollups(hour_start(datetime.now(UTC)))
+        await db_session.commit()
+
         analytics = await repo.get_analytics(days=30)
 
         assert "features" in analytics
@@ -216,3 +350,26 @@ class TestAIResponseRepository:
         assert analytics["features"]["negotiation"]["total_calls"] == 2
         assert analytics["features"]["negotiation"]["llm_calls"] == 1
         assert analytics["features"]["negotiation"]["fallback_calls"] == 1
+        assert analytics["features"]["negotiation"]["total_tokens"] == 100
+
+    @pytest.mark.asyncio
+    async def test_delete_by_deal_id(self, db_session: AsyncSession):
+        repo = AIResponseRepository(db_session)
+        await db_session.execute(
+            insert(AIResponse),
+            [
+                {
+                    "feature": "negotiation",
+                    "deal_id": deal_id,
+                    "prompt_id": "test",
+                    "response_content": {"text": "Response"},
+                }
+                for deal_id in (7, 7, 7, 8)
+            ],
+        )
+        await db_session.commit()
+
+        assert await repo.delete_by_deal_id(7) == 3
+
+        remaining = await db_session.execute(select(func.count()).select_from(AIResponse))
+        assert remaining.scalar() == 1
@@ -0,0 +1,176 @@
+"""
+Tests for the pooled MarketCheck HTTP client
+"""
+
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.metrics import external_api_duration, external_api_errors
+from app.tools.marketcheck_client import MarketCheckAPIClient, MarketCheckServerError
+
+# Simulated per-connection setup cost (stands in for DNS + TCP + TLS handshakes)
+CONNECTION_SETUP_SECONDS = 0.02
+REQUESTS_PER_RUN = 40
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Minimal MarketCheck stand-in that supports HTTP/1.1 keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        time.sleep(CONNECTION_SETUP_SECONDS)
+        super().setup()
+
+    def do_GET(self):
+        if self.path.startswith("/error"):
+            status, body = 503, b'{"message": "unavailable"}'
+        elif self.path.startswith("/throttled"):
+            status, body = 429, b'{"message": "rate limited"}'
+        elif self.path.startswith("/invalid"):
+            status, body = 400, b'{"message": "bad request"}'
+        else:
+            status, body = 200, json.dumps({"num_found": 1, "listings": [{"vin": "X"}]}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    """Run the stand-in server on an ephemeral port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@pytest.mark.asyncio
+async def test_search_cars_uses_shared_client(stand_in_server):
+    """Repeated searches reuse one client instead of opening a new one per call"""
+    client = MarketCheckAPIClient(api_key="test", base_url=stand_in_server)
+    await client.start()
+    try:
+        shared = client._client
+        result = await client.search_cars(make="Toyota", rows=5)
+        await client.search_cars(make="Honda", rows=5)
+
+        assert result["num_found"] == 1
+        assert client._client is shared
+    finally:
+        await client.close()
+
+    assert client._client is None
+
+
+@pytest.mark.asyncio
+async def test_search_cars_records_latency_metric(stand_in_server):
+    """Each call is observed in the external_api_duration histogram"""
+    histogram = external_api_duration.labels(api_name="marketcheck")
+    before = histogram._sum.get()
+
+    client = MarketCheckAPIClient(api_key="test", base_url=stand_in_server)
+    try:
+        await client.search_cars(make="Toyota")
+    finally:
+        await client.close()
+
+    assert histogram._sum.get() > before
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path,status", [("/error", 503), ("/throttled", 429)])
+async def test_search_cars_server_error_raises_upstream_error(stand_in_server, path, status):
+    """5xx and 429 are upstream failures (a ConnectionError), counted per status"""
+    errors = external_api_errors.labels(api_name="marketcheck", error_type=f"http_{status}")
+    before = errors._value.get()
+
+    client = MarketCheckAPIClient(api_key="test", base_url=f"{stand_in_server}{path}")
+    try:
+        with pytest.raises(MarketCheckServerError, match=str(status)) as exc_info:
+            await client.search_cars(make="Toyota")
+    finally:
+        await client.close()
+
+    assert isinstance(exc_info.value, ConnectionError)
+    assert exc_info.value.status_code == status
+    assert errors._value.get() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_search_cars_client_error_raises_value_error(stand_in_server):
+    """Other 4xx statuses mean the request was wrong and stay ValueError"""
+    client = MarketCheckAPIClient(api_key="test", base_url=f"{stand_in_server}/invalid")
+    try:
+        with pytest.raises(ValueError, match="400"):
+            await client.search_cars(make="Toyota")
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_search_cars_connection_error():
+    """Unreachable hosts raise ConnectionError"""
+    client = MarketCheckAPIClient(api_key="test", base_url="http://127.0.0.1:1")
+    try:
+        with pytest.raises(ConnectionError):
+            await client.search_cars(make="Toyota")
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_latency_beats_per_call_client(stand_in_server):
+    """Keep-alive pooling avoids the connection setup cost on every call"""
+    endpoint = f"{stand_in_server}/search/car/active"
+
+    per_call: list[float] = []
+    for _ in range(REQUESTS_PER_RUN):
+        start = time.perf_counter()
+        async with httpx.AsyncClient(timeout=30.0) as fresh:
+            response = await fresh.get(endpoint, params={"api_key": "test"})
+            response.json()
+        per_call.append(time.perf_counter() - start)
+
+    client = MarketCheckAPIClient(api_key="test", base_url=stand_in_server)
+    await client.start()
+    pooled: list[float] = []
+    try:
+        for _ in range(REQUESTS_PER_RUN):
+            start = time.perf_counter()
+            await client.search_cars(make="Toyota")
+            pooled.append(time.perf_counter() - start)
+    finally:
+        await client.close()
+
+    per_call_p50, per_call_p99 = statistics.median(per_call), _percentile(per_call, 99)
+    pooled_p50, pooled_p99 = statistics.median(pooled), _percentile(pooled, 99)
+    print(
+        f"\nper-call client: p50={per_call_p50 * 1000:.2f}ms p99={per_call_p99 * 1000:.2f}ms"
+        f"\npooled client:   p50={pooled_p50 * 1000:.2f}ms p99={pooled_p99 * 1000:.2f}ms"
+    )
+
+    # Every per-call request pays the setup cost; pooled requests pay it once
+    assert per_call_p50 >= CONNECTION_SETUP_SECONDS
+    assert pooled_p50 < CONNECTION_SETUP_SECONDS
+    assert pooled_p50 < per_call_p50
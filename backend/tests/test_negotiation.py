@@ -5,6 +5,7 @@ from unittest.mock import patch
 import pytest
 
 from app.api.dependencies import get_current_user
+from app.models.jsonb_data import AIResponse
 from app.models.models import Deal, DealStatus, User
 from app.models.negotiation import MessageRole, NegotiationStatus
 from app.repositories.negotiation_repository import NegotiationRepository
@@ -59,17 +60,18 @@ def authenticated_client(client, mock_user):
 
 
 @pytest.fixture
-def negotiation_repo(db):
+def negotiation_repo(async_db):
     """Create a negotiation repository instance"""
-    return NegotiationRepository(db)
+    return NegotiationRepository(async_db)
 
 
 # Repository Tests
 
 
-def test_create_negotiation_session(negotiation_repo, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_create_negotiation_session(negotiation_repo, mock_user, mock_deal):
     """Test creating a negotiation session"""
-    session = negotiation_repo.create_session(
+    session = await negotiation_repo.create_session(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
         max_rounds=10,
@@ -83,58 +85,63 @@ def test_create_negotiation_session(negotiation_repo, mock_user, mock_deal):
     assert session.max_rounds == 10
 
 
-def test_get_negotiation_session_repo(negotiation_repo, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_get_negotiation_session_repo(negotiation_repo, mock_user, mock_deal):
     """Test retrieving a negotiation session"""
-    session = negotiation_repo.create_session(
+    session = await negotiation_repo.create_session(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
     )
 
-    retrieved = negotiation_repo.get_session(session.id)
+    retrieved = await negotiation_repo.get_session(session.id)
     assert retrieved is not None
     assert retrieved.id == session.id
     assert retrieved.user_id == mock_user.id
 
 
-def test_get_nonexistent_session(negotiation_repo):
+@pytest.mark.asyncio
+async def test_get_nonexistent_session(negotiation_repo):
     """Test getting a non-existent session"""
-    session = negotiation_repo.get_session(99999)
+    session = await negotiation_repo.get_session(99999)
     assert session is None
 
 
-def test_update_session_status(negotiation_repo, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_update_session_status(negotiation_repo, mock_user, mock_deal):
     """Test updating session status"""
-    session = negotiation_repo.create_session(
+    session = await negotiation_repo.create_session(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
     )
 
-    updated = negotiation_repo.update_session_status(session.id, NegotiationStatus.COMPLETED)
+    updated = await negotiation_repo.update_session_status(session.id, NegotiationStatus.COMPLETED)
     assert updated is not None
     assert updated.status == NegotiationStatus.COMPLETED
 
 
-def test_increment_round(negotiation_repo, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_increment_round(negotiation_repo, mock_user, mock_deal):
     """Test incrementing negotiation round"""
-    session = negotiation_repo.create_session(
+    session = await negotiation_repo.create_session(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
     )
 
     assert session.current_round == 1
 
-    updated = negotiation_repo.increment_round(session.id)
+    updated = await negotiation_repo.increment_round(session.id)
     assert updated.current_round == 2
 
 
-def test_add_message(negotiation_repo, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_add_message(negotiation_repo, mock_user, mock_deal):
     """Test adding a message to a session"""
-    session = negotiation_repo.create_session(
+    session = await negotiation_repo.create_session(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
     )
 
-    message = negotiation_repo.add_message(
+    message = await negotiation_repo.add_message(
         session_id=session.id,
         role=MessageRole.USER,
         content="I want to negotiate the price",
@@ -150,67 +157,70 @@ def test_add_message(negotiation_repo, mock_user, mock_deal):
     assert message.message_metadata == {"target_price": 20000}
 
 
-def test_get_messages(negotiation_repo, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_get_messages(negotiation_repo, mock_user, mock_deal):
     """Test retrieving messages for a session"""
-    session = negotiation_repo.create_session(
+    session = await negotiation_repo.create_session(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
     )
 
     # Add multiple messages
-    negotiation_repo.add_message(
+    await negotiation_repo.add_message(
         session_id=session.id,
         role=MessageRole.USER,
         content="First message",
         round_number=1,
     )
-    negotiation_repo.add_message(
+    await negotiation_repo.add_message(
         session_id=session.id,
         role=MessageRole.AGENT,
         content="Second message",
         round_number=1,
     )
 
-    messages = negotiation_repo.get_messages(session.id)
+    messages = await negotiation_repo.get_messages(session.id)
     assert len(messages) == 2
     assert messages[0].content == "First message"
     assert messages[1].content == "Second message"
 
 
-def test_get_latest_message(negotiation_repo, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_get_latest_message(negotiation_repo, mock_user, mock_deal):
     """Test getting the latest message"""
-    session = negotiation_repo.create_session(
+    session = await negotiation_repo.create_session(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
     )
 
-    negotiation_repo.add_message(
+    await negotiation_repo.add_message(
         session_id=session.id,
         role=MessageRole.USER,
         content="First message",
         round_number=1,
     )
-    negotiation_repo.add_message(
+    await negotiation_repo.add_message(
         session_id=session.id,
         role=MessageRole.AGENT,
         content="Latest message",
         round_number=1,
     )
 
-    latest = negotiation_repo.get_latest_message(session.id)
+    latest = await negotiation_repo.get_latest_message(session.id)
     assert latest is not None
     assert latest.content == "Latest message"
 
 
-def test_delete_session(negotiation_repo, mock_user, mock_deal):
+@pytest.mark.asyncio
+async def test_delete_session(negotiation_repo, mock_user, mock_deal):
     """Test deleting a negotiation session"""
-    session = negotiation_repo.create_session(
+    session = await negotiation_repo.create_session(
         user_id=mock_user.id,
         deal_id=mock_deal.id,
     )
 
     # Add a message
-    negotiation_repo.add_message(
+    await negotiation_repo.add_message(
         session_id=session.id,
         role=MessageRole.USER,
         content="Test message",
@@ -218,11 +228,11 @@ def test_delete_session(negotiation_repo, mock_user, mock_deal):
     )
 
     # Delete session (should cascade delete messages)
-    deleted = negotiation_repo.delete_session(session.id)
+    deleted = await negotiation_repo.delete_session(session.id)
     assert deleted is True
 
     # Verify session is gone
-    retrieved = negotiation_repo.get_session(session.id)
+    retrieved = await negotiation_repo.get_session(session.id)
     assert retrieved is None
 
 
@@ -251,6 +261,30 @@ async def test_create_negotiation_endpoint(authenticated_client, mock_deal):
         assert "agent_message" in data
 
 
+def test_create_negotiation_logs_ai_response(
+    authenticated_client, mock_user, mock_deal, db, async_session_factory
+):
+    """The initial agent response is recorded in ai_responses"""
+    request_data = {"deal_id": mock_deal.id, "user_target_price": 22000.00}
+
+    with (
+        patch("app.services.negotiation_service.AsyncSessionLocal", async_session_factory),
+        patch(
+            "app.services.negotiation_service.generate_text",
+            side_effect=RuntimeError("LLM unavailable"),
+        ),
+    ):
+        response = authenticated_client.post("/api/v1/negotiations/", json=request_data)
+
+    assert response.status_code == 201
+    logged = db.query(AIResponse).filter(AIResponse.feature == "negotiation").all()
+    assert len(logged) == 1
+    assert logged[0].deal_id == mock_deal.id
+    assert logged[0].user_id == mock_user.id
+    assert logged[0].llm_used == 0
+    assert logged[0].response_metadata["session_id"] == response.json()["session_id"]
+
+
 @pytest.mark.asyncio
 async def test_create_negotiation_invalid_deal(authenticated_client):
     """Test creating negotiation with invalid deal ID"""
@@ -264,7 +298,7 @@ async def test_create_negotiation_invalid_deal(authenticated_client):
 
 
 @pytest.mark.asyncio
-async def test_process_next_round_counter(authenticated_client, mock_deal, db):
+async def test_process_next_round_counter(authenticated_client, mock_deal, db, async_db):
     """Test processing next round with counter offer"""
     from app.models.models import User
     from app.repositories.negotiation_repository import NegotiationRepository
@@ -273,11 +307,11 @@ async def test_process_next_round_counter(authenticated_client, mock_deal, db):
     user = db.query(User).filter(User.email == "testuser@example.com").first()
 
     # Create a session
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
 
     # Add initial message
-    repo.add_message(
+    await repo.add_message(
         session_id=session.id,
         role=MessageRole.USER,
         content="Initial message",
@@ -302,18 +336,18 @@ async def test_process_next_round_counter(authenticated_client, mock_deal, db):
 
 
 @pytest.mark.asyncio
-async def test_process_next_round_confirm(authenticated_client, mock_deal, db):
+async def test_process_next_round_confirm(authenticated_client, mock_deal, db, async_db):
     """Test processing next round with confirm action and verify deal update"""
     from app.models.models import User
     from app.repositories.deal_repository import DealRepository
     from app.repositories.negotiation_repository import NegotiationRepository
 
     user = db.query(User).filter(User.email == "testuser@example.com").first()
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
 
     # Add a message with a suggested price to simulate negotiation
-    repo.add_message(
+    await repo.add_message(
         session_id=session.id,
         role=MessageRole.AGENT,
         content="I can offer $23,500 for this vehicle.",
@@ -332,8 +366,8 @@ async def test_process_next_round_confirm(authenticated_client, mock_deal, db):
     assert data["status"] == "completed"
 
     # Verify deal was updated with negotiated price and status
-    deal_repo = DealRepository(db)
-    updated_deal = deal_repo.get(mock_deal.id)
+    deal_repo = DealRepository(async_db)
+    updated_deal = await deal_repo.get(mock_deal.id)
     assert updated_deal is not None
     assert updated_deal.status == "completed"
     assert updated_deal.offer_price == 23500.00
@@ -341,14 +375,14 @@ async def test_process_next_round_confirm(authenticated_client, mock_deal, db):
 
 
 @pytest.mark.asyncio
-async def test_process_next_round_reject(authenticated_client, mock_deal, db):
+async def test_process_next_round_reject(authenticated_client, mock_deal, db, async_db):
     """Test processing next round with reject action"""
     from app.models.models import User
     from app.repositories.negotiation_repository import NegotiationRepository
 
     user = db.query(User).filter(User.email == "testuser@example.com").first()
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
 
     request_data = {"user_action": "reject"}
 
@@ -362,23 +396,23 @@ async def test_process_next_round_reject(authenticated_client, mock_deal, db):
 
 
 @pytest.mark.asyncio
-async def test_get_negotiation_session(authenticated_client, mock_deal, db):
+async def test_get_negotiation_session(authenticated_client, mock_deal, db, async_db):
     """Test retrieving a negotiation session"""
     from app.models.models import User
     from app.repositories.negotiation_repository import NegotiationRepository
 
     user = db.query(User).filter(User.email == "testuser@example.com").first()
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
 
     # Add messages
-    repo.add_message(
+    await repo.add_message(
         session_id=session.id,
         role=MessageRole.USER,
         content="User message",
         round_number=1,
     )
-    repo.add_message(
+    await repo.add_message(
         session_id=session.id,
         role=MessageRole.AGENT,
         content="Agent response",
@@ -402,7 +436,7 @@ def test_get_nonexistent_negotiation(authenticated_client):
 
 
 @pytest.mark.asyncio
-async def test_access_other_user_session(authenticated_client, mock_deal, db):
+async def test_access_other_user_session(authenticated_client, mock_deal, db, async_db):
     """Test that users cannot access other users' sessions"""
     from app.models.models import User
     from app.repositories.negotiation_repository import NegotiationRepository
@@ -418,8 +452,8 @@ async def test_access_other_user_session(authenticated_client, mock_deal, db):
     db.refresh(other_user)
 
     # Create session for other user
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=other_user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=other_user.id, deal_id=mock_deal.id)
 
     # Try to access with authenticated client (different user)
     response = authenticated_client.get(f"/api/v1/negotiations/{session.id}")
@@ -430,7 +464,7 @@ async def test_access_other_user_session(authenticated_client, mock_deal, db):
 
 
 @pytest.mark.asyncio
-async def test_send_chat_message(authenticated_client, mock_deal, db):
+async def test_send_chat_message(authenticated_client, mock_deal, db, async_db):
     """Test sending a free-form chat message"""
     from app.models.models import User
     from app.repositories.negotiation_repository import NegotiationRepository
@@ -439,8 +473,8 @@ async def test_send_chat_message(authenticated_client, mock_deal, db):
     user = db.query(User).filter(User.email == "testuser@example.com").first()
 
     # Create a session
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
 
     request_data = {
         "message": "What's the best strategy for negotiating this price?",
@@ -499,7 +533,7 @@ async def test_send_chat_message_invalid_session(authenticated_client):
 
 
 @pytest.mark.asyncio
-async def test_send_chat_message_validation(authenticated_client, mock_deal, db):
+async def test_send_chat_message_validation(authenticated_client, mock_deal, db, async_db):
     """Test chat message validation"""
     from app.models.models import User
     from app.repositories.negotiation_repository import NegotiationRepository
@@ -508,8 +542,8 @@ async def test_send_chat_message_validation(authenticated_client, mock_deal, db)
     user = db.query(User).filter(User.email == "testuser@example.com").first()
 
     # Create a session
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
 
     # Test with empty message
     request_data = {"message": "", "message_type": "general"}
@@ -530,7 +564,7 @@ async def test_send_chat_message_validation(authenticated_client, mock_deal, db)
 
 
 @pytest.mark.asyncio
-async def test_submit_dealer_info(authenticated_client, mock_deal, db):
+async def test_submit_dealer_info(authenticated_client, mock_deal, db, async_db):
     """Test submitting dealer-provided information"""
     from app.models.models import User
     from app.repositories.negotiation_repository import NegotiationRepository
@@ -539,8 +573,8 @@ async def test_submit_dealer_info(authenticated_client, mock_deal, db):
     user = db.query(User).filter(User.email == "testuser@example.com").first()
 
     # Create a session
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
 
     request_data = {
         "info_type": "price_quote",
@@ -590,7 +624,7 @@ async def test_submit_dealer_info(authenticated_client, mock_deal, db):
 
 
 @pytest.mark.asyncio
-async def test_submit_dealer_info_inactive_session(authenticated_client, mock_deal, db):
+async def test_submit_dealer_info_inactive_session(authenticated_client, mock_deal, db, async_db):
     """Test submitting dealer info to inactive session"""
     from app.models.models import User
     from app.models.negotiation import NegotiationStatus
@@ -600,9 +634,9 @@ async def test_submit_dealer_info_inactive_session(authenticated_client, mock_de
     user = db.query(User).filter(User.email == "testuser@example.com").first()
 
     # Create a completed session
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
-    repo.update_session_status(session.id, NegotiationStatus.COMPLETED)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    await repo.update_session_status(session.id, NegotiationStatus.COMPLETED)
 
     request_data = {
         "info_type": "price_quote",
@@ -617,7 +651,7 @@ async def test_submit_dealer_info_inactive_session(authenticated_client, mock_de
 
 
 @pytest.mark.asyncio
-async def test_submit_dealer_info_validation(authenticated_client, mock_deal, db):
+async def test_submit_dealer_info_validation(authenticated_client, mock_deal, db, async_db):
     """Test dealer info validation"""
     from app.models.models import User
     from app.repositories.negotiation_repository import NegotiationRepository
@@ -626,8 +660,8 @@ async def test_submit_dealer_info_validation(authenticated_client, mock_deal, db
     user = db.query(User).filter(User.email == "testuser@example.com").first()
 
     # Create a session
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=user.id, deal_id=mock_deal.id)
 
     # Test with empty content
     request_data = {"info_type": "price_quote", "content": ""}
@@ -642,3 +676,45 @@ async def test_submit_dealer_info_validation(authenticated_client, mock_deal, db
         f"/api/v1/negotiations/{session.id}/dealer-info", json=request_data
     )
     assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_send_chat_message_streams_deltas(mock_user, mock_deal, db, async_db):
+    """Test chat replies are streamed as deltas and persisted once at the end"""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from app.services.negotiation_service import NegotiationService
+
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=mock_user.id, deal_id=mock_deal.id)
+
+    async def fake_stream(**kwargs):
+        for delta in ["Hold ", "firm ", "at $23k."]:
+            yield delta
+
+    ws_manager = MagicMock()
+    ws_manager.broadcast_message = AsyncMock()
+    ws_manager.broadcast_message_delta = AsyncMock()
+    ws_manager.broadcast_typing_indicator = AsyncMock()
+
+    service = NegotiationService(async_db)
+    service._ws_manager = ws_manager
+
+    with patch("app.services.negotiation_service.stream_text", new=fake_stream):
+        result = await service.send_chat_message(session.id, "Should I counter?")
+
+    assert result["agent_message"]["content"] == "Hold firm at $23k."
+    assert result["agent_message"]["metadata"]["llm_used"] is True
+
+    deltas = [c.args[2] for c in ws_manager.broadcast_message_delta.call_args_list]
+    assert deltas == ["Hold ", "firm ", "at $23k."]
+    stream_ids = {c.args[1] for c in ws_manager.broadcast_message_delta.call_args_list}
+    assert len(stream_ids) == 1
+
+    # Final agent message is broadcast once, tagged with the same stream ID
+    final_call = ws_manager.broadcast_message.call_args_list[-1]
+    assert final_call.kwargs["stream_id"] in stream_ids
+
+    agent_messages = [m for m in await repo.get_messages(session.id) if m.role == MessageRole.AGENT]
+    assert len(agent_messages) == 1
+    assert agent_messages[0].content == "Hold firm at $23k."
@@ -118,16 +118,16 @@ class TestFinancingOptions:
 
 
 @pytest.mark.asyncio
-async def test_negotiation_response_includes_financing(db, mock_deal):
+async def test_negotiation_response_includes_financing(async_db, mock_deal):
     """Test that negotiation responses include financing options"""
-    from unittest.mock import Mock, patch
+    from unittest.mock import AsyncMock, Mock, patch
 
-    service = NegotiationService(db)
+    service = NegotiationService(async_db)
 
     # Mock the LLM response
     with patch(
         "app.services.negotiation_service.generate_text",
-        return_value="Here's my offer for this vehicle.",
+        new=AsyncMock(return_value="Here's my offer for this vehicle."),
     ):
         response = await service._generate_agent_response(
             session=Mock(id=1, current_round=1, max_rounds=10),
@@ -140,6 +140,7 @@ async def test_negotiation_response_includes_financing(db, mock_deal):
     # Check metadata includes financing options
     assert "metadata" in response
     metadata = response["metadata"]
+    assert metadata["llm_used"] is True
     assert "financing_options" in metadata
     assert "cash_savings" in metadata
 
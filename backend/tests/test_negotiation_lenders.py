@@ -1,6 +1,7 @@
 """Tests for negotiation lender recommendation endpoint"""
 
 import pytest
+import pytest_asyncio
 
 from app.models.models import Deal, DealStatus, User
 from app.models.negotiation import MessageRole
@@ -42,14 +43,14 @@ def mock_deal(db):
     return deal
 
 
-@pytest.fixture
-def mock_negotiation_session(db, mock_user, mock_deal):
+@pytest_asyncio.fixture
+async def mock_negotiation_session(async_db, mock_user, mock_deal):
     """Create a mock negotiation session"""
-    repo = NegotiationRepository(db)
-    session = repo.create_session(user_id=mock_user.id, deal_id=mock_deal.id)
+    repo = NegotiationRepository(async_db)
+    session = await repo.create_session(user_id=mock_user.id, deal_id=mock_deal.id)
 
     # Add a message with suggested price
-    repo.add_message(
+    await repo.add_message(
         session_id=session.id,
         role=MessageRole.AGENT,
         content="Here's a counter offer",
@@ -0,0 +1,160 @@
+"""
+Tests for the partition maintenance job
+"""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.partition_maintenance import (
+    MaintenanceReport,
+    PartitionMaintainer,
+    PartitionPolicy,
+    add_months,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+NOW = datetime(2026, 10, 16, 8, 30, tzinfo=UTC)
+POLICY = PartitionPolicy("search_history", retention_months=12)
+
+
+def _maintainer(**overrides) -> PartitionMaintainer:
+    params = {"policies": [POLICY], "premake_months": 3, "run_hour_utc": 3}
+    params.update(overrides)
+    return PartitionMaintainer(**params)
+
+
+def _db():
+    db = MagicMock()
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    return db
+
+
+def _statements(db) -> list[str]:
+    return [str(call.args[0]) for call in db.execute.call_args_list]
+
+
+def test_month_math():
+    assert month_start(NOW) == datetime(2026, 10, 1, tzinfo=UTC)
+    assert add_months(month_start(NOW), 3) == datetime(2027, 1, 1, tzinfo=UTC)
+    assert add_months(month_start(NOW), -10) == datetime(2025, 12, 1, tzinfo=UTC)
+    assert partition_name("ai_responses", month_start(NOW)) == "ai_responses_p202610"
+    assert partition_month("search_history", "search_history_p202512") == datetime(
+        2025, 12, 1, tzinfo=UTC
+    )
+    assert partition_month("search_history", "search_history_default") is None
+
+
+def test_plan_creates_upcoming_and_expires_old_months():
+    existing = [
+        "search_history_default",
+        "search_history_p202509",
+        "search_history_p202510",
+        "search_history_p202610",
+        "search_history_p202611",
+    ]
+
+    to_create, expired = _maintainer().plan(POLICY, existing, NOW)
+
+    assert to_create == [datetime(2026, 12, 1, tzinfo=UTC), datetime(2027, 1, 1, tzinfo=UTC)]
+    # Twelve whole months before October 2026 are kept, from October 2025
+    assert expired == ["search_history_p202509"]
+
+
+@pytest.mark.asyncio
+async def test_maintain_table_creates_and_drops_partitions():
+    maintainer = _maintainer()
+    db = _db()
+    report = MaintenanceReport()
+
+    with patch.object(
+        maintainer,
+        "_existing_partitions",
+        AsyncMock(
+            return_value=[
+                "search_history_p202508",
+                *[
+                    partition_name("search_history", add_months(month_start(NOW), i))
+                    for i in range(3)
+                ],
+            ]
+        ),
+    ):
+        await maintainer.maintain_table(db, POLICY, NOW, report)
+
+    assert report.created == ["search_history_p202701"]
+    assert report.dropped == ["search_history_p202508"]
+    assert _statements(db) == [
+        "CREATE TABLE IF NOT EXISTS search_history_p202701 PARTITION OF search_history "
+        "FOR VALUES FROM ('2027-01-01T00:00:00+00:00') TO ('2027-02-01T00:00:00+00:00')",
+        "DROP TABLE search_history_p202508",
+    ]
+    assert db.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_partitions_are_detached_into_archive_schema():
+    maintainer = _maintainer(premake_months=0, archive_schema="archive")
+    db = _db()
+    report = MaintenanceReport()
+
+    with patch.object(
+        maintainer,
+        "_existing_partitions",
+        AsyncMock(return_value=["search_history_p202001", "search_history_p202610"]),
+    ):
+        await maintainer.maintain_table(db, POLICY, NOW, report)
+
+    assert report.archived == ["search_history_p202001"]
+    assert report.dropped == []
+    assert _statements(db) == [
+        "CREATE SCHEMA IF NOT EXISTS archive",
+        "ALTER TABLE search_history DETACH PARTITION search_history_p202001",
+        "ALTER TABLE search_history_p202001 SET SCHEMA archive",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_partition_is_reported_and_rest_continue():
+    maintainer = _maintainer(premake_months=1)
+    db = _db()
+    db.execute.side_effect = [Exception("overlaps default partition"), None]
+    report = MaintenanceReport()
+
+    with patch.object(maintainer, "_existing_partitions", AsyncMock(return_value=[])):
+        await maintainer.maintain_table(db, POLICY, NOW, report)
+
+    assert report.created == ["search_history_p202611"]
+    assert len(report.errors) == 1
+    db.rollback.assert_awaited_once()
+
+
+def test_invalid_archive_schema_is_rejected():
+    with pytest.raises(ValueError):
+        _maintainer(archive_schema="archive; DROP TABLE users")
+
+
+@pytest.mark.asyncio
+async def test_run_once_skips_unpartitioned_tables(async_session_factory):
+    """On SQLite (and PostgreSQL before migration 012) nothing is touched"""
+    maintainer = _maintainer(
+        policies=[POLICY, PartitionPolicy("ai_responses", retention_months=24)]
+    )
+
+    with patch("app.services.partition_maintenance.AsyncSessionLocal", async_session_factory):
+        report = await maintainer.run_once(now=NOW)
+
+    assert report.skipped_tables == ["search_history", "ai_responses"]
+    assert report.created == [] and report.errors == []
+
+
+def test_seconds_until_next_run():
+    maintainer = _maintainer()
+
+    assert maintainer.seconds_until_next_run(datetime(2026, 10, 16, 2, 0, tzinfo=UTC)) == 3600
+    assert maintainer.seconds_until_next_run(NOW) == (24 - 5.5) * 3600
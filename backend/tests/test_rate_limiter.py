@@ -2,88 +2,147 @@
 Tests for rate limiter functionality
 """
 
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import NoScriptError
 
-from app.core.rate_limiter import RateLimiter
+from app.api.rate_limit import RateLimitMiddleware
+from app.core.rate_limiter import (
+    SLIDING_WINDOW_SCRIPT,
+    SLIDING_WINDOW_SHA,
+    InMemoryRateLimiter,
+    RateLimiter,
+)
+
+
+class CountingRedis:
+    """Redis stand-in that answers the rate limit script and counts round-trips"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.members: list[str] = []
+        self.round_trips = 0
+
+    async def evalsha(self, sha, numkeys, key, now, window, limit, member):
+        self.round_trips += 1
+        if len(self.members) < limit:
+            self.members.append(member)
+            return [1, limit - len(self.members), 0]
+        return [0, 0, window // 2]
+
+    def __getattr__(self, name):
+        raise AssertionError(f"unexpected Redis command {name}")
+
+
+def _redis(return_value=None, **kwargs):
+    mock_redis = MagicMock()
+    mock_redis.evalsha = AsyncMock(return_value=return_value, **kwargs)
+    return mock_redis
 
 
 @pytest.mark.asyncio
 async def test_rate_limiter_allows_requests_within_limit():
     """Test that requests within limit are allowed"""
     limiter = RateLimiter(max_requests=5, window_seconds=60)
-
-    # Mock Redis client with pipeline methods
-    mock_redis = MagicMock()
-    mock_pipeline = MagicMock()
-    mock_pipeline.zremrangebyscore = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.zcard = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.zadd = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.expire = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.execute = AsyncMock(return_value=[None, 0, None, None])  # Count is 0
-    mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
+    mock_redis = _redis(return_value=[1, 4, 0])
 
     with patch("app.core.rate_limiter.redis_client.get_client", return_value=mock_redis):
         is_allowed, retry_after = await limiter.is_allowed(user_id=1)
 
-        assert is_allowed is True
-        assert retry_after is None
+    assert is_allowed is True
+    assert retry_after is None
+    sha, numkeys, key, now, window, limit, member = mock_redis.evalsha.call_args.args
+    assert (sha, numkeys, key) == (SLIDING_WINDOW_SHA, 1, "rate_limit:user:1")
+    assert (window, limit) == (60000, 5)
 
 
 @pytest.mark.asyncio
 async def test_rate_limiter_blocks_requests_over_limit():
     """Test that requests over limit are blocked"""
     limiter = RateLimiter(max_requests=5, window_seconds=60)
+    mock_redis = _redis(return_value=[0, 0, 29500])
 
-    # Mock Redis client - simulate 5 requests already made
-    import time
+    with patch("app.core.rate_limiter.redis_client.get_client", return_value=mock_redis):
+        result = await limiter.check(user_id=1)
 
-    current_time = int(time.time())
+    assert result.allowed is False
+    assert result.remaining == 0
+    assert result.retry_after == 30
 
-    mock_redis = MagicMock()
-    mock_pipeline = MagicMock()
-    mock_pipeline.zremrangebyscore = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.zcard = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.zadd = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.expire = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.execute = AsyncMock(return_value=[None, 5, None, None])  # Count is 5 (at limit)
-    mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
-    # Return a timestamp within the window
-    mock_redis.zrange = AsyncMock(return_value=[("timestamp", current_time - 30)])
 
-    with patch("app.core.rate_limiter.redis_client.get_client", return_value=mock_redis):
+@pytest.mark.asyncio
+async def test_rate_limiter_uses_in_process_limiter_when_redis_unavailable():
+    """Without Redis the limit is enforced per process instead of failing"""
+    limiter = RateLimiter(max_requests=2, window_seconds=60)
+
+    with patch(
+        "app.core.rate_limiter.redis_client.get_client",
+        side_effect=RuntimeError("Redis client is not initialized"),
+    ):
+        assert await limiter.is_allowed(user_id=1) == (True, None)
+        assert await limiter.is_allowed(user_id=1) == (True, None)
         is_allowed, retry_after = await limiter.is_allowed(user_id=1)
 
-        assert is_allowed is False
-        assert retry_after is not None
-        assert retry_after > 0
+    assert is_allowed is False
+    assert retry_after == 30
 
 
 @pytest.mark.asyncio
-async def test_rate_limiter_fail_open_when_redis_unavailable():
-    """Test that limiter allows requests when Redis is unavailable (fail-open)"""
+async def test_rate_limiter_falls_back_on_redis_error():
     limiter = RateLimiter(max_requests=5, window_seconds=60)
+    mock_redis = _redis(side_effect=RedisConnectionError("down"))
 
-    with patch("app.core.rate_limiter.redis_client.get_client", return_value=None):
-        is_allowed, retry_after = await limiter.is_allowed(user_id=1)
+    with (
+        patch("app.core.rate_limiter.redis_client.get_client", return_value=mock_redis),
+        patch("app.core.rate_limiter.redis_client.report_error") as report_error,
+    ):
+        result = await limiter.check(user_id=1)
 
-        assert is_allowed is True
-        assert retry_after is None
+    assert result.allowed is True
+    assert result.remaining == 4
+    report_error.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_script_is_loaded_with_eval_when_not_cached():
+    limiter = RateLimiter(max_requests=5, window_seconds=60)
+    mock_redis = _redis(side_effect=NoScriptError("NOSCRIPT"))
+    mock_redis.eval = AsyncMock(return_value=[1, 4, 0])
+
+    with patch("app.core.rate_limiter.redis_client.get_client", return_value=mock_redis):
+        result = await limiter.check(user_id=1)
+
+    assert result.allowed is True
+    assert mock_redis.eval.call_args.args[0] == SLIDING_WINDOW_SCRIPT
+
+
+@pytest.mark.asyncio
+async def test_burst_requests_get_unique_members():
+    """Requests in the same millisecond are recorded separately"""
+    limiter = RateLimiter(max_requests=5, window_seconds=60)
+    mock_redis = _redis(return_value=[1, 4, 0])
+
+    with (
+        patch("app.core.rate_limiter.redis_client.get_client", return_value=mock_redis),
+        patch("app.core.rate_limiter.time.time", return_value=1_700_000_000.0),
+    ):
+        for _ in range(3):
+            await limiter.check(user_id=1)
+
+    members = [call.args[-1] for call in mock_redis.evalsha.call_args_list]
+    assert len(set(members)) == 3
 
 
 @pytest.mark.asyncio
 async def test_get_remaining_requests():
     """Test getting remaining request count"""
     limiter = RateLimiter(max_requests=10, window_seconds=60)
-
-    # Mock Redis client - simulate 3 requests made
     mock_redis = MagicMock()
-    mock_pipeline = MagicMock()
-    mock_pipeline.zremrangebyscore = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.zcard = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.execute = AsyncMock(return_value=[None, 3])  # Count is 3
-    mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
+    mock_redis.zcount = AsyncMock(return_value=3)
 
     with patch("app.core.rate_limiter.redis_client.get_client", return_value=mock_redis):
         remaining = await limiter.get_remaining_requests(user_id=1)
@@ -95,26 +154,97 @@ async def test_get_remaining_requests():
 async def test_rate_limiter_different_users():
     """Test that different users have separate rate limits"""
     limiter = RateLimiter(max_requests=5, window_seconds=60)
-
-    # Mock Redis client
-    mock_redis = MagicMock()
-    mock_pipeline = MagicMock()
-    mock_pipeline.zremrangebyscore = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.zcard = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.zadd = MagicMock(return_value=mock_pipeline)
-    mock_pipeline.expire = MagicMock(return_value=mock_pipeline)
-
-    # First user - 2 requests
-    mock_pipeline.execute = AsyncMock(return_value=[None, 2, None, None])
-    mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
+    mock_redis = _redis(return_value=[1, 3, 0])
 
     with patch("app.core.rate_limiter.redis_client.get_client", return_value=mock_redis):
         is_allowed_1, _ = await limiter.is_allowed(user_id=1)
-
-        # Second user - 4 requests
-        mock_pipeline.execute = AsyncMock(return_value=[None, 4, None, None])
         is_allowed_2, _ = await limiter.is_allowed(user_id=2)
 
-        # Both should be allowed as they're under the limit
-        assert is_allowed_1 is True
-        assert is_allowed_2 is True
+    assert is_allowed_1 is True
+    assert is_allowed_2 is True
+    keys = [call.args[2] for call in mock_redis.evalsha.call_args_list]
+    assert keys == ["rate_limit:user:1", "rate_limit:user:2"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_sets_remaining_and_rejects_over_limit():
+    middleware = RateLimitMiddleware(max_requests=2, window_seconds=60)
+    redis = CountingRedis(limit=2)
+    request = SimpleNamespace(state=SimpleNamespace(user_id=7), client=None)
+
+    with patch("app.core.rate_limiter.redis_client.get_client", return_value=redis):
+        await middleware(request)
+        assert request.state.rate_limit_remaining == 1
+        await middleware(request)
+        with pytest.raises(HTTPException) as exc_info:
+            await middleware(request)
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "30"
+
+
+@pytest.mark.asyncio
+async def test_benchmark_round_trips_per_request():
+    """One round-trip per request (previously a pipeline, a ZRANGE when over
+    the limit and a second pipeline for the remaining count: 3)"""
+    requests = 200
+    middleware = RateLimitMiddleware(max_requests=150, window_seconds=60)
+    redis = CountingRedis(limit=150)
+    request = SimpleNamespace(state=SimpleNamespace(user_id=7), client=None)
+
+    with patch("app.core.rate_limiter.redis_client.get_client", return_value=redis):
+        for _ in range(requests):
+            try:
+                await middleware(request)
+            except HTTPException:
+                pass
+
+    per_request = redis.round_trips / requests
+    print(f"\nrate limit round-trips per request: {per_request:.2f} (was 3 when over limit)")
+    assert per_request == 1
+
+
+class TestInMemoryRateLimiter:
+    @pytest.mark.asyncio
+    async def test_allows_burst_then_spaces_requests(self):
+        limiter = InMemoryRateLimiter(max_requests=3, window_seconds=60)
+
+        with patch("app.core.rate_limiter.time.monotonic", return_value=1000.0):
+            results = [await limiter.check("u") for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert results[3].retry_after == 20
+
+        # One emission interval later exactly one more request fits
+        with patch("app.core.rate_limiter.time.monotonic", return_value=1020.0):
+            assert (await limiter.check("u")).allowed
+            assert not (await limiter.check("u")).allowed
+
+    @pytest.mark.asyncio
+    async def test_remaining_does_not_consume(self):
+        limiter = InMemoryRateLimiter(max_requests=5, window_seconds=60)
+
+        await limiter.check("u")
+
+        assert await limiter.get_remaining_requests("u") == 4
+        assert await limiter.get_remaining_requests("u") == 4
+        assert await limiter.get_remaining_requests("other") == 5
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_are_swept(self):
+        """10k+ distinct users are tracked with one entry each and dropped once idle"""
+        now = 1000.0
+
+        with patch("app.core.rate_limiter.time.monotonic", side_effect=lambda: now):
+            limiter = InMemoryRateLimiter(max_requests=100, window_seconds=60, num_shards=16)
+            for user_id in range(12000):
+                assert (await limiter.check(user_id)).allowed
+            assert len(limiter) == 12000
+
+            # After the window every shard gets swept in turn
+            for _ in range(16):
+                now += 60 / 16 + 1
+                await limiter.check("active")
+
+        assert len(limiter) == 1
@@ -41,16 +41,9 @@ def authenticated_client(client, mock_user):
 @pytest.fixture
 def mock_rate_limiter_allowed():
     """Mock rate limiter that allows requests"""
-    mock_pipeline = AsyncMock()
-    mock_pipeline.zremrangebyscore = MagicMock(return_value=None)
-    mock_pipeline.zcard = MagicMock(return_value=None)
-    mock_pipeline.zadd = MagicMock(return_value=None)
-    mock_pipeline.expire = MagicMock(return_value=None)
-    mock_pipeline.execute = AsyncMock(return_value=[None, 10, None, None])  # request count = 10
-
     mock_redis = MagicMock()
-    mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
-    mock_redis.zrange = AsyncMock(return_value=[])
+    # Rate limit script result: allowed, 89 remaining
+    mock_redis.evalsha = AsyncMock(return_value=[1, 89, 0])
 
     return mock_redis
 
@@ -58,18 +51,9 @@ def mock_rate_limiter_allowed():
 @pytest.fixture
 def mock_rate_limiter_exceeded():
     """Mock rate limiter that denies requests (rate limit exceeded)"""
-    mock_pipeline = AsyncMock()
-    mock_pipeline.zremrangebyscore = MagicMock(return_value=None)
-    mock_pipeline.zcard = MagicMock(return_value=None)
-    mock_pipeline.zadd = MagicMock(return_value=None)
-    mock_pipeline.expire = MagicMock(return_value=None)
-    mock_pipeline.execute = AsyncMock(
-        return_value=[None, 100, None, None]
-    )  # request count = 100 (at limit)
-
     mock_redis = MagicMock()
-    mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
-    mock_redis.zrange = AsyncMock(return_value=[[b"timestamp", 1234567890.0]])
+    # Rate limit script result: denied, retry in 10 minutes
+    mock_redis.evalsha = AsyncMock(return_value=[0, 0, 600000])
 
     return mock_redis
 
@@ -0,0 +1,80 @@
+"""
+Tests for Redis pool setup, health tracking and background reconnect
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
+from app.db.redis import InstrumentedConnectionPool, RedisClient, _create_pool
+
+
+@pytest_asyncio.fixture
+async def redis_state():
+    """Give RedisClient fake clients and restore its class state afterwards"""
+    saved = (RedisClient.client, RedisClient.binary_client, RedisClient.healthy)
+    RedisClient.client = AsyncMock()
+    RedisClient.binary_client = AsyncMock()
+    RedisClient._set_healthy(True)
+    yield RedisClient
+    if RedisClient._reconnect_task is not None:
+        RedisClient._reconnect_task.cancel()
+        await asyncio.gather(RedisClient._reconnect_task, return_exceptions=True)
+        RedisClient._reconnect_task = None
+    RedisClient.client, RedisClient.binary_client, RedisClient.healthy = saved
+
+
+def test_pool_uses_configured_limits():
+    pool = _create_pool("test")
+
+    assert isinstance(pool, InstrumentedConnectionPool)
+    assert pool.max_connections == settings.REDIS_MAX_CONNECTIONS
+    assert pool.timeout == settings.REDIS_POOL_TIMEOUT_SECONDS
+    assert pool.connection_kwargs["socket_timeout"] == settings.REDIS_SOCKET_TIMEOUT_SECONDS
+    assert pool.connection_kwargs["retry_on_timeout"] is True
+
+
+@pytest.mark.asyncio
+async def test_pool_checkout_latency_is_recorded():
+    pool = _create_pool("checkout_test")
+    before = REGISTRY.get_sample_value(
+        "autodealgenie_redis_pool_checkout_seconds_count", {"pool": "checkout_test"}
+    )
+
+    with patch("redis.asyncio.BlockingConnectionPool.get_connection", AsyncMock()):
+        await pool.get_connection("GET")
+
+    after = REGISTRY.get_sample_value(
+        "autodealgenie_redis_pool_checkout_seconds_count", {"pool": "checkout_test"}
+    )
+    assert after == (before or 0) + 1
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_mark_redis_unhealthy(redis_state):
+    redis_state.report_error(ResponseError("WRONGTYPE"))
+    assert redis_state.get_client() is redis_state.client
+
+    redis_state.report_error(RedisConnectionError("connection reset"))
+    with pytest.raises(RuntimeError):
+        redis_state.get_client()
+    with pytest.raises(RuntimeError):
+        redis_state.get_binary_client()
+
+
+@pytest.mark.asyncio
+async def test_background_reconnect_restores_health(redis_state):
+    redis_state.client.ping = AsyncMock(side_effect=[RedisConnectionError("down"), True])
+
+    with patch.object(settings, "REDIS_RECONNECT_INTERVAL_SECONDS", 0):
+        redis_state.mark_unhealthy(RedisConnectionError("down"))
+        await asyncio.wait_for(redis_state._reconnect_task, timeout=1)
+
+    assert redis_state.healthy
+    assert redis_state.get_binary_client() is redis_state.binary_client
@@ -1,5 +1,16 @@
 """Tests for repository pattern implementations"""
 
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.models.models import Deal
 from app.repositories.deal_repository import DealRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.schemas import DealCreate, DealUpdate, UserCreate
@@ -8,9 +19,10 @@ from app.schemas.schemas import DealCreate, DealUpdate, UserCreate
 class TestUserRepository:
     """Test UserRepository methods"""
 
-    def test_create_user(self, db):
+    @pytest.mark.asyncio
+    async def test_create_user(self, async_db):
         """Test creating a user"""
-        repo = UserRepository(db)
+        repo = UserRepository(async_db)
         user_in = UserCreate(
             email="test@example.com",
             username="testuser",
@@ -18,113 +30,124 @@ class TestUserRepository:
             full_name="Test User",
         )
 
-        user = repo.create(user_in)
+        user = await repo.create(user_in)
         assert user.id is not None
         assert user.email == "test@example.com"
         assert user.username == "testuser"
         assert user.full_name == "Test User"
         assert user.hashed_password != "Testpass123!"  # Should be hashed
 
-    def test_get_by_email(self, db):
+    @pytest.mark.asyncio
+    async def test_get_by_email(self, async_db):
         """Test getting user by email"""
-        repo = UserRepository(db)
+        repo = UserRepository(async_db)
         user_in = UserCreate(email="test@example.com", username="testuser", password="Testpass123!")
 
-        created_user = repo.create(user_in)
-        found_user = repo.get_by_email("test@example.com")
+        created_user = await repo.create(user_in)
+        found_user = await repo.get_by_email("test@example.com")
 
         assert found_user is not None
         assert found_user.id == created_user.id
         assert found_user.email == created_user.email
 
-    def test_get_by_email_not_found(self, db):
+    @pytest.mark.asyncio
+    async def test_get_by_email_not_found(self, async_db):
         """Test getting user by non-existent email"""
-        repo = UserRepository(db)
-        user = repo.get_by_email("nonexistent@example.com")
+        repo = UserRepository(async_db)
+        user = await repo.get_by_email("nonexistent@example.com")
         assert user is None
 
-    def test_get_by_username(self, db):
+    @pytest.mark.asyncio
+    async def test_get_by_username(self, async_db):
         """Test getting user by username"""
-        repo = UserRepository(db)
+        repo = UserRepository(async_db)
         user_in = UserCreate(email="test@example.com", username="testuser", password="Testpass123!")
 
-        created_user = repo.create(user_in)
-        found_user = repo.get_by_username("testuser")
+        created_user = await repo.create(user_in)
+        found_user = await repo.get_by_username("testuser")
 
         assert found_user is not None
         assert found_user.id == created_user.id
         assert found_user.username == created_user.username
 
-    def test_get_by_username_not_found(self, db):
+    @pytest.mark.asyncio
+    async def test_get_by_username_not_found(self, async_db):
         """Test getting user by non-existent username"""
-        repo = UserRepository(db)
-        user = repo.get_by_username("nonexistent")
+        repo = UserRepository(async_db)
+        user = await repo.get_by_username("nonexistent")
         assert user is None
 
-    def test_get_by_id(self, db):
+    @pytest.mark.asyncio
+    async def test_get_by_id(self, async_db):
         """Test getting user by ID"""
-        repo = UserRepository(db)
+        repo = UserRepository(async_db)
         user_in = UserCreate(email="test@example.com", username="testuser", password="Testpass123!")
 
-        created_user = repo.create(user_in)
-        found_user = repo.get_by_id(created_user.id)
+        created_user = await repo.create(user_in)
+        found_user = await repo.get_by_id(created_user.id)
 
         assert found_user is not None
         assert found_user.id == created_user.id
 
-    def test_get_by_id_not_found(self, db):
+    @pytest.mark.asyncio
+    async def test_get_by_id_not_found(self, async_db):
         """Test getting user by non-existent ID"""
-        repo = UserRepository(db)
-        user = repo.get_by_id(99999)
+        repo = UserRepository(async_db)
+        user = await repo.get_by_id(99999)
         assert user is None
 
-    def test_authenticate_success(self, db):
+    @pytest.mark.asyncio
+    async def test_authenticate_success(self, async_db):
         """Test successful authentication"""
-        repo = UserRepository(db)
+        repo = UserRepository(async_db)
         user_in = UserCreate(email="test@example.com", username="testuser", password="Testpass123!")
 
-        repo.create(user_in)
-        authenticated_user = repo.authenticate("test@example.com", "Testpass123!")
+        await repo.create(user_in)
+        authenticated_user = await repo.authenticate("test@example.com", "Testpass123!")
 
         assert authenticated_user is not None
         assert authenticated_user.email == "test@example.com"
 
-    def test_authenticate_wrong_password(self, db):
+    @pytest.mark.asyncio
+    async def test_authenticate_wrong_password(self, async_db):
         """Test authentication with wrong password"""
-        repo = UserRepository(db)
+        repo = UserRepository(async_db)
         user_in = UserCreate(email="test@example.com", username="testuser", password="Testpass123!")
 
-        repo.create(user_in)
-        authenticated_user = repo.authenticate("test@example.com", "wrongpassword")
+        await repo.create(user_in)
+        authenticated_user = await repo.authenticate("test@example.com", "wrongpassword")
 
         assert authenticated_user is None
 
-    def test_authenticate_nonexistent_user(self, db):
+    @pytest.mark.asyncio
+    async def test_authenticate_nonexistent_user(self, async_db):
         """Test authentication with non-existent user"""
-        repo = UserRepository(db)
-        authenticated_user = repo.authenticate("nonexistent@example.com", "Testpass123!")
+        repo = UserRepository(async_db)
+        authenticated_user = await repo.authenticate("nonexistent@example.com", "Testpass123!")
         assert authenticated_user is None
 
-    def test_authenticate_inactive_user(self, db):
+    @pytest.mark.asyncio
+    async def test_authenticate_inactive_user(self, async_db):
         """Test authentication with inactive user"""
-        repo = UserRepository(db)
+        repo = UserRepository(async_db)
         user_in = UserCreate(email="test@example.com", username="testuser", password="Testpass123!")
 
-        user = repo.create(user_in)
+        user = await repo.create(user_in)
         # Manually set user as inactive
         user.is_active = False
-        db.commit()
+        await async_db.commit()
 
-        authenticated_user = repo.authenticate("test@example.com", "Testpass123!")
+        authenticated_user = await repo.authenticate("test@example.com", "Testpass123!")
         assert authenticated_user is None
 
 
 class TestDealRepository:
     """Test DealRepository methods"""
 
-    def test_create_deal(self, db):
+    @pytest.mark.asyncio
+    async def test_create_deal(self, async_db):
         """Test creating a deal"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
         deal_in = DealCreate(
             customer_name="John Doe",
             customer_email="john@example.com",
@@ -137,14 +160,15 @@ class TestDealRepository:
             status="pending",
         )
 
-        deal = repo.create(deal_in)
+        deal = await repo.create(deal_in)
         assert deal.id is not None
         assert deal.customer_name == "John Doe"
         assert deal.vehicle_make == "Toyota"
 
-    def test_get_deal(self, db):
+    @pytest.mark.asyncio
+    async def test_get_deal(self, async_db):
         """Test getting a deal by ID"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
         deal_in = DealCreate(
             customer_name="Jane Doe",
             customer_email="jane@example.com",
@@ -157,22 +181,24 @@ class TestDealRepository:
             status="pending",
         )
 
-        created_deal = repo.create(deal_in)
-        found_deal = repo.get(created_deal.id)
+        created_deal = await repo.create(deal_in)
+        found_deal = await repo.get(created_deal.id)
 
         assert found_deal is not None
         assert found_deal.id == created_deal.id
         assert found_deal.customer_name == created_deal.customer_name
 
-    def test_get_deal_not_found(self, db):
+    @pytest.mark.asyncio
+    async def test_get_deal_not_found(self, async_db):
         """Test getting a non-existent deal"""
-        repo = DealRepository(db)
-        deal = repo.get(99999)
+        repo = DealRepository(async_db)
+        deal = await repo.get(99999)
         assert deal is None
 
-    def test_get_all_deals(self, db):
+    @pytest.mark.asyncio
+    async def test_get_all_deals(self, async_db):
         """Test getting all deals with pagination"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
 
         # Create multiple deals
         for i in range(5):
@@ -187,14 +213,15 @@ class TestDealRepository:
                 asking_price=25000.00,
                 status="pending",
             )
-            repo.create(deal_in)
+            await repo.create(deal_in)
 
-        deals = repo.get_all(skip=0, limit=10)
+        deals = await repo.get_all(skip=0, limit=10)
         assert len(deals) == 5
 
-    def test_get_all_deals_pagination(self, db):
+    @pytest.mark.asyncio
+    async def test_get_all_deals_pagination(self, async_db):
         """Test pagination in get_all"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
 
         # Create multiple deals
         for i in range(5):
@@ -209,19 +236,20 @@ class TestDealRepository:
                 asking_price=25000.00,
                 status="pending",
             )
-            repo.create(deal_in)
+            await repo.create(deal_in)
 
         # Get first 3
-        deals = repo.get_all(skip=0, limit=3)
+        deals = await repo.get_all(skip=0, limit=3)
         assert len(deals) == 3
 
         # Get next 2
-        deals = repo.get_all(skip=3, limit=3)
+        deals = await repo.get_all(skip=3, limit=3)
         assert len(deals) == 2
 
-    def test_get_by_status(self, db):
+    @pytest.mark.asyncio
+    async def test_get_by_status(self, async_db):
         """Test getting deals by status"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
 
         # Create deals with different statuses
         for status in ["pending", "in_progress", "completed"]:
@@ -236,15 +264,16 @@ class TestDealRepository:
                 asking_price=25000.00,
                 status=status,
             )
-            repo.create(deal_in)
+            await repo.create(deal_in)
 
-        pending_deals = repo.get_by_status("pending")
+        pending_deals = await repo.get_by_status("pending")
         assert len(pending_deals) == 1
         assert pending_deals[0].status == "pending"
 
-    def test_get_by_email(self, db):
+    @pytest.mark.asyncio
+    async def test_get_by_email(self, async_db):
         """Test getting deals by customer email"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
 
         email = "customer@example.com"
 
@@ -261,15 +290,16 @@ class TestDealRepository:
                 asking_price=25000.00,
                 status="pending",
             )
-            repo.create(deal_in)
+            await repo.create(deal_in)
 
-        deals = repo.get_by_email(email)
+        deals = await repo.get_by_email(email)
         assert len(deals) == 3
         assert all(deal.customer_email == email for deal in deals)
 
-    def test_update_deal(self, db):
+    @pytest.mark.asyncio
+    async def test_update_deal(self, async_db):
         """Test updating a deal"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
         deal_in = DealCreate(
             customer_name="John Doe",
             customer_email="john@example.com",
@@ -282,12 +312,12 @@ class TestDealRepository:
             status="pending",
         )
 
-        deal = repo.create(deal_in)
+        deal = await repo.create(deal_in)
 
         # Update the deal
         update_data = DealUpdate(status="in_progress", offer_price=24000.00, notes="Negotiating")
 
-        updated_deal = repo.update(deal.id, update_data)
+        updated_deal = await repo.update(deal.id, update_data)
 
         assert updated_deal is not None
         assert updated_deal.id == deal.id
@@ -295,17 +325,19 @@ class TestDealRepository:
         assert updated_deal.offer_price == 24000.00
         assert updated_deal.notes == "Negotiating"
 
-    def test_update_nonexistent_deal(self, db):
+    @pytest.mark.asyncio
+    async def test_update_nonexistent_deal(self, async_db):
         """Test updating a non-existent deal"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
         update_data = DealUpdate(status="completed")
 
-        updated_deal = repo.update(99999, update_data)
+        updated_deal = await repo.update(99999, update_data)
         assert updated_deal is None
 
-    def test_delete_deal(self, db):
+    @pytest.mark.asyncio
+    async def test_delete_deal(self, async_db):
         """Test deleting a deal"""
-        repo = DealRepository(db)
+        repo = DealRepository(async_db)
         deal_in = DealCreate(
             customer_name="John Doe",
             customer_email="john@example.com",
@@ -318,14 +350,105 @@ class TestDealRepository:
             status="pending",
         )
 
-        deal = repo.create(deal_in)
-        result = repo.delete(deal.id)
+        deal = await repo.create(deal_in)
+        result = await repo.delete(deal.id)
 
         assert result is True
-        assert repo.get(deal.id) is None
+        assert await repo.get(deal.id) is None
 
-    def test_delete_nonexistent_deal(self, db):
+    @pytest.mark.asyncio
+    async def test_delete_nonexistent_deal(self, async_db):
         """Test deleting a non-existent deal"""
-        repo = DealRepository(db)
-        result = repo.delete(99999)
+        repo = DealRepository(async_db)
+        result = await repo.delete(99999)
         assert result is False
+
+
+# Simulated database round-trip. The trace callback runs on the thread executing
+# the statement: the event loop thread for a sync Session, aiosqlite's worker
+# thread for an AsyncSession.
+QUERY_LATENCY = 0.01
+
+
+class _InFlightQueries:
+    """Track how many simulated queries are executing at the same time"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def run(self, statement):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(QUERY_LATENCY)
+        with self.lock:
+            self.current -= 1
+
+
+@pytest.mark.asyncio
+async def test_benchmark_concurrent_lookups_per_worker(db):
+    """Concurrent requests overlap their queries instead of queueing on the event loop"""
+    requests = 20
+    deal = Deal(
+        customer_name="John Doe",
+        customer_email="john@example.com",
+        vehicle_make="Toyota",
+        vehicle_vin="1HGCM41JXMN109186",
+        vehicle_model="Camry",
+        vehicle_year=2022,
+        vehicle_mileage=15000,
+        asking_price=25000.00,
+    )
+    db.add(deal)
+    db.commit()
+
+    sync_queries = _InFlightQueries()
+    async_queries = _InFlightQueries()
+
+    def slow_sqlite(dbapi_connection, connection_record):
+        dbapi_connection.set_trace_callback(sync_queries.run)
+
+    def slow_aiosqlite(dbapi_connection, connection_record):
+        dbapi_connection.run_async(lambda conn: conn.set_trace_callback(async_queries.run))
+
+    sync_engine = create_engine("sqlite:///./test.db", poolclass=NullPool)
+    event.listen(sync_engine, "connect", slow_sqlite)
+    SyncSession = sessionmaker(bind=sync_engine)
+
+    async def sync_request():
+        # The previous repositories: a blocking query inside an async endpoint
+        with SyncSession() as session:
+            return session.query(Deal).filter(Deal.id == deal.id).first()
+
+    async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+    event.listen(async_engine.sync_engine, "connect", slow_aiosqlite)
+    AsyncSessionFactory = sessionmaker(async_engine, class_=AsyncSession)
+
+    async def async_request():
+        async with AsyncSessionFactory() as session:
+            return await DealRepository(session).get(deal.id)
+
+    async def throughput(request) -> float:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(request() for _ in range(requests)))
+        assert all(result.id == deal.id for result in results)
+        return requests / (time.perf_counter() - start)
+
+    try:
+        before = await throughput(sync_request)
+        after = await throughput(async_request)
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+    # Report-only: wall-clock throughput varies with machine load
+    print(
+        f"\n{requests} concurrent lookups with {QUERY_LATENCY * 1000:.0f}ms queries: "
+        f"{before:.0f} req/s with Session, {after:.0f} req/s with AsyncSession "
+        f"(peak in-flight queries {sync_queries.peak} vs {async_queries.peak})"
+    )
+    # A sync Session blocks the event loop, so its queries run one at a time
+    assert sync_queries.peak == 1
+    assert async_queries.peak > 1
@@ -0,0 +1,211 @@
+"""
+Tests for the hourly rollup refresh job
+"""
+
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import desc, func, insert, select
+
+from app.models.jsonb_data import (
+    AIResponse,
+    AIUsageRollupHourly,
+    SearchHistory,
+    SearchRollupHourly,
+)
+from app.repositories.ai_response_repository import AIResponseRepository
+from app.repositories.search_history_repository import SearchHistoryRepository
+from app.services.rollup_refresher import RollupRefresher
+
+NOW = datetime(2026, 10, 16, 8, 30, tzinfo=UTC)
+
+
+def _refresher(**overrides) -> RollupRefresher:
+    params = {"interval_seconds": 300, "recompute_hours": 2, "retention_days": 30}
+    params.update(overrides)
+    return RollupRefresher(**params)
+
+
+def _search(make, model, at):
+    return {"search_criteria": {"make": make, "model": model}, "timestamp": at}
+
+
+def _response(feature, llm_used, tokens, at):
+    return {
+        "feature": feature,
+        "prompt_id": "test",
+        "response_content": {},
+        "model_used": "gpt-4" if llm_used else None,
+        "llm_used": llm_used,
+        "tokens_used": tokens,
+        "timestamp": at,
+    }
+
+
+async def _counts(async_db, model, column):
+    result = await async_db.execute(
+        select(model.bucket, func.sum(column)).group_by(model.bucket).order_by(model.bucket)
+    )
+    return [(bucket.hour, total) for bucket, total in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_run_once_rebuilds_recent_hours(async_db, async_session_factory):
+    await async_db.execute(
+        insert(SearchHistory),
+        [
+            _search("Toyota", "Camry", NOW - timedelta(hours=3)),  # Outside the window
+            _search("Toyota", "Camry", NOW - timedelta(hours=2)),
+            _search("Toyota", "Camry", NOW),
+            _search("Honda", "Civic", NOW),
+        ],
+    )
+    await async_db.execute(
+        insert(AIResponse),
+        [
+            _response("negotiation", 1, 100, NOW - timedelta(hours=1)),
+            _response("negotiation", 1, 50, NOW - timedelta(hours=1)),
+            _response("negotiation", 0, None, NOW),
+        ],
+    )
+    await async_db.commit()
+
+    with patch("app.services.rollup_refresher.AsyncSessionLocal", async_session_factory):
+        report = await _refresher().run_once(now=NOW)
+        # Rerunning replaces the buckets rather than adding to them
+        await _refresher().run_once(now=NOW)
+
+    assert report.rebuilt_since == datetime(2026, 10, 16, 6, tzinfo=UTC)
+    assert await _counts(async_db, SearchRollupHourly, SearchRollupHourly.search_count) == [
+        (6, 1),
+        (8, 2),
+    ]
+    assert await _counts(async_db, AIUsageRollupHourly, AIUsageRollupHourly.total_tokens) == [
+        (7, 150),
+        (8, 0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_once_fills_hours_missed_between_runs(async_db, async_session_factory):
+    await async_db.execute(insert(SearchHistory), [_search("Toyota", "Camry", NOW)])
+    await async_db.commit()
+
+    with patch("app.services.rollup_refresher.AsyncSessionLocal", async_session_factory):
+        await _refresher().run_once(now=NOW)
+
+        # No refresh ran for six hours; the searches made meanwhile start
+        # before the next run's trailing window
+        await async_db.execute(
+            insert(SearchHistory),
+            [_search("Honda", "Civic", NOW + timedelta(hours=h)) for h in range(1, 6)],
+        )
+        await async_db.commit()
+        report = await _refresher().run_once(now=NOW + timedelta(hours=6))
+
+    assert report.rebuilt_since == datetime(2026, 10, 16, 8, tzinfo=UTC)
+    assert await _counts(async_db, SearchRollupHourly, SearchRollupHourly.search_count) == [
+        (8, 1),
+        (9, 1),
+        (10, 1),
+        (11, 1),
+        (12, 1),
+        (13, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_once_prunes_expired_buckets(async_db, async_session_factory):
+    await async_db.execute(
+        insert(SearchRollupHourly),
+        [
+            {"bucket": NOW - timedelta(days=31), "make": "Ford", "search_count": 1},
+            {"bucket": NOW - timedelta(days=29), "make": "Ford", "search_count": 1},
+        ],
+    )
+    await async_db.execute(insert(SearchHistory), [_search("Ford", None, NOW - timedelta(days=29))])
+    await async_db.commit()
+
+    with patch("app.services.rollup_refresher.AsyncSessionLocal", async_session_factory):
+        report = await _refresher().run_once(now=NOW)
+
+    assert report.pruned == 1
+    remaining = await async_db.execute(select(func.count()).select_from(SearchRollupHourly))
+    assert remaining.scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_benchmark_popular_searches_from_rollups(async_db, async_session_factory):
+    """Reading a week of rollups vs. aggregating a week of raw searches"""
+    rows = 50_000
+    now = datetime.now(UTC)
+    pairs = [(f"Make{i}", f"Model{j}") for i in range(10) for j in range(3)]
+    rng = random.Random(7)
+    await async_db.execute(
+        insert(SearchHistory),
+        [
+            _search(*rng.choice(pairs), now - timedelta(seconds=rng.randrange(7 * 24 * 3600)))
+            for _ in range(rows)
+        ],
+    )
+    await async_db.commit()
+
+    with patch("app.services.rollup_refresher.AsyncSessionLocal", async_session_factory):
+        await _refresher(recompute_hours=7 * 24).run_once(now=now)
+
+    make = SearchHistory.search_criteria["make"].astext
+    model = SearchHistory.search_criteria["model"].astext
+    started = time.perf_counter()
+    result = await async_db.execute(
+        # Previous implementation
+        select(make.label("make"), model.label("model"), func.count().label("count"))
+        .filter(SearchHistory.timestamp >= now - timedelta(days=7))
+        .group_by(make, model)
+        .order_by(desc("count"))
+        .limit(10)
+    )
+    raw = result.all()
+    raw_time = time.perf_counter() - started
+
+    repo = SearchHistoryRepository(async_db)
+    started = time.perf_counter()
+    popular = await repo.get_popular_searches(limit=10, days=7)
+    rollup_time = time.perf_counter() - started
+
+    print(
+        f"\npopular searches over {rows} rows: raw GROUP BY {raw_time * 1000:.1f}ms, "
+        f"rollups {rollup_time * 1000:.1f}ms"
+    )
+    assert [row["search_count"] for row in popular] == [row.count for row in raw]
+    assert rollup_time * 3 < raw_time
+
+
+@pytest.mark.asyncio
+async def test_analytics_read_rollups(async_db, async_session_factory):
+    await async_db.execute(
+        insert(AIResponse),
+        [
+            _response("deal_evaluation", 1, 200, datetime.now(UTC)),
+            _response("deal_evaluation", 0, None, datetime.now(UTC)),
+        ],
+    )
+    await async_db.commit()
+    repo = AIResponseRepository(async_db)
+
+    # Not visible until the next refresh
+    assert (await repo.get_analytics(days=1))["features"] == {}
+
+    with patch("app.services.rollup_refresher.AsyncSessionLocal", async_session_factory):
+        await _refresher().run_once()
+
+    assert (await repo.get_analytics(days=1))["features"] == {
+        "deal_evaluation": {
+            "total_calls": 2,
+            "llm_calls": 1,
+            "fallback_calls": 1,
+            "total_tokens": 200,
+        }
+    }
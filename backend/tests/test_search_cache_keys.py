@@ -0,0 +1,206 @@
+"""
+Tests for canonicalized two-level car search cache keys
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.db import cache as cache_module
+from app.metrics import cache_hits, cache_misses
+from app.services.car_recommendation_service import (
+    LISTINGS_CACHE_NAME,
+    CarRecommendationService,
+)
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in storing values in a dict"""
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def pttl(self, key):
+        return -1
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.fixture
+def service():
+    return CarRecommendationService()
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch.object(cache_module.redis_client, "get_binary_client", return_value=redis):
+        yield redis
+
+
+def _raw_listing(vin: str, price: int, miles: int = 20000) -> dict:
+    return {
+        "vin": vin,
+        "price": price,
+        "miles": miles,
+        "build": {"make": "Toyota", "model": "Camry", "year": 2021},
+    }
+
+
+class TestRankingKey:
+    """Ranking-level keys ignore case and whitespace but keep exact filters"""
+
+    def test_text_inputs_are_canonicalized(self, service):
+        key1 = service._generate_cache_key(
+            make="Toyota", model="RAV4", user_priorities="Fuel  economy\nand safety"
+        )
+        key2 = service._generate_cache_key(
+            make=" toyota", model="rav4 ", user_priorities="fuel economy and SAFETY"
+        )
+        assert key1 == key2
+
+    def test_priorities_change_ranking_key(self, service):
+        assert service._generate_cache_key(
+            make="Toyota", user_priorities="safety"
+        ) != service._generate_cache_key(make="Toyota", user_priorities="price")
+
+
+class TestListingKey:
+    """Listing-level keys are shared across priorities and near-identical ranges"""
+
+    def _key(self, service, **overrides):
+        params = {
+            "make": "Toyota",
+            "model": "Camry",
+            "car_type": "used",
+            "budget_min": None,
+            "budget_max": 30000,
+            "year_min": None,
+            "year_max": None,
+            "mileage_max": 50000,
+        }
+        params.update(overrides)
+        return service._generate_listing_key(service._listing_fetch_params(**params), rows=50)
+
+    def test_price_and_mileage_are_bucketed(self, service):
+        assert self._key(service, budget_max=29999) == self._key(service, budget_max=30000)
+        assert self._key(service, mileage_max=47500) == self._key(service, mileage_max=50000)
+        assert self._key(service, budget_max=30001) != self._key(service, budget_max=30000)
+
+    def test_buckets_widen_outward(self, service):
+        params = service._listing_fetch_params(
+            make="TOYOTA",
+            model="Camry",
+            car_type=None,
+            budget_min=15500,
+            budget_max=29999,
+            year_min=None,
+            year_max=None,
+            mileage_max=42000,
+        )
+        assert params["make"] == "toyota"
+        assert params["min_price"] == 15000
+        assert params["max_price"] == 30000
+        assert params["max_mileage"] == 45000
+
+
+@pytest.mark.asyncio
+async def test_different_priorities_share_one_listing_fetch(service, fake_redis):
+    """A second search with new priorities re-ranks cached listings without refetching"""
+    api = AsyncMock(
+        return_value={
+            "num_found": 3,
+            "listings": [
+                _raw_listing("A", 29500),
+                _raw_listing("B", 29999),
+                # Inside the widened bucket but above the exact budget
+                _raw_listing("C", 30000),
+            ],
+        }
+    )
+    hits = cache_hits.labels(cache_name=LISTINGS_CACHE_NAME)
+    misses = cache_misses.labels(cache_name=LISTINGS_CACHE_NAME)
+    hits_before, misses_before = hits._value.get(), misses._value.get()
+
+    with (
+        patch.object(service, "_search_marketcheck_with_retry", api),
+        patch.object(service, "_get_from_file_cache", AsyncMock(return_value=None)),
+        patch.object(service, "_save_to_file_cache", AsyncMock()),
+        patch("app.services.car_recommendation_service.llm_client") as mock_llm,
+    ):
+        mock_llm.is_available.return_value = False
+        first = await service.search_and_recommend(
+            make="Toyota", budget_max=29999, user_priorities="safety"
+        )
+        second = await service.search_and_recommend(
+            make="toyota", budget_max=29999, user_priorities="price"
+        )
+
+    api.assert_called_once()
+    assert api.call_args.kwargs["max_price"] == 30000
+    assert hits._value.get() == hits_before + 1
+    assert misses._value.get() == misses_before + 1
+    for result in (first, second):
+        assert sorted(v["vin"] for v in result["top_vehicles"]) == ["A", "B"]
+        assert result["total_analyzed"] == 2
+        # num_found covered the widened range, C included
+        assert result["total_found"] == 2
+        assert not result["total_found_is_estimate"]
+
+
+@pytest.mark.asyncio
+async def test_matches_filters_keeps_listings_with_missing_fields(service):
+    params = {"make": "Toyota", "max_price": 30000, "max_mileage": 40000}
+
+    assert service._matches_filters({"make": "TOYOTA", "price": None}, params)
+    assert not service._matches_filters({"make": "Honda", "price": 20000}, params)
+    assert not service._matches_filters({"make": "Toyota", "mileage": 40001}, params)
+
+
+@pytest.mark.asyncio
+async def test_truncated_widened_fetch_reports_estimated_count(service, fake_redis):
+    """A widened fetch cut off at rows reports MarketCheck's count as an estimate, no extra call"""
+    api = AsyncMock(return_value={"num_found": 400, "listings": [_raw_listing("A", 29500)]})
+
+    with (
+        patch.object(service, "_search_marketcheck_with_retry", api),
+        patch.object(service, "_get_from_file_cache", AsyncMock(return_value=None)),
+        patch.object(service, "_save_to_file_cache", AsyncMock()),
+        patch("app.services.car_recommendation_service.llm_client") as mock_llm,
+        patch("app.services.car_recommendation_service.settings.MAX_SEARCH_RESULTS", 1),
+    ):
+        mock_llm.is_available.return_value = False
+        first = await service.search_and_recommend(make="Toyota", budget_max=29999)
+        # A nearby budget shares the listing fetch and its count
+        second = await service.search_and_recommend(make="Toyota", budget_max=29500)
+
+    api.assert_called_once()
+    assert first["total_found"] == second["total_found"] == 400
+    assert first["total_found_is_estimate"] and second["total_found_is_estimate"]
@@ -0,0 +1,274 @@
+"""
+Tests for stale-while-revalidate caching of car search results
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.db import cache as cache_module
+from app.db import serialization
+from app.services import car_recommendation_service as service_module
+from app.services.car_recommendation_service import (
+    CACHE_STALE_TTL,
+    CACHE_TTL,
+    CarRecommendationService,
+)
+
+RESULT = {"search_criteria": {"make": "Toyota"}, "top_vehicles": [], "total_found": 3}
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in storing values in a dict"""
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def pttl(self, key):
+        return self.ttls[key] * 1000 if key in self.ttls else -1
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+
+class FakeDiskCache:
+    """Stand-in for the persistent disk cache"""
+
+    def __init__(self):
+        self.store: dict[str, dict] = {}
+        self.ttls: dict[str, int | None] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+
+
+@pytest.fixture
+def fake_disk():
+    disk = FakeDiskCache()
+    with patch.object(service_module, "market_data_cache", disk):
+        yield disk
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with (
+        patch.object(cache_module.redis_client, "get_binary_client", return_value=redis),
+        patch("app.core.single_flight.SingleFlight._get_redis", return_value=None),
+    ):
+        yield redis
+
+
+def _store(redis: FakeRedis, key: str, result: dict, age: float) -> None:
+    redis.store[key] = serialization.encode({"cached_at": time.time() - age, "result": result})
+
+
+async def _drain_refreshes():
+    while service_module._background_refreshes:
+        await asyncio.gather(*list(service_module._background_refreshes.values()))
+
+
+@pytest.mark.asyncio
+async def test_set_cached_result_uses_hard_ttl_and_records_age(fake_redis):
+    service = CarRecommendationService()
+
+    await service._set_cached_result("car_search:k", RESULT)
+
+    assert fake_redis.ttls["car_search:k"] == CACHE_STALE_TTL
+    result, age = await service._get_cached_entry("car_search:k")
+    assert result == RESULT
+    assert age < 1
+
+
+@pytest.mark.asyncio
+async def test_legacy_cache_entry_is_treated_as_fresh(fake_redis):
+    """Entries written before cached_at existed are still served"""
+    service = CarRecommendationService()
+    fake_redis.store["car_search:k"] = json.dumps(RESULT)
+
+    assert await service._get_cached_result("car_search:k", max_age=CACHE_TTL) == RESULT
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_does_not_refresh(fake_redis):
+    service = CarRecommendationService()
+    cache_key = service._generate_cache_key(make="Toyota")
+    _store(fake_redis, cache_key, RESULT, age=10)
+    refresh = AsyncMock()
+
+    with patch.object(service, "_refresh_search", refresh):
+        result = await service.search_and_recommend(make="Toyota")
+
+    assert result == RESULT
+    assert not service_module._background_refreshes
+    refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stale_hit_served_immediately_and_refreshed_once(fake_redis):
+    """Concurrent requests for a stale key all get the cached result and trigger one refresh"""
+    service = CarRecommendationService()
+    cache_key = service._generate_cache_key(make="Toyota")
+    _store(fake_redis, cache_key, RESULT, age=CACHE_TTL + 60)
+    refreshed = {**RESULT, "total_found": 99}
+    release = asyncio.Event()
+
+    async def slow_refresh(**kwargs):
+        await release.wait()
+        await service._set_cached_result(kwargs["cache_key"], refreshed)
+        return refreshed
+
+    refresh = AsyncMock(side_effect=slow_refresh)
+
+    with patch.object(service, "_refresh_search", refresh):
+        results = await asyncio.gather(
+            *(service.search_and_recommend(make="Toyota") for _ in range(5))
+        )
+
+        # All callers got the stale value without waiting for the refresh
+        assert results == [RESULT] * 5
+        assert list(service_module._background_refreshes) == [cache_key]
+
+        release.set()
+        await _drain_refreshes()
+
+    refresh.assert_called_once()
+    assert refresh.call_args.kwargs["cache_key"] == cache_key
+    assert await service._get_cached_result(cache_key, max_age=CACHE_TTL) == refreshed
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_entry(fake_redis):
+    """A failing refresh is logged and the stale result keeps being served"""
+    service = CarRecommendationService()
+    cache_key = service._generate_cache_key(make="Toyota")
+    _store(fake_redis, cache_key, RESULT, age=CACHE_TTL + 60)
+    refresh = AsyncMock(side_effect=ConnectionError("MarketCheck down"))
+
+    with patch.object(service, "_refresh_search", refresh):
+        assert await service.search_and_recommend(make="Toyota") == RESULT
+        await _drain_refreshes()
+
+        assert await service.search_and_recommend(make="Toyota") == RESULT
+        await _drain_refreshes()
+
+    assert refresh.call_count == 2
+    assert not service_module._background_refreshes
+
+
+@pytest.mark.asyncio
+async def test_save_to_file_cache_records_age_and_hard_ttl(fake_disk):
+    service = CarRecommendationService()
+
+    await service._save_to_file_cache("car_search:k", RESULT)
+
+    assert fake_disk.ttls["car_search:k"] == CACHE_STALE_TTL
+    result, age, hard_ttl = await service._get_from_file_cache("car_search:k")
+    assert (result, hard_ttl) == (RESULT, CACHE_STALE_TTL)
+    assert age < 1
+
+
+@pytest.mark.asyncio
+async def test_stale_disk_hit_keeps_its_age_and_is_refreshed(fake_redis, fake_disk):
+    """A Redis miss served from an old disk entry is not promoted as fresh"""
+    service = CarRecommendationService()
+    cache_key = service._generate_cache_key(make="Toyota")
+    age = CACHE_TTL + 600
+    fake_disk.store[cache_key] = {
+        "cached_at": time.time() - age,
+        "ttl": CACHE_STALE_TTL,
+        "result": RESULT,
+    }
+    refresh = AsyncMock(return_value=RESULT)
+
+    with patch.object(service, "_refresh_search", refresh):
+        assert await service.search_and_recommend(make="Toyota") == RESULT
+        await _drain_refreshes()
+
+    refresh.assert_called_once()
+    # Promoted with the time it has left, and still stale in Redis
+    assert CACHE_STALE_TTL - age <= fake_redis.ttls[cache_key] <= CACHE_STALE_TTL - age + 1
+    assert await service._get_cached_result(cache_key, max_age=CACHE_TTL) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "entry",
+    [
+        {"cached_at": time.time() - CACHE_STALE_TTL - 1, "ttl": CACHE_STALE_TTL, "result": RESULT},
+        RESULT,  # Written before the cached_at envelope, age unknown
+    ],
+    ids=["past-hard-ttl", "legacy"],
+)
+async def test_expired_or_legacy_disk_entry_is_ignored(fake_redis, fake_disk, entry):
+    service = CarRecommendationService()
+    cache_key = service._generate_cache_key(make="Toyota")
+    fake_disk.store[cache_key] = entry
+    fresh = {**RESULT, "total_found": 99}
+    search = AsyncMock(return_value=fresh)
+
+    with patch.object(service, "_search_and_rank", search):
+        assert await service.search_and_recommend(make="Toyota") == fresh
+
+    search.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_search_uses_its_own_db_session(fake_redis):
+    """The shared computation does not borrow the leader request's db session"""
+    service = CarRecommendationService()
+    request_session = AsyncMock()
+    own_session = AsyncMock()
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = own_session
+    search = AsyncMock(return_value=RESULT)
+
+    with (
+        patch.object(service, "_search_and_rank", search),
+        patch.object(service_module, "AsyncSessionLocal", session_factory),
+        patch.object(service_module, "SearchHistoryRepository") as history_repo,
+    ):
+        history_repo.return_value.create_search_record = AsyncMock()
+        result = await service.search_and_recommend(
+            make="Toyota", user_id=1, db_session=request_session
+        )
+
+    assert result == RESULT
+    assert search.call_args.kwargs["db_session"] is own_session
+    # History is still recorded on the caller's session
+    history_repo.assert_called_once_with(request_session)
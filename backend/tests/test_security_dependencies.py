@@ -1,19 +1,26 @@
 """Tests for dependencies and security functions"""
 
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
 
-from app.api.dependencies import get_current_active_superuser
+from app.api.dependencies import (
+    get_current_active_superuser,
+    get_current_user,
+    invalidate_cached_user,
+)
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
+    decode_token_cached,
     get_password_hash,
     verify_password,
 )
 from app.models.models import User
+from app.repositories.user_repository import UserRepository
 
 
 class TestSecurityFunctions:
@@ -101,6 +108,18 @@ class TestSecurityFunctions:
         payload = decode_token(invalid_token)
         assert payload is None
 
+    def test_decode_token_cached_verifies_once(self):
+        """A verified token is not re-verified until it expires"""
+        token = create_access_token({"sub": "1"})
+
+        with patch("app.core.security.decode_token", wraps=decode_token) as spy:
+            assert decode_token_cached(token)["sub"] == "1"
+            assert decode_token_cached(token)["sub"] == "1"
+            assert decode_token_cached("invalid.token.here") is None
+            assert decode_token_cached("invalid.token.here") is None
+
+        assert spy.call_count == 3
+
     def test_decode_expired_token(self):
         """Test decoding an expired token"""
         data = {"sub": "test@example.com"}
@@ -147,3 +166,54 @@ class TestDependencies:
         result = get_current_active_superuser(user)
         assert result == user
         assert result.is_superuser is True
+
+
+@pytest.fixture
+def active_user(db):
+    user = User(email="cached@example.com", username="cached", hashed_password="hashed")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+class TestCurrentUserCache:
+    """get_current_user resolves repeat requests without the database"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_requests_skip_the_database(self, db, async_db, active_user):
+        token = create_access_token({"sub": str(active_user.id)})
+
+        with patch.object(
+            UserRepository, "get_by_id", wraps=UserRepository(async_db).get_by_id
+        ) as spy:
+            first = await get_current_user(access_token=token, db=async_db)
+            second = await get_current_user(access_token=token, db=async_db)
+
+        assert spy.call_count == 1
+        assert second.id == first.id == active_user.id
+        assert second.email == "cached@example.com"
+        assert second.created_at == active_user.created_at
+
+    @pytest.mark.asyncio
+    async def test_invalidation_picks_up_deactivation(self, db, async_db, active_user):
+        token = create_access_token({"sub": str(active_user.id)})
+        await get_current_user(access_token=token, db=async_db)
+
+        active_user.is_active = 0
+        db.commit()
+        await invalidate_cached_user(active_user.id)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(access_token=token, db=async_db)
+        assert exc_info.value.detail == "Inactive user"
+
+    @pytest.mark.asyncio
+    async def test_cached_identity_excludes_credentials(self, db, async_db, active_user):
+        token = create_access_token({"sub": str(active_user.id)})
+        await get_current_user(access_token=token, db=async_db)
+
+        user = await get_current_user(access_token=token, db=async_db)
+
+        assert user.hashed_password is None
+        assert user.reset_token is None
@@ -0,0 +1,140 @@
+"""
+Tests for cached payload serialization
+"""
+
+import json
+import statistics
+import time
+import zlib
+
+import pytest
+
+from app.db import serialization
+
+SEARCH_RESULT = {
+    "search_criteria": {"make": "Toyota", "model": "Camry", "price_max": 30000},
+    "top_vehicles": [
+        {
+            "vin": f"4T1B11HK5KU{n:06d}",
+            "make": "Toyota",
+            "model": "Camry",
+            "year": 2019 + n % 4,
+            "price": 24000 + n * 350,
+            "mileage": 42000 - n * 1200,
+            "dealer_name": "Downtown Toyota",
+            "highlights": ["Clean title verified", "Single owner vehicle"],
+            "recommendation_summary": "Good option based on condition and features.",
+            "photo_links": [
+                f"https://images.example.com/listing/{n}/photo_{p}.jpg" for p in range(20)
+            ],
+        }
+        for n in range(10)
+    ],
+    "total_found": 240,
+    "total_analyzed": 50,
+}
+
+EVALUATION = {
+    "fair_value": 24500.0,
+    "score": 7.5,
+    "insights": ["Price is slightly below market average", "Mileage is typical for the year"],
+    "talking_points": ["Ask about service records", "Request the vehicle history report"],
+}
+
+PREFERENCES = {"makes": ["Toyota", "Honda"], "budget_max": 30000, "body_types": ["sedan"]}
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd"])
+@pytest.mark.parametrize("value", [SEARCH_RESULT, EVALUATION, PREFERENCES, "text", 42, None])
+def test_round_trip(value, codec):
+    encoded = serialization.encode(value, compress_min_bytes=0, codec=codec)
+    assert serialization.decode(encoded) == value
+
+
+def test_small_payloads_are_not_compressed():
+    encoded = serialization.encode(PREFERENCES, compress_min_bytes=1024)
+    assert encoded[:2] == bytes((serialization.MAGIC, serialization.FORMAT_JSON))
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd"])
+def test_large_payloads_are_compressed(codec):
+    encoded = serialization.encode(SEARCH_RESULT, compress_min_bytes=1024, codec=codec)
+    assert encoded[1] == serialization.CODECS[codec]
+    assert len(encoded) < len(json.dumps(SEARCH_RESULT)) / 3
+
+
+def test_codec_comes_from_settings_not_installed_packages(monkeypatch):
+    """Replicas write the configured codec even when zstandard is importable"""
+    assert serialization.zstandard is not None
+    monkeypatch.setattr(serialization.settings, "CACHE_COMPRESSION_CODEC", "zlib")
+    assert serialization.encode(SEARCH_RESULT, compress_min_bytes=0)[1] == (
+        serialization.FORMAT_JSON_ZLIB
+    )
+
+    monkeypatch.setattr(serialization.settings, "CACHE_COMPRESSION_CODEC", "zstd")
+    assert serialization.encode(SEARCH_RESULT, compress_min_bytes=0)[1] == (
+        serialization.FORMAT_JSON_ZSTD
+    )
+
+
+def test_unknown_codec_raises():
+    with pytest.raises(ValueError):
+        serialization.encode(SEARCH_RESULT, codec="lz4")
+
+
+def test_legacy_json_text_is_readable():
+    """Values cached before the header existed decode as plain JSON"""
+    legacy = json.dumps(SEARCH_RESULT)
+    assert serialization.decode(legacy) == SEARCH_RESULT
+    assert serialization.decode(legacy.encode()) == SEARCH_RESULT
+
+
+def test_unknown_format_raises():
+    with pytest.raises(ValueError):
+        serialization.decode(bytes((serialization.MAGIC, 0x7F)) + b"{}")
+
+
+def test_zlib_entries_decode_without_zstd(monkeypatch):
+    """zlib entries never need zstandard"""
+    encoded = serialization.encode(SEARCH_RESULT, compress_min_bytes=0, codec="zlib")
+    monkeypatch.setattr(serialization, "_zstd_decompressor", None)
+
+    assert encoded[1] == serialization.FORMAT_JSON_ZLIB
+    assert zlib.decompress(encoded[2:])
+    assert serialization.decode(encoded) == SEARCH_RESULT
+
+
+def _time_per_op(fn, iterations: int = 200) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def test_benchmark_against_json_text():
+    """Report bytes stored and encode/decode time per payload type"""
+    lines = []
+    for name, payload in (
+        ("search_result", SEARCH_RESULT),
+        ("evaluation", EVALUATION),
+        ("preferences", PREFERENCES),
+    ):
+        legacy = json.dumps(payload)
+        encoded = serialization.encode(payload)
+
+        legacy_encode = _time_per_op(lambda p=payload: json.dumps(p))
+        legacy_decode = _time_per_op(lambda s=legacy: json.loads(s))
+        new_encode = _time_per_op(lambda p=payload: serialization.encode(p))
+        new_decode = _time_per_op(lambda b=encoded: serialization.decode(b))
+
+        lines.append(
+            f"{name:14} json: {len(legacy):6d}B enc={legacy_encode * 1e6:7.1f}us "
+            f"dec={legacy_decode * 1e6:7.1f}us | "
+            f"cache: {len(encoded):6d}B enc={new_encode * 1e6:7.1f}us "
+            f"dec={new_decode * 1e6:7.1f}us"
+        )
+        assert len(encoded) <= len(legacy) + 2
+
+    print("\n" + "\n".join(lines))
@@ -0,0 +1,149 @@
+"""
+Tests for single-flight request coalescing
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+def _no_redis():
+    return patch(
+        "app.core.single_flight.redis_client.get_client",
+        side_effect=RuntimeError("Redis client is not initialized"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_run_once():
+    """Concurrent callers with the same key share one computation"""
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"top_vehicles": ["rav4"]}
+
+    with _no_redis():
+        results = await asyncio.gather(*[flight.do("rav4", compute) for _ in range(20)])
+
+    assert calls == 1
+    assert all(r == {"top_vehicles": ["rav4"]} for r in results)
+    assert flight.inflight_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_independently():
+    """Distinct keys are not coalesced"""
+    flight = SingleFlight("test")
+    compute = AsyncMock(return_value="ok")
+
+    with _no_redis():
+        await asyncio.gather(flight.do("a", compute), flight.do("b", compute))
+
+    assert compute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failure_propagates_and_next_call_recomputes():
+    """An exception reaches every waiter and is not cached"""
+    flight = SingleFlight("test")
+    attempts = 0
+
+    async def compute():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        if attempts == 1:
+            raise ConnectionError("MarketCheck down")
+        return "recovered"
+
+    with _no_redis():
+        results = await asyncio.gather(
+            *[flight.do("k", compute) for _ in range(3)], return_exceptions=True
+        )
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+        assert await flight.do("k", compute) == "recovered"
+
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    """Cancelling the first caller leaves the shared computation running"""
+    flight = SingleFlight("test")
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    with _no_redis():
+        first = asyncio.create_task(flight.do("k", compute))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+
+@pytest.mark.asyncio
+async def test_leader_takes_and_releases_redis_lock():
+    """The worker that wins the Redis lock computes and releases it"""
+    flight = SingleFlight("car_search", lock_ttl_seconds=10)
+    redis = MagicMock()
+    redis.set = AsyncMock(return_value=True)
+    redis.eval = AsyncMock(return_value=1)
+    compute = AsyncMock(return_value="fresh")
+
+    with patch("app.core.single_flight.redis_client.get_client", return_value=redis):
+        result = await flight.do("k", compute, cache_lookup=AsyncMock(return_value=None))
+
+    assert result == "fresh"
+    compute.assert_awaited_once()
+    lock_key, token = redis.set.call_args.args
+    assert lock_key == "singleflight:car_search:k"
+    assert redis.set.call_args.kwargs == {"nx": True, "ex": 10}
+    assert redis.eval.call_args.args[1:] == (1, lock_key, token)
+
+
+@pytest.mark.asyncio
+async def test_waiter_polls_cache_while_other_worker_holds_lock():
+    """A worker that loses the lock reads the leader's cached result instead of computing"""
+    flight = SingleFlight("car_search", poll_interval_seconds=0.01)
+    redis = MagicMock()
+    redis.set = AsyncMock(return_value=None)
+    redis.exists = AsyncMock(return_value=1)
+    cache_lookup = AsyncMock(side_effect=[None, None, {"cached": True}])
+    compute = AsyncMock(return_value="fresh")
+
+    with patch("app.core.single_flight.redis_client.get_client", return_value=redis):
+        result = await flight.do("k", compute, cache_lookup=cache_lookup)
+
+    assert result == {"cached": True}
+    compute.assert_not_awaited()
+    assert cache_lookup.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_waiter_computes_when_lock_released_without_result():
+    """If the leader fails and releases the lock, the waiter computes itself"""
+    flight = SingleFlight("car_search", poll_interval_seconds=0.01)
+    redis = MagicMock()
+    redis.set = AsyncMock(return_value=None)
+    redis.exists = AsyncMock(return_value=0)
+    compute = AsyncMock(return_value="fresh")
+
+    with patch("app.core.single_flight.redis_client.get_client", return_value=redis):
+        result = await flight.do("k", compute, cache_lookup=AsyncMock(return_value=None))
+
+    assert result == "fresh"
+    compute.assert_awaited_once()
@@ -0,0 +1,221 @@
+"""
+Tests for upstream failure caching and single-probe recovery
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from tenacity import RetryError, wait_none
+
+from app.core.upstream_guard import UpstreamGuard, UpstreamUnavailableError
+from app.db import cache as cache_module
+from app.db import serialization
+from app.services import car_recommendation_service as service_module
+from app.services.car_recommendation_service import (
+    NEGATIVE_CACHE_TTL,
+    CarRecommendationService,
+)
+from app.tools.marketcheck_client import MarketCheckServerError, marketcheck_client
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in with SET NX/EX semantics"""
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def pttl(self, key):
+        return self.ttls[key] * 1000 if key in self.ttls else -1
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        if ex:
+            self.ttls[key] = ex
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def publish(self, channel, message):
+        pass
+
+
+@pytest.fixture
+def no_redis():
+    with patch(
+        "app.core.upstream_guard.redis_client.get_client",
+        side_effect=RuntimeError("not connected"),
+    ):
+        yield
+
+
+@pytest.fixture
+def fast_retries():
+    retrying = CarRecommendationService._search_marketcheck_with_retry.retry
+    with patch.object(retrying, "wait", wait_none()):
+        yield
+
+
+class TestUpstreamGuard:
+    @pytest.mark.asyncio
+    async def test_calls_pass_until_a_failure_is_recorded(self, no_redis):
+        guard = UpstreamGuard("test")
+
+        assert await guard.before_call() is False
+        await guard.record_failure()
+
+        assert await guard.before_call() is True  # first caller probes
+        with pytest.raises(UpstreamUnavailableError):
+            await guard.before_call()
+
+    @pytest.mark.asyncio
+    async def test_successful_probe_clears_failure(self, no_redis):
+        guard = UpstreamGuard("test")
+        await guard.record_failure()
+
+        probe = await guard.before_call()
+        await guard.record_success(probe)
+
+        assert await guard.before_call() is False
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared_through_redis(self):
+        redis = FakeRedis()
+        replica_a, replica_b = UpstreamGuard("test"), UpstreamGuard("test")
+
+        with patch("app.core.upstream_guard.redis_client.get_client", return_value=redis):
+            await replica_a.record_failure()
+            assert 24 <= redis.ttls["upstream:test:failed"] <= 36
+
+            assert await replica_b.before_call() is True
+            with pytest.raises(UpstreamUnavailableError):
+                await replica_a.before_call()
+
+            await replica_b.record_success(True)
+            assert await replica_a.before_call() is False
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_of_failing_upstream_make_one_probe(no_redis, fast_retries):
+    """While one probe is retrying, other callers fail fast instead of retrying 3x each"""
+    service = CarRecommendationService()
+    release = asyncio.Event()
+    calls = 0
+
+    async def failing_search(**kwargs):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        raise ConnectionError("MarketCheck down")
+
+    await service_module.marketcheck_guard.record_failure()
+
+    with patch.object(marketcheck_client, "search_cars", new=failing_search):
+        tasks = [
+            asyncio.create_task(service._search_marketcheck_with_retry(make=f"make{i}"))
+            for i in range(10)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    unavailable = [r for r in results if isinstance(r, UpstreamUnavailableError)]
+    assert len(unavailable) == 9
+    # Only the probe made calls: its first attempt plus two retries
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_server_error_status_is_recorded_as_failure(no_redis, fast_retries):
+    """An upstream that keeps answering 503 is failure-cached like an unreachable one"""
+    service = CarRecommendationService()
+    search = AsyncMock(side_effect=MarketCheckServerError("MarketCheck API error: 503", 503))
+
+    with patch.object(marketcheck_client, "search_cars", search):
+        with pytest.raises(RetryError):
+            await service._search_marketcheck_with_retry(make="Toyota")
+        assert search.await_count == 3
+
+        # The failure is cached: the next caller is the probe, the rest fail fast
+        assert await service_module.marketcheck_guard.before_call() is True
+        with pytest.raises(UpstreamUnavailableError):
+            await service._search_marketcheck_with_retry(make="Honda")
+
+    assert search.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_unavailable_error_is_not_retried(no_redis, fast_retries):
+    service = CarRecommendationService()
+    search = AsyncMock()
+    await service_module.marketcheck_guard.record_failure()
+    await service_module.marketcheck_guard.before_call()  # another caller holds the probe
+
+    with patch.object(marketcheck_client, "search_cars", search):
+        with pytest.raises(UpstreamUnavailableError):
+            await service._search_marketcheck_with_retry(make="Toyota")
+
+    search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_empty_results_use_short_jittered_ttl():
+    redis = FakeRedis()
+    service = CarRecommendationService()
+    api = AsyncMock(return_value={"num_found": 0, "listings": []})
+    disk_save = AsyncMock()
+
+    with (
+        patch.object(cache_module.redis_client, "get_binary_client", return_value=redis),
+        patch("app.core.single_flight.SingleFlight._get_redis", return_value=None),
+        patch.object(service, "_search_marketcheck_with_retry", api),
+        patch.object(service, "_get_from_file_cache", AsyncMock(return_value=None)),
+        patch.object(service, "_save_to_file_cache", disk_save),
+    ):
+        result = await service.search_and_recommend(make="Nonexistent")
+
+    assert result["top_vehicles"] == []
+    cache_key = service._generate_cache_key(make="Nonexistent")
+    assert 0.8 * NEGATIVE_CACHE_TTL <= redis.ttls[cache_key] <= 1.2 * NEGATIVE_CACHE_TTL
+    assert serialization.decode(redis.store[cache_key])["result"] == result
+    assert disk_save.call_args.kwargs["ttl"] == redis.ttls[cache_key]
+    listing_ttls = [ttl for key, ttl in redis.ttls.items() if key.startswith("car_listings:")]
+    assert listing_ttls and all(ttl <= 1.2 * NEGATIVE_CACHE_TTL for ttl in listing_ttls)
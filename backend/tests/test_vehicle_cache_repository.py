@@ -0,0 +1,278 @@
+"""
+Tests for the local vehicle listing index
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.repositories.vehicle_cache_repository import VehicleCacheRepository
+from app.services.car_recommendation_service import CarRecommendationService
+
+
+def _listing(vin: str, **overrides) -> dict:
+    listing = {
+        "vin": vin,
+        "make": "Toyota",
+        "model": "RAV4",
+        "year": 2021,
+        "price": 28000,
+        "mileage": 30000,
+        "inventory_type": "used",
+    }
+    listing.update(overrides)
+    return listing
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Create a test database session"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    from app.db.session import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with AsyncSessionLocal() as session:
+        yield session
+
+    await engine.dispose()
+
+
+class TestVehicleCacheRepository:
+    """Test cases for VehicleCacheRepository"""
+
+    @pytest.mark.asyncio
+    async def test_add_or_update_tracks_first_and_last_seen(self, db_session: AsyncSession):
+        """Re-ingesting a VIN keeps first_seen_at and refreshes data and last_seen_at"""
+        repo = VehicleCacheRepository(db_session)
+
+        created = await repo.add_or_update("VIN1", _listing("VIN1", price=30000))
+        first_seen = created.first_seen_at
+        last_seen = created.last_seen_at
+
+        updated = await repo.add_or_update("VIN1", _listing("VIN1", price=29000))
+
+        assert updated.first_seen_at == first_seen
+        assert updated.last_seen_at >= last_seen
+        assert updated.price == 29000
+        assert updated.listing["price"] == 29000
+        assert updated.make == "toyota"
+
+    @pytest.mark.asyncio
+    async def test_upsert_listings_skips_missing_vin(self, db_session: AsyncSession):
+        """Batches are ingested by VIN and listings without one are ignored"""
+        repo = VehicleCacheRepository(db_session)
+
+        count = await repo.upsert_listings(
+            [_listing("VIN1"), _listing("VIN2"), _listing(None), _listing("VIN1", price=1)]
+        )
+
+        assert count == 2
+        assert (await repo.get("VIN1")).price == 1
+        assert await repo.get("VIN2") is not None
+
+    @pytest.mark.asyncio
+    async def test_upsert_listings_reports_price_changes(self, db_session: AsyncSession):
+        """Known VINs whose price changed are collected; new VINs are not"""
+        repo = VehicleCacheRepository(db_session)
+        await repo.upsert_listings([_listing("VIN1"), _listing("VIN2")])
+
+        changed: set[str] = set()
+        await repo.upsert_listings(
+            [_listing("VIN1", price=26500), _listing("VIN2"), _listing("VIN3")],
+            price_changes=changed,
+        )
+
+        assert changed == {"VIN1"}
+        assert (await repo.get("VIN1")).price_changed_at is not None
+        assert (await repo.get("VIN2")).price_changed_at is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_ingest_of_same_new_vin(self, tmp_path):
+        """Two searches returning the same new VIN both store it without a key conflict"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/index.db")
+        from app.db.session import Base
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def ingest(price: int) -> int:
+            async with session_factory() as session:
+                return await VehicleCacheRepository(session).upsert_listings(
+                    [_listing("NEWVIN", price=price), _listing(f"OTHER{price}")]
+                )
+
+        try:
+            assert await asyncio.gather(ingest(27000), ingest(27500)) == [2, 2]
+            async with session_factory() as session:
+                assert (await VehicleCacheRepository(session).get("NEWVIN")) is not None
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_search_applies_filters(self, db_session: AsyncSession):
+        """Make/model matching is case-insensitive and ranges are inclusive"""
+        repo = VehicleCacheRepository(db_session)
+        await repo.upsert_listings(
+            [
+                _listing("A", price=20000, year=2019, mileage=60000),
+                _listing("B", price=25000, year=2021, mileage=20000),
+                _listing("C", price=32000, year=2023, mileage=5000),
+                _listing("D", make="Honda", model="CR-V"),
+                _listing("E", inventory_type="new"),
+            ]
+        )
+
+        results = await repo.search(
+            make="TOYOTA",
+            model="rav4",
+            car_type="used",
+            min_price=20000,
+            max_price=30000,
+            min_year=2020,
+            max_mileage=40000,
+        )
+
+        assert [listing["vin"] for listing in results] == ["B"]
+
+    @pytest.mark.asyncio
+    async def test_search_excludes_stale_listings(self, db_session: AsyncSession):
+        """Listings not seen within max_age_seconds are not returned"""
+        repo = VehicleCacheRepository(db_session)
+        await repo.upsert_listings([_listing("FRESH"), _listing("STALE")])
+
+        stale = await repo.get("STALE")
+        stale.last_seen_at = datetime.now(UTC) - timedelta(hours=2)
+        await db_session.commit()
+
+        results = await repo.search(make="toyota", max_age_seconds=3600)
+
+        assert [listing["vin"] for listing in results] == ["FRESH"]
+
+    @pytest.mark.asyncio
+    async def test_remove(self, db_session: AsyncSession):
+        """Removed entries are no longer returned"""
+        repo = VehicleCacheRepository(db_session)
+        await repo.add_or_update("VIN1", _listing("VIN1"))
+
+        await repo.remove("VIN1")
+
+        assert await repo.get("VIN1") is None
+
+
+class TestLocalIndexSearch:
+    """Test that searches are answered from the index when it is fresh enough"""
+
+    async def _run_search(self, service, db_session, rows=50):
+        with (
+            patch.object(service, "_set_cached_result", AsyncMock()),
+            patch.object(service, "_save_to_file_cache", AsyncMock()),
+            patch("app.services.car_recommendation_service.llm_client") as mock_llm,
+        ):
+            mock_llm.is_available.return_value = False
+            return await service._search_and_rank(
+                cache_key="car_search:test",
+                make="Toyota",
+                model="RAV4",
+                budget_min=None,
+                budget_max=None,
+                car_type=None,
+                year_min=None,
+                year_max=None,
+                mileage_max=None,
+                user_priorities=None,
+                rows=rows,
+                db_session=db_session,
+            )
+
+    @pytest.mark.asyncio
+    async def test_fresh_index_skips_marketcheck(self, db_session: AsyncSession):
+        """Enough fresh local matches answer the search without an API call"""
+        service = CarRecommendationService()
+        await VehicleCacheRepository(db_session).upsert_listings(
+            [_listing(f"VIN{i}") for i in range(5)]
+        )
+        api = AsyncMock()
+
+        with (
+            patch.object(settings, "LISTING_INDEX_MIN_RESULTS", 5),
+            patch.object(service, "_search_marketcheck_with_retry", api),
+        ):
+            result = await self._run_search(service, db_session)
+
+        api.assert_not_called()
+        assert result["total_analyzed"] == 5
+        assert len(result["top_vehicles"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_index_total_counts_matches_beyond_rows(self, db_session: AsyncSession):
+        """total_found covers every fresh match, not just the rows analysed, as an estimate"""
+        service = CarRecommendationService()
+        await VehicleCacheRepository(db_session).upsert_listings(
+            [_listing(f"VIN{i}") for i in range(8)]
+        )
+
+        with (
+            patch.object(settings, "LISTING_INDEX_MIN_RESULTS", 5),
+            patch.object(service, "_search_marketcheck_with_retry", AsyncMock()),
+        ):
+            result = await self._run_search(service, db_session, rows=5)
+
+        assert result["total_analyzed"] == 5
+        assert result["total_found"] == 8
+        assert result["total_found_is_estimate"]
+
+    @pytest.mark.asyncio
+    async def test_sparse_index_falls_back_to_api_and_ingests(self, db_session: AsyncSession):
+        """Too few fresh matches query MarketCheck and store what comes back"""
+        service = CarRecommendationService()
+        api = AsyncMock(
+            return_value={
+                "num_found": 2,
+                "listings": [
+                    {"vin": "API1", "build": {"make": "Toyota", "model": "RAV4", "year": 2022}},
+                    {"vin": "API2", "build": {"make": "Toyota", "model": "RAV4", "year": 2020}},
+                ],
+            }
+        )
+
+        with (
+            patch.object(settings, "LISTING_INDEX_MIN_RESULTS", 5),
+            patch.object(service, "_search_marketcheck_with_retry", api),
+        ):
+            result = await self._run_search(service, db_session)
+
+        api.assert_called_once()
+        assert result["total_analyzed"] == 2
+        stored = await VehicleCacheRepository(db_session).get("API1")
+        assert stored is not None
+        assert stored.make == "toyota"
+        assert "recommendation_score" not in stored.listing
+
+    @pytest.mark.asyncio
+    async def test_price_change_invalidates_tagged_results(self, db_session: AsyncSession):
+        """Re-ingesting a listing at a new price drops cache entries tagged with its VIN"""
+        service = CarRecommendationService()
+        await VehicleCacheRepository(db_session).upsert_listings([_listing("VIN1")])
+        invalidate = AsyncMock(return_value=["car_search:old"])
+        disk_delete = AsyncMock()
+
+        with (
+            patch("app.services.car_recommendation_service.cache.invalidate_tags", invalidate),
+            patch("app.services.car_recommendation_service.market_data_cache.delete", disk_delete),
+        ):
+            await service._index_listings(
+                db_session, [_listing("VIN1", price=25000), _listing("VIN2")]
+            )
+
+        invalidate.assert_awaited_once_with("vin:VIN1")
+        disk_delete.assert_awaited_once_with("car_search:old")
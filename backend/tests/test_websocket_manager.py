@@ -183,3 +183,29 @@ def test_get_connection_count(connection_manager, mock_websocket):
 
     # Non-existent session
     assert connection_manager.get_connection_count(999) == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_message_delta(connection_manager, mock_websocket):
+    """Test broadcasting a streamed message delta"""
+    session_id = 1
+    await connection_manager.connect(mock_websocket, session_id)
+
+    await connection_manager.broadcast_message_delta(session_id, "stream-1", "Hello")
+
+    call_args = mock_websocket.send_json.call_args[0][0]
+    assert call_args == {"type": "message_delta", "stream_id": "stream-1", "delta": "Hello"}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_message_with_stream_id(connection_manager, mock_websocket):
+    """Test the final message of a stream carries its stream ID"""
+    session_id = 1
+    await connection_manager.connect(mock_websocket, session_id)
+
+    await connection_manager.broadcast_message(session_id, {"id": 7}, stream_id="stream-1")
+
+    call_args = mock_websocket.send_json.call_args[0][0]
+    assert call_args["type"] == "new_message"
+    assert call_args["stream_id"] == "stream-1"
+    assert call_args["message"] == {"id": 7}
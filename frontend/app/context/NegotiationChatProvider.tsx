@@ -37,6 +37,13 @@ const MAX_MESSAGE_QUEUE_SIZE = 50; // Maximum queued messages
 // Connection status types
 type ConnectionStatus = "connected" | "connecting" | "disconnected" | "error" | "reconnecting";
 
+// Streamed agent replies are shown as draft messages until the final message arrives
+const STREAM_DRAFT_KEY = "stream_draft";
+
+function isStreamDraft(message: NegotiationMessage): boolean {
+  return message.metadata?.[STREAM_DRAFT_KEY] === true;
+}
+
 // Queued message interface
 interface QueuedMessage {
   id: string;
@@ -104,6 +111,10 @@ export function NegotiationChatProvider({
   const pingIntervalRef = useRef<NodeJS.Timeout | null>(null);
   const lastSyncTimestampRef = useRef<string | null>(null);
   const retryQueueTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+  // Draft message IDs by stream_id, and streams whose final message already arrived
+  const streamDraftIdsRef = useRef<Map<string, number>>(new Map());
+  const completedStreamsRef = useRef<Set<string>>(new Set());
+  const nextDraftIdRef = useRef(-1);
 
   const setSessionId = useCallback((id: number) => {
     setState((prev) => ({ ...prev, sessionId: id }));
@@ -124,9 +135,10 @@ export function NegotiationChatProvider({
       const response = await apiClient.getNegotiationSession(sessionId);
       
       setState((prev) => {
-        // Get the timestamp of the last message we have
-        const lastLocalTimestamp = prev.messages.length > 0
-          ? prev.messages[prev.messages.length - 1].created_at
+        // Get the timestamp of the last message we have (drafts are not on the server)
+        const storedMessages = prev.messages.filter((msg) => !isStreamDraft(msg));
+        const lastLocalTimestamp = storedMessages.length > 0
+          ? storedMessages[storedMessages.length - 1].created_at
           : lastSyncTimestampRef.current;
         
         // Filter server messages to only those newer than our last message
@@ -180,7 +192,8 @@ export function NegotiationChatProvider({
           // Message sent successfully, remove from queue
           setState((prev) => {
             const newQueue = prev.messageQueue.slice(1);
-            const newMessages = [...prev.messages];
+            // The reply is complete, so any streamed draft of it is obsolete
+            const newMessages = prev.messages.filter((msg) => !isStreamDraft(msg));
             
             // Add messages if not already present
             const userExists = newMessages.some((msg) => msg.id === response.user_message.id);
@@ -250,6 +263,8 @@ export function NegotiationChatProvider({
   }, [processMessageQueue]);
 
   const resetChat = useCallback(() => {
+    streamDraftIdsRef.current.clear();
+    completedStreamsRef.current.clear();
     setState({
       messages: [],
       isTyping: false,
@@ -335,19 +350,82 @@ export function NegotiationChatProvider({
           console.log("WebSocket message received:", data);
 
           switch (data.type) {
-            case "new_message":
+            case "new_message": {
+              // A streamed reply's final message replaces its draft
+              const streamId: string | undefined = data.stream_id;
+              const draftId = streamId ? streamDraftIdsRef.current.get(streamId) : undefined;
+              if (streamId) {
+                completedStreamsRef.current.add(streamId);
+                streamDraftIdsRef.current.delete(streamId);
+              }
+
               // Add new message to state
               setState((prev) => {
+                const messages = draftId === undefined
+                  ? prev.messages
+                  : prev.messages.filter((msg) => msg.id !== draftId);
+
                 // Check if message already exists to prevent duplicates
-                const exists = prev.messages.some((msg) => msg.id === data.message.id);
-                if (exists) return prev;
-                
+                const exists = messages.some((msg) => msg.id === data.message.id);
+                if (exists) {
+                  return draftId === undefined ? prev : { ...prev, messages };
+                }
+
+                const draftIndex = draftId === undefined
+                  ? -1
+                  : prev.messages.findIndex((msg) => msg.id === draftId);
+                const newMessages = [...prev.messages];
+                if (draftIndex >= 0) {
+                  newMessages[draftIndex] = data.message;
+                } else {
+                  newMessages.push(data.message);
+                }
+                return { ...prev, messages: newMessages };
+              });
+              break;
+            }
+
+            case "message_delta": {
+              const streamId: string = data.stream_id;
+              // Late deltas for a reply that already arrived in full are ignored
+              if (!streamId || completedStreamsRef.current.has(streamId)) break;
+
+              let draftId = streamDraftIdsRef.current.get(streamId);
+              const isNewDraft = draftId === undefined;
+              if (draftId === undefined) {
+                draftId = nextDraftIdRef.current--;
+                streamDraftIdsRef.current.set(streamId, draftId);
+              }
+              const id = draftId;
+
+              setState((prev) => {
+                if (!isNewDraft) {
+                  return {
+                    ...prev,
+                    messages: prev.messages.map((msg) =>
+                      msg.id === id ? { ...msg, content: msg.content + data.delta } : msg
+                    ),
+                  };
+                }
+
+                const lastMessage = prev.messages[prev.messages.length - 1];
+                const draft: NegotiationMessage = {
+                  id,
+                  session_id: prev.sessionId ?? lastMessage?.session_id ?? 0,
+                  role: "agent",
+                  content: data.delta,
+                  round_number: lastMessage?.round_number ?? 1,
+                  metadata: { [STREAM_DRAFT_KEY]: true, stream_id: streamId },
+                  created_at: new Date().toISOString(),
+                };
                 return {
                   ...prev,
-                  messages: [...prev.messages, data.message],
+                  messages: [...prev.messages, draft],
+                  isTyping: false,
                 };
               });
               break;
+            }
 
             case "typing_indicator":
               setState((prev) => ({ ...prev, isTyping: data.is_typing }));
@@ -576,7 +654,8 @@ export function NegotiationChatProvider({
           const userExists = prev.messages.some((msg) => msg.id === response.user_message.id);
           const agentExists = prev.messages.some((msg) => msg.id === response.agent_message.id);
           
-          const newMessages = [...prev.messages];
+          // The reply is complete, so any streamed draft of it is obsolete
+          const newMessages = prev.messages.filter((msg) => !isStreamDraft(msg));
           if (!userExists) newMessages.push(response.user_message);
           if (!agentExists) newMessages.push(response.agent_message);
           
@@ -636,7 +715,8 @@ export function NegotiationChatProvider({
           const userExists = prev.messages.some((msg) => msg.id === response.user_message.id);
           const agentExists = prev.messages.some((msg) => msg.id === response.agent_message.id);
           
-          const newMessages = [...prev.messages];
+          // The reply is complete, so any streamed draft of it is obsolete
+          const newMessages = prev.messages.filter((msg) => !isStreamDraft(msg));
           if (!userExists) newMessages.push(response.user_message);
           if (!agentExists) newMessages.push(response.agent_message);
           
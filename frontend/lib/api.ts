@@ -62,7 +62,7 @@ export interface CarSearchRequest {
   year_max?: number;
   mileage_max?: number;
   user_priorities?: string;
-  max_results?: number; // Maximum number of results to analyze (default: 50)
+  max_results?: number; // Maximum number of listings to analyze (default: 200)
 }
 
 export interface SearchCriteria {
@@ -110,6 +110,7 @@ export interface CarSearchResponse {
   search_criteria: SearchCriteria;
   top_vehicles: VehicleRecommendation[];
   total_found: number;
+  total_found_is_estimate?: boolean; // total_found is approximate
   total_analyzed: number;
   message?: string | null;
 }